@@ -1,8 +1,35 @@
 import streamlit as st
 from datetime import date
-import plotly.graph_objects as go
 import pandas as pd
 import numpy as np
+import io
+import os
+import sqlite3
+from contextlib import contextmanager
+
+from oekorps import figures, presets
+from oekorps.batch import compare_methods
+from oekorps.engine import (
+    BENZINVERBRAUCH, DIESELVERBRAUCH, FAHRZEUG_SPALTEN, FAHRZEUGTYP, KILOMETER_BESETZT, KILOMETER_LEER, METHODEN, MODAL_SPLIT_PKM,
+    MODAL_SPLIT_WEGE, STROMVERBRAUCH, UMFRAGE_PKM, UMFRAGE_WEGE, EmissionFactors, blend_strom_emissionsdaten, compare_balances,
+    compute_rps_emissions, modes_for,
+)
+from oekorps.export import EXCEL, EXPORT_FORMATE, JSON, PARQUET, TABELLEN, export_bytes, export_file, export_tables
+from oekorps.fleet import (
+    DATEITYPEN, FleetTotals, apply_edits, combine_fleets, compute_fleet_totals, edited_fleet, empty_fleet, fleet_frame, read_fleet,
+)
+from oekorps.graph import DependencyGraph
+from oekorps.matrix import preset_matrix
+from oekorps.grid import MONATLICH, charging_emissions, period_grid_factors, read_grid_series
+from oekorps.modes import MODE_LABELS, ModeTable, distance_preset, is_wege, mode_vector
+from oekorps.sensitivity import AUSGABEN, MORRIS, SOBOL, BalanceModel, SensitivitySpec, run_sensitivity
+from oekorps.snapshot import EINGABEN, Snapshot, read_snapshot, read_token, snapshot_bytes, snapshot_token
+from oekorps.bands import BIS_KM, DistanceBands
+from oekorps.store import RunStore, balance_from_tables, store_path
+from oekorps.substitution import ANTEILE, ENTFERNUNG, SubstitutionSpec, load_trips, substitute_trips
+from oekorps.sweep import MAX_ACHSEN, Achse, SweepSpec, default_axes, run_sweep
+from oekorps.trips import FAHRT_SPALTEN, ZEITRAEUME, aggregate_trips, compute_trip_balance, trip_totals
+from oekorps.uncertainty import DREIECK, FEST, LOGNORMAL, UncertaintySpec, run_monte_carlo
 
 st.set_page_config(page_title="OekoRPS")
 
@@ -18,10 +45,242 @@ hide_buttons_css = """
 # Inject the custom CSS into the Streamlit app
 st.markdown(hide_buttons_css, unsafe_allow_html=True)
 
+# Zwischenspeicher der Berechnungen: gemeinsam für alle Sitzungen, Schlüssel ist ein Hash der Eingaben,
+# begrenzt auf CACHE_MAX_ENTRIES Einträge je Funktion (älteste zuerst verdrängt) und CACHE_TTL Sekunden
+CACHE_MAX_ENTRIES = 256
+CACHE_TTL = 60 * 60
+
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL, show_spinner=False)
+def cached_fleet_performance(summen: FleetTotals, abgeschlossene_buchungen, transportierte_fahrgaeste):
+    return compute_fleet_totals(summen, abgeschlossene_buchungen, transportierte_fahrgaeste)
+
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL, show_spinner=False)
+def cached_fleet_upload(daten: bytes, dateiname: str):
+    return read_fleet(io.BytesIO(daten), dateiname)
+
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL, show_spinner=False)
+def cached_rps_emissions(benzinverbrauch_gesamt, dieselverbrauch_gesamt, stromverbrauch_gesamt, personenkilometer_gefahren,
+                         benzin_emissionsdaten, diesel_emissionsdaten, strom_emissionsdaten, oekostrom_anteil):
+    return compute_rps_emissions(benzinverbrauch_gesamt, dieselverbrauch_gesamt, stromverbrauch_gesamt, personenkilometer_gefahren,
+                                 benzin_emissionsdaten, diesel_emissionsdaten, strom_emissionsdaten, oekostrom_anteil)
+
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL, show_spinner=False)
+def cached_reference_mobility(methodik: str, anteile: tuple, entfernungen, emissionsfaktoren: tuple,
+                              transportierte_fahrgaeste, personenkilometer_gefahren):
+    tabelle = ModeTable.from_vectors(methodik, anteile, emissionsfaktoren, entfernungen)
+    return tabelle, tabelle.compute(transportierte_fahrgaeste, personenkilometer_gefahren)
+
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL, show_spinner=False)
+def cached_export(tabellen: dict, dateiformat: str, komprimiert: bool) -> bytes:
+    return export_bytes(tabellen, dateiformat, komprimiert)
+
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL, show_spinner=False)
+def cached_trip_upload(daten: bytes, dateiname: str, zeitraum: str):
+    return aggregate_trips(io.BytesIO(daten), dateiname, zeitraum)
+
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL, show_spinner=False)
+def cached_grid_upload(daten: bytes, dateiname: str):
+    return read_grid_series(io.BytesIO(daten), dateiname)
+
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL, show_spinner=False)
+def cached_trip_arrays(daten: bytes, dateiname: str):
+    return load_trips(io.BytesIO(daten), dateiname)
+
+
+# Prozesse für die Monte-Carlo-Simulation und die Sensitivitätsanalyse (1: im Streamlit-Prozess);
+# auf Rechnern mit vielen Kernen über die Umgebungsvariable OEKORPS_PROZESSE einstellbar
+MONTE_CARLO_PROZESSE = int(os.environ.get('OEKORPS_PROZESSE', 1))
+
+
+@contextmanager
+def fortschrittsbalken(text: str):
+    """Fortschrittsbalken für `run_tasks`; wird nach der Berechnung entfernt.
+
+    Ein Neustart des Skripts (Eingabe geändert, "Stop") bricht die Berechnung bei der nächsten Fortschrittsmeldung ab;
+    noch nicht gestartete Blöcke werden verworfen.
+    """
+    balken = st.progress(0.0, text=text)
+    try:
+        yield lambda erledigt, gesamt: balken.progress(erledigt / gesamt, text=f"{text} ({erledigt}/{gesamt} Blöcke)")
+    finally:
+        balken.empty()
+
+
+# Abhängigkeiten der berechneten Größen (Abschnitte 3 bis 10). Die Abschnitte setzen ihre Eingaben in den Graphen;
+# eine Größe wird erst berechnet, wenn ein Abschnitt sie abfragt, und nur neu berechnet, wenn sich eine ihrer Eingaben ändert.
+RECHENGRAPH_EINGABEN = (
+    'fahrtleistung',  # (Flottensummen, abgeschlossene Buchungen, transportierte Fahrgäste) bei "Daten übernehmen & berechnen"
+    'transportierte_fahrgaeste', 'benzin_emissionsdaten', 'diesel_emissionsdaten', 'strom_emissionsdaten', 'oekostrom_anteil',
+    'methodik', 'anteile', 'entfernungen', 'emissionsfaktoren_av',
+    'unsicherheit',  # UncertaintySpec, gesetzt mit "Monte-Carlo-Simulation starten"
+    'strom_emissionsdaten_netz', 'pv_emissionsdaten',  # Stromfaktoren vor der Gewichtung (Sensitivitätsanalyse)
+    'sensitivitaetsanalyse',  # SensitivitySpec, gesetzt mit "Sensitivitätsanalyse starten"
+    'parametergitter',  # SweepSpec, gesetzt mit "Parameterstudie berechnen"
+)
+
+
+# Abschnitt und Eingabe, in denen fehlende Eingaben des Rechengraphen bzw. Sitzungswerte gesetzt werden
+EINGABE_ABSCHNITTE = {
+    'name_ridepooling_system': ("1. Allgemeine Informationen", "Name des Ridepooling-Systems"),
+    'start_date': ("1. Allgemeine Informationen", "Beginn Betrachtungszeitraum"),
+    'end_date': ("1. Allgemeine Informationen", "Ende Betrachtungszeitraum"),
+    'abgeschlossene_buchungen': ("2. Beförderungsleistung", "Abgeschlossene Buchungen"),
+    'transportierte_fahrgaeste': ("2. Beförderungsleistung", "Transportierte Fahrgäste"),
+    'fahrzeugtabelle': ("3. Fahrzeugflotte & Fahrtleistung", "Fahrzeugflotte"),
+    'fahrtleistung': ("3. Fahrzeugflotte & Fahrtleistung", "Daten übernehmen & berechnen"),
+    'benzin_emissionsdaten': ("4. Emissionsdaten", "CO2eq-Emissionsdaten (Benzin)"),
+    'diesel_emissionsdaten': ("4. Emissionsdaten", "CO2eq-Emissionsdaten (Diesel)"),
+    'strom_emissionsdaten': ("4. Emissionsdaten", "CO2eq-Emissionsdaten (Strom)"),
+    'strom_emissionsdaten_netz': ("4. Emissionsdaten", "CO2eq-Emissionsdaten (Strom)"),
+    'oekostrom_anteil': ("4. Emissionsdaten", "Anteil der sekundären Stromquelle"),
+    'pv_emissionsdaten': ("4. Emissionsdaten", "Emissionsfaktor der sekundären Stromquelle"),
+}
+
+
+def fehlende_eingaben(namen: list) -> str:
+    """Meldung zu fehlenden Eingaben, gruppiert nach den Abschnitten, in denen sie auszufüllen sind."""
+    abschnitte = {}
+    for name in namen:
+        abschnitt, eingabe = EINGABE_ABSCHNITTE.get(name, ("Weitere Angaben", name))
+        eingaben = abschnitte.setdefault(abschnitt, [])
+        if eingabe not in eingaben:
+            eingaben.append(eingabe)
+    return "Bitte ergänzen Sie die folgenden Angaben:\n" + "\n".join(
+        f"- **{abschnitt}:** {', '.join(eingaben)}" for abschnitt, eingaben in abschnitte.items())
+
+
+def build_rechengraph() -> DependencyGraph:
+    graph = DependencyGraph()
+    for name in RECHENGRAPH_EINGABEN:
+        graph.add_input(name)
+
+    @graph.node('flotte', 'fahrtleistung')
+    def flotte(fahrtleistung):
+        return cached_fleet_performance(*fahrtleistung)
+
+    @graph.node('personenkilometer_gefahren', 'flotte')
+    def personenkilometer_gefahren(flotte):
+        return flotte.personenkilometer_gefahren
+
+    @graph.node('rps', 'flotte', 'benzin_emissionsdaten', 'diesel_emissionsdaten', 'strom_emissionsdaten', 'oekostrom_anteil')
+    def rps(flotte, benzin_emissionsdaten, diesel_emissionsdaten, strom_emissionsdaten, oekostrom_anteil):
+        return cached_rps_emissions(flotte.benzinverbrauch_gesamt, flotte.dieselverbrauch_gesamt, flotte.stromverbrauch_gesamt,
+                                    flotte.personenkilometer_gefahren, benzin_emissionsdaten, diesel_emissionsdaten, strom_emissionsdaten,
+                                    oekostrom_anteil)
+
+    # Wege-Methoden benötigen die Flotte nicht; ohne Fahrtleistung rechnen Pkm-Methoden mit 0 Pkm
+    @graph.node('referenz', 'methodik', 'anteile', 'entfernungen', 'emissionsfaktoren_av', 'transportierte_fahrgaeste',
+                'personenkilometer_gefahren', optional=['personenkilometer_gefahren'])
+    def referenz(methodik, anteile, entfernungen, emissionsfaktoren_av, transportierte_fahrgaeste, personenkilometer_gefahren):
+        return cached_reference_mobility(methodik, anteile, entfernungen, emissionsfaktoren_av, transportierte_fahrgaeste,
+                                         personenkilometer_gefahren or 0)
+
+    @graph.node('vergleich', 'rps', 'referenz')
+    def vergleich(rps, referenz):
+        _, referenz = referenz
+        return compare_balances(rps.co2_emissionen_gesamt_rps, rps.co2_emissionen_pro_personenkilometer_rps,
+                                referenz.gesamtemissionen_av, referenz.emissionen_pro_personenkilometer_av)
+
+    @graph.node('monte_carlo', 'referenz', 'rps', 'unsicherheit', 'transportierte_fahrgaeste', 'personenkilometer_gefahren',
+                optional=['personenkilometer_gefahren'])
+    def monte_carlo(referenz, rps, unsicherheit, transportierte_fahrgaeste, personenkilometer_gefahren):
+        tabelle, _ = referenz
+        with fortschrittsbalken("Monte-Carlo-Simulation läuft...") as fortschritt:
+            return run_monte_carlo(tabelle, rps.co2_emissionen_gesamt_rps, rps.co2_emissionen_pro_personenkilometer_rps, unsicherheit,
+                                   transportierte_fahrgaeste, personenkilometer_gefahren or 0, prozesse=MONTE_CARLO_PROZESSE,
+                                   fortschritt=fortschritt)
+
+    # Vektorisierte Rechenkette um den aktuellen Fall für Sensitivitätsanalyse und Parameterstudie
+    @graph.node('bilanzmodell', 'flotte', 'referenz', 'transportierte_fahrgaeste', 'benzin_emissionsdaten', 'diesel_emissionsdaten',
+                'strom_emissionsdaten_netz', 'oekostrom_anteil', 'pv_emissionsdaten')
+    def bilanzmodell(flotte, referenz, transportierte_fahrgaeste, benzin_emissionsdaten, diesel_emissionsdaten, strom_emissionsdaten_netz,
+                     oekostrom_anteil, pv_emissionsdaten):
+        tabelle, _ = referenz
+        return BalanceModel.from_balance(flotte, tabelle, transportierte_fahrgaeste, benzin_emissionsdaten, diesel_emissionsdaten,
+                                         strom_emissionsdaten_netz, oekostrom_anteil, pv_emissionsdaten)
+
+    @graph.node('sensitivitaet', 'bilanzmodell', 'sensitivitaetsanalyse')
+    def sensitivitaet(bilanzmodell, sensitivitaetsanalyse):
+        with fortschrittsbalken("Sensitivitätsanalyse läuft...") as fortschritt:
+            return run_sensitivity(bilanzmodell, sensitivitaetsanalyse, prozesse=MONTE_CARLO_PROZESSE, fortschritt=fortschritt)
+
+    @graph.node('parameterstudie', 'bilanzmodell', 'parametergitter')
+    def parameterstudie(bilanzmodell, parametergitter):
+        return run_sweep(bilanzmodell, parametergitter)
+
+    return graph
+
+
+def rechengraph() -> DependencyGraph:
+    if 'rechengraph' not in st.session_state:
+        st.session_state['rechengraph'] = build_rechengraph()
+    return st.session_state['rechengraph']
+
+
 # Funktion zur Initialisierung der Session State Variablen
 def initialize_session_state():
-    if 'vehicle_list' not in st.session_state:
-        st.session_state['vehicle_list'] = []
+    if 'fahrzeugtabelle_basis' not in st.session_state:
+        set_fleet_base(empty_fleet())
+
+
+# Geladenes Szenario (Seitenleiste, oekorps.snapshot). Jedes Laden erhöht 'szenario_nr'; die Eingabefelder der Abschnitte 1 bis 8
+# erhalten damit neue Schlüssel und beginnen im selben Durchlauf mit den geladenen Werten statt mit den Vorgaben.
+def szenario_wert(name: str, vorgabe):
+    return st.session_state.get('szenario', {}).get(name, vorgabe)
+
+
+# Geladener Wert `name`, wenn die Vorauswahl `auswahl_name` wie im Szenario gewählt ist; sonst die Vorgabe der Vorauswahl
+def szenario_vorgabe(auswahl_name: str, auswahl: str, name: str, vorgabe):
+    szenario = st.session_state.get('szenario', {})
+    return szenario.get(name, vorgabe) if szenario.get(auswahl_name) == auswahl else vorgabe
+
+
+def szenario_index(optionen: list, name: str) -> int:
+    auswahl = szenario_wert(name, None)
+    return optionen.index(auswahl) if auswahl in optionen else 0
+
+
+# Schlüssel eines Eingabefelds der Abschnitte 1 bis 8. Er enthält die Vorgaben, damit das Feld wie ein Feld ohne Schlüssel
+# bei einer geänderten Vorgabe (z. B. andere Vorauswahl) neu beginnt.
+def eingabe_key(name: str, *vorgaben) -> str:
+    return "_".join(map(str, ('eingabe', name, st.session_state.get('szenario_nr', 0), *vorgaben)))
+
+
+def load_snapshot(snapshot: Snapshot):
+    """Übernimmt ein Szenario: Eingabefelder, Fahrzeugtabelle, Fahrtleistung und Methodik, ohne weiteren Durchlauf."""
+    eingaben = dict(snapshot.eingaben)
+    st.session_state['szenario'] = eingaben
+    st.session_state['szenario_nr'] = st.session_state.get('szenario_nr', 0) + 1
+    st.session_state.pop('fahrtdaten_leistung', None)
+    set_fleet_base(snapshot.fahrzeuge)
+    if eingaben.get('methodik') in METHODEN:
+        st.session_state.update({'methodik': eingaben['methodik'], 'methodik_selected': True,
+                                 'methodik_selected_pkm': not is_wege(eingaben['methodik'])})
+    # Wie "Daten übernehmen & berechnen" in Abschnitt 3
+    if len(snapshot.fahrzeuge) and 'abgeschlossene_buchungen' in eingaben and 'transportierte_fahrgaeste' in eingaben:
+        graph = rechengraph()
+        graph.set('fahrtleistung', (st.session_state['fahrzeugtabelle_basis_summen'], eingaben['abgeschlossene_buchungen'],
+                                    eingaben['transportierte_fahrgaeste']))
+        st.session_state.update(graph.get('flotte').as_dict())
+    if snapshot.datenbibliothek != presets.VERSION:
+        st.sidebar.warning(f"Das Szenario wurde mit der Datenbibliothek {snapshot.datenbibliothek} gespeichert (aktuell {presets.VERSION}); "
+                           "Vorauswahlen können abweichen.")
+
+
+def current_snapshot() -> Snapshot:
+    """Szenario aus den aktuellen Eingaben; eine Zeitreihe der Netzintensität wird als eigener Emissionsfaktor (Strom) gespeichert."""
+    eingaben = {name: st.session_state[name] for name in EINGABEN if st.session_state.get(name) is not None}
+    if eingaben.get('strom_emissionsdaten_auswahl') == ZEITREIHE_NETZ:
+        eingaben['strom_emissionsdaten_auswahl'] = "Eigene Angaben"
+    return Snapshot(eingaben, st.session_state.get('fahrzeugtabelle', st.session_state['fahrzeugtabelle_basis']))
 
 # Funktion zur Anzeige der Sidebar
 def show_sidebar():
@@ -42,6 +301,51 @@ def show_sidebar():
         </style>
     """, unsafe_allow_html=True)
 
+
+# Szenario laden (Seitenleiste): vor den Abschnitten, damit die geladenen Eingaben im selben Durchlauf gelten.
+# Quellen: Szenario-Datei, Szenario-Code oder Link mit dem Parameter ?szenario=<Code>; jede Quelle wird einmal übernommen.
+def show_scenario_upload():
+    with st.sidebar.expander("**Szenario laden**"):
+        datei = st.file_uploader("Szenario-Datei (JSON, auch gzip-komprimiert):", type=['json', 'gz'], key='szenario_datei')
+        with st.form('szenario_code_form', clear_on_submit=True):
+            code = st.text_input("Szenario-Code:")
+            code_laden = st.form_submit_button("Szenario-Code laden")
+
+    quelle, lesen = None, None
+    if datei is not None and st.session_state.get('szenario_quelle') != datei.file_id:
+        quelle, lesen = datei.file_id, lambda: read_snapshot(datei.getvalue())
+    elif code_laden and code.strip():
+        quelle, lesen = code.strip(), lambda: read_token(code)
+    elif (link := st.query_params.get('szenario')) and st.session_state.get('szenario_link') != link:
+        st.session_state['szenario_link'] = link
+        quelle, lesen = link, lambda: read_token(link)
+    if quelle is None:
+        return
+    st.session_state['szenario_quelle'] = quelle
+    try:
+        load_snapshot(lesen())
+        st.sidebar.success("Das Szenario wurde geladen.")
+    except ValueError as error:
+        st.sidebar.error(str(error))
+
+
+# Szenario speichern (Seitenleiste): nach den Abschnitten, damit die Eingaben dieses Durchlaufs enthalten sind
+def show_scenario_download():
+    with st.sidebar.expander("**Szenario speichern**"):
+        try:
+            snapshot = current_snapshot()
+            daten = snapshot_bytes(snapshot)
+        except ValueError as error:  # z. B. nicht endliche Werte
+            st.error(str(error))
+            return
+        name = format_dateiname(st.session_state.get('name_ridepooling_system') or "szenario")
+        st.download_button("Szenario-Datei herunterladen", data=daten, file_name=f"{name}.oekorps.json.gz", mime="application/gzip")
+        st.text_input("Szenario-Code (auch als Link mit ?szenario=<Code>):", snapshot_token(snapshot), disabled=True)
+
+
+def format_dateiname(name: str) -> str:
+    return "".join(zeichen if zeichen.isalnum() or zeichen in "-_" else "_" for zeichen in name.strip()) or "szenario"
+
 # Funktion zur Validierung der Eingaben
 def validate_input(text):
     return text.isdigit()
@@ -99,9 +403,10 @@ def format_text(text: str) -> str:
 def show_general_info():
     with st.expander("**1. Allgemeine Informationen**"):
         st.info("**Hinweis:** Bitte geben Sie zunächst allgemeine Informationen zum Ridepooling-System an. Bitte berücksichtigen Sie den Betrachtungszeitraum, auf welchen sich die folgenden Angaben beziehen.")
-        name_ridepooling_system = st.text_input("Name des Ridepooling-Systems:")
-        start_date = st.date_input("Beginn Betrachtungszeitraum:", date(2022, 1, 1))
-        end_date = st.date_input("Ende Betrachtungszeitraum:", date(2022, 12, 31))
+        name_ridepooling_system = st.text_input("Name des Ridepooling-Systems:", szenario_wert('name_ridepooling_system', ""),
+                                                key=eingabe_key('name_ridepooling_system'))
+        start_date = st.date_input("Beginn Betrachtungszeitraum:", szenario_wert('start_date', date(2022, 1, 1)), key=eingabe_key('start_date'))
+        end_date = st.date_input("Ende Betrachtungszeitraum:", szenario_wert('end_date', date(2022, 12, 31)), key=eingabe_key('end_date'))
 
         st.session_state.update({
             'name_ridepooling_system': name_ridepooling_system,
@@ -128,115 +433,139 @@ def show_system_performance():
     with st.expander("**2. Beförderungsleistung**"):
         st.info("**Hinweis:** Bitte geben Sie die Beförderungsleistung des Ridepooling-Systems an. Hierzu zählen die Anzahl der abgeschlossenen Buchungen und die Anzahl der transportierten Fahrgäste im Betrachtungszeitraum. Optional können Sie auch ein Ridepooling-System auswählen, um vorausgefüllte Daten zu erhalten.")
         
-        # Daten für das Dropdown-Menü
-        ridepooling_data = {
-            "Eigene Angaben": {"Fahrten": 0, "Transportierte Fahrgäste": 0},
-            "bussi": {"Fahrten": 8475, "Transportierte Fahrgäste": 13876, "vehicle_type": "LEVC TX (Volvo XC 90 Recharge T8 AWD)", "Benzinverbrauch (l/100km)": 1.2, "Dieselverbrauch (l/100km)": 0.0, "Stromverbrauch (kWh/100km)": 20.5, "Kilometer leer": 50422.31, "Kilometer besetzt": 40063.44},
-            "G-Mobil": {"Fahrten": 60043, "Transportierte Fahrgäste": 74561},
-            "kommit-Shuttle": {"Fahrten": 21908, "Transportierte Fahrgäste": 26280},
-            "LOOPmünster": {"Fahrten": 151415, "Transportierte Fahrgäste": 187309},
-        }
+        # Daten für das Dropdown-Menü (Datenbibliothek, oekorps/data/presets.toml)
+        ridepooling_data = {"Eigene Angaben": {"abgeschlossene_buchungen": 0, "transportierte_fahrgaeste": 0}, **presets.RIDEPOOLING_SYSTEME}
 
         # Dropdown-Menü zum Auswählen des Ridepooling-Systems
-        selected_system = st.selectbox('Wählen Sie ein Ridepooling-System (Optional):', list(ridepooling_data.keys()))
+        optionen = list(ridepooling_data.keys())
+        selected_system = st.selectbox('Wählen Sie ein Ridepooling-System (Optional):', optionen,
+                                       index=szenario_index(optionen, 'ridepooling_system_auswahl'), key=eingabe_key('ridepooling_system_auswahl'))
+        st.session_state['ridepooling_system_auswahl'] = selected_system
+
+        # Aus Fahrtdaten übernommene Summen (Abschnitt "Zeitlich aufgelöste Bilanz") ersetzen die eigenen Angaben
+        vorgabe = {name: szenario_vorgabe('ridepooling_system_auswahl', selected_system, name, wert)
+                   for name, wert in ridepooling_data[selected_system].items()}
+        if selected_system == "Eigene Angaben" and 'fahrtdaten_leistung' in st.session_state:
+            vorgabe = dict(zip(("abgeschlossene_buchungen", "transportierte_fahrgaeste"), st.session_state['fahrtdaten_leistung']))
 
         # Eingabefelder mit vorausgefüllten Daten basierend auf der Auswahl
-        abgeschlossene_buchungen = st.number_input("Abgeschlossene Buchungen im Betrachtungszeitraum:", value=ridepooling_data[selected_system]["Fahrten"], min_value=0)
-        transportierte_fahrgaeste = st.number_input("Transportierte Fahrgäste im Betrachtungszeitraum:", value=ridepooling_data[selected_system]["Transportierte Fahrgäste"], min_value=0)
+        abgeschlossene_buchungen = st.number_input("Abgeschlossene Buchungen im Betrachtungszeitraum:", value=vorgabe["abgeschlossene_buchungen"], min_value=0,
+                                                   key=eingabe_key('abgeschlossene_buchungen', vorgabe["abgeschlossene_buchungen"]))
+        transportierte_fahrgaeste = st.number_input("Transportierte Fahrgäste im Betrachtungszeitraum:", value=vorgabe["transportierte_fahrgaeste"], min_value=0,
+                                                    key=eingabe_key('transportierte_fahrgaeste', vorgabe["transportierte_fahrgaeste"]))
 
         # Speichern der globalen Variablen
         st.session_state.update({
             'abgeschlossene_buchungen': abgeschlossene_buchungen,
             'transportierte_fahrgaeste': transportierte_fahrgaeste
         })
+        rechengraph().set('transportierte_fahrgaeste', int(transportierte_fahrgaeste))
+
+# Spalten des Fahrzeug-Editors: Fahrzeugtyp als Text, Verbrauch und Kilometer als Zahlen >= 0
+FAHRZEUG_EDITOR_SPALTEN = {
+    FAHRZEUGTYP: st.column_config.TextColumn(FAHRZEUGTYP, required=True, width='large'),
+    BENZINVERBRAUCH: st.column_config.NumberColumn("Benzin (l/100km)", min_value=0.0, format='%.2f'),
+    DIESELVERBRAUCH: st.column_config.NumberColumn("Diesel (l/100km)", min_value=0.0, format='%.2f'),
+    STROMVERBRAUCH: st.column_config.NumberColumn("Strom (kWh/100km)", min_value=0.0, format='%.2f'),
+    KILOMETER_LEER: st.column_config.NumberColumn("KM leer", min_value=0.0, format='%.0f'),
+    KILOMETER_BESETZT: st.column_config.NumberColumn("KM besetzt", min_value=0.0, format='%.0f'),
+}
+
+
+# Ersetzt die Ausgangstabelle des Fahrzeug-Editors (Hochladen, Fahrzeug hinzufügen); der Editor beginnt neu.
+# Die Ausgangstabelle ist immer geprüft (`read_fleet`, `validate_fleet` bzw. `edited_fleet`).
+# Nur hier werden die Flottensummen über alle Zeilen gebildet, Änderungen im Editor werden als Differenz fortgeschrieben.
+def set_fleet_base(tabelle: pd.DataFrame):
+    tabelle = tabelle.reset_index(drop=True)
+    st.session_state['fahrzeugtabelle_basis'] = tabelle
+    st.session_state['fahrzeugtabelle_basis_summen'] = FleetTotals.of_frame(tabelle)
+    st.session_state['fahrzeug_editor_version'] = st.session_state.get('fahrzeug_editor_version', 0) + 1
+
+
+def fleet_editor_key() -> str:
+    return f"fahrzeug_editor_{st.session_state['fahrzeug_editor_version']}"
+
+
+# Flottensummen der geprüften Fahrzeugtabelle aus dem Editor von Abschnitt 3
+def current_fleet_totals() -> FleetTotals:
+    if 'fahrzeugtabelle_summen' not in st.session_state:
+        raise ValueError("Die Fahrzeugtabelle enthält ungültige Angaben.")
+    return st.session_state['fahrzeugtabelle_summen']
+
 
 # Funktion zur Darstellung der Fahrzeugflotten- und Fahrtleistungs-Sektion
 def show_vehicle_fleet_performance():
     with st.expander("**3. Fahrzeugflotte & Fahrtleistung**"):
-        # Vordefinierte Fahrzeugtypen und deren Verbrauchsdaten
-        vehicle_types = {
-            "LEVC TX (Volvo XC 90 Recharge T8 AWD)": {"Benzinverbrauch (l/100km)": 1.35, "Dieselverbrauch (l/100km)": 0.0, "Stromverbrauch (kWh/100km)": 21.55, "Kilometer leer": 0, "Kilometer besetzt": 0},
-            "Mercedes Vito lang 114 CDI": {"Benzinverbrauch (l/100km)": 0.0, "Dieselverbrauch (l/100km)": 8.4, "Stromverbrauch (kWh/100km)": 0.0, "Kilometer leer": 0, "Kilometer besetzt": 0},
-            "Mercedes eVito Tourer PRO lang (90 kWh)": {"Benzinverbrauch (l/100km)": 0.0, "Dieselverbrauch (l/100km)": 0.0, "Stromverbrauch (kWh/100km)": 29.8, "Kilometer leer": 0, "Kilometer besetzt": 0},
-            "Mercedes EQV 300 extra lang": {"Benzinverbrauch (l/100km)": 0.0, "Dieselverbrauch (l/100km)": 0.0, "Stromverbrauch (kWh/100km)": 30.2, "Kilometer leer": 0, "Kilometer besetzt": 0},
-            "Nissan e NV 200": {"Benzinverbrauch (l/100km)": 0.0, "Dieselverbrauch (l/100km)": 0.0, "Stromverbrauch (kWh/100km)": 20.6, "Kilometer leer": 0, "Kilometer besetzt": 0},
-            "Anderer Fahrzeugtyp": {"Benzinverbrauch (l/100km)": 0.0, "Dieselverbrauch (l/100km)": 0.0, "Stromverbrauch (kWh/100km)": 0.0, "Kilometer leer": 0, "Kilometer besetzt": 0}
-        }
-
-        # Initialisierung der Fahrzeugliste im Session State, falls noch nicht vorhanden
-        if 'vehicle_list' not in st.session_state:
-            st.session_state['vehicle_list'] = []
+        # Vordefinierte Fahrzeugtypen und deren Verbrauchsdaten (Datenbibliothek, oekorps/data/presets.toml)
+        vehicle_types = presets.FAHRZEUGTYPEN
 
         # Fahrzeugdaten durch Nutzereingaben modifizieren
         with st.container():
-            st.info("**Hinweis:** Bitte geben Sie an, welche Fahrzeugtypen in Ihrer Flotte vorhanden sind. Bitte geben Sie für jeden Fahrzeugtyp die gefahrenen Kilometerleistungen (leer, besetzt) flottenbezogen an. Bitte beziehen Sie sich auf den Betrachtungszeitraum. Die vorgegebenen Verbrauchsdaten beziehen sich auf die WLTP-Methode (Deutsche Automobil Treuhand GmbH, Leitfaden CO2 (2022)). Passen Sie ggf. Verbrauchsdaten an. Klicken Sie anschließend auf 'Daten übernehmen & berechnen'. Sie können andere Fahrzeugtypen abbilden, indem Sie ein 'andere Fahrzeugtypen' auswählen und die entsprechende Bezeichnung, sowie Kilometer- & Verbrauchsdaten eingeben.")
+            st.info("**Hinweis:** Bitte geben Sie an, welche Fahrzeugtypen in Ihrer Flotte vorhanden sind. Bitte geben Sie für jeden Fahrzeugtyp die gefahrenen Kilometerleistungen (leer, besetzt) flottenbezogen an. Bitte beziehen Sie sich auf den Betrachtungszeitraum. Die vorgegebenen Verbrauchsdaten beziehen sich auf die WLTP-Methode (Deutsche Automobil Treuhand GmbH, Leitfaden CO2 (2022)). Passen Sie ggf. Verbrauchsdaten an. Klicken Sie anschließend auf 'Daten übernehmen & berechnen'. Sie können andere Fahrzeugtypen abbilden, indem Sie ein 'andere Fahrzeugtypen' auswählen und die entsprechende Bezeichnung, sowie Kilometer- & Verbrauchsdaten eingeben. Fahrzeuge können direkt in der Tabelle ergänzt, geändert oder gelöscht werden. Größere Flotten können Sie als Tabelle (CSV, Excel oder Parquet) mit einer Zeile je Fahrzeug hochladen; die hochgeladene Tabelle ersetzt die bisherigen Einträge.")
+
+        # Gesamte Flotte als Tabelle hochladen (eine Zeile je Fahrzeug oder Fahrzeugtyp); ersetzt die Fahrzeugtabelle
+        datei = st.file_uploader("Fahrzeugtabelle hochladen (CSV, Excel, Parquet)", type=list(DATEITYPEN),
+                                 help=f"Spalten: {', '.join(FAHRZEUG_SPALTEN)}. Verbrauchsspalten sind optional.")
+        if datei is not None and st.session_state.get('fahrzeugtabelle_datei') != datei.file_id:
+            try:
+                set_fleet_base(cached_fleet_upload(datei.getvalue(), datei.name))
+                st.session_state['fahrzeugtabelle_datei'] = datei.file_id
+            except ImportError as error:
+                st.error(f"Das Dateiformat kann nicht gelesen werden: {error}")
+            except ValueError as error:
+                st.error(str(error))
 
         with st.form("vehicle_form", clear_on_submit=True):
             new_vehicle_type = st.selectbox("Wählen Sie einen Fahrzeugtyp", list(vehicle_types.keys()))
             add_vehicle = st.form_submit_button("Fahrzeug hinzufügen")
-        if add_vehicle:
-            data = vehicle_types[new_vehicle_type].copy() if new_vehicle_type in vehicle_types else {"Benzinverbrauch (l/100km)": 0.0, "Dieselverbrauch (l/100km)": 0.0, "Stromverbrauch (kWh/100km)": 0.0, "Kilometer leer": 0, "Kilometer besetzt": 0}
-            data['Fahrzeugtyp'] = new_vehicle_type  # Füge den Fahrzeugtyp hinzu
-            vehicle_id = len(st.session_state['vehicle_list']) + 1
-            st.session_state[f'vehicle_{vehicle_id}'] = data
-            st.session_state['vehicle_list'].append(data)
-
-        for i, vehicle in enumerate(st.session_state['vehicle_list'], start=1):
-            cols = st.columns((3, 1, 1, 1, 1, 1))
-            vehicle['Fahrzeugtyp'] = cols[0].text_input(f"Fahrzeugtyp {i}", vehicle['Fahrzeugtyp'])
-            vehicle['Benzinverbrauch (l/100km)'] = cols[1].number_input(f"Benzin {i} (l/100km)", value=vehicle['Benzinverbrauch (l/100km)'], min_value=0.0, format='%f')
-            vehicle['Dieselverbrauch (l/100km)'] = cols[2].number_input(f"Diesel {i} (l/100km)", value=vehicle['Dieselverbrauch (l/100km)'], min_value=0.0, format='%f')
-            vehicle['Stromverbrauch (kWh/100km)'] = cols[3].number_input(f"Strom {i} (kWh/100km)", value=vehicle['Stromverbrauch (kWh/100km)'], min_value=0.0, format='%f')
-            vehicle['Kilometer leer'] = cols[4].number_input(f"KM leer {i}", value=vehicle['Kilometer leer'], min_value=0, format='%d')
-            vehicle['Kilometer besetzt'] = cols[5].number_input(f"KM besetzt {i}", value=vehicle['Kilometer besetzt'], min_value=0, format='%d')
-            # Speichern der globalen Variablen
-            st.session_state['Benzinverbrauch (l/100km)'] = vehicle['Benzinverbrauch (l/100km)'],
-            st.session_state['Dieselverbrauch (l/100km)'] = vehicle['Dieselverbrauch (l/100km)'],
-            st.session_state['Stromverbrauch (kWh/100km)'] = vehicle['Stromverbrauch (kWh/100km)']
-
-        if st.button('Letztes Fahrzeug entfernen'):
-            if st.session_state['vehicle_list']:
-                removed_vehicle_id = len(st.session_state['vehicle_list'])
-                st.session_state.pop(f'vehicle_{removed_vehicle_id}', None)  # Remove the global variable
-                st.session_state['vehicle_list'].pop()
-
-        # Berechne die Kilometer leer und besetzt für die gesamte Flotte
-        fahrzeugkilometer_leer = sum(vehicle['Kilometer leer'] for vehicle in st.session_state['vehicle_list'])
-        fahrzeugkilometer_besetzt = sum(vehicle['Kilometer besetzt'] for vehicle in st.session_state['vehicle_list'])
+
+        # Ein Editor für die gesamte Flotte; Zeilen können direkt ergänzt, geändert und gelöscht werden
+        if 'fahrzeugtabelle_basis' not in st.session_state:
+            set_fleet_base(empty_fleet())
+        st.data_editor(
+            st.session_state['fahrzeugtabelle_basis'],
+            key=fleet_editor_key(),
+            column_config=FAHRZEUG_EDITOR_SPALTEN,
+            num_rows='dynamic',
+            hide_index=True,
+        )
+        # Die Ausgangstabelle ist geprüft; geprüft und summiert werden nur die im Editor geänderten Zeilen
+        aenderungen = st.session_state.get(fleet_editor_key())
+        try:
+            st.session_state['fahrzeugtabelle'] = edited_fleet(st.session_state['fahrzeugtabelle_basis'], aenderungen)
+            st.session_state['fahrzeugtabelle_summen'] = apply_edits(
+                st.session_state['fahrzeugtabelle_basis_summen'], st.session_state['fahrzeugtabelle_basis'], aenderungen)
+        except ValueError as error:
+            st.session_state.pop('fahrzeugtabelle', None)
+            st.session_state.pop('fahrzeugtabelle_summen', None)
+            st.error(str(error))
+
+        if add_vehicle and 'fahrzeugtabelle' in st.session_state:
+            data = dict(vehicle_types[new_vehicle_type])
+            data[FAHRZEUGTYP] = new_vehicle_type  # Füge den Fahrzeugtyp hinzu
+            set_fleet_base(combine_fleets(st.session_state['fahrzeugtabelle'], fleet_frame([data])))
+            st.rerun()
+        elif add_vehicle:
+            st.warning("Bitte korrigieren Sie zuerst die Fahrzeugtabelle.")
 
         if st.button('Daten übernehmen & berechnen'):
             try:
-                abgeschlossene_buchungen = float(st.session_state['abgeschlossene_buchungen'])
-                transportierte_fahrgaeste = float(st.session_state['transportierte_fahrgaeste'])
-                fahrzeugkilometer_leer = float(fahrzeugkilometer_leer)
-                fahrzeugkilometer_besetzt = float(fahrzeugkilometer_besetzt)
-                fahrzeugkilometer_gesamt = round(fahrzeugkilometer_leer + fahrzeugkilometer_besetzt, 2)
-                durchschnittliche_fahrtdistanz_mit_lk = round(fahrzeugkilometer_gesamt / abgeschlossene_buchungen, 2) if abgeschlossene_buchungen > 0 else 0
-                durchschnittliche_fahrtdistanz_mit_bk = round(fahrzeugkilometer_besetzt / abgeschlossene_buchungen, 2) if abgeschlossene_buchungen > 0 else 0
-                personenkilometer_gefahren = round((fahrzeugkilometer_besetzt / abgeschlossene_buchungen) * transportierte_fahrgaeste, 2) if abgeschlossene_buchungen > 0 else 0
-
-                # Berechnungen der neuen Kennzahlen
-                leerkilometeranteil = round((fahrzeugkilometer_leer / fahrzeugkilometer_gesamt) *100, 2) if fahrzeugkilometer_gesamt > 0 else 0
-                buendelungsquote = round(personenkilometer_gefahren / fahrzeugkilometer_gesamt, 2) if fahrzeugkilometer_gesamt > 0 else 0
-                besetzungsquote = round(personenkilometer_gefahren / fahrzeugkilometer_besetzt, 2) if fahrzeugkilometer_besetzt > 0 else 0
-
-                # Speichern des Werts in den Sitzungszustand
-                st.session_state.update({
-                    'fahrzeugkilometer_leer': fahrzeugkilometer_leer,
-                    'fahrzeugkilometer_besetzt': fahrzeugkilometer_besetzt,
-                    'fahrzeugkilometer_gesamt': fahrzeugkilometer_gesamt,
-                    'durchschnittliche_fahrtdistanz_mit_lk': durchschnittliche_fahrtdistanz_mit_lk,
-                    'durchschnittliche_fahrtdistanz_mit_bk': durchschnittliche_fahrtdistanz_mit_bk,
-                    'personenkilometer_gefahren': personenkilometer_gefahren,
-                    'leerkilometeranteil': leerkilometeranteil,
-                    'buendelungsquote': buendelungsquote,
-                    'besetzungsquote': besetzungsquote,
-
-                })
-
-                benzinverbrauch_gesamt = sum(vehicle['Benzinverbrauch (l/100km)'] * ((vehicle['Kilometer besetzt'] + vehicle['Kilometer leer']) / 100) for vehicle in st.session_state['vehicle_list'])
-                dieselverbrauch_gesamt = sum(vehicle['Dieselverbrauch (l/100km)'] * ((vehicle['Kilometer besetzt'] + vehicle['Kilometer leer']) / 100) for vehicle in st.session_state['vehicle_list'])
-                stromverbrauch_gesamt = sum(vehicle['Stromverbrauch (kWh/100km)'] * ((vehicle['Kilometer besetzt'] + vehicle['Kilometer leer']) / 100) for vehicle in st.session_state['vehicle_list'])
+                # Berechnung der Fahrtleistung und des Verbrauchs der gesamten Flotte
+                graph = rechengraph()
+                graph.set('fahrtleistung', (current_fleet_totals(), st.session_state['abgeschlossene_buchungen'], st.session_state['transportierte_fahrgaeste']))
+                flotte = graph.get('flotte')
+                fahrzeugkilometer_leer = flotte.fahrzeugkilometer_leer
+                fahrzeugkilometer_besetzt = flotte.fahrzeugkilometer_besetzt
+                fahrzeugkilometer_gesamt = flotte.fahrzeugkilometer_gesamt
+                durchschnittliche_fahrtdistanz_mit_lk = flotte.durchschnittliche_fahrtdistanz_mit_lk
+                durchschnittliche_fahrtdistanz_mit_bk = flotte.durchschnittliche_fahrtdistanz_mit_bk
+                personenkilometer_gefahren = flotte.personenkilometer_gefahren
+                leerkilometeranteil = flotte.leerkilometeranteil
+                buendelungsquote = flotte.buendelungsquote
+                besetzungsquote = flotte.besetzungsquote
+                benzinverbrauch_gesamt = flotte.benzinverbrauch_gesamt
+                dieselverbrauch_gesamt = flotte.dieselverbrauch_gesamt
+                stromverbrauch_gesamt = flotte.stromverbrauch_gesamt
 
                 with st.container():
                     
@@ -318,25 +647,8 @@ def show_vehicle_fleet_performance():
                     with col2:
                         st.write(f"{stromverbrauch_gesamt:.2f} kWh")
 
-                # Save the total consumptions to the session state
-                st.session_state.update({
-                    'benzinverbrauch_gesamt': benzinverbrauch_gesamt,
-                    'dieselverbrauch_gesamt': dieselverbrauch_gesamt,
-                    'stromverbrauch_gesamt': stromverbrauch_gesamt
-                })
-
                 # Speichern der berechneten Werte im Sitzungszustand
-                st.session_state.update({
-                    'fahrzeugkilometer_leer': fahrzeugkilometer_leer,
-                    'fahrzeugkilometer_besetzt': fahrzeugkilometer_besetzt,
-                    'fahrzeugkilometer_gesamt': fahrzeugkilometer_gesamt,
-                    'durchschnittliche_fahrtdistanz_mit_lk': durchschnittliche_fahrtdistanz_mit_lk,
-                    'durchschnittliche_fahrtdistanz_mit_bk': durchschnittliche_fahrtdistanz_mit_bk,
-                    'personenkilometer_gefahren': personenkilometer_gefahren,
-                    'leerkilometeranteil': leerkilometeranteil,
-                    'buendelungsquote': buendelungsquote,
-                    'besetzungsquote': besetzungsquote
-                })
+                st.session_state.update(flotte.as_dict())
 
 
                 #Zeige den Sitzungszustand
@@ -362,51 +674,89 @@ def show_vehicle_fleet_performance():
                 st.error("Bitte geben Sie gültige Zahlenwerte ein.")
             
 
+ZEITREIHE_NETZ = "Zeitreihe der Netzintensität (stündlich oder monatlich)"
+
+
+def show_grid_series():
+    """Emissionsfaktor für Strom aus einer Zeitreihe und einem Ladeprofil; None ohne gültige Zeitreihe."""
+    st.info("Die Zeitreihe enthält je Stunde oder Monat einen Emissionsfaktor des Stromnetzes (Spalten 'zeitstempel' und 'g/kWh'). "
+            "Der Stromverbrauch im Betrachtungszeitraum (Abschnitt 1) wird nach dem Ladeprofil auf die Stunden verteilt.")
+    datei = st.file_uploader("Zeitreihe der Netzintensität hochladen:", type=DATEITYPEN, key='netz_zeitreihe_datei')
+    ladeprofil_name = st.selectbox("Ladeprofil:", list(presets.LADEPROFILE))
+    if datei is None:
+        st.error("Bitte laden Sie eine Zeitreihe der Netzintensität hoch.")
+        return None
+    ladeprofil = presets.LADEPROFILE[ladeprofil_name]
+    beginn, ende = st.session_state.get('start_date', date(2022, 1, 1)), st.session_state.get('end_date', date(2022, 12, 31))
+    try:
+        reihe = cached_grid_upload(datei.getvalue(), datei.name)
+        strom_emissionsdaten = float(period_grid_factors(reihe, [beginn], [ende], ladeprofil)[0])
+    except ValueError as e:
+        st.error(str(e))
+        return None
+    st.session_state.update({'netz_zeitreihe': reihe, 'ladeprofil': ladeprofil})
+
+    stromverbrauch_gesamt = st.session_state.get('stromverbrauch_gesamt', 0.0)
+    if stromverbrauch_gesamt > 0:
+        verlauf = charging_emissions(reihe, stromverbrauch_gesamt, beginn, ende, ladeprofil).set_index('zeitstempel')
+        if reihe.aufloesung != MONATLICH:
+            verlauf = verlauf.resample('D').sum()  # Tageswerte für die Darstellung
+        st.write(f"Emissionen des Stromverbrauchs ({stromverbrauch_gesamt:.2f} kWh) im Betrachtungszeitraum:")
+        st.line_chart(verlauf['Emissionen (kg CO2eq)'])
+    return strom_emissionsdaten
+
+
 def show_emissions_data():
     with st.expander("**4. Emissionsdaten**"):
         st.info("**Hinweis:** Bitte geben Sie die CO2-Emissionsdaten für Benzin, Diesel und Strom an. Sie können vorausgewählte Optionen wählen oder eigene Angaben tätigen. Optional können Sie auch den Anteil an selbst erzeugtem Strom aus Photovoltaikanlagen angeben, um den adjustierten CO2eq-Emissionsfaktor für Strom zu berechnen. Bitte berücksichtigen Sie die Betrachtungsweise/Analyseprinzip. Dieses Programm nutzt die Well-to-Wheel-Betrachtung (WTW).")
 
         # CO2-Emissionsdaten (Benzin)
-        benzin_emissionsdaten_auswahl = st.selectbox("CO2eq-Emissionsdaten (Benzin):", 
-                                                      ["DIN EN 16258:2013, Tabelle A.2 [CO2eq]", "Helmholtz-Gemeinschaft Deutscher Forschungszentren [CO2eq]", "Eigene Angaben"])
-        if benzin_emissionsdaten_auswahl == "DIN EN 16258:2013, Tabelle A.2 [CO2eq]":
-            benzin_emissionsdaten = 2880  # g/l
-        elif benzin_emissionsdaten_auswahl == "Helmholtz-Gemeinschaft Deutscher Forschungszentren [CO2eq]":
-            benzin_emissionsdaten = 3030  # g/l
+        optionen = [*presets.BENZIN_EMISSIONSDATEN_OPTIONEN, "Eigene Angaben"]
+        benzin_emissionsdaten_auswahl = st.selectbox("CO2eq-Emissionsdaten (Benzin):", optionen, index=szenario_index(optionen, 'benzin_emissionsdaten_auswahl'),
+                                                    key=eingabe_key('benzin_emissionsdaten_auswahl'))
+        if benzin_emissionsdaten_auswahl in presets.BENZIN_EMISSIONSDATEN_OPTIONEN:
+            benzin_emissionsdaten = presets.BENZIN_EMISSIONSDATEN_OPTIONEN[benzin_emissionsdaten_auswahl]
         else:  # Eigene Angaben
-            benzin_emissionsdaten = st.number_input("Geben Sie die CO2-Emissionsdaten (Benzin) [g/l] ein:", min_value=0, format='%d', step=1)
+            vorgabe = round(szenario_vorgabe('benzin_emissionsdaten_auswahl', benzin_emissionsdaten_auswahl, 'benzin_emissionsdaten', 0))
+            benzin_emissionsdaten = st.number_input("Geben Sie die CO2-Emissionsdaten (Benzin) [g/l] ein:", value=vorgabe, min_value=0, format='%d', step=1,
+                                                     key=eingabe_key('benzin_emissionsdaten', vorgabe))
 
         # CO2-Emissionsdaten (Diesel)
-        diesel_emissionsdaten_auswahl = st.selectbox("CO2eq-Emissionsdaten (Diesel):", 
-                                                      ["DIN EN 16258:2013, Tabelle A.4 [CO2eq]","Helmholtz-Gemeinschaft Deutscher Forschungszentren [CO2eq]", "Eigene Angaben"])
-        if diesel_emissionsdaten_auswahl == "DIN EN 16258:2013, Tabelle A.4 [CO2eq]":
-            diesel_emissionsdaten = 3170  # g/l
-        elif diesel_emissionsdaten_auswahl == "Helmholtz-Gemeinschaft Deutscher Forschungszentren [CO2eq]":
-            diesel_emissionsdaten = 3410  # g/l
+        optionen = [*presets.DIESEL_EMISSIONSDATEN_OPTIONEN, "Eigene Angaben"]
+        diesel_emissionsdaten_auswahl = st.selectbox("CO2eq-Emissionsdaten (Diesel):", optionen, index=szenario_index(optionen, 'diesel_emissionsdaten_auswahl'),
+                                                    key=eingabe_key('diesel_emissionsdaten_auswahl'))
+        if diesel_emissionsdaten_auswahl in presets.DIESEL_EMISSIONSDATEN_OPTIONEN:
+            diesel_emissionsdaten = presets.DIESEL_EMISSIONSDATEN_OPTIONEN[diesel_emissionsdaten_auswahl]
         else:  # Eigene Angaben
-            diesel_emissionsdaten = st.number_input("Geben Sie die CO2-Emissionsdaten (Diesel) [g/l] ein:", min_value=0, format='%d', step=1)
+            vorgabe = round(szenario_vorgabe('diesel_emissionsdaten_auswahl', diesel_emissionsdaten_auswahl, 'diesel_emissionsdaten', 0))
+            diesel_emissionsdaten = st.number_input("Geben Sie die CO2-Emissionsdaten (Diesel) [g/l] ein:", value=vorgabe, min_value=0, format='%d', step=1,
+                                                     key=eingabe_key('diesel_emissionsdaten', vorgabe))
 
         # CO2-Emissionsdaten (Strom)
-        strom_emissionsdaten_auswahl = st.selectbox("CO2eq-Emissionsdaten (Strom):", 
-                                                     ["LANUK Emissionsfaktoren der Klimaneutralen Landesverwaltung: Strommix DE, 2022 [CO2eq]",
-                                                      "LANUK Emissionsfaktoren der Klimaneutralen Landesverwaltung: Ökostrom DE, 2022 [CO2eq]", 
-                                                      "Umweltbundesamt: CO2-Emissionsfaktor Strommix (2024) [CO2eq]", 
-                                                      "Eigene Angaben"])
-        if strom_emissionsdaten_auswahl == "LANUK Emissionsfaktoren der Klimaneutralen Landesverwaltung: Strommix DE, 2022 [CO2eq]":
-            strom_emissionsdaten = 498  # g/kWh
-        elif strom_emissionsdaten_auswahl == "LANUK Emissionsfaktoren der Klimaneutralen Landesverwaltung: Ökostrom DE, 2022 [CO2eq]":
-            strom_emissionsdaten = 56  # g/kWh
-        elif strom_emissionsdaten_auswahl == "Umweltbundesamt: CO2-Emissionsfaktor Strommix (2024) [CO2eq]":
-            strom_emissionsdaten = 363  # g/kWh
+        optionen = [*presets.STROM_EMISSIONSDATEN_OPTIONEN, ZEITREIHE_NETZ, "Eigene Angaben"]
+        strom_emissionsdaten_auswahl = st.selectbox("CO2eq-Emissionsdaten (Strom):", optionen, index=szenario_index(optionen, 'strom_emissionsdaten_auswahl'),
+                                                    key=eingabe_key('strom_emissionsdaten_auswahl'))
+        if strom_emissionsdaten_auswahl != ZEITREIHE_NETZ:
+            st.session_state.pop('netz_zeitreihe', None)
+            st.session_state.pop('ladeprofil', None)
+        if strom_emissionsdaten_auswahl in presets.STROM_EMISSIONSDATEN_OPTIONEN:
+            strom_emissionsdaten = presets.STROM_EMISSIONSDATEN_OPTIONEN[strom_emissionsdaten_auswahl]
+        elif strom_emissionsdaten_auswahl == ZEITREIHE_NETZ:
+            strom_emissionsdaten = show_grid_series() or 0
         else:  # Eigene Angaben
-            strom_emissionsdaten = st.number_input("Geben Sie die CO2-Emissionsdaten (Strom) [g CO2eq/kWh] ein:", min_value=0, format='%d', step=1)
+            vorgabe = round(szenario_vorgabe('strom_emissionsdaten_auswahl', strom_emissionsdaten_auswahl, 'strom_emissionsdaten_netz', 0))
+            strom_emissionsdaten = st.number_input("Geben Sie die CO2-Emissionsdaten (Strom) [g CO2eq/kWh] ein:", value=vorgabe, min_value=0, format='%d', step=1,
+                                                   key=eingabe_key('strom_emissionsdaten', vorgabe))
 
         # Anteil an selbst erzeugtem Strom aus Photovoltaikanlagen
         
         st.info( "Optional: Ein Teil des Strombezugs kann aus einer sekundären Quelle (z. B. PV-Eigenerzeugung, zertifizierter Ökostrom, PPA) stammen. Der gewichtete Emissionsfaktor wird entsprechend berechnet.")
-        oekostrom_anteil = st.slider("Optional: Geben Sie den Anteil einer **sekundären Stromquelle** am Stromverbrauch an [%]:", 0, 100, 0)
-        pv_emissionsdaten = st.number_input("Geben Sie den Emissionsfaktor der **sekundären Stromquelle** an [g CO2e/kWh]:", value=50.0, min_value=0.0, format='%f', step=1.0)
-        strom_emissionsdaten = round(strom_emissionsdaten * (1 - oekostrom_anteil / 100.0) + pv_emissionsdaten * (oekostrom_anteil / 100.0), 2)
+        oekostrom_anteil = st.slider("Optional: Geben Sie den Anteil einer **sekundären Stromquelle** am Stromverbrauch an [%]:", 0, 100,
+                                     szenario_wert('oekostrom_anteil', 0), key=eingabe_key('oekostrom_anteil'))
+        pv_emissionsdaten = st.number_input("Geben Sie den Emissionsfaktor der **sekundären Stromquelle** an [g CO2e/kWh]:", value=float(szenario_wert('pv_emissionsdaten', 50.0)),
+                                            min_value=0.0, format='%f', step=1.0, key=eingabe_key('pv_emissionsdaten'))
+        strom_emissionsdaten_netz = strom_emissionsdaten
+        strom_emissionsdaten = blend_strom_emissionsdaten(strom_emissionsdaten, pv_emissionsdaten, oekostrom_anteil)
 
         col1, col2 = st.columns([3, 1])
         with col1:
@@ -429,12 +779,20 @@ def show_emissions_data():
 
         # Speichern der globalen Variablen
         st.session_state.update({
+            'benzin_emissionsdaten_auswahl': benzin_emissionsdaten_auswahl,
+            'diesel_emissionsdaten_auswahl': diesel_emissionsdaten_auswahl,
+            'strom_emissionsdaten_auswahl': strom_emissionsdaten_auswahl,
             'benzin_emissionsdaten': benzin_emissionsdaten,
             'diesel_emissionsdaten': diesel_emissionsdaten,
             'strom_emissionsdaten': strom_emissionsdaten,
+            'strom_emissionsdaten_netz': strom_emissionsdaten_netz,
             'oekostrom_anteil': oekostrom_anteil,
             'pv_emissionsdaten': pv_emissionsdaten
         })
+        graph = rechengraph()
+        for name in ('benzin_emissionsdaten', 'diesel_emissionsdaten', 'strom_emissionsdaten', 'strom_emissionsdaten_netz', 'oekostrom_anteil',
+                     'pv_emissionsdaten'):
+            graph.set(name, st.session_state[name])
 
 # Funktion zur Darstellung der Berechnung der Umweltwirkung des Ridepooling-Systems
 def show_environmental_impact_calculation():
@@ -443,77 +801,22 @@ def show_environmental_impact_calculation():
         st.info("**Hinweis:** Im Folgenden ist die Umweltwirkung des Ridepooling-Systems dargestellt. In der Abbildung wird der spezifische CO2-Ausstoß des Ridepooling-Systems denen anderer Verkehrsmittel gegenübergestellt. Die Daten der anderen Verkehrsmittel stammen vom Umweltbundesamt, Umweltfreundlich mobil! (2022).")
 
         # Stellen Sie sicher, dass alle erforderlichen Werte vorhanden sind, bevor Sie fortfahren
-        required_keys = ['fahrzeugkilometer_gesamt', 'personenkilometer_gefahren', 'benzin_emissionsdaten', 'diesel_emissionsdaten', 'strom_emissionsdaten', 'oekostrom_anteil']
-        missing_keys = [key for key in required_keys if key not in st.session_state]
+        graph = rechengraph()
+        missing_keys = graph.missing('rps')
         
         if missing_keys:
-            st.error(f"Die folgenden Schlüssel fehlen: {', '.join(missing_keys)}")
+            st.error(fehlende_eingaben(missing_keys))
         else:
-            # Abrufen der Werte aus dem Sitzungszustand
-            fahrzeugkilometer_gesamt = st.session_state['fahrzeugkilometer_gesamt']
-            personenkilometer_gefahren = st.session_state['personenkilometer_gefahren']
-            benzinverbrauch_gesamt = float(st.session_state['benzinverbrauch_gesamt'])
-            dieselverbrauch_gesamt = float(st.session_state['dieselverbrauch_gesamt'])
-            stromverbrauch_gesamt = float(st.session_state['stromverbrauch_gesamt'])
-            benzin_emissionsdaten = st.session_state['benzin_emissionsdaten']
-            diesel_emissionsdaten = st.session_state['diesel_emissionsdaten']
-            strom_emissionsdaten = st.session_state['strom_emissionsdaten']
-            oekostrom_anteil = st.session_state['oekostrom_anteil']
-
-            benzin_emissionen = (benzinverbrauch_gesamt * benzin_emissionsdaten) / 1000  # kg CO2
-            diesel_emissionen = (dieselverbrauch_gesamt * diesel_emissionsdaten) / 1000  # kg CO2
-            strom_emissionen = (stromverbrauch_gesamt * strom_emissionsdaten) / 1000  # kg CO2
-            strom_emissionen *= (1 - oekostrom_anteil / 100)  # Anpassung für Ökostrom
-
-            # Speichern als globale Variablen
-            st.session_state.update({
-                'benzin_emissionen': benzin_emissionen,
-                'diesel_emissionen': diesel_emissionen,
-                'strom_emissionen': strom_emissionen
-            })
-
-            co2_emissionen_gesamt_rps = round(benzin_emissionen + diesel_emissionen + strom_emissionen, 4)
-            co2_emissionen_pro_personenkilometer_rps = round(co2_emissionen_gesamt_rps / personenkilometer_gefahren, 4) if personenkilometer_gefahren else 0
+            # Berechnung der Emissionen nur, wenn sich Fahrtleistung oder Emissionsdaten geändert haben
+            rps = graph.get('rps')
+            co2_emissionen_gesamt_rps = rps.co2_emissionen_gesamt_rps
+            co2_emissionen_pro_personenkilometer_rps = rps.co2_emissionen_pro_personenkilometer_rps
 
             # Speichern der berechneten Werte im Sitzungszustand
-            st.session_state.update({
-                'co2_emissionen_gesamt_rps': co2_emissionen_gesamt_rps,
-                'co2_emissionen_pro_personenkilometer_rps': co2_emissionen_pro_personenkilometer_rps
-            })
-
-            # Emissionen pro pkm für verschiedene Verkehrsträger
-            emissionen_data = {
-                st.session_state['name_ridepooling_system']: co2_emissionen_pro_personenkilometer_rps * 1000,
-                'Pkw - MIV (Fahrer) & MIV (Mitfahrer)': 152.86,
-                '(Nahlinien-)Bus': 80.54,
-                'Straßen-/Stadt-/U-Bahn': 59.30,
-                'Schienen(nah)verkehr/Bahn/Zug': 58.79,
-                'Motorrad': 173.3,
-                'E-Bike/Pedelec/E-Lastenrad': 3.9,
-                'Fahrrad/Lastenrad': 0.0,
-                'Zu Fuß': 0.0
-            }
+            st.session_state.update(rps.as_dict())
 
-            # Erstellung des ersten Diagramms
-            fig1 = go.Figure()
-            for verkehrsmittel, emissionen in emissionen_data.items():
-                fig1.add_trace(go.Bar(name=verkehrsmittel, x=[verkehrsmittel], y=[emissionen], marker_line_color='rgb(0,0,0)', marker_line_width=1.5, opacity=0.7))
-            fig1.update_layout(
-                barmode='group',
-                title='Gegenüberstellung der Emissionen pro Personenkilometer nach Verkehrsmittel - Well-to-Wheel (WTW)*',
-                legend=dict(
-                orientation="v",  # vertikale Anordnung
-                y=0.6,  # Positionierung der Legende
-                x=1.02,  # Legende rechts vom Diagramm
-                xanchor='left',
-                yanchor='top'
-                ),
-                width=650,
-                height=650,
-                yaxis_title='Emissionen [g CO2eq/pkm]',
-                xaxis_tickangle=-45
-            )
-            st.plotly_chart(fig1)
+            # Spezifische Emissionen im Vergleich zu anderen Verkehrsträgern (UBA)
+            st.plotly_chart(figures.uba_comparison_figure(st.session_state['name_ridepooling_system'], co2_emissionen_pro_personenkilometer_rps * 1000))
 
             
             col1, col2 = st.columns([3, 1])
@@ -531,11 +834,693 @@ def show_environmental_impact_calculation():
 
 
 
+####################################################################################################
+# Referenzmobilität im Bediengebiet (Abschnitte 6 bis 16)
+# Alle vier Methoden nutzen dieselbe Verkehrsmitteltabelle (oekorps.modes.ModeTable); sie unterscheiden sich nur in
+# der Vorauswahl der Verteilung und darin, ob die Personenkilometer über Fahrgäste und Wegeentfernungen (Wege)
+# oder über die gefahrenen Personenkilometer des Ridepooling-Systems (Pkm) berechnet werden.
+METHODIK_ANZEIGE = {
+    MODAL_SPLIT_WEGE: {"vorauswahl": "Vorauswahl Modal Split (Optional):", "eigene_angaben": "Eigene Angaben (Wege)",
+                       "verteilung": "Modal-Split-Verteilung (Wege)", "datei": 'eingabedaten_und_ergebnisse'},
+    MODAL_SPLIT_PKM: {"vorauswahl": "Vorauswahl Modal Split (Optional):", "eigene_angaben": "Eigene Angaben Modal Split (Personenkilometer)",
+                      "verteilung": "Modal-Split-Verteilung (Personenkilometer)", "datei": 'eingabedaten_und_ergebnisse_modal_split_pkm'},
+    UMFRAGE_WEGE: {"vorauswahl": "Vorauswahl Umfrage (Wege) (Optional):", "eigene_angaben": "Eigene Angaben",
+                   "verteilung": "Verkehrsmittelverteilung (Umfrage, Wege)", "datei": 'eingabedaten_und_ergebnisse_umfrage_wege'},
+    UMFRAGE_PKM: {"vorauswahl": "Vorauswahl Umfrage (Pkm) (Optional):", "eigene_angaben": "Eigene Angaben",
+                  "verteilung": "Verkehrsmittelverteilung (Umfrage, Personenkilometer)", "datei": 'eingabedaten_und_ergebnisse_umfrage_pkm'},
+}
+
+def show_result_row(label: str, value: str):
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        st.write(f"**{label}**")
+    with col2:
+        st.write(f"**{value}**")
+
+
+def input_modal_split(methodik: str) -> np.ndarray:
+    """Eingabe der Anteile je Verkehrsmittel (Abschnitt 6)."""
+    anzeige = METHODIK_ANZEIGE[methodik]
+    st.info(f"""**Hinweis:** Bitte geben Sie die Annahmen für die {anzeige['verteilung']} der Fahrgäste an.
+                **Vorauswahl:** Wählen Sie ein vordefiniertes Szenario aus, um die Standardwerte für die Verteilung automatisch auszufüllen. Diese Werte sind anpassbar.""")
+    modes = modes_for(methodik)
+    modal_split_options = {anzeige['eigene_angaben']: [0] * len(modes), **presets.modal_split_options(methodik)}
+    optionen = list(modal_split_options.keys())
+    selected_modal_split = st.selectbox(anzeige['vorauswahl'], optionen, index=szenario_index(optionen, 'selected_modal_split'),
+                                        key=eingabe_key('selected_modal_split', methodik))
+    st.session_state['selected_modal_split'] = selected_modal_split
+    geladen = szenario_vorgabe('selected_modal_split', selected_modal_split, 'anteile', {})
+    default_values = [geladen.get(key, wert) for key, wert in zip(modes, modal_split_options[selected_modal_split])]
+
+    anteile = np.array([
+        st.number_input(
+            f"Anteil der Fahrgäste, die {MODE_LABELS[key]} genutzt hätten (%):",
+            min_value=0.0,
+            max_value=100.0,
+            value=round(float(default_values[i]), 1),  # Round the default value to 1 decimal place
+            step=0.1,
+            format="%.1f",  # Display with 1 decimal place
+            key=eingabe_key('anteil', key, round(float(default_values[i]), 1)),
+        )
+        for i, key in enumerate(modes)
+    ])
+
+    # Überprüfung der Gesamtsumme der eingegebenen Werte
+    total_percentage = anteile.sum()
+    if total_percentage > 100:
+        st.error("Die Summe der Modal-Split-Anteile überschreitet 100%.")
+    elif total_percentage < 100:
+        st.warning("Die Summe der Modal-Split-Anteile liegt unter 100%.")
+    return anteile
+
+
+def input_entfernungen(methodik: str) -> np.ndarray:
+    """Eingabe der Wegeentfernung je Verkehrsmittel (Abschnitt 7, nur Wege-Methoden)."""
+    st.info("""**Hinweis:** Bitte geben Sie die Annahmen zur Wegeentfernung der alternativ genutzten Verkehrsmittel an. Sie können vorausgewählte Optionen wählen oder eigene Angaben tätigen. Die durschnittliche Fahrtdistanz je Buchung (einschließlich Leerkilometern) und die durschnittliche Fahrtdistanz je Buchung (mit Fahrgast) sind Angaben, die sich auf das Ridepooling-System beziehen. Wahlweise können auch Daten der durchschnittlichen Reiseweiten nach MiD 2017 verwendet werden.""")
+    optionen = list(presets.ENTFERNUNG_OPTIONEN)
+    selected_vorauswahl = st.selectbox("Vorauswahl der Wegeentfernung:", optionen, index=szenario_index(optionen, 'selected_entfernung'),
+                                       key=eingabe_key('selected_entfernung'))
+    st.session_state['selected_entfernung'] = selected_vorauswahl
+    vorauswahl = presets.REISEWEITEN_MID_2017 if selected_vorauswahl == presets.REISEWEITEN_MID_2017_NAME else selected_vorauswahl
+    default_distances = distance_preset(vorauswahl, methodik,
+                                        st.session_state.get('durchschnittliche_fahrtdistanz_mit_bk', 0),
+                                        st.session_state.get('durchschnittliche_fahrtdistanz_mit_lk', 0))
+    geladen = szenario_vorgabe('selected_entfernung', selected_vorauswahl, 'entfernungen', {})
+    default_distances = [geladen.get(key, wert) for key, wert in zip(modes_for(methodik), default_distances)]
+    return np.array([
+        round(st.number_input(
+            f"Wegeentfernung {MODE_LABELS[key]} [km]:",
+            min_value=0.0,
+            value=round(float(default_distances[i]), 2),  # Round the default value to 2 decimal places
+            format="%.2f",  # Display with 2 decimal places
+            step=0.01,
+            key=eingabe_key('entfernung', key, round(float(default_distances[i]), 2)),
+        ), 2)
+        for i, key in enumerate(modes_for(methodik))
+    ])
+
+
+def input_emissionsfaktoren(methodik: str) -> np.ndarray:
+    """Eingabe der Emissionsdaten je Verkehrsmittel."""
+    st.info("""**Hinweis:** Bitte geben Sie die CO2-Emissionsdaten für die alternativ genutzten Verkehrsmittel an. Sie können vorausgewählte Optionen wählen oder eigene Angaben tätigen.
+                **Vorauswahl der Emissionsdaten:**
+                Wählen Sie ein vordefiniertes Szenario aus, um die Standardwerte für die Emissionsdaten automatisch auszufüllen. Diese Werte sind anpassbar.""")
+    vorauswahl_emissionsdaten_optionen = [*presets.EMISSIONSDATEN_AV_OPTIONEN, "Eigene Angaben"]
+    selected_vorauswahl_emissionsdaten = st.selectbox("Vorauswahl der Emissionsdaten:", vorauswahl_emissionsdaten_optionen,
+                                                      index=szenario_index(vorauswahl_emissionsdaten_optionen, 'selected_emissionsdaten_av'),
+                                                      key=eingabe_key('selected_emissionsdaten_av'))
+    st.session_state['selected_emissionsdaten_av'] = selected_vorauswahl_emissionsdaten
+    emissionsdaten_defaults = mode_vector(methodik, presets.EMISSIONSDATEN_AV_OPTIONEN.get(selected_vorauswahl_emissionsdaten))
+    geladen = szenario_vorgabe('selected_emissionsdaten_av', selected_vorauswahl_emissionsdaten, 'emissionsfaktoren_av', {})
+    emissionsdaten_defaults = [geladen.get(key, wert) for key, wert in zip(modes_for(methodik), emissionsdaten_defaults)]
+    return np.array([
+        round(st.number_input(
+            f"Annahmen Emissionsdaten {MODE_LABELS[key]} [gCO2eq/pkm]:",
+            min_value=0.0,
+            value=round(float(emissionsdaten_defaults[i]), 2),  # Round the default value
+            format="%.2f",  # Limit the display to 2 decimal places
+            step=0.01,
+            key=eingabe_key('emissionsfaktor', key, round(float(emissionsdaten_defaults[i]), 2)),
+        ), 2)
+        for i, key in enumerate(modes_for(methodik))
+    ])
+
+
+def show_reference_comparison(nummer: int):
+    """Vergleich der spezifischen Emissionen des Ridepooling-Systems und der Referenzmobilität (Abschnitt 10)."""
+    st.subheader("Vergleich der spezifischen CO2-Emissionen pro Personenkilometer für das Ridepooling-System und Referenzmobilität im Bediengebiet")
+    with st.expander(f"**{nummer}. Vergleich**"):
+        st.info("""**Hinweis:** Im Folgenden wird der spezifische CO2-Ausstoß pro Personenkilometer des Ridepooling-Systems mit dem der Referenzmobilität im Bediengebiet verglichen.""")
+
+        # Überprüfen, ob alle erforderlichen Werte vorhanden sind, bevor Sie fortfahren
+        graph = rechengraph()
+        if not graph.ready('vergleich'):
+            st.error("Bitte stellen Sie sicher, dass alle erforderlichen Daten vorhanden sind, um den Vergleich der spezifischen CO2-Emissionen pro Personenkilometer durchzuführen.")
+            return
+
+        vergleich = graph.get('vergleich')
+        st.plotly_chart(figures.bar_figure((
+            (st.session_state['name_ridepooling_system'], vergleich.co2_emissionen_pro_personenkilometer_rps * 1000),
+            ('Referenzmobilität im Bediengebiet', vergleich.emissionen_pro_personenkilometer_av * 1000),
+        ), figures.TITEL_VERGLEICH))
+
+        show_result_row("Gesamte CO2-Emissionen des Ridepooling-Systems:", f"{vergleich.co2_emissionen_gesamt_rps:.2f} kg CO2")
+        show_result_row("CO2-Emissionen des Ridepooling-Systems pro Personenkilometer:", f"{vergleich.co2_emissionen_pro_personenkilometer_rps:.3f} kg CO2/pkm")
+        show_result_row("Gesamte CO2-Emissionen der Referenzmobilität im Bediengebiet (alternativ genutzte Verkehrsmittel):", f"{vergleich.gesamtemissionen_av} kg CO2")
+        show_result_row("CO2-Emissionen der Referenzmobilität im Bediengebiet (alternativ genutzte Verkehrsmittel) pro Personenkilometer:",
+                        f"{vergleich.emissionen_pro_personenkilometer_av:.3f} kg CO2/pkm")
+
+        # Erstelle ein Textfeld, in welchem je nach Ausgang des Vergleichs eine entsprechende Meldung ausgegeben wird
+        start_date = st.session_state.get('start_date', "")
+        end_date = st.session_state.get('end_date', "")
+        if vergleich.ergebnis == "niedriger":
+            st.success(f"Das Ridepooling-System weist im Vergleich zu der Referenzmobilität im Bediengebiet eine geringere spezifische CO2-Emission pro Personenkilometer auf. Die spezifische CO2-Emission pro Personenkilometer des Ridepooling-Systems ist um {vergleich.percentage_difference} % niedriger als die der Referenzmobilität im Bediengebiet. Die Gesamtemissionen des Ridepoolings betragen {vergleich.co2_emissionen_gesamt_rps} kg CO2, was im Betrachtungszeitraum ({start_date} bis {end_date}) zu einer Einsparung von {vergleich.total_difference} kg CO2 im Vergleich zu der Referenzmobilität im Bediengebiet entspricht.")
+        elif vergleich.ergebnis == "hoeher":
+            st.error(f"Das Ridepooling-System weist im Vergleich zu der Referenzmobilität im Bediengebiet eine höhere spezifische CO2-Emission pro Personenkilometer auf. Die spezifische CO2-Emission pro Personenkilometer des Ridepooling-Systems ist um {vergleich.percentage_difference} % höher als die der Referenzmobilität im Bediengebiet. Die Gesamtemissionen des Ridepoolings betragen {vergleich.co2_emissionen_gesamt_rps} kg CO2, was im Betrachtungszeitraum ({start_date} bis {end_date}) zu einer Erhöhung von {vergleich.total_difference} kg CO2 im Vergleich zu der Referenzmobilität im Bediengebiet entspricht.")
+        elif vergleich.ergebnis == "gleich":
+            st.warning("Das Ridepooling-System und die Referenzmobilität im Bediengebiet weisen die gleiche spezifische CO2-Emission pro Personenkilometer auf.")
+
+
+VERTEILUNG_ANZEIGE = {LOGNORMAL: "Lognormal", DREIECK: "Dreieck", FEST: "Fest (ohne Streuung)"}
+
+
+def show_uncertainty_analysis(nummer: int):
+    """Monte-Carlo-Simulation der Referenzmobilität mit Konfidenzintervallen für den Vergleich (Abschnitt 10)."""
+    with st.expander(f"**{nummer}. Unsicherheitsanalyse (Monte-Carlo-Simulation)**"):
+        st.info("""**Hinweis:** Verkehrsmittelverteilung, Wegeentfernungen und Emissionsdaten der Referenzmobilität sind mit Unsicherheit behaftet. Die Simulation zieht Stichproben um die gewählten Werte (Anteile: Dirichlet-Verteilung, Wegeentfernungen und Emissionsdaten: Lognormal- oder Dreiecksverteilung) und gibt Konfidenzintervalle für die Emissionen der Referenzmobilität und die Differenz zum Ridepooling-System an. Die Emissionen des Ridepooling-Systems werden als fest angenommen.""")
+        graph = rechengraph()
+        if not graph.ready('vergleich'):
+            st.error("Bitte stellen Sie sicher, dass alle erforderlichen Daten vorhanden sind, um die Unsicherheitsanalyse durchzuführen.")
+            return
+
+        standard = UncertaintySpec()
+        col1, col2 = st.columns(2)
+        stichproben = col1.number_input("Anzahl der Stichproben:", value=standard.stichproben, min_value=1000, max_value=1_000_000, step=10_000)
+        konzentration = col2.number_input("Konzentration der Verkehrsmittelverteilung (Dirichlet, größer = engere Streuung):",
+                                          value=standard.konzentration, min_value=1.0, step=10.0, format='%f')
+        col1, col2 = st.columns(2)
+        entfernung_verteilung = col1.selectbox("Verteilung der Wegeentfernungen:", list(VERTEILUNG_ANZEIGE), format_func=VERTEILUNG_ANZEIGE.get)
+        entfernung_streuung = col2.number_input("Relative Streuung der Wegeentfernungen [%]:", value=standard.entfernung_streuung * 100,
+                                                min_value=0.0, max_value=100.0, format='%f')
+        col1, col2 = st.columns(2)
+        emission_verteilung = col1.selectbox("Verteilung der Emissionsdaten:", list(VERTEILUNG_ANZEIGE), format_func=VERTEILUNG_ANZEIGE.get)
+        emission_streuung = col2.number_input("Relative Streuung der Emissionsdaten [%]:", value=standard.emission_streuung * 100,
+                                              min_value=0.0, max_value=100.0, format='%f')
+        seed = st.number_input("Startwert des Zufallsgenerators:", value=0, min_value=0, step=1)
+
+        if st.button("Monte-Carlo-Simulation starten"):
+            graph.set('unsicherheit', UncertaintySpec(
+                stichproben=int(stichproben), konzentration=konzentration,
+                entfernung_verteilung=entfernung_verteilung, entfernung_streuung=entfernung_streuung / 100,
+                emission_verteilung=emission_verteilung, emission_streuung=emission_streuung / 100, seed=int(seed)))
+        if not graph.ready('monte_carlo'):
+            return
+
+        # Nach dem Start wird die Simulation bei Änderungen der Eingaben der Abschnitte 3 bis 9 neu berechnet
+        ergebnis = graph.get('monte_carlo')
+        st.dataframe(ergebnis.summary(), hide_index=True)
+        show_result_row("Wahrscheinlichkeit geringerer Emissionen pro Personenkilometer des Ridepooling-Systems:",
+                        f"{ergebnis.wahrscheinlichkeit_niedriger:.1%}")
+
+
+def parameter_titel(parameter) -> str:
+    return f"{parameter.label} [{parameter.einheit}]" if parameter.einheit else parameter.label
+
+
+SENSITIVITAET_METHODEN = {MORRIS: "Morris (Elementareffekte)", SOBOL: "Sobol (Varianzzerlegung)"}
+
+
+def show_sensitivity_analysis(nummer: int):
+    """Globale Sensitivitätsanalyse über die Eingaben der Abschnitte 3 bis 9 mit Tornado-Diagramm."""
+    with st.expander(f"**{nummer}. Sensitivitätsanalyse**"):
+        st.info("""**Hinweis:** Die Sensitivitätsanalyse zeigt, welche Eingaben das Ergebnis am stärksten beeinflussen. Variiert werden Leerkilometeranteil und Besetzungsquote (und damit die Bündelungsquote), der Energieverbrauch der Fahrzeuge, die Emissionsdaten der Kraftstoffe und des Stroms, der Anteil der sekundären Stromquelle, der Anteil des MIV (zulasten der übrigen Verkehrsmittel), die Emissionsdaten des MIV und die Wegeentfernungen. Faktoren werden um die angegebene Spanne variiert, der Leerkilometeranteil und der MIV-Anteil um ±10 und der Anteil der sekundären Stromquelle um ±20 Prozentpunkte. Personenkilometer und Fahrgäste bleiben fest.
+Morris: mittlerer absoluter Elementareffekt (μ*) über den ganzen Parameterbereich, σ zeigt Nichtlinearität und Wechselwirkungen. Sobol: Anteil an der Varianz der Kennzahl allein (S1) bzw. einschließlich Wechselwirkungen (ST).""")
+        graph = rechengraph()
+        if not graph.ready('bilanzmodell'):
+            st.error("Bitte stellen Sie sicher, dass alle erforderlichen Daten vorhanden sind, um die Sensitivitätsanalyse durchzuführen.")
+            return
+
+        standard = SensitivitySpec()
+        col1, col2 = st.columns(2)
+        methode = col1.selectbox("Methode:", list(SENSITIVITAET_METHODEN), format_func=SENSITIVITAET_METHODEN.get)
+        ausgabe = col2.selectbox("Kennzahl:", list(AUSGABEN), format_func=AUSGABEN.get)
+        col1, col2 = st.columns(2)
+        spanne = col1.number_input("Relative Spanne der Faktoren [%]:", value=standard.spanne * 100, min_value=1.0, max_value=90.0, format='%f')
+        if methode == MORRIS:
+            umfang = col2.number_input("Anzahl der Trajektorien:", value=standard.trajektorien, min_value=10, max_value=10_000, step=10)
+        else:
+            umfang = col2.number_input("Anzahl der Stichproben je Matrix:", value=standard.stichproben, min_value=256, max_value=200_000, step=1024)
+        seed = st.number_input("Startwert des Zufallsgenerators:", value=0, min_value=0, step=1, key='sensitivitaet_seed')
+
+        if st.button("Sensitivitätsanalyse starten"):
+            graph.set('sensitivitaetsanalyse', SensitivitySpec(
+                methode=methode, ausgabe=ausgabe, spanne=spanne / 100,
+                trajektorien=int(umfang) if methode == MORRIS else standard.trajektorien,
+                stichproben=int(umfang) if methode == SOBOL else standard.stichproben, seed=int(seed)))
+        if not graph.ready('sensitivitaet'):
+            return
+
+        # Wie die Monte-Carlo-Simulation wird die Analyse nach dem Start bei Änderungen der Eingaben neu berechnet
+        try:
+            ergebnis = graph.get('sensitivitaet')
+        except ValueError as e:
+            st.error(str(e))
+            return
+        kennzahl = AUSGABEN[ergebnis.spec.ausgabe]
+        st.plotly_chart(figures.tornado_figure(ergebnis.tornado[['Parameter', 'unten', 'oben']].itertuples(index=False),
+                                               ergebnis.tornado['basis'].iloc[0], kennzahl))
+        st.write(f"**{SENSITIVITAET_METHODEN[ergebnis.spec.methode]}: {kennzahl}**")
+        st.dataframe(ergebnis.indizes.drop(columns='parameter'), hide_index=True)
+
+
+def show_parameter_sweep(nummer: int):
+    """Kennzahl über ein Gitter aus 1 bis 3 Eingaben mit Break-even für die erste Eingabe."""
+    with st.expander(f"**{nummer}. Parameterstudie (Break-even)**"):
+        st.info("""**Hinweis:** Die Parameterstudie berechnet die gewählte Kennzahl für alle Kombinationen von bis zu drei Eingaben, z. B. Leerkilometeranteil und Anteil der sekundären Stromquelle. Für die erste Eingabe wird der Break-even gesucht, also der Wert, bei dem das Ridepooling-System und die Referenzmobilität gleich hohe Emissionen pro Personenkilometer haben. Alle übrigen Eingaben bleiben beim aktuellen Fall; Personenkilometer und Fahrgäste bleiben fest.""")
+        graph = rechengraph()
+        if not graph.ready('bilanzmodell'):
+            st.error("Bitte stellen Sie sicher, dass alle erforderlichen Daten vorhanden sind, um die Parameterstudie durchzuführen.")
+            return
+        try:
+            modell = graph.get('bilanzmodell')
+        except ValueError as e:
+            st.error(str(e))
+            return
+
+        parameter = {p.name: p for p in modell.parameters()}
+        auswahl = st.multiselect("Eingaben (der Break-even wird für die erste gesucht):", list(parameter), default=['leerkilometeranteil'],
+                                 format_func=lambda name: parameter[name].label, max_selections=MAX_ACHSEN)
+        col1, col2 = st.columns(2)
+        ausgabe = col1.selectbox("Kennzahl:", list(AUSGABEN), format_func=AUSGABEN.get, key='parameterstudie_ausgabe')
+        schritte = col2.number_input("Stützstellen je Eingabe:", value=41, min_value=2, max_value=201, step=10)
+        vorschlag = default_axes(modell)
+        achsen = []
+        for name in auswahl:
+            col1, col2 = st.columns(2)
+            untere = col1.number_input(f"{parameter_titel(parameter[name])} von:", value=vorschlag[name].untere, format='%f',
+                                       key=f'parameterstudie_{name}_untere')
+            obere = col2.number_input(f"{parameter_titel(parameter[name])} bis:", value=vorschlag[name].obere, format='%f',
+                                      key=f'parameterstudie_{name}_obere')
+            achsen.append(Achse(name, untere, obere, int(schritte)))
+
+        if st.button("Parameterstudie berechnen", disabled=not achsen):
+            graph.set('parametergitter', SweepSpec(tuple(achsen), ausgabe))
+        if not graph.ready('parameterstudie'):
+            return
+
+        try:
+            ergebnis = graph.get('parameterstudie')
+        except ValueError as e:
+            st.error(str(e))
+            return
+        achsen, werte, break_even = ergebnis.spec.achsen, ergebnis.werte, ergebnis.break_even
+        titel = [parameter_titel(parameter[achse.name]) for achse in achsen]
+        if len(achsen) == 3:
+            # Eine Heatmap je Wert der dritten Eingabe
+            index = st.select_slider(f"{titel[2]}:", options=range(achsen[2].schritte), format_func=lambda i: f"{ergebnis.achsen[2][i]:.4g}")
+            werte, break_even = werte[:, :, index], break_even[:, index]
+        if len(achsen) == 1:
+            st.plotly_chart(figures.sweep_figure(titel[0], ergebnis.achsen[0], werte, AUSGABEN[ergebnis.spec.ausgabe], break_even))
+            wert = float(break_even)
+            show_result_row(f"Break-even {titel[0]}:", "kein Break-even im Bereich" if np.isnan(wert) else f"{wert:.4g}")
+        else:
+            st.plotly_chart(figures.sweep_figure(titel[0], ergebnis.achsen[0], werte, AUSGABEN[ergebnis.spec.ausgabe], break_even,
+                                                 titel[1], ergebnis.achsen[1]))
+            if np.isnan(break_even).all():
+                st.warning(f"Im gewählten Bereich von {titel[0]} gibt es keinen Break-even.")
+        st.download_button("Ergebnisse der Parameterstudie herunterladen (CSV)", ergebnis.frame().to_csv(index=False).encode('utf-8'),
+                           file_name="parameterstudie.csv", mime="text/csv")
+
+
+# Sortierung der Zeilen und Spalten im Vergleich der Vorauswahlen: aufsteigend (True), absteigend (False) oder wie in der Datenbibliothek
+SORTIERUNGEN = {"Reihenfolge der Datenbibliothek": None, "Emissionen aufsteigend": True, "Emissionen absteigend": False}
+
+
+def show_preset_matrix(nummer: int, methodik: str):
+    """Emissionen pro Pkm der Referenzmobilität für alle Kombinationen der Vorauswahlen der Abschnitte 6 bis 8."""
+    with st.expander(f"**{nummer}. Vergleich der Vorauswahlen der Referenzmobilität**"):
+        st.info("""**Hinweis:** Für die gewählte Methodik werden alle Kombinationen der Vorauswahlen von Verkehrsmittelverteilung, Wegeentfernung (nur Wege-Methoden) und Emissionsdaten der alternativ genutzten Verkehrsmittel gemeinsam berechnet. Eigene Angaben der Abschnitte 6 bis 8 werden nicht berücksichtigt. Ist der Wert des Ridepooling-Systems bekannt, liegt er in der Mitte der Farbskala: blaue Felder bedeuten eine Einsparung, rote eine Mehremission durch das Ridepooling-System.""")
+        graph = rechengraph()
+        flotte = graph.get('flotte') if graph.ready('flotte') else None
+        matrix = preset_matrix(methodik, int(st.session_state.get('transportierte_fahrgaeste', 0)),
+                               flotte.personenkilometer_gefahren if flotte else 0,
+                               flotte.durchschnittliche_fahrtdistanz_mit_bk if flotte else 0,
+                               flotte.durchschnittliche_fahrtdistanz_mit_lk if flotte else 0)
+        if np.isnan(matrix.werte).all():
+            st.error("Bitte stellen Sie sicher, dass die Beförderungsleistung und die Fahrtleistung des Ridepooling-Systems (Abschnitte 2 und 3) vorhanden sind.")
+            return
+        rps = graph.get('rps').co2_emissionen_pro_personenkilometer_rps if graph.ready('rps') else None
+
+        col1, col2 = st.columns(2)
+        zeilen = SORTIERUNGEN[col1.selectbox("Zeilen (Verkehrsmittelverteilung):", list(SORTIERUNGEN), key='vorauswahlen_zeilen')]
+        spalten = SORTIERUNGEN[col2.selectbox("Spalten (Wegeentfernung und Emissionsdaten):", list(SORTIERUNGEN), key='vorauswahlen_spalten')]
+        tabelle = matrix.pivot() * 1000
+        if zeilen is not None:
+            tabelle = tabelle.loc[tabelle.mean(axis=1).sort_values(ascending=zeilen, kind='stable').index]
+        if spalten is not None:
+            tabelle = tabelle[tabelle.mean(axis=0).sort_values(ascending=spalten, kind='stable').index]
+        st.plotly_chart(figures.preset_matrix_figure(tabelle.index, tabelle.columns, tabelle.to_numpy(),
+                                                     rps=rps * 1000 if rps is not None else float('nan')))
+
+        ergebnis = matrix.frame()
+        if rps is not None:
+            ergebnis['differenz_pro_personenkilometer'] = ergebnis['emissionen_pro_personenkilometer_av'] - rps
+        st.dataframe(ergebnis.rename(columns={
+            'verteilung': "Verkehrsmittelverteilung",
+            'entfernung': "Wegeentfernung",
+            'emissionsdaten': "Emissionsdaten",
+            'emissionen_pro_personenkilometer_av': "Emissionen Referenzmobilität (kg CO2eq/pkm)",
+            'differenz_pro_personenkilometer': AUSGABEN['differenz_pro_personenkilometer'],
+        }), hide_index=True)
+        st.download_button("Vergleich der Vorauswahlen herunterladen (CSV)", ergebnis.to_csv(index=False).encode('utf-8'),
+                           file_name="vergleich_vorauswahlen.csv", mime="text/csv")
+
+
+def show_trip_balance(nummer: int, tabelle: ModeTable):
+    """Bilanz je Tag, Woche oder Monat aus Fahrtdaten des Betreibers (eine Zeile je Fahrt)."""
+    with st.expander(f"**{nummer}. Zeitlich aufgelöste Bilanz (Fahrtdaten)**"):
+        st.info(f"""**Hinweis:** Fahrtdaten enthalten eine Zeile je Fahrt mit den Spalten {', '.join(FAHRT_SPALTEN)}. Die Fahrten werden je Zeitraum und Fahrzeug summiert; Zeilen ohne Buchungs-ID (z. B. Leerfahrten) zählen nur mit ihren Kilometern. Der Verbrauch wird über den Fahrzeugtyp der Fahrzeugtabelle (Abschnitt 3) der Fahrzeug-ID zugeordnet; enthält die Fahrzeugtabelle nur eine Zeile, gilt sie für alle Fahrzeuge. Emissionsdaten und Referenzmobilität entsprechen den Eingaben oben.""")
+        col1, col2 = st.columns([3, 1])
+        datei = col1.file_uploader("Fahrtdaten hochladen (CSV, Excel, JSON oder Parquet):", type=list(DATEITYPEN) + ['json'],
+                                   key='fahrtdaten_datei')
+        zeitraum = col2.selectbox("Zeitraum:", list(ZEITRAEUME), index=2, key='fahrtdaten_zeitraum')
+        if datei is None:
+            return
+        fahrzeuge = st.session_state.get('fahrzeugtabelle')
+        if fahrzeuge is None or fahrzeuge.empty or 'benzin_emissionsdaten' not in st.session_state:
+            st.error("Bitte erfassen Sie zuerst die Fahrzeugtabelle und die Emissionsdaten (Abschnitte 3 und 4).")
+            return
+
+        faktoren = EmissionFactors(st.session_state['benzin_emissionsdaten'], st.session_state['diesel_emissionsdaten'],
+                                   st.session_state['strom_emissionsdaten_netz'], st.session_state['oekostrom_anteil'],
+                                   st.session_state['pv_emissionsdaten'])
+        keys = modes_for(tabelle.methodik)
+        try:
+            with st.spinner("Fahrtdaten werden zusammengefasst..."):
+                summen = cached_trip_upload(datei.getvalue(), datei.name, zeitraum)
+            fahrzeugtabelle, buchungen, fahrgaeste = trip_totals(summen, fahrzeuge)
+            bilanz = compute_trip_balance(
+                summen, fahrzeuge, faktoren, st.session_state.get('name_ridepooling_system', ""), tabelle.methodik,
+                dict(zip(keys, tabelle.anteile.tolist())), dict(zip(keys, tabelle.emissionsfaktoren.tolist())),
+                dict(zip(keys, tabelle.entfernungen.tolist())) if tabelle.wege else None,
+                st.session_state.get('netz_zeitreihe'), st.session_state.get('ladeprofil'))
+        except ValueError as e:
+            st.error(str(e))
+            return
+
+        show_result_row("Abgeschlossene Buchungen (Fahrtdaten):", f"{buchungen}")
+        show_result_row("Transportierte Fahrgäste (Fahrtdaten):", f"{fahrgaeste}")
+        if st.button("Summen in die Abschnitte 2 und 3 übernehmen", help="Ersetzt die Fahrzeugtabelle durch eine Zeile je Fahrzeug"):
+            st.session_state['fahrtdaten_leistung'] = (buchungen, fahrgaeste)
+            set_fleet_base(fahrzeugtabelle)
+            st.rerun()
+        st.dataframe(bilanz[['start_date', 'end_date', 'transportierte_fahrgaeste', 'personenkilometer_gefahren', 'co2_emissionen_gesamt_rps',
+                             'co2_emissionen_pro_personenkilometer_rps', 'gesamtemissionen_av', 'emissionen_pro_personenkilometer_av']],
+                     hide_index=True)
+        verlauf = bilanz.set_index('start_date')[['co2_emissionen_pro_personenkilometer_rps', 'emissionen_pro_personenkilometer_av']]
+        st.line_chart(verlauf.rename(columns={'co2_emissionen_pro_personenkilometer_rps': "Ridepooling-System (kg CO2eq/pkm)",
+                                              'emissionen_pro_personenkilometer_av': "Referenzmobilität (kg CO2eq/pkm)"}))
+        st.download_button("Bilanz je Zeitraum herunterladen (CSV)", bilanz.to_csv(index=False).encode('utf-8'),
+                           file_name="bilanz_zeitraeume.csv", mime="text/csv")
+        if tabelle.wege:
+            show_trip_substitution(datei, tabelle)
+
+
+WAHLMODELL_ANZEIGE = {ANTEILE: "Anteile der Verkehrsmittelverteilung", ENTFERNUNG: "Distanzabhängig (Logit-Modell)"}
+
+
+def show_trip_substitution(datei, tabelle: ModeTable):
+    """Referenzmobilität je Fahrt statt mit mittleren Wegeentfernungen (nur Wege-Methoden)."""
+    st.write("**Referenzmobilität je Fahrt (Substitution)**")
+    st.info("""**Hinweis:** Statt mit einer mittleren Wegeentfernung je Verkehrsmittel (Abschnitt 7) erhält jede gebuchte Fahrt ein alternatives Verkehrsmittel und behält ihre eigene Distanz (besetzte Kilometer). Das Verkehrsmittel wird nach der Verkehrsmittelverteilung gezogen oder distanzabhängig: Der Faktor beta verschiebt die Wahl bei Fahrten, die länger (beta > 0) bzw. kürzer (beta < 0) als die mittlere Fahrt sind, hin zu diesem Verkehrsmittel. Bei der mittleren Distanz gelten die Anteile der Verkehrsmittelverteilung.""")
+    col1, col2 = st.columns([3, 1])
+    wahlmodell = col1.radio("Wahl des alternativen Verkehrsmittels:", list(WAHLMODELL_ANZEIGE), format_func=WAHLMODELL_ANZEIGE.get)
+    seed = col2.number_input("Startwert des Zufallsgenerators:", value=0, min_value=0, step=1, key='substitution_seed')
+    elastizitaeten = {}
+    if wahlmodell == ENTFERNUNG:
+        spalten = st.columns(3)
+        aktiv = [(key, label) for key, label, anteil in zip(tabelle.keys, tabelle.labels, tabelle.anteile) if anteil > 0]
+        for i, (key, label) in enumerate(aktiv):
+            elastizitaeten[key] = spalten[i % 3].number_input(f"beta {label}:", value=0.0, step=0.1, format='%f', key=f'substitution_{key}')
+
+    # Verteilung je Entfernungsklasse; Ausgangspunkt ist eine Klasse mit der Verteilung aus Abschnitt 6
+    klassen_tabelle = None
+    if st.checkbox("Verkehrsmittelverteilung nach Entfernungsklassen", key='substitution_klassen'):
+        st.write(f"Eine Zeile je Entfernungsklasse mit der oberen Grenze in der Spalte '{BIS_KM}'; die Klasse ohne Grenze gilt für alle längeren Fahrten. Anteile in %.")
+        klassen_tabelle = st.data_editor(DistanceBands.flat(tabelle.methodik, tabelle.anteile).frame(), num_rows='dynamic', hide_index=True,
+                                         key=f'substitution_klassen_{tabelle.methodik}')
+
+    if not st.button("Substitution je Fahrt berechnen"):
+        return
+    try:
+        klassen = DistanceBands.from_frame(tabelle.methodik, klassen_tabelle) if klassen_tabelle is not None else None
+        with st.spinner("Fahrten werden zugeordnet..."):
+            distanzen, fahrgaeste = cached_trip_arrays(datei.getvalue(), datei.name)
+            ergebnis = substitute_trips(tabelle, distanzen, fahrgaeste, SubstitutionSpec(wahlmodell, elastizitaeten, klassen=klassen, seed=int(seed)),
+                                        prozesse=MONTE_CARLO_PROZESSE)
+    except ValueError as e:
+        st.error(str(e))
+        return
+    referenz = ergebnis.referenz
+    verteilung = pd.DataFrame({
+        "Verkehrsmittel": tabelle.labels,
+        "Fahrten": list(ergebnis.fahrten.values()),
+        "Personenkilometer (pkm)": list(referenz.personenkilometer.values()),
+        "Emissionen (kg CO2eq)": list(referenz.emissionen.values()),
+    })
+    if klassen is not None and len(distanzen):
+        verteilung.insert(1, "Anteil über alle Klassen (%)", klassen.weighted_shares(distanzen))
+    st.dataframe(verteilung, hide_index=True)
+    show_result_row(f"Gebuchte Fahrten (mittlere Distanz {ergebnis.referenzdistanz:.2f} km):", f"{len(distanzen)}")
+    show_result_row("Gesamtemissionen der Referenzmobilität (je Fahrt):", f"{referenz.gesamtemissionen_av} kg CO2eq")
+    show_result_row("CO2e-Emissionen der Referenzmobilität pro Personenkilometer (je Fahrt):",
+                    f"{referenz.emissionen_pro_personenkilometer_av:.3f} kg CO2/pkm")
+
+
+EXPORT_NAMEN = {PARQUET: "Parquet (ZIP-Archiv)", EXCEL: "Excel (ein Tabellenblatt je Tabelle)", JSON: "JSON"}
+
+
+def build_export_tables(tabelle: ModeTable, referenz) -> dict:
+    """Eingabedaten und Ergebnisse als typisierte Tabellen (Export)."""
+    graph = rechengraph()
+    faktoren = EmissionFactors(st.session_state['benzin_emissionsdaten'], st.session_state['diesel_emissionsdaten'],
+                               st.session_state['strom_emissionsdaten_netz'], st.session_state['oekostrom_anteil'],
+                               st.session_state['pv_emissionsdaten'])
+    return export_tables(st.session_state['name_ridepooling_system'], st.session_state['start_date'], st.session_state['end_date'],
+                         st.session_state['abgeschlossene_buchungen'], st.session_state['transportierte_fahrgaeste'],
+                         st.session_state['fahrzeugtabelle'], graph.get('flotte'), faktoren, graph.get('rps'), tabelle, referenz,
+                         graph.get('vergleich') if graph.ready('vergleich') else None)
+
+
+def show_export(nummer: int, tabelle: ModeTable, referenz):
+    with st.expander(f"**{nummer}. Export der Eingabedaten und Ergebnisse**"):
+        # Stellen Sie sicher, dass alle erforderlichen Werte vorhanden sind, bevor Sie fortfahren
+        required_keys = [
+            'name_ridepooling_system', 'start_date', 'end_date', 'abgeschlossene_buchungen',
+            'transportierte_fahrgaeste', 'fahrzeugtabelle', 'oekostrom_anteil', 'benzin_emissionsdaten', 'diesel_emissionsdaten',
+            'strom_emissionsdaten', 'strom_emissionsdaten_netz', 'pv_emissionsdaten',
+        ]
+        missing_keys = [key for key in required_keys if key not in st.session_state]
+        if missing_keys:
+            st.error(fehlende_eingaben(missing_keys))
+            return
+        if not rechengraph().ready('rps'):
+            st.error("Bitte stellen Sie sicher, dass alle erforderlichen Daten des Ridepooling-Systems (Abschnitte 2 bis 4) vorhanden sind.")
+            return
+        st.info(f"""**Hinweis:** Die Eingabedaten und Ergebnisse werden als Tabellen mit festen Spalten und Datentypen exportiert: {', '.join(TABELLEN)}. Parquet-Dateien werden als ZIP-Archiv (eine Datei je Tabelle) ausgegeben, Excel mit einem Tabellenblatt je Tabelle, JSON mit dem Schema jeder Tabelle. Mit Komprimierung werden Parquet-Dateien mit gzip statt snappy geschrieben und JSON-Dateien mit gzip komprimiert.""")
+        col1, col2 = st.columns([3, 1])
+        dateiformat = col1.selectbox("Format:", list(EXPORT_FORMATE), format_func=EXPORT_NAMEN.get, key='export_format')
+        komprimiert = col2.checkbox("Komprimieren (gzip)", key='export_komprimiert', disabled=dateiformat == EXCEL)
+        tabellen = build_export_tables(tabelle, referenz)
+        try:
+            daten = cached_export(tabellen, dateiformat, komprimiert)
+        except ImportError as error:
+            st.error(f"Das Dateiformat kann nicht geschrieben werden: {error}")
+            return
+        with st.popover("Vorschau der Tabellen"):
+            for name, df in tabellen.items():
+                st.write(f"**{name}**")
+                st.dataframe(df, hide_index=True)
+        dateiname, mime = export_file(METHODIK_ANZEIGE[tabelle.methodik]['datei'], dateiformat, komprimiert)
+        st.download_button("Eingabedaten und Ergebnisse herunterladen", daten, file_name=dateiname, mime=mime)
+
+        # Bilanzspeicher: die Bilanz bleibt über das Ende der Sitzung hinaus abrufbar (Abschnitt "Gespeicherte Bilanzen")
+        if st.button("Bilanz im Bilanzspeicher ablegen"):
+            try:
+                with RunStore() as store:
+                    bilanz_id = store.record(*balance_from_tables(tabellen))
+                st.success(f"Die Bilanz wurde unter der ID {bilanz_id} gespeichert.")
+            except (sqlite3.Error, ValueError) as error:
+                st.error(f"Die Bilanz konnte nicht gespeichert werden: {error}")
+
+
+def show_method_comparison():
+    """Referenzmobilität und Vergleich (Abschnitte 6 bis 10) für alle vier Methoden in einer Rechnung."""
+    with st.expander("**Vergleich aller Methoden der Referenzmobilität**", expanded=True):
+        st.info("**Hinweis:** Alle vier Methoden werden mit denselben Angaben zum Ridepooling-System (Abschnitte 1 bis 5), derselben Wegeentfernung und denselben Emissionsdaten der alternativ genutzten Verkehrsmittel berechnet. Die Verkehrsmittelverteilung wird je Methodik gewählt; für die oben gewählte Methodik können die Eingaben der Abschnitte 6 bis 8 übernommen werden.")
+        graph = rechengraph()
+        if not graph.ready('rps'):
+            st.error("Bitte stellen Sie sicher, dass alle erforderlichen Daten des Ridepooling-Systems (Abschnitte 2 bis 4) vorhanden sind.")
+            return
+
+        spalten = st.columns(len(METHODEN))
+        verteilungen = {methodik: spalte.selectbox(f"{methodik}:", list(presets.modal_split_options(methodik)), key=f'methodenvergleich_{methodik}')
+                        for methodik, spalte in zip(METHODEN, spalten)}
+        col1, col2 = st.columns(2)
+        entfernung = col1.selectbox("Wegeentfernung (Wege-Methoden):", list(presets.ENTFERNUNG_OPTIONEN), key='methodenvergleich_entfernung')
+        emissionsdaten = col2.selectbox("Emissionsdaten der alternativ genutzten Verkehrsmittel:", list(presets.EMISSIONSDATEN_AV_OPTIONEN),
+                                        key='methodenvergleich_emissionsdaten')
+        eigene = None
+        if graph.ready('referenz'):
+            eigene, _ = graph.get('referenz')
+            if not st.checkbox(f"Für '{eigene.methodik}' die Eingaben der Abschnitte 6 bis 8 verwenden", value=True):
+                eigene = None
+
+        flotte = graph.get('flotte')
+        vorauswahl = presets.REISEWEITEN_MID_2017 if entfernung == presets.REISEWEITEN_MID_2017_NAME else entfernung
+        tabellen = []
+        for methodik in METHODEN:
+            if eigene is not None and eigene.methodik == methodik:
+                tabellen.append(eigene)
+                continue
+            entfernungen = distance_preset(vorauswahl, methodik, flotte.durchschnittliche_fahrtdistanz_mit_bk,
+                                           flotte.durchschnittliche_fahrtdistanz_mit_lk) if is_wege(methodik) else None
+            tabellen.append(ModeTable.from_vectors(methodik, presets.modal_split_options(methodik)[verteilungen[methodik]],
+                                                   mode_vector(methodik, presets.EMISSIONSDATEN_AV_OPTIONEN[emissionsdaten]), entfernungen))
+
+        rps = graph.get('rps')
+        vergleich = compare_methods(tabellen, int(st.session_state.get('transportierte_fahrgaeste', 0)), flotte.personenkilometer_gefahren,
+                                    rps.co2_emissionen_gesamt_rps, rps.co2_emissionen_pro_personenkilometer_rps)
+        anzeige = vergleich[['methodik', 'personenkilometer_gesamt_av', 'gesamtemissionen_av', 'emissionen_pro_personenkilometer_av',
+                             'percentage_difference', 'total_difference']].assign(
+            ergebnis=vergleich['ergebnis'].map({"niedriger": "Einsparung", "hoeher": "Mehremission", "gleich": "Gleich"}))
+        st.dataframe(anzeige.rename(columns={
+            'methodik': "Methodik",
+            'personenkilometer_gesamt_av': "Personenkilometer Referenzmobilität (Pkm)",
+            'gesamtemissionen_av': "Gesamtemissionen Referenzmobilität (kg CO2eq)",
+            'emissionen_pro_personenkilometer_av': "Emissionen Referenzmobilität (kg CO2eq/pkm)",
+            'percentage_difference': "Differenz pro Pkm (%)",
+            'total_difference': "Differenz gesamt (kg CO2eq)",
+            'ergebnis': "Ridepooling-System",
+        }), hide_index=True)
+        st.plotly_chart(figures.method_comparison_figure(
+            rps.co2_emissionen_pro_personenkilometer_rps * 1000,
+            zip(vergleich['methodik'], vergleich['emissionen_pro_personenkilometer_av'] * 1000)))
+        st.download_button("Vergleich der Methoden herunterladen (CSV)", vergleich.to_csv(index=False).encode('utf-8'),
+                           file_name="vergleich_methoden.csv", mime="text/csv")
+
+
+def show_run_history():
+    """Abfrage der im Bilanzspeicher abgelegten Bilanzen nach System, Methodik und Zeitraum."""
+    with st.expander("**Gespeicherte Bilanzen**"):
+        st.info("**Hinweis:** Bilanzen, die im Abschnitt 'Export der Eingabedaten und Ergebnisse' oder über die Kommandozeile (`--store`) im Bilanzspeicher abgelegt wurden, können hier mit ihren Eingaben und Ergebnissen erneut angesehen werden, ohne sie neu zu berechnen. Es werden alle Bilanzen angezeigt, deren Betrachtungszeitraum in den gewählten Jahren liegt oder sie überschneidet.")
+        if not os.path.exists(store_path()):
+            st.write("Es wurden noch keine Bilanzen gespeichert.")
+            return
+        try:
+            with RunStore() as store:
+                col1, col2, col3 = st.columns([2, 2, 3])
+                system = col1.selectbox("Ridepooling-System:", ["Alle", *store.systems()], key='bilanzspeicher_system')
+                methodik = col2.selectbox("Methodik:", ["Alle", *METHODEN], key='bilanzspeicher_methodik')
+                von, bis = col3.slider("Jahre:", min_value=2000, max_value=date.today().year + 1, value=(2019, date.today().year),
+                                       key='bilanzspeicher_jahre')
+                bilanzen = store.query(None if system == "Alle" else system, None if methodik == "Alle" else methodik, von, bis)
+                if bilanzen.empty:
+                    st.write("Keine gespeicherten Bilanzen für diese Auswahl.")
+                    return
+                st.dataframe(bilanzen, hide_index=True)
+                bilanz_id = st.selectbox("Eingaben und Ergebnisse der Bilanz mit der ID:", bilanzen['id'].tolist(), key='bilanzspeicher_id')
+                bilanz = store.load(bilanz_id)
+        except sqlite3.Error as error:
+            st.error(f"Der Bilanzspeicher kann nicht gelesen werden: {error}")
+            return
+        st.write(f"Gespeichert am {bilanz['erstellt']} ({bilanz['quelle']}), Datenbibliothek {bilanz['datenbibliothek']}")
+        col1, col2 = st.columns(2)
+        col1.json(bilanz['eingaben'], expanded=False)
+        col2.json(bilanz['ergebnisse'], expanded=False)
+
+
+def show_reference_mobility(methodik: str):
+    """Abschnitte 6 bis 16 für die gewählte Methodik.
+
+    Zuerst werden alle Eingaben erfasst, dann wird die Referenzmobilität einmal
+    über die Verkehrsmitteltabelle berechnet und in die Expander geschrieben.
+    """
+    wege = is_wege(methodik)
+    graph = rechengraph()
+    transportierte_fahrgaeste = int(st.session_state.get('transportierte_fahrgaeste', 0))
+    personenkilometer_gefahren = graph.get('personenkilometer_gefahren') if graph.ready('personenkilometer_gefahren') else None
+    nummer = iter(range(6, 17))
+
+    verteilung = st.expander(f"**{next(nummer)}. Verkehrsmittelverteilung der Referenzmobilität im Bediengebiet (alternativ genutzte Verkehrsmittel)**")
+    with verteilung:
+        anteile = input_modal_split(methodik)
+
+    entfernung = None
+    entfernungen = None
+    if wege:
+        entfernung = st.expander(f"**{next(nummer)}. Wegeentfernung alternativ genutzter Verkehrsmittel**")
+        with entfernung:
+            entfernungen = input_entfernungen(methodik)
+
+    emissionsdaten = st.expander(f"**{next(nummer)}. Emissionsdaten alternativ genutzter Verkehrsmittel (Nutzung [TTW] und Energie [WTT])**")
+    with emissionsdaten:
+        emissionsfaktoren = input_emissionsfaktoren(methodik)
+
+    # Eine Berechnung für alle Verkehrsmittel; nur nach Änderung einer Eingabe der Referenzmobilität
+    graph.set('methodik', methodik)
+    graph.set('anteile', tuple(anteile.tolist()))
+    graph.set('entfernungen', tuple(entfernungen.tolist()) if wege else None)
+    graph.set('emissionsfaktoren_av', tuple(emissionsfaktoren.tolist()))
+    # Werte je Verkehrsmittel für die Szenario-Datei (Seitenleiste)
+    modes = modes_for(methodik)
+    st.session_state.update({
+        'anteile': dict(zip(modes, anteile.tolist())),
+        'entfernungen': dict(zip(modes, entfernungen.tolist())) if wege else None,
+        'emissionsfaktoren_av': dict(zip(modes, emissionsfaktoren.tolist())),
+    })
+    tabelle, referenz = graph.get('referenz')
+    st.session_state['referenz_av'] = referenz
+    st.session_state.update({
+        'personenkilometer_gesamt_av': referenz.personenkilometer_gesamt_av,
+        'gesamtemissionen_av': referenz.gesamtemissionen_av,
+        'emissionen_pro_personenkilometer_av': referenz.emissionen_pro_personenkilometer_av,
+    })
+
+    with verteilung:
+        if wege:
+            st.write("**Berechnung der Wegehäufigkeit der Referenzmobilität im Bediengebiet (alternativ genutzte Verkehrsmittel):**")
+            st.info("**Hinweis:** Um die Wegehäufigkeit der Referenzmobilität im Bediengebiet zu berechnen, wird die Anzahl der Fahrgäste mit dem entsprechenden Anteil (Wege) multipliziert.")
+            st.write(f"Von den **{transportierte_fahrgaeste}** transportierten Fahrgästen des Ridepooling-Verkehrs hätten entsprechend viele Personen folgende alternative Verkehrsmittel genutzt:")
+            for mode, personen in zip(tabelle.labels, (transportierte_fahrgaeste * tabelle.anteile / 100).tolist()):
+                show_result_row(f"{mode}:", f"{personen:.0f} Personen")
+        elif personenkilometer_gefahren is None:
+            st.warning("Bitte stellen Sie sicher, dass die Personenkilometer gefahren und die Modal-Split-Annahmen festgelegt wurden.")
+        else:
+            st.write("**Berechnung der Personenkilometer der Referenzmobilität im Bediengebiet (alternativ genutzte Verkehrsmittel)**")
+            st.info("**Hinweis:** Um die Anzahl der Personenkilometer der alternativ genutzten Verkehrsmittel zu berechnen, werden die mit dem Ridepooling zurückgelegten Personenkilometer mit dem entsprechenden Anteil (Personenkilometer) multipliziert.")
+            st.write(f"Von den zurückgelegten **{int(personenkilometer_gefahren)}** Personenkilometern des Ridepooling-Systems würden entsprechend viele auf folgende alternativ genutzte Verkehrsmittel entfallen:")
+            for key, mode in zip(tabelle.keys, tabelle.labels):
+                show_result_row(f"{mode}:", f"{referenz.personenkilometer[key]:.1f} Pkm")
+            show_result_row("Gesamte Personenkilometer der Referenzmobilität im Bediengebiet (alternativ genutzte Verkehrsmittel):", f"{referenz.personenkilometer_gesamt_av:.1f} Pkm")
+
+    if wege:
+        with entfernung:
+            st.write("**Berechnung der Personenkilometer für Referenzmobiliität im Bediengebiet (alternativ genutzte Verkehrsmittel):**")
+            st.info("**Hinweis:** Die Berechnung der Personenkilometer basiert auf der Anzahl der transportierten Fahrgäste, der Verkehrsmittelverteilung und der jeweiligen Wegeentfernung. Die Formel lautet: PKM = Anzahl der transportierten Fahrgäste * Anteil * Wegeentfernung.")
+            for key, mode in zip(tabelle.keys, tabelle.labels):
+                show_result_row(f"{mode}:", f"{referenz.personenkilometer[key]} Pkm")
+            show_result_row("Gesamte Personenkilometer für die Referenzmobilität im Bediengebiet (alternativ genutzte Verkehrsmittel):", f"{referenz.personenkilometer_gesamt_av} Pkm")
+
+    with emissionsdaten:
+        if not tabelle.bilanziert.all():
+            st.info("**Hinweis:** Die Verkehrsinduktion wird bei der Berechnung der Gesamt-Personenkilometer und Gesamtemissionen nicht berücksichtigt.")
+        for key, mode in zip(tabelle.keys, tabelle.labels):
+            show_result_row(f"Emissionen für {mode}:", f"{round(referenz.emissionen[key], 2)} kg CO2eq")
+        show_result_row("Gesamtemissionen der Referenzmobilität im Bediengebiet (alternativ genutzte Verkehrsmittel):", f"{referenz.gesamtemissionen_av} kg CO2eq")
+
+    with st.expander(f"**{next(nummer)}. Berechnung der Umweltwirkung der Referenzmobilität im Bediengebiet**"):
+        st.info(f"""**Hinweis:** Im Folgenden wird die Umweltwirkung der Referenzmobilität im Bediengebiet anhand der {METHODIK_ANZEIGE[methodik]['verteilung']} dargestellt. In der Abbildung wird der spezifische CO2-Ausstoß pro Pkm der Referenzmobilität denen anderer Verkehrsmittel gegenübergestellt. Die Kategorie 'Sonstiges' wird durch die UBA-Quelle ("Umweltfreundlich mobil!", 2022) nicht berücksichtigt.""")
+        st.plotly_chart(figures.uba_comparison_figure('Referenzmobilität im Bediengebiet', referenz.emissionen_pro_personenkilometer_av * 1000))
+        show_result_row("Gesamte Well-to-Wheel CO2e-Emissionen der Referenzmobilität im Bediengebiet:", f"{referenz.gesamtemissionen_av} kg CO2")
+        show_result_row("CO2e-Emissionen der Referenzmobilität im Bediengebiet (alternativ genutzter Verkehrsmittel) pro Personenkilometer:",
+                        f"{referenz.emissionen_pro_personenkilometer_av:.3f} kg CO2/pkm")
+
+    show_reference_comparison(next(nummer))
+    show_uncertainty_analysis(next(nummer))
+    show_sensitivity_analysis(next(nummer))
+    show_parameter_sweep(next(nummer))
+    show_preset_matrix(next(nummer), methodik)
+    show_trip_balance(next(nummer), tabelle)
+    show_export(next(nummer), tabelle, referenz)
+
+
 # Initialisiere Session State Variablen
 initialize_session_state()
 
 # Zeige Sidebar an
 show_sidebar()
+show_scenario_upload()
 
 # Grundlegende Konfiguration
 st.title("ÖkoRPS - Ökologische Bewertung von Ridepooling-Systemen")
@@ -596,6 +1581,8 @@ with col4:
         st.session_state['methodik_selected_pkm'] = True
 
 
+methodenvergleich = st.checkbox("Alle vier Methoden nebeneinander vergleichen", key='methodenvergleich')
+
 # Überprüfe, ob eine Methode ausgewählt wurde
 if 'methodik_selected' in st.session_state and st.session_state['methodik_selected']:
     st.success(f"Die Methode **'{st.session_state['methodik']}'** wurde ausgewählt. Bitte fahren Sie mit der Eingabe der Daten fort.")
@@ -603,1949 +1590,22 @@ else:
     st.warning("Zur Berechnung der THG-Bilanz der Referenzmobilität im Bediengebiet ist ein geeigneter methodischer Ansatz auszuwählen.")
 
 ####################################################################################################
-# Modal Split (Wege)
-# Sollte Button "Modal Split (Wege)" ausgewählt sein, dann zeige folgende Expander an
-if 'methodik' in st.session_state and st.session_state['methodik'] == "Modal Split (Wege)":
-    with st.expander("**6. Verkehrsmittelverteilung alternativ genutzer Verkehrsmittel (ohne Ridepooling-Verkehr)**"):
-        st.info("""**Hinweis:** Bitte geben Sie die Annahmen für die Modal-Split-Verteilung (Wege) der Fahrgäste an.                     
-                    **Vorauswahl des Modal Split (Wege):**
-    Wählen Sie ein vordefiniertes Szenario aus, um die Standardwerte für die Modal-Split-Verteilung automatisch auszufüllen. Diese Werte sind anpassbar.
-        """)
-        # Dropdown-Menü für Modal-Split-Optionen
-        modal_split_options = {
-            "Eigene Angaben (Wege)": [0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-            "Modal Split (Wege) MiD 2017": [42, 16, 3, 3, 2, 1, 1, 10, 22, 0],
-            "Modal Split (Wege) Essen (2019)": [46, 8, 6, 8, 5, 1, 1, 6, 19, 0],
-            "Modal Split (Wege) Senden (2000)": [48, 10, 4.5, 0, 1.5, 0, 0, 21, 14, 1],
-            "Modal Split (Wege) Gronau (2020)": [47, 8, 1, 0, 1, 0, 0, 30, 13, 0],
-            "Modal Split (Wege) Münster, Hiltrup (2022)": [31, 9, 7, 0, 2, 0, 10, 24, 17, 0]
-        }
-        selected_modal_split = st.selectbox("Vorauswahl Modal Split (Optional):", list(modal_split_options.keys()))
-
-        # Speichern der globalen Variablen
-        st.session_state['selected_modal_split'] = selected_modal_split
-
-        # Anzeigen der Anteile basierend auf der ausgewählten Vorauswahl
-        default_values = modal_split_options[selected_modal_split]
-
-        # Eingabefelder für die Anteile
-        transport_modes = ["MIV (Fahrer)", "MIV (Mitfahrer)", "(Nahlinien-)Bus", "Straßen-/Stadt-/U-Bahn", "Schienen(nah)verkehr/Bahn/Zug", "Motorrad", "E-Bike/Pedelec/E-Lastenrad", "Fahrrad/Lastenrad", "zu Fuß", "Sonstiges"]
-        entries_modal_split = {}
-        for i, mode in enumerate(transport_modes):
-            entries_modal_split[mode] = st.number_input(
-                f"Anteil der Fahrgäste, die {mode} genutzt hätten (%):", 
-                min_value=0.0, 
-                max_value=100.0, 
-                value=round(float(default_values[i]), 1),  # Round the default value to 1 decimal place
-                step=0.1, 
-                format="%.1f"  # Display with 1 decimal place
-            )
-
-        # Überprüfung der Gesamtsumme der eingegebenen Werte
-        total_percentage = sum(entries_modal_split.values())
-        if total_percentage > 100:
-            st.error("Die Summe der Modal-Split-Anteile überschreitet 100%.")
-        elif total_percentage < 100:
-            st.warning("Die Summe der Modal-Split-Anteile liegt unter 100%.")
-
-        # Außerhalb des Expanders
-        st.write("**Berechnung der Wegehäufigkeit der Referenzmobilität im Bediengebiet (Alternativ genutzte Verkehrsmittel):**")
-        st.info("**Hinweis:** Um die Wegehäufigkeit der Referenzmobilität im Betriebsgebiet (der alternativ genutzten Verkehrsmittel) zu berechnen, wird die Anzahl der Fahrgäste mit dem ensprechenden Modal-Split-Anteil (Wege) multipliziert.")
-        #Speichern der globalen Variablen
-        st.session_state['entries_modal_split'] = entries_modal_split
-
-        if 'transportierte_fahrgaeste' in st.session_state and 'entries_modal_split' in st.session_state:
-            transportierte_fahrgaeste = int(st.session_state['transportierte_fahrgaeste'])
-            st.write(f"Von den **{int(st.session_state['transportierte_fahrgaeste'])}** transportierten Fahrgästen des Ridepooling-Verkehrs hätten entsprechend viele Personen folgende alternative Verkehrsmittel genutzt:")
-            entries_modal_split = st.session_state['entries_modal_split']
-            
-            for verkehrsmittel, anteil in entries_modal_split.items():
-                col1, col2 = st.columns([3, 1])
-                with col1:
-                    st.write(f"**{verkehrsmittel}:**")
-                with col2:
-                    berechneter_wert = transportierte_fahrgaeste * anteil / 100
-                    st.write(f"**{berechneter_wert:.0f} Personen**")
-                    
-        else:
-            st.warning("Bitte stellen Sie sicher, dass die Gesamtzahl der transportierten Fahrgäste und die Modal-Split-Annahmen festgelegt wurden.")
-
-    ####################################################################################################
-    with st.expander("**7. Wegeentfernung alternativ genutzter Verkehrsmittel**"):
-        # Initializations
-        if 'durchschnittliche_fahrtdistanz_mit_bk' not in st.session_state:
-            st.session_state['durchschnittliche_fahrtdistanz_mit_bk'] = 0
-        if 'durchschnittliche_fahrtdistanz_mit_lk' not in st.session_state:
-            st.session_state['durchschnittliche_fahrtdistanz_mit_lk'] = 0
-        if 'transportierte_fahrgaeste' not in st.session_state:
-            st.session_state['transportierte_fahrgaeste'] = 0
-        if 'entries_modal_split' not in st.session_state:
-            st.session_state['entries_modal_split'] = {}
-        st.info("""**Hinweis:** Bitte geben Sie die Annahmen zur Wegeentfernung der alternativ genutzten Verkehrsmittel an. Sie können vorausgewählte Optionen wählen oder eigene Angaben tätigen. Die durschnittliche Fahrtdistanz je Buchung (einschließlich Leerkilometern) und die durschnittliche Fahrtdistanz je Buchung (mit Fahrgast) sind Angaben, die sich auf das Ridepooling-System beziehen. Wahlweise können auch Daten der durchschnittlichen Reiseweiten nach MiD 2017 verwendet werden.""")
-        
-        vorauswahl_optionen = {
-            "Durchschnittliche Fahrtdistanz je Buchung (mit Fahrgast)": st.session_state['durchschnittliche_fahrtdistanz_mit_bk'],
-            "Durchschnittliche Fahrtdistanz je Buchung (einschließlich Leerkilometern)": st.session_state['durchschnittliche_fahrtdistanz_mit_lk'],
-            "Durchschnittliche Reiseweiten nach MID 2017": {
-                "MIV (Fahrer)": 16.0,
-                "MIV (Mitfahrer)": 18.0,
-                "(Nahlinien-)Bus": 23.0,
-                "Straßen-/Stadt-/U-Bahn": 23.0,
-                "Schienen(nah)verkehr/Bahn/Zug": 23.0,
-                "Motorrad": 16.0,
-                "E-Bike/Pedelec/E-Lastenrad": 4.0,
-                "Fahrrad/Lastenrad": 4.0,
-                "Zu Fuss": 2.0,
-                "Sonstiges": 0.0
-            }
-        }
-
-        selected_vorauswahl = st.selectbox("Vorauswahl der Wegeentfernung:", list(vorauswahl_optionen.keys()))
-
-        if selected_vorauswahl == "Durchschnittliche Fahrtdistanz je Buchung (mit Fahrgast)":
-            default_distances = {mode: st.session_state['durchschnittliche_fahrtdistanz_mit_bk'] for mode in transport_modes}
-        elif selected_vorauswahl == "Durchschnittliche Fahrtdistanz je Buchung (einschließlich Leerkilometern)":
-            default_distances = {mode: st.session_state['durchschnittliche_fahrtdistanz_mit_lk'] for mode in transport_modes}
-        else:
-            default_distances = vorauswahl_optionen[selected_vorauswahl]
-
-        mode_to_key = {
-            "MIV (Fahrer)": "miv_fahrer",
-            "MIV (Mitfahrer)": "miv_mitfahrer",
-            "(Nahlinien-)Bus": "nahlinien_bus",
-            "Straßen-/Stadt-/U-Bahn": "strassen_stadt_u_bahn",
-            "Schienen(nah)verkehr/Bahn/Zug": "schienen_nah_verkehr_bahn_zug",
-            "Motorrad": "motorrad",
-            "E-Bike/Pedelec/E-Lastenrad": "e_bike_pedelec_e_lastenrad",
-            "Fahrrad/Lastenrad": "fahrrad_lastenrad",
-            "zu Fuß": "zu_fuss",  # Corrected key to match 'zu Fuß'
-            "Sonstiges": "sonstiges"
-        }
-
-        for mode in transport_modes:
-            key = mode_to_key[mode]
-            distance = st.number_input(
-                f"Wegeentfernung {mode} [km]:", 
-                min_value=0.0, 
-                value=round(float(default_distances.get(mode, 0)), 2),  # Round the default value to 2 decimal places
-                format="%.2f",  # Display with 2 decimal places
-                step=0.01
-            )
-            st.session_state[f'entfernung_{key}'] = round(distance, 2)  # Round the input value to 2 decimal places
-
-        st.write("**Berechnung der Personenkilometer für Referenzmobiliität im Bediengebiet (alternativ genutzte Verkehrsmittel):**")
-        st.info("**Hinweis:** Die Berechnung der Personenkilometer basiert auf der Anzahl der transportierten Fahrgäste und der jeweiligen durchschnittlichen Fahrtdistanz. Die Formel zur Berechnung der Personenkilometer (PKM) lautet: PKM = Anzahl der transportierten Fahrgäste * Durchschnittliche Fahrtdistanz.")
-
-        # Berechnung und Anzeige der Personenkilometer für jedes Verkehrsmittel
-        st.write("Die Berechnung der Personenkilometer für die verschiedenen alternativ genutzten Verkehrsmittel ergibt folgende Werte:")
-        for mode in transport_modes:
-            key = mode_to_key[mode]
-            transportierte_fahrgaeste = st.session_state['transportierte_fahrgaeste']
-            personen = int(transportierte_fahrgaeste) * float(st.session_state['entries_modal_split'].get(mode, 0)) / 100
-            entfernung = st.session_state.get(f'entfernung_{key}', 0)
-            personenkilometer = round(personen * entfernung, 2)
-            st.session_state[f'personenkilometer_{key}'] = personenkilometer
-            col1, col2 = st.columns([3, 1])
-            with col1:
-                st.write(f"**{mode}**:")
-            with col2:
-                st.write(f"**{personenkilometer} Pkm**")
-
-        # Berechnung der Gesamt-Personenkilometer für alternative Verkehrsmittel
-        personenkilometer_gesamt_av = round(sum(
-            st.session_state.get(f'personenkilometer_{mode_to_key[mode]}', 0)
-            for mode in transport_modes), 2)
-        col1, col2 = st.columns([3, 1])
-        with col1:
-            st.write("**Gesamte Personenkilometer für die Referenzmobilität im Bediengebiet (alternativ genutzte Verkehrsmittel):**")
-        with col2:
-            st.write(f"**{personenkilometer_gesamt_av} Pkm**")
-
-
-
-    with st.expander("**8. Emissionsdaten alternativ genutzter Verkehrsmittel (Nutzung [TTW] und Energie [WTT])**"):
-        st.info("""**Hinweis:** Bitte geben Sie die CO2-Emissionsdaten für die alternativ genutzten Verkehrsmittel an. Sie können vorausgewählte Optionen wählen oder eigene Angaben tätigen.
-                    **Vorauswahl der Emissionsdaten:**
-                    Wählen Sie ein vordefiniertes Szenario aus, um die Standardwerte für die Emissionsdaten automatisch auszufüllen. Diese Werte sind anpassbar.""")
-
-
-        transport_modes = ["MIV (Fahrer)", "MIV (Mitfahrer)", "(Nahlinien-)Bus", "Straßen-/Stadt-/U-Bahn", "Schienen(nah)verkehr/Bahn/Zug", "Motorrad", "E-Bike/Pedelec/E-Lastenrad", "Fahrrad/Lastenrad", "zu Fuß", "Sonstiges"]
-
-        mode_to_key = {
-            "MIV (Fahrer)": "miv_fahrer",
-            "MIV (Mitfahrer)": "miv_mitfahrer",
-            "(Nahlinien-)Bus": "nahlinien_bus",
-            "Straßen-/Stadt-/U-Bahn": "strassen_stadt_u_bahn",
-            "Schienen(nah)verkehr/Bahn/Zug": "schienen_nah_verkehr_bahn_zug",
-            "Motorrad": "motorrad",
-            "E-Bike/Pedelec/E-Lastenrad": "e_bike_pedelec_e_lastenrad",
-            "Fahrrad/Lastenrad": "fahrrad_lastenrad",
-            "zu Fuß": "zu_fuss",
-            "Sonstiges": "sonstiges"
-        }
-
-        # Vorauswahl der Emissionsdaten
-        vorauswahl_emissionsdaten_optionen = ["Umweltbundesamt, Umweltfreundlich mobil! (2022)", "Eigene Angaben"]
-        selected_vorauswahl_emissionsdaten = st.selectbox("Vorauswahl der Emissionsdaten:", vorauswahl_emissionsdaten_optionen)
-
-        # Definieren der Standardemissionswerte basierend auf der Vorauswahl
-        if selected_vorauswahl_emissionsdaten == "Umweltbundesamt, Umweltfreundlich mobil! (2022)":
-            emissionsdaten_defaults = {
-                "miv_fahrer": 152.86,
-                "miv_mitfahrer": 152.86,
-                "nahlinien_bus": 80.54,
-                "strassen_stadt_u_bahn": 58.79,
-                "schienen_nah_verkehr_bahn_zug": 58.79,
-                "motorrad": 90.0,
-                "e_bike_pedelec_e_lastenrad": 3.9,
-                "fahrrad_lastenrad": 0.0,
-                "zu_fuss": 0.0,
-                "sonstiges": 0.0
-            }
-        else:
-            emissionsdaten_defaults = {key: 0 for key in mode_to_key.values()}
-
-        for mode in transport_modes:
-            key = mode_to_key[mode]
-            emission = st.number_input(
-                f"Annahmen Emissionsdaten {mode} [gCO2eq/pkm]:", 
-                min_value=0.0, 
-                value=round(float(emissionsdaten_defaults.get(key, 0)), 2),  # Round the default value
-                format="%.2f",  # Limit the display to 2 decimal places
-                step=0.01
-            )
-            st.session_state[f'emission_{key}'] = round(emission, 2)  # Round the input value to 2 decimal places
-
-        # Direkte Berechnung und Anzeige der Emissionen pro Verkehrsmittel
-        
-        for mode in transport_modes:
-            key = mode_to_key[mode]
-            personenkilometer = st.session_state.get(f'personenkilometer_{key}', 0)
-            emission = st.session_state.get(f'emission_{key}', 0)
-            emissionen_av = round(personenkilometer * emission / 1000, 2)  # Umrechnung von gCO2eq in kg CO2eq
-            col1, col2 = st.columns([3, 1])
-            with col1:
-                st.write(f"**Emissionen für {mode}:**")
-            with col2:
-                st.write(f"**{emissionen_av} kg CO2eq**")
-
-        # Berechnung und Speicherung der Gesamtemissionen für alternative Verkehrsmittel
-        gesamtemissionen_av = round(sum(
-            st.session_state.get(f'personenkilometer_{mode_to_key[mode]}', 0) *
-            st.session_state.get(f'emission_{mode_to_key[mode]}', 0) / 1000
-            for mode in transport_modes
-        ), 2)
-        st.session_state['gesamtemissionen_av'] = gesamtemissionen_av
-        
-        col1, col2 = st.columns([3, 1])
-        with col1:
-            st.write("**Gesamtemissionen für Referenzmobilität im Bediengebiet (alternativ genutzte Verkehrsmittel):**")
-        with col2:
-            st.write(f"**{gesamtemissionen_av} kg CO2eq**")
-
-        #Berechnen der Personenkilometer für alternative Verkehrsmittel
-        personenkilometer_gesamt_av = round(sum(
-            st.session_state.get(f'personenkilometer_{mode_to_key[mode]}', 0)
-            for mode in transport_modes
-        ), 2)
-        st.session_state['personenkilometer_gesamt_av'] = personenkilometer_gesamt_av
-
-
-    # 8. Registerkarte: Berechnung der Umweltwirkung alternativer Verkehrsmittel
-    with st.expander("**9. Berechnung der Umweltwirkung der Referenzmobilität im Bediengebiet**"):
-        st.info("""**Hinweis:** Im Folgenden wird die Umweltwirkung der Referenzmobiltät im Raum anhand des Modal Split (Wege) dargestellt. In der Abbildung wird der spezifische CO2-Ausstoß pro Pkm der zunächst alternativ genutzten Verkehrsmittel gegenübergestellt.""")
-        
-        # Überprüfen, ob alle erforderlichen Werte vorhanden sind, bevor Sie fortfahren
-        required_keys = ['gesamtemissionen_av', 'personenkilometer_gesamt_av']
-        if all(key in st.session_state for key in required_keys):
-            gesamtemissionen_av = st.session_state['gesamtemissionen_av']
-            personenkilometer_gesamt_av = st.session_state['personenkilometer_gesamt_av']
-
-            # Berechnung der Emissionen pro Personenkilometer
-            emissionen_pro_personenkilometer_av = gesamtemissionen_av / personenkilometer_gesamt_av if personenkilometer_gesamt_av > 0 else 0
-
-            # Speichere die berechneten Werte im Sitzungszustand
-            st.session_state['emissionen_pro_personenkilometer_av'] = emissionen_pro_personenkilometer_av
-
-            emissionen_data = {
-                'THG-Bilanz Referenzmobilität im Bediengebiet': emissionen_pro_personenkilometer_av * 1000,
-                'Pkw - MIV (Fahrer) & MIV (Mitfahrer)': 152.86,
-                '(Nahlinien-)Bus': 80.54,
-                'Straßen-/Stadt-/U-Bahn': 59.30,
-                'Schienen(nah)verkehr/Bahn/Zug': 58.79,
-                'Motorrad': 173.3,
-                'E-Bike/Pedelec/E-Lastenrad': 3.9,
-                'Fahrrad/Lastenrad': 0.0,
-                'Zu Fuß': 0.0
-            }
-
-            # Diagramm erstellen
-            fig = go.Figure()
-            for verkehrsmittel, emissionen in emissionen_data.items():
-                fig.add_trace(go.Bar(name=verkehrsmittel, x=[verkehrsmittel], y=[emissionen], marker_line_color='rgb(0,0,0)', marker_line_width=1.5, opacity=0.7))
-            fig.update_layout(
-                barmode='group',
-                title='Gegenüberstellung der Emissionen pro Personenkilometer nach Verkehrsmittel - Well-to-Wheel (WTW)*',
-                legend=dict(
-                    orientation="v",  # vertikale Anordnung
-                    y=0.6,  # Positionierung der Legende
-                    x=1.02,  # Legende rechts vom Diagramm
-                    xanchor='left',
-                    yanchor='top'
-                ),
-                width=650,
-                height=650,
-                yaxis_title='Emissionen [kg CO2/pkm]',
-                xaxis_tickangle=-45
-            )
-            st.plotly_chart(fig)
-
-            col1, col2 = st.columns([3, 1])
-            with col1:
-                st.write("**Gesamte Well-to-Wheel CO2e-Emissionen der Referenzmobilität im Bedieengebiet:**")
-            with col2:
-                st.write(f"**{gesamtemissionen_av} kg CO2**")
-
-            col1, col2 = st.columns([3, 1])
-            with col1:
-                st.write("**CO2e-Emissionen der Referenzmobilität im Bediengebiet (alternativ genutzter Verkehrsmittel) pro Personenkilometer:**")
-            with col2:
-                st.write(f"**{emissionen_pro_personenkilometer_av:.3f} kg CO2/pkm**")
-
-        else:
-            st.error("Bitte stellen Sie sicher, dass alle erforderlichen Daten vorhanden sind, um die THG-Bilanz der Referenzmobilität im Bediengebiet zu berechnen.")
-
-    
-    st.subheader("Vergleich der spezifischen CO2-Emissionen pro Personenkilometer für das Ridepooling-System und Referenzmobilität im Bediengebiet")
-    with st.expander("**10. Vergleich**"):
-        st.info("""**Hinweis:** Im Folgenden wird der spezifische CO2-Ausstoß pro Personenkilometer des Ridepooling-Systems mit dem der Referenzmobilität im Bediengebiet.""")
-
-        # Überprüfen, ob alle erforderlichen Werte vorhanden sind, bevor Sie fortfahren
-        required_keys = ['co2_emissionen_pro_personenkilometer_rps', 'emissionen_pro_personenkilometer_av', 'gesamtemissionen_av', 'co2_emissionen_gesamt_rps']
-
-        if all(key in st.session_state for key in required_keys):
-            co2_emissionen_pro_personenkilometer_rps = st.session_state['co2_emissionen_pro_personenkilometer_rps']
-            emissionen_pro_personenkilometer_av = st.session_state['emissionen_pro_personenkilometer_av']
-
-            # Erstellung des Diagramms
-            emissionen_data = {
-                st.session_state['name_ridepooling_system']: co2_emissionen_pro_personenkilometer_rps * 1000,
-                'Referenzmobilität im Bediengebiet': emissionen_pro_personenkilometer_av * 1000
-            }
-
-            fig2 = go.Figure()
-            for verkehrsmittel, emissionen in emissionen_data.items():
-                fig2.add_trace(go.Bar(name=verkehrsmittel, x=[verkehrsmittel], y=[emissionen], marker_line_color='rgb(0,0,0)', marker_line_width=1.5, opacity=0.7))
-            fig2.update_layout(
-                barmode='group',
-                title='Gegenüberstellung der spezifischen CO2-Emissionen pro Personenkilometer - Well-to-Wheel (WTW)*',
-                legend=dict(
-                    orientation="v",  # vertikale Anordnung
-                    y=0.6,  # Positionierung der Legende
-                    x=1.02,  # Legende rechts vom Diagramm
-                    xanchor='left',
-                    yanchor='top'
-                ),
-                width=650,
-                height=650,
-                yaxis_title='Emissionen [g CO2/pkm]',
-                xaxis_tickangle=-45
-            )
-            st.plotly_chart(fig2)
-
-            #Get co2_emissionen_gesamt_rps, start_date, end_date, gesamtemissionen_av, und runde auf 2 Dezimalstellen
-            co2_emissionen_gesamt_rps = round(st.session_state['co2_emissionen_gesamt_rps'], 2)
-            gesamtemissionen_av = st.session_state['gesamtemissionen_av']
-            start_date = st.session_state['start_date']
-            end_date = st.session_state['end_date']
-
-            # Erstellung eines Textfeldes, in welchem die spezifischen CO2-Emissionen pro Personenkilometer des Ridepooling-Systems und der alternativ genutzten Verkehrsmittel verglichen werden
-            col1, col2 = st.columns([3, 1])
-            with col1:
-                st.write("**Gesamte CO2-Emissionen des Ridepooling-Systems:**")
-            with col2:
-                st.write(f"**{co2_emissionen_gesamt_rps:.2f} kg CO2**")
-
-            col1, col2 = st.columns([3, 1])
-            with col1:
-                st.write("**CO2-Emissionen des Ridepooling-Systems pro Personenkilometer:**")
-            with col2:
-                st.write(f"**{co2_emissionen_pro_personenkilometer_rps:.3f} kg CO2/pkm**")
-            
-            col1, col2 = st.columns([3, 1])
-            with col1:
-                st.write("**Gesamte CO2-Emissionen der Referenzmobilität im Bediengebiet (alternativ genutzter Verkehrsmittel):**")
-            with col2:
-                st.write(f"**{gesamtemissionen_av} kg CO2**")
-
-            col1, col2 = st.columns([3, 1])
-            with col1:
-                st.write("**CO2-Emissionen der Referenzmobilität im Bediengebiet (alternativ genutzter Verkehrsmittel) pro Personenkilometer:**")
-            with col2:
-                st.write(f"**{emissionen_pro_personenkilometer_av:.3f} kg CO2/pkm**")
-                         
-            # Erstelle ein Textfeld, in welchem je nach Ausgang des Vergleichs eine entsprechende Meldung ausgegeben wird
-            if emissionen_pro_personenkilometer_av != 0:
-                if co2_emissionen_pro_personenkilometer_rps < emissionen_pro_personenkilometer_av:
-                    percentage_difference = round((emissionen_pro_personenkilometer_av - co2_emissionen_pro_personenkilometer_rps) / emissionen_pro_personenkilometer_av * 100, 2)
-                    total_difference = round((gesamtemissionen_av - co2_emissionen_gesamt_rps), 2)
-                    st.success(f"Das Ridepooling-System weist im Vergleich zu der Referenzmobilität im Bediengebiet eine geringere spezifische CO2-Emission pro Personenkilometer auf. Die spezifische CO2-Emission pro Personenkilometer des Ridepooling-Systems ist um {percentage_difference} % niedriger als die der Referenzmobilität im Betriebsgebiet. Die Gesamtemissionen des Ridepoolings betragen {co2_emissionen_gesamt_rps} kg CO2, was im Betrachtungszeitraum ({start_date} bis {end_date}) zu einer Einsparung von {total_difference} kg CO2 im Vergleich der Referenzmobilität im Bediengebiet entspricht.")
-                elif co2_emissionen_pro_personenkilometer_rps > emissionen_pro_personenkilometer_av:
-                    percentage_difference = round((co2_emissionen_pro_personenkilometer_rps - emissionen_pro_personenkilometer_av) / emissionen_pro_personenkilometer_av * 100, 2)
-                    total_difference = round((co2_emissionen_gesamt_rps - gesamtemissionen_av), 2)
-                    st.error(f"Das Ridepooling-System weist im Vergleich zu der Referenzmobilität im Bediengebiet eine höhere spezifische CO2-Emission pro Personenkilometer auf. Die spezifische CO2-Emission pro Personenkilometer des Ridepooling-Systems ist um {percentage_difference} % höher als die der Referenzmobilität im Betriebsgebiet. Die Gesamtemissionen des Ridepoolings betragen {co2_emissionen_gesamt_rps} kg CO2, was im Betrachtungszeitraum ({start_date} bis {end_date}) zu einer Erhöhung von {total_difference} kg CO2 im Vergleich der Referenzmobilität im Bediengebiet entspricht.")
-                else:
-                    st.warning("Das Ridepooling-System und die Referenzmobilität im Bediengebiet weisen die gleiche spezifische CO2-Emission pro Personenkilometer auf.")
-        else:
-            st.error("Bitte stellen Sie sicher, dass alle erforderlichen Daten vorhanden sind, um den Vergleich der spezifischen CO2-Emissionen pro Personenkilometer durchzuführen.")
-
-    # Erstelle ein Textfeld, in welchem je nach Ausgang des Vergleichs eine entsprechende Meldung ausgegeben wird
-
-    with st.expander("**11. Export der Eingabedaten und Ergebnisse**"):
-        # Stellen Sie sicher, dass alle erforderlichen Werte vorhanden sind, bevor Sie fortfahren
-        required_keys = [
-            'name_ridepooling_system', 'start_date', 'end_date', 'abgeschlossene_buchungen',
-            'transportierte_fahrgaeste', 'vehicle_list', 'fahrzeugkilometer_leer', 'fahrzeugkilometer_besetzt',
-            'fahrzeugkilometer_gesamt', 'durchschnittliche_fahrtdistanz_mit_lk', "durchschnittliche_fahrtdistanz_mit_bk",
-            'personenkilometer_gefahren', 'benzinverbrauch_gesamt', 'dieselverbrauch_gesamt', 'stromverbrauch_gesamt',
-            'oekostrom_anteil', 'benzin_emissionsdaten', 'diesel_emissionsdaten', 'strom_emissionsdaten',
-            'co2_emissionen_gesamt_rps', 'co2_emissionen_pro_personenkilometer_rps', 'personenkilometer_gesamt_av',
-            'gesamtemissionen_av', 'emissionen_pro_personenkilometer_av', 'entries_modal_split'
-        ]
-        missing_keys = [key for key in required_keys if key not in st.session_state]
-        if missing_keys:
-            st.error(f"Die folgenden Schlüssel fehlen: {', '.join(missing_keys)}")
-        else:
-            st.write("Die Eingabedaten und Ergebnisse können als CSV-Datei exportiert werden.")
-            if st.button("Exportieren"):
-                # Erstellen eines DataFrames mit den Eingabedaten und Ergebnissen des Ridepooling-Systems
-                data_rps = {
-                    "Merkmal": ["Wert"],
-                    "Ridepooling-System": [st.session_state['name_ridepooling_system']],
-                    "Betrachtungszeitraum (Start)": [f"{st.session_state['start_date']}"],
-                    "Betrachtungszeitraum (Ende)": [f"{st.session_state['end_date']}"],
-                    "Anzahl abgeschlossener Buchungen": [st.session_state['abgeschlossene_buchungen']],
-                    "Transportierte Fahrgäste": [st.session_state['transportierte_fahrgaeste']],
-                    "Flotte - Fahrzeugkilometer (leer)": [st.session_state['fahrzeugkilometer_leer']],
-                    "Flotte - Fahrzeugkilometer (besetzt)": [st.session_state['fahrzeugkilometer_besetzt']],
-                    "Flotte - Fahrzeugkilometer (gesamt)": [st.session_state['fahrzeugkilometer_gesamt']],
-                    "Flotte - Personenkilometer (gefahren)": [st.session_state['personenkilometer_gefahren']],
-                    "Durchschnittliche Fahrtdistanz (mit Fahrgast)": [st.session_state['durchschnittliche_fahrtdistanz_mit_bk']],
-                    "Durchschnittliche Fahrtdistanz (ohne Fahrgast)": [st.session_state['durchschnittliche_fahrtdistanz_mit_lk']],
-                    "Flotte - Benzinverbrauch (gesamt)": [st.session_state['benzinverbrauch_gesamt']],
-                    "Flotte - Dieselverbrauch (gesamt)": [st.session_state['dieselverbrauch_gesamt']],
-                    "Flotte - Stromverbrauch (gesamt)": [st.session_state['stromverbrauch_gesamt']],
-                    "Ökostromanteil (%)": [st.session_state['oekostrom_anteil']],
-                    "CO2-Emissionsdaten (Benzin)": [st.session_state['benzin_emissionsdaten']],
-                    "CO2-Emissionsdaten (Diesel)": [st.session_state['diesel_emissionsdaten']],
-                    "CO2-Emissionsdaten (Strom)": [st.session_state['strom_emissionsdaten']],
-                    "CO2-Emissionen (gesamt)": [st.session_state['co2_emissionen_gesamt_rps']],
-                    "CO2-Emissionen pro Personenkilometer": [st.session_state['co2_emissionen_pro_personenkilometer_rps']]
-                }
-
-                df_rps = pd.DataFrame(data_rps).transpose()
-                df_rps.columns = df_rps.iloc[0]
-                df_rps = df_rps[1:]
-
-                # Erstellen eines DataFrames mit den Fahrzeugdaten
-                if 'vehicle_list' in st.session_state and st.session_state['vehicle_list']:
-                    vehicle_data = {
-                        "Fahrzeugtyp": [],
-                        "Benzinverbrauch (l/100km)": [],
-                        "Dieselverbrauch (l/100km)": [],
-                        "Stromverbrauch (kWh/100km)": [],
-                        "Kilometer leer": [],
-                        "Kilometer besetzt": []
-                    }
-                    for vehicle in st.session_state['vehicle_list']:
-                        if isinstance(vehicle, dict) and all(key in vehicle for key in ['Fahrzeugtyp', 'Kilometer leer', 'Kilometer besetzt']):
-                            vehicle_data["Fahrzeugtyp"].append(vehicle['Fahrzeugtyp'])
-                            vehicle_data["Benzinverbrauch (l/100km)"].append(vehicle['Benzinverbrauch (l/100km)'])
-                            vehicle_data["Dieselverbrauch (l/100km)"].append(vehicle['Dieselverbrauch (l/100km)'])
-                            vehicle_data["Stromverbrauch (kWh/100km)"].append(vehicle['Stromverbrauch (kWh/100km)'])
-                            vehicle_data["Kilometer leer"].append(vehicle['Kilometer leer'])
-                            vehicle_data["Kilometer besetzt"].append(vehicle['Kilometer besetzt'])
-
-                    df_vehicles = pd.DataFrame(vehicle_data)
-                else:
-                    st.error("No vehicles in the session state or 'vehicle_list' is not set.")
-                    df_vehicles = pd.DataFrame()
-
-                # Erstellen eines DataFrames mit den Emissionsdaten der alternativ genutzten Verkehrsmittel, Modal Split, Emissions
-                mode_to_key = {
-                    "MIV (Fahrer)": "miv_fahrer",
-                    "MIV (Mitfahrer)": "miv_mitfahrer",
-                    "(Nahlinien-)Bus": "nahlinien_bus",
-                    "Straßen-/Stadt-/U-Bahn": "strassen_stadt_u_bahn",
-                    "Schienen(nah)verkehr/Bahn/Zug": "schienen_nah_verkehr_bahn_zug",
-                    "Motorrad": "motorrad",
-                    "E-Bike/Pedelec/E-Lastenrad": "e_bike_pedelec_e_lastenrad",
-                    "Fahrrad/Lastenrad": "fahrrad_lastenrad",
-                    "zu Fuß": "zu_fuss",
-                    "Sonstiges": "sonstiges"
-                }
-
-                data_av = {
-                    "Merkmal": ["Wert"],
-                    "Gesamtemissionen Referenzmobilität im Bediengebiet (alternativ genutzte Verkehrsmittel) (kg CO2eq)": [st.session_state['gesamtemissionen_av']],
-                    "Personenkilometer Referenzmobilität im Bediengebiet (alternativ genutzte Verkehrsmittel) (pkm)": [st.session_state['personenkilometer_gesamt_av']],
-                    "CO2-Emissionen pro Personenkilometer der Referenzmobilität im Bediengebiet (alternativ genutzte Verkehrsmittel)(g CO2eq/pkm)": [st.session_state['emissionen_pro_personenkilometer_av']]
-                }
-
-                # Hinzufügen der Modal Split Daten
-                for verkehrsmittel, anteil in st.session_state['entries_modal_split'].items():
-                    key = mode_to_key.get(verkehrsmittel, verkehrsmittel)
-                    data_av[f"Modal Split Anteil für {verkehrsmittel} (%)"] = [anteil]
-
-                # Hinzufügen der Wegehäufigkeit, Durchschnittliche Fahrtdistanz, Personenkilometer und Emissionsdaten für alternative Verkehrsmittel
-                for mode in st.session_state['entries_modal_split']:
-                    key = mode_to_key.get(mode, mode)
-                    personenkilometer = st.session_state.get(f'personenkilometer_{key}', 0)
-                    durchschnittliche_fahrtdistanz = st.session_state.get(f'entfernung_{key}', 0)
-                    emissionsdaten = st.session_state.get(f'emission_{key}', 0)
-                    data_av[f"Wegehäufigkeit für {mode} (Personenkilometer)"] = [personenkilometer]
-                    data_av[f"Durchschnittliche Fahrtdistanz für {mode} (km)"] = [durchschnittliche_fahrtdistanz]
-                    data_av[f"Emissionsdaten für {mode} (g CO2eq/pkm)"] = [emissionsdaten]
-
-                df_av = pd.DataFrame(data_av).transpose()
-                df_av.columns = df_av.iloc[0]
-                df_av = df_av[1:]
-
-                # Zusammenführen der DataFrames
-                df_combined = pd.concat([df_rps, df_vehicles, df_av], axis=0)
-                df_combined = df_combined.replace('', np.nan)
-                st.write(df_combined)
-
-                # Export als CSV-Datei
-                csv = df_combined.to_csv(index=True)
-                st.download_button(label="CSV-Datei herunterladen", data=csv, file_name='eingabedaten_und_ergebnisse.csv', mime='text/csv')
-
-
-#########################################################################################
-# Modal Split (Pkm)
-
-
-mode_to_key_pkm = {
-    "MIV (Fahrer)": "miv_fahrer",
-    "MIV (Mitfahrer)": "miv_mitfahrer",
-    "(Nahlinien-)Bus": "nahlinien_bus",
-    "Straßen-/Stadt-/U-Bahn": "strassen_stadt_u_bahn",
-    "Schienen(nah)verkehr/Bahn/Zug": "schienen_nah_verkehr_bahn_zug",
-    "Motorrad": "motorrad",
-    "E-Bike/Pedelec/E-Lastenrad": "e_bike_pedelec_e_lastenrad",
-    "Fahrrad/Lastenrad": "fahrrad_lastenrad",
-    "zu Fuß": "zu_fuss",
-    "Sonstiges": "sonstiges"
-}
-
-# Sollte Button "Modal Split (Pkm)" ausgewählt sein, dann zeige folgende Expander an
-if 'methodik' in st.session_state and st.session_state['methodik'] == "Modal Split (Pkm)":
-    with st.expander("**6. Verkehrsmittelverteilung der Referenzmobilität im Bediengebiet (alternativ genutzte Verkehrsmittel)**"):
-        st.info("""**Hinweis:** Bitte geben Sie die Annahmen für die Modal-Split-Verteilung (Personenkilometer) der Fahrgäste an.
-                    **Vorauswahl des Modal Split (Personenkilometer):**
-    Wählen Sie ein vordefiniertes Szenario aus, um die Standardwerte für die Modal-Split-Verteilung automatisch auszufüllen. Diese Werte sind anpassbar.
-        """)
-        # Dropdown-Menü für Modal-Split-Optionen
-        modal_split_options_pkm = {
-            "Eigene Angaben Modal Split (Personenkilometer)": [0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-            "Modal Split (Personenkilometer) MiD 2017": [77, 0, 2, 4, 10, 0, 1, 3, 3, 0],
-            "Modal Split (Personenkilometer) Essen (2019)": [61, 7, 7.3, 9.7, 6, 0, 0, 4, 5, 0],
-            "Modal Split (Personenkilometer) Münster (2022)": [43, 5, 19, 0, 6, 0, 6, 17, 3, 1]
-        }
-        selected_modal_split_pkm = st.selectbox("Vorauswahl Modal Split (Optional):", list(modal_split_options_pkm.keys()))
-
-        # Speichern der globalen Variablen
-        st.session_state['selected_modal_split'] = selected_modal_split_pkm
-
-        # Anzeigen der Anteile basierend auf der ausgewählten Vorauswahl
-        default_values = modal_split_options_pkm[selected_modal_split_pkm]
-
-        # Eingabefelder für die Anteile
-        transport_modes_pkm = ["MIV (Fahrer)", "MIV (Mitfahrer)", "(Nahlinien-)Bus", "Straßen-/Stadt-/U-Bahn", "Schienen(nah)verkehr/Bahn/Zug", "Motorrad", "E-Bike/Pedelec/E-Lastenrad", "Fahrrad/Lastenrad", "zu Fuß", "Sonstiges"]
-
-        entries_modal_split_pkm = {}
-
-        for i, mode in enumerate(transport_modes_pkm):
-            entries_modal_split_pkm[mode] = st.number_input(f"Anteil der Fahrgäste, die {mode} genutzt hätten (%):",
-                                            min_value=0.0, max_value=100.0,
-                                            value=float(default_values[i]), step=0.1,  format="%f")
-
-        # Überprüfung der Gesamtsumme der eingegebenen Werte
-        total_percentage = sum(entries_modal_split_pkm.values())
-
-        if total_percentage > 100:
-            st.error("Die Summe der Modal-Split-Anteile überschreitet 100%.")
-        elif total_percentage < 100:
-            st.warning("Die Summe der Modal-Split-Anteile liegt unter 100%.")
-
-        # Speichern der globalen Variablen
-        st.session_state['entries_modal_split'] = entries_modal_split_pkm
-
-        st.write("**Berechnung der Personenkilometer der Referenzmobilität im Bediengebiet (alternativ genutzte Verkehrsmittel)**")
-        st.info("**Hinweis:** Um die Anzahl der Personenkilometer der alternativen Verkehrsmittel zu berechnen, werden die mit dem Ridepooling zurückgelegten Personenkilometer mit dem entsprechenden Modal-Split-Anteil (Personenkilometer) multipliziert.")
-
-        if 'personenkilometer_gefahren' in st.session_state and 'entries_modal_split' in st.session_state:
-            personenkilometer_gefahren = int(st.session_state['personenkilometer_gefahren'])
-            st.write(f"Von den zurückgelegten **{personenkilometer_gefahren}** Personenkilometer des Ridepooling-Systems würden entsprechend viele auf folgende alternativ genutzte Verkehrsmittel entfallen:")
-            entries_modal_split_pkm = st.session_state['entries_modal_split']
-
-            berechnete_werte = {}
-            for verkehrsmittel, anteil in entries_modal_split_pkm.items():
-                berechneter_wert = personenkilometer_gefahren * anteil / 100
-                berechnete_werte[mode_to_key_pkm[verkehrsmittel]] = berechneter_wert
-                col1, col2 = st.columns([3, 1])
-                with col1:
-                    st.write(f"**{verkehrsmittel}:**")
-                with col2:
-                    st.write(f"**{berechneter_wert:.1f} Pkm**")
-
-            st.session_state['berechnete_werte'] = berechnete_werte
-
-            # Berechnung der Gesamtpersonenkilometer für alternative Verkehrsmittel
-            personenkilometer_gesamt_av_pkm = round(sum(berechnete_werte.values()), 0)
-            col1, col2 = st.columns([3, 1])
-
-            with col1:
-                st.write("**Gesamte Personenkilometer der Referenzmobilität im Bediengebiet (alternativ genutzte Verkehrsmittel):**")
-            with col2:
-                st.write(f"**{personenkilometer_gesamt_av_pkm:.1f} Pkm**")
-
-            # Speichern der globalen Variablen
-            st.session_state['personenkilometer_gesamt_av_pkm'] = personenkilometer_gesamt_av_pkm
-
-        else:
-            st.warning("Bitte stellen Sie sicher, dass die Personenkilometer gefahren und die Modal-Split-Annahmen festgelegt wurden.")
-
-    with st.expander("**7. Emissionsdaten alternativ genutzter Verkehrsmittel (Nutzung [TTW] und Energie [WTT])**"):
-        st.info("""**Hinweis:** Bitte geben Sie die CO2-Emissionsdaten für die alternativ genutzten Verkehrsmittel an. Sie können vorausgewählte Optionen wählen oder eigene Angaben tätigen.
-                    **Vorauswahl der Emissionsdaten:**
-                    Wählen Sie ein vordefiniertes Szenario aus, um die Standardwerte für die Emissionsdaten automatisch auszufüllen. Diese Werte sind anpassbar.""")
-
-        # Vorauswahl der Emissionsdaten
-        vorauswahl_emissionsdaten_optionen_pkm = ["Umweltbundesamt, Umweltfreundlich mobil! (2022)", "Eigene Angaben"]
-        selected_vorauswahl_emissionsdaten_pkm = st.selectbox("Vorauswahl der Emissionsdaten:", vorauswahl_emissionsdaten_optionen_pkm)
-
-        # Definieren der Standardemissionswerte basierend auf der Vorauswahl
-        if selected_vorauswahl_emissionsdaten_pkm == "Umweltbundesamt, Umweltfreundlich mobil! (2022)":
-            emissionsdaten_defaults_pkm = {
-                "miv_fahrer": 152.86,
-                "miv_mitfahrer": 152.86,
-                "nahlinien_bus": 80.54,
-                "strassen_stadt_u_bahn": 58.79,
-                "schienen_nah_verkehr_bahn_zug": 58.79,
-                "motorrad": 90.0,
-                "e_bike_pedelec_e_lastenrad": 3.9,
-                "fahrrad_lastenrad": 0.0,
-                "zu_fuss": 0.0,
-                "sonstiges": 0.0
-            }
-        else:
-            emissionsdaten_defaults_pkm = {key: 0 for key in mode_to_key_pkm.values()}
-
-        # Eingabefelder für die Emissionsdaten
-        for mode in transport_modes_pkm:
-            key = mode_to_key_pkm[mode]
-            emission = st.number_input(f"Annahmen Emissionsdaten {mode} [gCO2eq/pkm]:", min_value=0.0, value=float(emissionsdaten_defaults_pkm.get(key, 0)), format='%f')
-            st.session_state[f'emission_{key}'] = emission
-
-        st.write("**Berechnung der Emissionen der Referenzmobilität im Bediengebiet (alternativ genutzte Verkehrsmittel):**")
-        st.info("**Hinweis:** Die Emissionen für die Referenzmobilität im Bediengebiet (alternativ genutzte Verkehrsmittel) werden anhand der Personenkilometer berechnet. Die Formel zur Berechnung der Emissionen lautet: Emissionen = Personenkilometer * Emissionsfaktoren.")
-
-        st.write("Die Emissionsfaktoren für die alternativ genutzten Verkehrsmittel betragen:")
-        for mode in transport_modes_pkm:
-            key = mode_to_key_pkm[mode]
-            personenkilometer = st.session_state.get(f'berechnete_werte', {}).get(key, 0)
-            emission = st.session_state.get(f'emission_{key}', 0)
-            emissionen_av_pkm = round(personenkilometer * emission / 1000, 2)
-
-            col1, col2 = st.columns([3, 1])
-            with col1:
-                st.write(f"**Emissionen für {mode}:**")
-            with col2:
-                st.write(f"**{emissionen_av_pkm} kg CO2eq**")
-
-        # Berechnung und Speicherung der Gesamtemissionen für alternative Verkehrsmittel
-        gesamtemissionen_av_pkm = round(sum(
-            st.session_state.get(f'berechnete_werte', {}).get(mode_to_key_pkm[mode], 0) *
-            st.session_state.get(f'emission_{mode_to_key_pkm[mode]}', 0) / 1000
-            for mode in transport_modes_pkm
-        ), 2)
-        st.session_state['gesamtemissionen_av_pkm'] = gesamtemissionen_av_pkm
-
-        col1, col2 = st.columns([3, 1])
-        with col1:
-            st.write("**Gesamtemissionen der Referenzmobilität im Bediengebiet (alternativ genutzte Verkehrsmittel):**")
-        with col2:
-            st.write(f"**{gesamtemissionen_av_pkm} kg CO2eq**")
-
-        #Speichere gesamtemissionen_av_pkm in globalen Variablen
-        st.session_state['gesamtemissionen_av_pkm'] = gesamtemissionen_av_pkm
-
-        # Berechnen der Personenkilometer für alternative Verkehrsmittel
-        personenkilometer_gesamt_av_pkm = round(sum(
-            st.session_state.get(f'berechnete_werte', {}).get(mode_to_key_pkm[mode], 0)
-            for mode in transport_modes_pkm
-        ), 2)
-        st.session_state['personenkilometer_gesamt_av_pkm'] = personenkilometer_gesamt_av_pkm
-        #Speichere die globalen Variablen
-        st.session_state['emissionen_pro_personenkilometer_av_pkm'] = gesamtemissionen_av_pkm / personenkilometer_gesamt_av_pkm if personenkilometer_gesamt_av_pkm > 0 else 0
-
-    ### 7. Berechnung Umweltwirkung alternativer Verkehrsmittel
-    with st.expander("**8. Berechnung der THG-Bilanz der Referenzmobilität im Bediengebiet (alternativ genutzte Verkehrsmittel)**"):
-        st.info("**Hinweis:** Im Folgenden wird die Umweltwirkung der alternativ genutzten Verkehrsmittel anhand der Mobilitätslage im Raum (Modal Split Pkm) dargestellt. In der Abbildung wird der spezifische CO2-Ausstoß pro Pkm der Referenzmobilität im Bediengebiet (alternativ genutzte Verkehrsmittel) gegenübergestellt.")
-
-        #get co2_emissionen_pro_personenkilometer_rps
-        if 'co2_emissionen_pro_personenkilometer_rps' in st.session_state:
-            co2_emissionen_pro_personenkilometer_rps = st.session_state['co2_emissionen_pro_personenkilometer_rps']
-
-        # Überprüfen, ob alle erforderlichen Werte vorhanden sind, bevor Sie fortfahren
-        required_keys = ['co2_emissionen_pro_personenkilometer_rps', 'personenkilometer_gesamt_av_pkm', 'gesamtemissionen_av_pkm', 'emissionen_pro_personenkilometer_av_pkm']
-
-        if all(key in st.session_state for key in required_keys):
-            personenkilometer_gesamt_av_pkm = st.session_state['personenkilometer_gesamt_av_pkm']
-            gesamtemissionen_av_pkm = st.session_state['gesamtemissionen_av_pkm']
-            emissionen_pro_personenkilometer_av_pkm = st.session_state['emissionen_pro_personenkilometer_av_pkm']
-
-            emissionen_data = {
-                            'Alternative Verkehrsmittel': emissionen_pro_personenkilometer_av_pkm * 1000,
-                            'Pkw - MIV (Fahrer) & MIV (Mitfahrer)': 152.86,
-                            '(Nahlinien-)Bus': 80.54,
-                            'Straßen-/Stadt-/U-Bahn': 59.30,
-                            'Schienen(nah)verkehr/Bahn/Zug': 58.79,
-                            'Motorrad': 173.3,
-                            'E-Bike/Pedelec/E-Lastenrad': 3.9,
-                            'Fahrrad/Lastenrad': 0.0,
-                            'Zu Fuß': 0.0
-                        }
-
-            # Diagramm erstellen
-            fig3 = go.Figure()
-            for verkehrsmittel, emissionen in emissionen_data.items():
-                fig3.add_trace(go.Bar(name=verkehrsmittel, x=[verkehrsmittel], y=[emissionen], marker_line_color='rgb(0,0,0)', marker_line_width=1.5, opacity=0.7))
-            fig3.update_layout(
-                barmode='group',
-                title='Gegenüberstellung der Emissionen pro Personenkilometer nach Verkehrsmittel - Well-to-Wheel (WTW)*',
-                legend=dict(
-                    orientation="v",  # vertikale Anordnung
-                    y=0.6,  # Positionierung der Legende
-                    x=1.02,  # Legende rechts vom Diagramm
-                    xanchor='left',
-                    yanchor='top'
-                ),
-                width=650,
-                height=650,
-                yaxis_title='Emissionen [g CO2/pkm]',
-                xaxis_tickangle=-45
-            )
-            st.plotly_chart(fig3)
-
-            col1, col2 = st.columns([3, 1])
-            with col1:
-                st.write("**Gesamte CO2-Emissionen der Referenzmobilität im Bediengebiet (alternativ genutzte Verkehrsmittel):**")
-            with col2:
-                st.write(f"**{gesamtemissionen_av_pkm} kg CO2**")
-
-            col1, col2 = st.columns([3, 1])
-            with col1:
-                st.write("**CO2-Emissionen der Referenzmobilität im Bediengebiet (alternativ genutzte Verkehrsmittel) pro Personenkilometer:**")
-            with col2:
-                st.write(f"**{emissionen_pro_personenkilometer_av_pkm:.3f} g CO2/pkm**")
-
-        else:
-            st.error("Bitte stellen Sie sicher, dass alle erforderlichen Daten vorhanden sind, um den Vergleich der spezifischen CO2-Emissionen pro Personenkilometer durchzuführen.")
-            
-    #### 8. Vergleich
-    st.subheader("Vergleich der spezifischen CO2-Emissionen pro Personenkilometer für das Ridepooling-System und der Referenzmobilität im Bediengebiet (alternativ genutzte Verkehrsmittel)")
-    
-    # Zeige den Expander Inhalt an, wenn alle erforderlichen Werte vorhanden sind
-    with st.expander("**9. Vergleich**"):
-        st.info("""**Hinweis:** Im Folgenden wird der spezifische CO2-Ausstoß pro Personenkilometer des Ridepooling-Systems mit denen der Referenzmobilität im Bediengebiet (alternativ genutzte Verkehrsmittel) verglichen.""")
-        required_keys = ['co2_emissionen_pro_personenkilometer_rps', 'emissionen_pro_personenkilometer_av_pkm']
-
-        if all(key in st.session_state for key in required_keys):
-                co2_emissionen_pro_personenkilometer_rps = st.session_state['co2_emissionen_pro_personenkilometer_rps']
-                emissionen_pro_personenkilometer_av_pkm = st.session_state['emissionen_pro_personenkilometer_av_pkm']
-
-                # Erstellung des Diagramms
-                emissionen_data = {
-                    st.session_state['name_ridepooling_system']: co2_emissionen_pro_personenkilometer_rps * 1000,
-                    'Referenzmobilität im Bediengebiet (alternativ genutzte Verkehrsmittel)': emissionen_pro_personenkilometer_av_pkm * 1000
-                }
-
-                fig2 = go.Figure()
-                for verkehrsmittel, emissionen in emissionen_data.items():
-                    fig2.add_trace(go.Bar(name=verkehrsmittel, x=[verkehrsmittel], y=[emissionen], marker_line_color='rgb(0,0,0)', marker_line_width=1.5, opacity=0.7))
-                fig2.update_layout(
-                    barmode='group',
-                    title='Gegenüberstellung der spezifischen CO2-Emissionen pro Personenkilometer - Well-to-Wheel (WTW)*',
-                    legend=dict(
-                        orientation="v",  # vertikale Anordnung
-                        y=0.6,  # Positionierung der Legende
-                        x=1.02,  # Legende rechts vom Diagramm
-                        xanchor='left',
-                        yanchor='top'
-                    ),
-                    width=650,
-                    height=650,
-                    yaxis_title='Emissionen [g CO2/pkm]',
-                    xaxis_tickangle=-45
-                )
-                st.plotly_chart(fig2)
-
-                #Get co2_emissionen_gesamt_rps, start_date, end_date, gesamtemissionen_av, und runde auf 2 Dezimalstellen
-                co2_emissionen_gesamt_rps = round(st.session_state['co2_emissionen_gesamt_rps'], 2)
-                gesamtemissionen_av_pkm = st.session_state['gesamtemissionen_av_pkm']
-                start_date = st.session_state['start_date']
-                end_date = st.session_state['end_date']
-
-                # Erstellung eines Textfeldes, in welchem die spezifischen CO2-Emissionen pro Personenkilometer des Ridepooling-Systems und der alternativ genutzten Verkehrsmittel verglichen werden
-                col1, col2 = st.columns([3, 1])
-                with col1:
-                    st.write("**Gesamte CO2-Emissionen des Ridepooling-Systems:**")
-                with col2:
-                    st.write(f"**{co2_emissionen_gesamt_rps:.2f} kg CO2**")
-
-                col1, col2 = st.columns([3, 1])
-                with col1:
-                    st.write("**CO2-Emissionen des Ridepooling-Systems pro Personenkilometer:**")
-                with col2:
-                    st.write(f"**{co2_emissionen_pro_personenkilometer_rps:.3f} kg CO2/pkm**")
-                
-                col1, col2 = st.columns([3, 1])
-                with col1:
-                    st.write("**Gesamte CO2-Emissionen der Referenzmobilität im Bediengebiet (alternativ genutzte Verkehrsmittel):**")
-                with col2:
-                    st.write(f"**{gesamtemissionen_av_pkm} kg CO2**")
-
-                col1, col2 = st.columns([3, 1])
-                with col1:
-                    st.write("**CO2-Emissionen der Referenzmobilität im Bediengebiet (alternativ genutzte Verkehrsmittel) pro Personenkilometer:**")
-                with col2:
-                    st.write(f"**{emissionen_pro_personenkilometer_av_pkm:.3f} kg CO2/pkm**")
-                            
-                # Erstelle ein Textfeld, in welchem je nach Ausgang des Vergleichs eine entsprechende Meldung ausgegeben wird
-                if emissionen_pro_personenkilometer_av_pkm != 0:
-                    if co2_emissionen_pro_personenkilometer_rps < emissionen_pro_personenkilometer_av_pkm:
-                        percentage_difference = round((emissionen_pro_personenkilometer_av_pkm - co2_emissionen_pro_personenkilometer_rps) / emissionen_pro_personenkilometer_av_pkm * 100, 2)
-                        total_difference = round((gesamtemissionen_av_pkm - co2_emissionen_gesamt_rps), 2)
-                        st.success(f"Das Ridepooling-System weist im Vergleich zu der Referenzmobilität im Bediengebiet (alternativ genutzten Verkehrsmitteln) eine geringere spezifische CO2-Emission pro Personenkilometer auf. Die spezifische CO2-Emission pro Personenkilometer des Ridepooling-Systems ist um {percentage_difference} % niedriger als die der Referenzmobilität im Bediengebiet. Die Gesamtemissionen des Ridepoolings betragen {co2_emissionen_gesamt_rps} kg CO2, was im Betrachtungszeitraum ({start_date} bis {end_date}) zu einer Einsparung von {total_difference} kg CO2 im Vergleich zu der Referenzmobilität im Bediengebiet entspricht.")
-                    elif co2_emissionen_pro_personenkilometer_rps > emissionen_pro_personenkilometer_av_pkm:
-                        percentage_difference = round((co2_emissionen_pro_personenkilometer_rps - emissionen_pro_personenkilometer_av_pkm) / emissionen_pro_personenkilometer_av_pkm * 100, 2)
-                        total_difference = round((co2_emissionen_gesamt_rps - gesamtemissionen_av_pkm), 2)
-                        st.error(f"Das Ridepooling-System weist im Vergleich zu der Referenzmobilität im Bediengebiet (alternativ genutzten Verkehrsmitteln) eine höhere spezifische CO2-Emission pro Personenkilometer auf. Die spezifische CO2-Emission pro Personenkilometer des Ridepooling-Systems ist um {percentage_difference} % höher als die der Referenzmobilität im Bediengebiet. Die Gesamtemissionen des Ridepoolings betragen {co2_emissionen_gesamt_rps} kg CO2, was im Betrachtungszeitraum ({start_date} bis {end_date}) zu einer Erhöhung von {total_difference} kg CO2 im Vergleich zu derReferenzmobilität im Bediengebiet entspricht.")
-                    else:
-                        st.warning("Das Ridepooling-System und die Referenzmobilität im Bediengebiet (alternativ genutzte Verkehrsmittel) weisen die gleiche spezifische CO2-Emission pro Personenkilometer auf.")
-        else:
-            st.error("Bitte stellen Sie sicher, dass alle erforderlichen Daten vorhanden sind, um den Vergleich der spezifischen CO2-Emissionen pro Personenkilometer durchzuführen.")
-                
-    # Export
-    with st.expander("**10. Export der Eingabedaten und Ergebnisse**"):
-        st.info("**Hinweis:** Im Folgenden wird der spezifische CO2-Ausstoß pro Personenkilometer des Ridepooling-Systems mit denen der Referenzmobilität im Betriebsgebiet verglichen.")
-        # Stellen Sie sicher, dass alle erforderlichen Werte vorhanden sind, bevor Sie fortfahren
-        required_keys = [
-            'name_ridepooling_system', 'start_date', 'end_date', 'abgeschlossene_buchungen',
-            'transportierte_fahrgaeste', 'vehicle_list', 'fahrzeugkilometer_leer', 'fahrzeugkilometer_besetzt',
-            'fahrzeugkilometer_gesamt', 'durchschnittliche_fahrtdistanz_mit_lk', "durchschnittliche_fahrtdistanz_mit_bk",
-            'personenkilometer_gefahren', 'benzinverbrauch_gesamt', 'dieselverbrauch_gesamt', 'stromverbrauch_gesamt',
-            'oekostrom_anteil', 'benzin_emissionsdaten', 'diesel_emissionsdaten', 'strom_emissionsdaten',
-            'co2_emissionen_gesamt_rps', 'co2_emissionen_pro_personenkilometer_rps', 'personenkilometer_gesamt_av',
-            'gesamtemissionen_av', 'emissionen_pro_personenkilometer_av', 'entries_modal_split'
-        ]
-        missing_keys = [key for key in required_keys if key not in st.session_state]
-        if missing_keys:
-            st.error(f"Die folgenden Schlüssel fehlen: {', '.join(missing_keys)}")
-        else:
-            st.write("Die Eingabedaten und Ergebnisse können als CSV-Datei exportiert werden.")
-            if st.button("Exportieren"):
-                # Erstellen eines DataFrames mit den Eingabedaten und Ergebnissen des Ridepooling-Systems
-                data_rps = {
-                    "Merkmal": ["Wert"],
-                    "Ridepooling-System": [st.session_state['name_ridepooling_system']],
-                    "Betrachtungszeitraum (Start)": [f"{st.session_state['start_date']}"],
-                    "Betrachtungszeitraum (Ende)": [f"{st.session_state['end_date']}"],
-                    "Anzahl abgeschlossener Buchungen": [st.session_state['abgeschlossene_buchungen']],
-                    "Transportierte Fahrgäste": [st.session_state['transportierte_fahrgaeste']],
-                    "Flotte - Fahrzeugkilometer (leer)": [st.session_state['fahrzeugkilometer_leer']],
-                    "Flotte - Fahrzeugkilometer (besetzt)": [st.session_state['fahrzeugkilometer_besetzt']],
-                    "Flotte - Fahrzeugkilometer (gesamt)": [st.session_state['fahrzeugkilometer_gesamt']],
-                    "Durchschnittliche Fahrtdistanz (mit Fahrgast)": [st.session_state['durchschnittliche_fahrtdistanz_mit_bk']],
-                    "Durchschnittliche Fahrtdistanz (ohne Fahrgast)": [st.session_state['durchschnittliche_fahrtdistanz_mit_lk']],
-                    "Flotte - Benzinverbrauch (gesamt)": [st.session_state['benzinverbrauch_gesamt']],
-                    "Flotte - Dieselverbrauch (gesamt)": [st.session_state['dieselverbrauch_gesamt']],
-                    "Flotte - Stromverbrauch (gesamt)": [st.session_state['stromverbrauch_gesamt']],
-                    "Ökostromanteil (%)": [st.session_state['oekostrom_anteil']],
-                    "CO2-Emissionsdaten (Benzin)": [st.session_state['benzin_emissionsdaten']],
-                    "CO2-Emissionsdaten (Diesel)": [st.session_state['diesel_emissionsdaten']],
-                    "CO2-Emissionsdaten (Strom)": [st.session_state['strom_emissionsdaten']],
-                    "CO2-Emissionen (gesamt)": [st.session_state['co2_emissionen_gesamt_rps']],
-                    "CO2-Emissionen pro Personenkilometer": [st.session_state['co2_emissionen_pro_personenkilometer_rps']]
-                }
-
-                df_rps = pd.DataFrame(data_rps).transpose()
-                df_rps.columns = df_rps.iloc[0]
-                df_rps = df_rps[1:]
-
-                # Erstellen eines DataFrames mit den Fahrzeugdaten
-                if 'vehicle_list' in st.session_state and st.session_state['vehicle_list']:
-                    vehicle_data = {
-                        "Fahrzeugtyp": [],
-                        "Benzinverbrauch (l/100km)": [],
-                        "Dieselverbrauch (l/100km)": [],
-                        "Stromverbrauch (kWh/100km)": [],
-                        "Kilometer leer": [],
-                        "Kilometer besetzt": []
-                    }
-                    for vehicle in st.session_state['vehicle_list']:
-                        if isinstance(vehicle, dict) and all(key in vehicle for key in ['Fahrzeugtyp', 'Kilometer leer', 'Kilometer besetzt']):
-                            vehicle_data["Fahrzeugtyp"].append(vehicle['Fahrzeugtyp'])
-                            vehicle_data["Benzinverbrauch (l/100km)"].append(vehicle['Benzinverbrauch (l/100km)'])
-                            vehicle_data["Dieselverbrauch (l/100km)"].append(vehicle['Dieselverbrauch (l/100km)'])
-                            vehicle_data["Stromverbrauch (kWh/100km)"].append(vehicle['Stromverbrauch (kWh/100km)'])
-                            vehicle_data["Kilometer leer"].append(vehicle['Kilometer leer'])
-                            vehicle_data["Kilometer besetzt"].append(vehicle['Kilometer besetzt'])
-
-                    df_vehicles = pd.DataFrame(vehicle_data)
-                else:
-                    st.error("No vehicles in the session state or 'vehicle_list' is not set.")
-                    df_vehicles = pd.DataFrame()
-
-                # Erstellen eines DataFrames mit den Emissionsdaten der alternativ genutzten Verkehrsmittel, Modal Split, Emissions
-                mode_to_key_pkm = {
-                    "MIV (Fahrer)": "miv_fahrer",
-                    "MIV (Mitfahrer)": "miv_mitfahrer",
-                    "(Nahlinien-)Bus": "nahlinien_bus",
-                    "Straßen-/Stadt-/U-Bahn": "strassen_stadt_u_bahn",
-                    "Schienen(nah)verkehr/Bahn/Zug": "schienen_nah_verkehr_bahn_zug",
-                    "Motorrad": "motorrad",
-                    "E-Bike/Pedelec/E-Lastenrad": "e_bike_pedelec_e_lastenrad",
-                    "Fahrrad/Lastenrad": "fahrrad_lastenrad",
-                    "zu Fuß": "zu_fuss",
-                    "Sonstiges": "sonstiges"
-                }
-
-                data_av_pkm = {
-                    "Merkmal": ["Wert"],
-                    "Gesamtemissionen Referenzmobilität im Bediengebiet (alternativ genutzte Verkehrsmittel) (kg CO2eq)": [st.session_state['gesamtemissionen_av_pkm']],
-                    "Personenkilometer Referenzmobilität im Bediengebiet (pkm)": [st.session_state['personenkilometer_gesamt_av_pkm']],
-                    "CO2-Emissionen pro Personenkilometer Referenzmobilität im Bediengebiet (g CO2eq/pkm)": [st.session_state['emissionen_pro_personenkilometer_av_pkm']]
-                }
-
-                # Hinzufügen der Modal Split Daten  
-                for verkehrsmittel, anteil in st.session_state['entries_modal_split'].items():
-                    key = mode_to_key_pkm.get(verkehrsmittel, verkehrsmittel)
-                    data_av_pkm[f"Modal Split Anteil für {verkehrsmittel} (%)"] = [anteil]
-
-                # Hinzufügen der Emissionsdaten für alternative Verkehrsmittel
-                for mode in st.session_state['entries_modal_split']:
-                    key = mode_to_key_pkm.get(mode, mode)
-                    personenkilometer = st.session_state.get(f'berechnete_werte', {}).get(key, 0)
-                    emission = st.session_state.get(f'emission_{key}', 0)
-                    data_av_pkm[f"Wegehäufigkeit für {mode} (Personenkilometer)"] = [personenkilometer]
-                    data_av_pkm[f"Emissionsdaten für {mode} (g CO2eq/pkm)"] = [emission]
-                
-                df_av_pkm = pd.DataFrame(data_av_pkm).transpose()
-                df_av_pkm.columns = df_av_pkm.iloc[0]
-                df_av_pkm = df_av_pkm[1:]
-
-                # Zusammenführen der DataFrames
-                df_combined = pd.concat([df_rps, df_vehicles, df_av_pkm], axis=0)
-                df_combined = df_combined.replace('', np.nan)
-                st.write(df_combined)
-
-#########################################################################################
-# Umfrage (Wege)
-
-mode_to_key_umfrage_wege = {
-    "Verkehrsinduktion": "verkehrsinduktion",
-    "MIV (Fahrer)": "miv_fahrer",
-    "MIV (Mitfahrer)": "miv_mitfahrer",
-    "(Nahlinien-)Bus": "nahlinien_bus",
-    "Straßen-/Stadt-/U-Bahn": "strassen_stadt_u_bahn",
-    "Schienen(nah)verkehr/Bahn/Zug": "schienen_nah_verkehr_bahn_zug",
-    "Motorrad": "motorrad",
-    "E-Bike/Pedelec/E-Lastenrad": "e_bike_pedelec_e_lastenrad",
-    "Fahrrad/Lastenrad": "fahrrad_lastenrad",
-    "zu Fuß": "zu_fuß",
-    "Sonstiges": "sonstiges"
-}
+# Referenzmobilität im Bediengebiet (Abschnitte 6 bis 16)
+# Sollte eine Methodik ausgewählt sein, dann zeige die Expander der gewählten Methodik an
+if 'methodik' in st.session_state and st.session_state['methodik'] in METHODEN:
+    show_reference_mobility(st.session_state['methodik'])
 
-### Verkehrsmittelverteilung Umfrage (Wege)
-if 'methodik' in st.session_state and st.session_state['methodik'] == "Umfrage (Wege)":
-    with st.expander("**6. Verkehrsmittelverteilung der Referenzmobilität im Bediengebiet (alternativ genutzter Verkehrsmittel)**"):
-        st.info("""**Hinweis:** Bitte geben Sie die Annahmen für die Verteilung der Referenzmobilität im Bediengebiet (der alternativ genutzten Verkehrsmittel) der Fahrgäste an.
-                    **Vorauswahl der Umfrage (Wege):** Wählen Sie ein vordefiniertes Szenario aus, um die Standardwerte für die Verteilung automatisch auszufüllen. Diese Werte sind anpassbar.""")
-        # Dropdown-Menü für Umfrage_wege
-        umfrage_wege_options = {
-            "Eigene Angaben": [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-            "Umfrage LOOPmünster (2021, 2022, 2022)": [0, 31, 9, 7, 0, 2, 0, 10, 24, 17, 0]
-        }
+# Vergleich aller Methoden; nach den Abschnitten der gewählten Methodik, damit deren Eingaben übernommen werden können
+if methodenvergleich:
+    show_method_comparison()
 
-        selected_modal_split_umfrage_wege = st.selectbox("Vorauswahl Umfrage (Wege) (Optional):", list(umfrage_wege_options.keys()))
+# Gespeicherte Bilanzen (Bilanzspeicher); unabhängig von der gewählten Methodik
+show_run_history()
 
-        # Speichern der globalen Variablen
-        st.session_state['selected_modal_split_umfrage_wege'] = selected_modal_split_umfrage_wege
-
-        # Anzeigen der Anteile basierend auf der ausgewählten Vorauswahl
-        default_values_umfrage_wege = umfrage_wege_options[selected_modal_split_umfrage_wege]
-
-        # Eingabefelder für die Anteile
-        transport_modes_umfrage_wege = ["Verkehrsinduktion", "MIV (Fahrer)", "MIV (Mitfahrer)", "(Nahlinien-)Bus", "Straßen-/Stadt-/U-Bahn", "Schienen(nah)verkehr/Bahn/Zug", "Motorrad", "E-Bike/Pedelec/E-Lastenrad", "Fahrrad/Lastenrad", "zu Fuß", "Sonstiges"]
-        entries_umfrage_wege = {}
-        for i, mode_umfrage_wege in enumerate(transport_modes_umfrage_wege):
-            entries_umfrage_wege[mode_umfrage_wege] = st.number_input(f"Anteil der Fahrgäste, die {mode_umfrage_wege} genutzt hätten (%):", 
-                                            min_value=0.0, max_value=100.0, 
-                                            value=float(default_values_umfrage_wege[i]), step=0.1, format="%f")
-
-        # Überprüfung der Gesamtsumme der eingegebenen Werte
-        total_percentage = sum(entries_umfrage_wege.values())
-        if total_percentage > 100:
-            st.error("Die Summe der Modal-Split-Anteile überschreitet 100%.")
-        elif total_percentage < 100:
-            st.warning("Die Summe der Modal-Split-Anteile liegt unter 100%.")
-
-        # Außerhalb des Expanders
-        st.write("**Berechnung der Personenkilometer der Verkehrsmittelverteilung (der alternativ genutzten Verkehrsmittel)**")
-        st.info("**Hinweis:** Um die Anzahl der Personenkilometer der Verkehrsmittelverteilung zu berechnen, werden die mit dem Ridepooling beförderten Fahrgäste mit den entsprechenden Verkehrsmittelverteilung-Anteilen (Umfrage, Wege) multipliziert.")
-
-        #Speichern der globalen Variablen
-        st.session_state['entries_umfrage_wege'] = entries_umfrage_wege
-
-        if 'transportierte_fahrgaeste' in st.session_state and 'entries_umfrage_wege' in st.session_state:
-            transportierte_fahrgaeste = int(st.session_state['transportierte_fahrgaeste'])
-            st.write(f"Von den **{int(st.session_state['transportierte_fahrgaeste'])}** transportierten Fahrgästen hätten entsprechend viele Personen folgende alternative Verkehrsmittel genutzt:")
-            entries_umfrage_wege = st.session_state['entries_umfrage_wege']
-            
-            for verkehrsmittel, anteil_umfrage_wege in entries_umfrage_wege.items():
-                col1, col2 = st.columns([3, 1])
-                with col1:
-                    st.write(f"**{verkehrsmittel}:**")
-                with col2:
-                    berechneter_wert = transportierte_fahrgaeste * anteil_umfrage_wege / 100
-                    st.write(f"**{berechneter_wert:.0f} Personen**")
-                    
-        else:
-            st.warning("Bitte stellen Sie sicher, dass die Gesamtzahl der transportierten Fahrgäste und die Modal-Split-Annahmen festgelegt wurden.")
-
-    ######## 7. Annahmen für die Wegeentfernung alternativer Verkehrsmitteln
-
-    # Initialisierung der benötigten Variablen, falls nicht vorhanden
-    if 'durchschnittliche_fahrtdistanz_mit_bk' not in st.session_state:
-        st.session_state['durchschnittliche_fahrtdistanz_mit_bk'] = 0.0
-    if 'durchschnittliche_fahrtdistanz_mit_lk' not in st.session_state: 
-        st.session_state['durchschnittliche_fahrtdistanz_mit_lk'] = 0.0
-    if 'transportierte_fahrgaeste' not in st.session_state:
-        st.session_state['transportierte_fahrgaeste'] = 0
-    if 'entries_umfrage_wege' not in st.session_state:
-        st.session_state['entries_umfrage_wege'] = {}
-
-    mode_to_key_umfrage_wege = {
-        "Verkehrsinduktion": "verkehrsinduktion",
-        "MIV (Fahrer)": "miv_fahrer",
-        "MIV (Mitfahrer)": "miv_mitfahrer",
-        "(Nahlinien-)Bus": "nahlinien_bus",
-        "Straßen-/Stadt-/U-Bahn": "strassen_stadt_u_bahn",
-        "Schienen(nah)verkehr/Bahn/Zug": "schienen_nah_verkehr_bahn_zug",
-        "Motorrad": "motorrad",
-        "E-Bike/Pedelec/E-Lastenrad": "e_bike_pedelec_e_lastenrad",
-        "Fahrrad/Lastenrad": "fahrrad_lastenrad",
-        "Zu Fuß": "zu_fuss",
-        "Sonstiges": "sonstiges"
-    }
+# Szenario speichern; nach allen Abschnitten, damit deren Eingaben enthalten sind
+show_scenario_download()
 
-    # Sicherstellen, dass die Transportmodi konsistent benannt sind
-    transport_modes_umfrage_wege = list(mode_to_key_umfrage_wege.keys())
 
-    with st.expander("**7. Wegeentfernung alternativer Verkehrsmittel**"):
-        st.info("""**Hinweis:** Bitte geben Sie die Annahmen zur Wegeentfernung der alternativ genutzten Verkehrsmittel an. Sie können vorausgewählte Optionen wählen oder eigene Angaben tätigen.""")
-
-        
-        
-        vorauswahl_optionen_umfrage_wege = {
-            "Durchschnittliche Fahrtdistanz je Buchung (mit Fahrgast)": st.session_state['durchschnittliche_fahrtdistanz_mit_bk'],
-            "Durchschnittliche Fahrtdistanz je Buchung (mit Leerkilometern)": st.session_state['durchschnittliche_fahrtdistanz_mit_lk'],
-            "Durchschnittliche Reiseweiten nach MID 2017": {
-                "Verkehrsinduktion": 0.0,
-                "MIV (Fahrer)": 16.0,
-                "MIV (Mitfahrer)": 18.0,
-                "(Nahlinien-)Bus": 23.0,
-                "Straßen-/Stadt-/U-Bahn": 23.0,
-                "Schienen(nah)verkehr/Bahn/Zug": 23.0,
-                "Motorrad": 16.0,
-                "E-Bike/Pedelec/E-Lastenrad": 4.0,
-                "Fahrrad/Lastenrad": 4.0,
-                "Zu Fuß": 2.0,
-                "Sonstiges": 0.0
-            }
-        }
-
-        selected_vorauswahl_umfrage_wege = st.selectbox("Vorauswahl der Wegeentfernung:", list(vorauswahl_optionen_umfrage_wege.keys()))
-
-        if selected_vorauswahl_umfrage_wege in ["Durchschnittliche Fahrtdistanz je Buchung (mit Fahrgast)", "Durchschnittliche Fahrtdistanz je Buchung (mit Leerkilometern)"]:
-            default_distance = vorauswahl_optionen_umfrage_wege[selected_vorauswahl_umfrage_wege]
-            default_distances_umfrage_wege = {mode: default_distance for mode in transport_modes_umfrage_wege}
-        else:
-            default_distances_umfrage_wege = vorauswahl_optionen_umfrage_wege[selected_vorauswahl_umfrage_wege]
-
-        for mode in transport_modes_umfrage_wege:
-            key = mode_to_key_umfrage_wege[mode]
-            distance_umfrage_wege = st.number_input(f"Wegeentfernung {mode} [km]:", min_value=0.0, value=float(default_distances_umfrage_wege.get(mode, 0)), format='%f')
-            st.session_state[f'entfernung_{key}'] = distance_umfrage_wege
-
-        st.write("**Berechnung der Personenkilometer der Referenzmobilität im Bediengebiet (alternativ genutzte Verkehrsmittel)**")
-        st.info("**Hinweis:** Die Personenkilometer der alternativ genutzten Verkehrsmittel werden basierend auf den Annahmen zur Wegeentfernung und der Verkehrsmittelverteilung der Fahrgäste berechnet.")
-
-        # Berechnung und Speicherung der Personenkilometer für jedes Verkehrsmittel
-        st.write("Die Berechnung der Personenkilometer für die verschiedenen alternativen Verkehrsmittel ergibt folgende Werte:")
-        for mode in transport_modes_umfrage_wege:
-            key = mode_to_key_umfrage_wege[mode]
-            transportierte_fahrgaeste = int(st.session_state['transportierte_fahrgaeste'])
-            modal_split = float(st.session_state['entries_umfrage_wege'].get(mode, 0))
-            personen = transportierte_fahrgaeste * (modal_split / 100)
-            entfernung = float(st.session_state.get(f'entfernung_{key}', 0))
-            personenkilometer = round(personen * entfernung, 2)
-            st.session_state[f'personenkilometer_{key}'] = personenkilometer
-            col1, col2 = st.columns([3, 1])
-            with col1:
-                st.write(f"**{mode}**:")
-            with col2:
-                st.write(f"**{personenkilometer} Pkm**")
-
-        # Berechnung der Gesamt-Personenkilometer für alternative Verkehrsmittel
-        personenkilometer_gesamt_av_umfrage_wege = round(sum(
-                    float(st.session_state.get(f'personenkilometer_{mode_to_key_umfrage_wege[mode]}', 0))
-                    for mode in transport_modes_umfrage_wege if mode != "Verkehrsinduktion"), 0)
-        col1, col2 = st.columns([3, 1])
-        with col1:
-                    st.write("**Gesamte Personenkilometer der Referenzmobilität im Bediengebiet (alternativ genutzte Verkehrsmittel):**")
-        with col2:
-                    st.write(f"**{personenkilometer_gesamt_av_umfrage_wege} Pkm**")
-
-        st.info("**Hinweis:** Die Verkehrsinduktion wird bei der Berechnung der Gesamt-Personenkilometer nicht berücksichtigt.")
-
-        # Speichern der globalen Variablen
-        st.session_state['personenkilometer_gesamt_av'] = personenkilometer_gesamt_av_umfrage_wege
-
-        ##### 7. Emissionsdaten alternativer Verkehrsmittel (Nutzung [TTW] und Energie [WTT])
-    with st.expander("**8. Emissionsdaten der Referenzmobilität im Bediengebiet (Nutzung [TTW] und Energie [WTT])**"):
-        st.info("**Hinweis:** Bitte geben Sie die CO2-Emissionsdaten für die alternativ genutzten Verkehrsmittel an. Sie können vorausgewählte Optionen wählen oder eigene Angaben tätigen. **Vorauswahl der Emissionsdaten:** Wählen Sie ein vordefiniertes Szenario aus, um die Standardwerte für die Emissionsdaten automatisch auszufüllen. Diese Werte sind anpassbar.")
-        # Vorauswahl der Emissionsdaten
-        vorauswahl_emissionsdaten_optionen_umfrage_wege = ["Eigene Angaben", "Umweltbundesamt, Umweltfreundlich mobil! (2022)"]
-        selected_vorauswahl_emissionsdaten_umfrage_wege = st.selectbox("Vorauswahl der Emissionsdaten:", vorauswahl_emissionsdaten_optionen_umfrage_wege)
-
-        # Definieren der Standardemissionswerte basierend auf der Vorauswahl
-        if selected_vorauswahl_emissionsdaten_umfrage_wege == "Umweltbundesamt, Umweltfreundlich mobil! (2022)":
-                emissionsdaten_defaults_umfrage_wege = {
-                    "verkehrsinduktion": 0.0,
-                    "miv_fahrer": 152.86,
-                    "miv_mitfahrer": 152.86,
-                    "nahlinien_bus": 80.54,
-                    "strassen_stadt_u_bahn": 58.79,
-                    "schienen_nah_verkehr_bahn_zug": 58.79,
-                    "motorrad": 90.0,
-                    "e_bike_pedelec_e_lastenrad": 3.9,
-                    "fahrrad_lastenrad": 0.0,
-                    "zu_fuß": 0.0,
-                    "sonstiges": 0.0
-                }
-        else:
-                emissionsdaten_defaults_umfrage_wege = {key: 0 for key in mode_to_key_umfrage_wege.values()}
-
-            # Eingabefelder für die Emissionsdaten
-        for mode in transport_modes_umfrage_wege:
-                key = mode_to_key_umfrage_wege[mode]
-                emission_umfrage_wege = st.number_input(f"Annahmen Emissionsdaten {mode} [gCO2eq/pkm]:", min_value=0.0, value=float(emissionsdaten_defaults_umfrage_wege.get(key, 0)), format='%f')
-                st.session_state[f'emission_{key}'] = emission_umfrage_wege
-
-        st.write("**Berechnung der Personenkilometer für die Referenzmobilität im Bediengebiet (alternativ genutzte Verkehrsmittel)**")
-        st.info("**Hinweis:** Die Personenkilometer der alternativ genutzten Verkehrsmittel werden basierend auf den Annahmen zur Wegeentfernung und den Emissionsdaten berechnet.")
-        st.write("Die Emissionsdaten für die alternativ genutzten Verkehrsmittel betragen:")
-
-        for mode in transport_modes_umfrage_wege:
-                key = mode_to_key_umfrage_wege[mode]
-                personenkilometer_umfrage_wege = st.session_state.get(f'personenkilometer_{key}', 0)
-                emission_umfrage_wege = st.session_state.get(f'emission_{key}', 0)
-                emissionen_av_umfrage_wege = round(personenkilometer_umfrage_wege * emission_umfrage_wege / 1000, 2)
-
-                col1, col2 = st.columns([3, 1])
-                with col1:
-                    st.write(f"**Emissionen für {mode}:**")
-                with col2:
-                    st.write(f"**{emissionen_av_umfrage_wege} kg CO2eq**")
-
-            # Berechnung und Speicherung der Gesamtemissionen für alternative Verkehrsmittel
-        gesamtemissionen_av_umfrage_wege = round(sum(
-                st.session_state.get(f'personenkilometer_{mode_to_key_umfrage_wege[mode]}', 0) *
-                st.session_state.get(f'emission_{mode_to_key_umfrage_wege[mode]}', 0) / 1000
-                for mode in transport_modes_umfrage_wege if mode != "Verkehrsinduktion"
-            ), 2)
-
-        st.session_state['gesamtemissionen_av_umfrage_wege'] = gesamtemissionen_av_umfrage_wege
-
-        col1, col2 = st.columns([3, 1])
-        with col1:
-                st.write("**Gesamtemissionen der Referenzmobilität im Bediengebiet (alternativ genutzte Verkehrsmittel):**")
-        with col2:
-                st.write(f"**{gesamtemissionen_av_umfrage_wege} kg CO2eq**")
-
-        # Berechnen der Personenkilometer für alternative Verkehrsmittel
-
-
-        personenkilometer_gesamt_av_umfrage_wege = round(sum(
-                st.session_state.get(f'personenkilometer_{mode_to_key_umfrage_wege[mode]}', 0)
-                for mode in transport_modes_umfrage_wege if mode != "Verkehrsinduktion"
-            ), 2)
-        st.session_state['personenkilometer_gesamt_av_umfrage_wege'] = personenkilometer_gesamt_av_umfrage_wege
-            #Speichere die globalen Variablen
-        st.session_state['emissionen_pro_personenkilometer_av'] = gesamtemissionen_av_umfrage_wege / personenkilometer_gesamt_av_umfrage_wege if personenkilometer_gesamt_av_umfrage_wege > 0 else 0
-        #Speichere die globalen Variablen
-        st.session_state['gesamtemissionen_av_umfrage_wege'] = gesamtemissionen_av_umfrage_wege
-
-    ######## 9. Berechnung der Umweltwirkung alternativer Verkehrsmittel
-    with st.expander("**9. Berechnung der Umweltwirkung der Referenzmobilität im Bediengebiet**"):
-        st.info("""**Hinweis:** Im Folgenden wird die Umweltwirkung der Referenzmobilität im Bediengebiet (alternativ genutzter Verkehrsmittel) anhand von Umfragedaten im Raum (Umfragedaten, Wege) dargestellt. In der Abbildung wird der spezifische CO2-Ausstoß pro Pkm der Referenzmobilität im Betriebsgebiet denen anderer Verkehrsmittel gegenübergestellt.""")
-        # Überprüfen, ob alle erforderlichen Werte vorhanden sind, bevor Sie fortfahren
-        required_keys = ['gesamtemissionen_av_umfrage_wege', 'personenkilometer_gesamt_av_umfrage_wege']
-        if all(key in st.session_state for key in required_keys):
-            gesamtemissionen_av_umfrage_wege = st.session_state['gesamtemissionen_av_umfrage_wege']
-            personenkilometer_gesamt_av_umfrage_wege = st.session_state['personenkilometer_gesamt_av_umfrage_wege']
-
-            # Berechnung der Emissionen pro Personenkilometer
-            emissionen_pro_personenkilometer_av_umfrage_wege = gesamtemissionen_av_umfrage_wege / personenkilometer_gesamt_av_umfrage_wege if personenkilometer_gesamt_av_umfrage_wege > 0 else 0
-
-            # Speichere die berechneten Werte im Sitzungszustand
-            st.session_state['emissionen_pro_personenkilometer_av_umfrage_wege'] = emissionen_pro_personenkilometer_av_umfrage_wege
-
-            emissionen_data = {
-                'Referenzmobilität im Bediengebiet (alternativ genutzte Verkehrsmittel)': emissionen_pro_personenkilometer_av_umfrage_wege * 1000,
-                'Pkw - MIV (Fahrer) & MIV (Mitfahrer)': 152.86,
-                '(Nahlinien-)Bus': 80.54,
-                'Straßen-/Stadt-/U-Bahn': 59.30,
-                'Schienen(nah)verkehr/Bahn/Zug': 58.79,
-                'Motorrad': 173.3,
-                'E-Bike/Pedelec/E-Lastenrad': 3.9,
-                'Fahrrad/Lastenrad': 0.0,
-                'Zu Fuß': 0.0
-            }
-
-            # Diagramm erstellen
-            fig = go.Figure()
-            for verkehrsmittel, emissionen in emissionen_data.items():
-                fig.add_trace(go.Bar(name=verkehrsmittel, x=[verkehrsmittel], y=[emissionen], marker_line_color='rgb(0,0,0)', marker_line_width=1.5, opacity=0.7))
-            fig.update_layout(
-                barmode='group',
-                title='Gegenüberstellung der Emissionen pro Personenkilometer nach Verkehrsmittel - Well-to-Wheel (WTW)*',
-                legend=dict(
-                    orientation="v",  # vertikale Anordnung
-                    y=0.6,  # Positionierung der Legende
-                    x=1.02,  # Legende rechts vom Diagramm
-                    xanchor='left',
-                    yanchor='top'
-                ),
-                width=650,
-                height=650,
-                yaxis_title='Emissionen [g CO2/pkm]',
-                xaxis_tickangle=-45
-            )
-            st.plotly_chart(fig)
-
-            col1, col2 = st.columns([3, 1])
-            with col1:
-                st.write("**Gesamte CO2-Emissionen der Referenzmobilität im Bediengebiet (alternativ genutzte Verkehrsmittel):**")
-            with col2:
-                st.write(f"**{gesamtemissionen_av_umfrage_wege} kg CO2**")
-            st.session_state['gesamtemissionen_av_umfrage_wege'] = gesamtemissionen_av_umfrage_wege
-
-            col1, col2 = st.columns([3, 1])
-            with col1:
-                st.write("**CO2-Emissionen der Referenzmobilität im Bediengebiet (alternativ genutzte Verkehrsmittel) pro Personenkilometer:**")
-            with col2:
-                st.write(f"**{emissionen_pro_personenkilometer_av_umfrage_wege:.3f} g CO2/pkm**")
-
-            # SPEICHERN DER GLOBALEN VARIABLEN
-            st.session_state['emissionen_pro_personenkilometer_av_umfrage_wege'] = emissionen_pro_personenkilometer_av_umfrage_wege
-
-        else:
-            st.error("Bitte stellen Sie sicher, dass alle erforderlichen Daten vorhanden sind, um die Umweltwirkung der Referenzmobilität im Bediengebiet (alternativ genutzten Verkehrsmittel) zu berechnen.")
-    
-    st.subheader("Vergleich der spezifischen CO2-Emissionen pro Personenkilometer für das Ridepooling-System und der Referenzmobilität im Bediengebiet")
-
-    ######## 10. Vergleich
-    with st.expander("**10. Vergleich**"):
-        st.info("""**Hinweis:** Im Folgenden wird der spezifische CO2-Ausstoß pro Personenkilometer des Ridepooling-Systems mit denen der alternativ genutzten Verkehrsmittel verglichen.""")
-
-        'initialisierung der benötigten Variablen, falls nicht vorhanden'
-        if 'co2_emissionen_pro_personenkilometer_rps_umfrage_wege' not in st.session_state:
-            st.session_state['co2_emissionen_pro_personenkilometer_rps_umfrage_wege'] = 0.0
-        if 'emissionen_pro_personenkilometer_av_umfrage_wege' not in st.session_state:
-            st.session_state['emissionen_pro_personenkilometer_av_umfrage_wege'] = 0.0
-        if 'co2_emissionen_gesamt_rps_umfrage_wege' not in st.session_state:
-            st.session_state['co2_emissionen_gesamt_rps_umfrage_wege'] = 0.0
-        if 'gesamtemissionen_av_umfrage_wege' not in st.session_state:
-            st.session_state['gesamtemissionen_av_umfrage_wege'] = 0.0
-        if 'start_date' not in st.session_state:
-            st.session_state['start_date'] = ""
-        if 'end_date' not in st.session_state:
-            st.session_state['end_date'] = ""
-
-
-        # Überprüfen, ob alle erforderlichen Werte vorhanden sind, bevor Sie fortfahren
-        required_keys = ['emissionen_pro_personenkilometer_av_umfrage_wege', 'co2_emissionen_pro_personenkilometer_rps', 'gesamtemissionen_av_umfrage_wege', 'start_date', 'end_date']
-
-        if all(key in st.session_state for key in required_keys):
-            co2_emissionen_pro_personenkilometer_rps = st.session_state['co2_emissionen_pro_personenkilometer_rps']
-            emissionen_pro_personenkilometer_av_umfrage_wege = st.session_state['emissionen_pro_personenkilometer_av_umfrage_wege']
-
-            # Erstellung des Diagramms
-            emissionen_data = {
-                st.session_state['name_ridepooling_system']: co2_emissionen_pro_personenkilometer_rps * 1000,
-                'Alternative Verkehrsmittel': emissionen_pro_personenkilometer_av_umfrage_wege * 1000
-            }
-
-            fig5 = go.Figure()
-            for verkehrsmittel, emissionen in emissionen_data.items():
-                fig5.add_trace(go.Bar(name=verkehrsmittel, x=[verkehrsmittel], y=[emissionen], marker_line_color='rgb(0,0,0)', marker_line_width=1.5, opacity=0.7))
-            fig5.update_layout(
-                barmode='group',
-                title='Gegenüberstellung der spezifischen CO2-Emissionen pro Personenkilometer - Well-to-Wheel (WTW)*',
-                legend=dict(
-                    orientation="v",  # vertikale Anordnung
-                    y=0.6,  # Positionierung der Legende
-                    x=1.02,  # Legende rechts vom Diagramm
-                    xanchor='left',
-                    yanchor='top'
-                ),
-                width=650,
-                height=650,
-                yaxis_title='Emissionen [g CO2/pkm]',
-                xaxis_tickangle=-45
-            )
-            st.plotly_chart(fig5)
-
-            #Get co2_emissionen_gesamt_rps, start_date, end_date, gesamtemissionen_av, und runde auf 2 Dezimalstellen
-            co2_emissionen_gesamt_rps = round(st.session_state['co2_emissionen_gesamt_rps'], 2)
-            gesamtemissionen_av_umfrage_wege = st.session_state['gesamtemissionen_av_umfrage_wege']
-            start_date = st.session_state['start_date']
-            end_date = st.session_state['end_date']
-
-            # Erstellung eines Textfeldes, in welchem die spezifischen CO2-Emissionen pro Personenkilometer des Ridepooling-Systems und der alternativ genutzten Verkehrsmittel verglichen werden
-            col1, col2 = st.columns([3, 1])
-            with col1:
-                st.write("**Gesamte CO2-Emissionen des Ridepooling-Systems:**")
-            with col2:
-                st.write(f"**{co2_emissionen_gesamt_rps:.2f} kg CO2**")
-
-            col1, col2 = st.columns([3, 1])
-            with col1:
-                st.write("**CO2-Emissionen des Ridepooling-Systems pro Personenkilometer:**")
-            with col2:
-                st.write(f"**{co2_emissionen_pro_personenkilometer_rps:.3f} kg CO2/pkm**")
-            
-            col1, col2 = st.columns([3, 1])
-            with col1:
-                st.write("**Gesamte CO2-Emissionen der Referenzmobilität im Bediengebiet (alternativ genutzte Verkehrsmittel):**")
-            with col2:
-                st.write(f"**{gesamtemissionen_av_umfrage_wege} kg CO2**")
-
-            col1, col2 = st.columns([3, 1])
-            with col1:
-                st.write("**CO2-Emissionen der Referenzmobilität im Bediengebiet (alternativ genutzte Verkehrsmittel) pro Personenkilometer:**")
-            with col2:
-                st.write(f"**{emissionen_pro_personenkilometer_av_umfrage_wege:.3f} kg CO2/pkm**")
-                         
-            # Erstelle ein Textfeld, in welchem je nach Ausgang des Vergleichs eine entsprechende Meldung ausgegeben wird
-            if emissionen_pro_personenkilometer_av_umfrage_wege != 0:
-                if co2_emissionen_pro_personenkilometer_rps < emissionen_pro_personenkilometer_av_umfrage_wege:
-                    percentage_difference = round((emissionen_pro_personenkilometer_av_umfrage_wege - co2_emissionen_pro_personenkilometer_rps) / emissionen_pro_personenkilometer_av_umfrage_wege * 100, 2)
-                    total_difference = round((gesamtemissionen_av_umfrage_wege - co2_emissionen_gesamt_rps), 2)
-                    st.success(f"Das Ridepooling-System weist im Vergleich zu den alternativ genutzten Verkehrsmitteln eine geringere spezifische CO2-Emission pro Personenkilometer auf. Die spezifische CO2-Emission pro Personenkilometer des Ridepooling-Systems ist um {percentage_difference} % niedriger als bei alternativ genutzten Verkehrsmitteln. Die Gesamtemissionen des Ridepoolings betragen {co2_emissionen_gesamt_rps} kg CO2, was im Betrachtungszeitraum ({start_date} bis {end_date}) zu einer Einsparung von {total_difference} kg CO2 im Vergleich den alternativ genutzten Verkehrsmitteln entspricht.")
-                elif co2_emissionen_pro_personenkilometer_rps > emissionen_pro_personenkilometer_av_umfrage_wege:
-                    percentage_difference = round((co2_emissionen_pro_personenkilometer_rps - emissionen_pro_personenkilometer_av_umfrage_wege) / emissionen_pro_personenkilometer_av_umfrage_wege * 100, 2)
-                    total_difference = round((co2_emissionen_gesamt_rps - gesamtemissionen_av_umfrage_wege), 2)
-                    st.error(f"Das Ridepooling-System weist im Vergleich zu den den alternativ genutzten Verkehrsmitteln eine höhere spezifische CO2-Emission pro Personenkilometer auf. Die spezifische CO2-Emission pro Personenkilometer des Ridepooling-Systems ist um {percentage_difference} % höher als bei alternativ genutzten Verkehrsmitteln. Die Gesamtemissionen des Ridepoolings betragen {co2_emissionen_gesamt_rps} kg CO2, was im Betrachtungszeitraum ({start_date} bis {end_date}) zu einer Erhöhung von {total_difference} kg CO2 im Vergleich den alternativ genutzten Verkehrsmitteln entspricht.")
-                else:
-                    st.warning("Das Ridepooling-System und die Referenzmobilität im Bediengebiet weisen die gleiche spezifische CO2-Emission pro Personenkilometer auf.")
-        else:
-            st.error("Bitte stellen Sie sicher, dass alle erforderlichen Daten vorhanden sind, um den Vergleich der spezifischen CO2-Emissionen pro Personenkilometer durchzuführen.")
-    
-        
-    with st.expander("**11. Export der Eingabedaten und Ergebnisse**"):
-        # Stellen Sie sicher, dass alle erforderlichen Werte vorhanden sind, bevor Sie fortfahren
-        required_keys = [
-            'name_ridepooling_system', 'start_date', 'end_date', 'abgeschlossene_buchungen',
-            'transportierte_fahrgaeste', 'vehicle_list', 'fahrzeugkilometer_leer', 'fahrzeugkilometer_besetzt',
-            'fahrzeugkilometer_gesamt', 'durchschnittliche_fahrtdistanz_mit_bk', "durchschnittliche_fahrtdistanz_mit_lk",
-            'personenkilometer_gefahren', 'benzinverbrauch_gesamt', 'dieselverbrauch_gesamt', 'stromverbrauch_gesamt',
-            'oekostrom_anteil', 'benzin_emissionsdaten', 'diesel_emissionsdaten', 'strom_emissionsdaten',
-            'co2_emissionen_gesamt_rps', 'co2_emissionen_pro_personenkilometer_rps', 'personenkilometer_gesamt_av_umfrage_wege',
-            'gesamtemissionen_av_umfrage_wege', 'emissionen_pro_personenkilometer_av_umfrage_wege', 'entries_umfrage_wege'
-        ]
-        missing_keys = [key for key in required_keys if key not in st.session_state]
-        if missing_keys:
-            st.error(f"Die folgenden Schlüssel fehlen: {', '.join(missing_keys)}")
-        else:
-            st.write("Die Eingabedaten und Ergebnisse können als CSV-Datei exportiert werden.")
-            if st.button("Exportieren"):
-                # Erstellen eines DataFrames mit den Eingabedaten und Ergebnissen des Ridepooling-Systems
-                data_rps = {
-                    "Merkmal": ["Wert"],
-                    "Ridepooling-System": [st.session_state['name_ridepooling_system']],
-                    "Betrachtungszeitraum (Start)": [f"{st.session_state['start_date']}"],
-                    "Betrachtungszeitraum (Ende)": [f"{st.session_state['end_date']}"],
-                    "Anzahl abgeschlossener Buchungen": [st.session_state['abgeschlossene_buchungen']],
-                    "Transportierte Fahrgäste": [st.session_state['transportierte_fahrgaeste']],
-                    "Flotte - Fahrzeugkilometer (leer)": [st.session_state['fahrzeugkilometer_leer']],
-                    "Flotte - Fahrzeugkilometer (besetzt)": [st.session_state['fahrzeugkilometer_besetzt']],
-                    "Flotte - Fahrzeugkilometer (gesamt)": [st.session_state['fahrzeugkilometer_gesamt']],
-                    "Flotte - Personenkilometer (gefahren)": [st.session_state['personenkilometer_gefahren']],
-                    "Durchschnittliche Fahrtdistanz (mit Fahrgast)": [st.session_state['durchschnittliche_fahrtdistanz_mit_bk']],
-                    "Durchschnittliche Fahrtdistanz (ohne Fahrgast)": [st.session_state['durchschnittliche_fahrtdistanz_mit_lk']],
-                    "Flotte - Benzinverbrauch (gesamt)": [st.session_state['benzinverbrauch_gesamt']],
-                    "Flotte - Dieselverbrauch (gesamt)": [st.session_state['dieselverbrauch_gesamt']],
-                    "Flotte - Stromverbrauch (gesamt)": [st.session_state['stromverbrauch_gesamt']],
-                    "Ökostromanteil (%)": [st.session_state['oekostrom_anteil']],
-                    "CO2-Emissionsdaten (Benzin)": [st.session_state['benzin_emissionsdaten']],
-                    "CO2-Emissionsdaten (Diesel)": [st.session_state['diesel_emissionsdaten']],
-                    "CO2-Emissionsdaten (Strom)": [st.session_state['strom_emissionsdaten']],
-                    "CO2-Emissionen (gesamt)": [st.session_state['co2_emissionen_gesamt_rps']],
-                    "CO2-Emissionen pro Personenkilometer": [st.session_state['co2_emissionen_pro_personenkilometer_rps']]
-                }
-
-                df_rps = pd.DataFrame(data_rps).transpose()
-                df_rps.columns = df_rps.iloc[0]
-                df_rps = df_rps[1:]
-
-                # Erstellen eines DataFrames mit den Fahrzeugdaten
-                if 'vehicle_list' in st.session_state and st.session_state['vehicle_list']:
-                    vehicle_data = {
-                        "Fahrzeugtyp": [],
-                        "Benzinverbrauch (l/100km)": [],
-                        "Dieselverbrauch (l/100km)": [],
-                        "Stromverbrauch (kWh/100km)": [],
-                        "Kilometer leer": [],
-                        "Kilometer besetzt": []
-                    }
-                    for vehicle in st.session_state['vehicle_list']:
-                        if isinstance(vehicle, dict) and all(key in vehicle for key in ['Fahrzeugtyp', 'Kilometer leer', 'Kilometer besetzt']):
-                            vehicle_data["Fahrzeugtyp"].append(vehicle['Fahrzeugtyp'])
-                            vehicle_data["Benzinverbrauch (l/100km)"].append(vehicle['Benzinverbrauch (l/100km)'])
-                            vehicle_data["Dieselverbrauch (l/100km)"].append(vehicle['Dieselverbrauch (l/100km)'])
-                            vehicle_data["Stromverbrauch (kWh/100km)"].append(vehicle['Stromverbrauch (kWh/100km)'])
-                            vehicle_data["Kilometer leer"].append(vehicle['Kilometer leer'])
-                            vehicle_data["Kilometer besetzt"].append(vehicle['Kilometer besetzt'])
-
-                    df_vehicles = pd.DataFrame(vehicle_data)
-                else:
-                    st.error("No vehicles in the session state or 'vehicle_list' is not set.")
-                    df_vehicles = pd.DataFrame()
-
-                # Erstellen eines DataFrames mit den Emissionsdaten der alternativ genutzten Verkehrsmittel, Modal Split, Emissions
-                mode_to_key_umfrage_wege = {
-                    "Verkehrsinduktion": "verkehrsinduktion",
-                    "MIV (Fahrer)": "miv_fahrer",
-                    "MIV (Mitfahrer)": "miv_mitfahrer",
-                    "(Nahlinien-)Bus": "nahlinien_bus",
-                    "Straßen-/Stadt-/U-Bahn": "strassen_stadt_u_bahn",
-                    "Schienen(nah)verkehr/Bahn/Zug": "schienen_nah_verkehr_bahn_zug",
-                    "Motorrad": "motorrad",
-                    "E-Bike/Pedelec/E-Lastenrad": "e_bike_pedelec_e_lastenrad",
-                    "Fahrrad/Lastenrad": "fahrrad_lastenrad",
-                    "zu Fuß": "zu_fuss",
-                    "Sonstiges": "sonstiges"
-                }
-
-                data_av_umfrage_wege = {
-                    "Merkmal": ["Wert"],
-                    "Gesamtemissionen der Referenzmobilität im Bediengebiet (alternativ genutzte Verkehrsmittel) (kg CO2eq)": [st.session_state['gesamtemissionen_av_umfrage_wege']],
-                    "Personenkilometer Referenzmobilität im Bediengebiet (pkm)": [st.session_state['personenkilometer_gesamt_av_umfrage_wege']],
-                    "CO2-Emissionen pro Personenkilometer der Referenzmobilität im Bediengebiet (g CO2eq/pkm)": [st.session_state['emissionen_pro_personenkilometer_av_umfrage_wege']]
-                }
-
-                # Hinzufügen der Modal Split Daten
-                for verkehrsmittel, anteil in st.session_state['entries_umfrage_wege'].items():
-                    key = mode_to_key_umfrage_wege.get(verkehrsmittel, verkehrsmittel)
-                    data_av_umfrage_wege[f"Modal Split Anteil für {verkehrsmittel} (%)"] = [anteil]
-
-                # Hinzufügen der Wegehäufigkeit, Durchschnittliche Fahrtdistanz, Personenkilometer und Emissionsdaten für alternative Verkehrsmittel
-                for mode in st.session_state['entries_umfrage_wege']:
-                    key = mode_to_key_umfrage_wege.get(mode, mode)
-                    personenkilometer = st.session_state.get(f'personenkilometer_{key}', 0)
-                    durchschnittliche_fahrtdistanz = st.session_state.get(f'entfernung_{key}', 0)
-                    emissionsdaten = st.session_state.get(f'emission_{key}', 0)
-                    data_av_umfrage_wege[f"Wegehäufigkeit für {mode} (Personenkilometer)"] = [personenkilometer]
-                    data_av_umfrage_wege[f"Durchschnittliche Fahrtdistanz für {mode} (km)"] = [durchschnittliche_fahrtdistanz]
-                    data_av_umfrage_wege[f"Emissionsdaten für {mode} (g CO2eq/pkm)"] = [emissionsdaten]
-
-                df_av_umfrage_wege = pd.DataFrame(data_av_umfrage_wege).transpose()
-                df_av_umfrage_wege.columns = df_av_umfrage_wege.iloc[0]
-                df_av_umfrage_wege = df_av_umfrage_wege[1:]
-
-                # Zusammenführen der DataFrames
-                df_combined = pd.concat([df_rps, df_vehicles, df_av_umfrage_wege], axis=0)
-                df_combined = df_combined.replace('', np.nan)
-                st.write(df_combined)
-
-                # Export als CSV-Datei
-                csv = df_combined.to_csv(index=True)
-                st.download_button(label="CSV-Datei herunterladen", data=csv, file_name='eingabedaten_und_ergebnisse_umfrage_wege.csv', mime='text/csv')
-
-#########################################################################################
-# Umfrage (Pkm)
-
-#Sobald der Nutzer die Umfrage (Pkm) als Methodik ausgewählt hat, wird der Inhalt des Dashboards entsprechend angepasst.
-
-mode_to_key_umfrage_pkm = {
-    "Verkehrsinduktion": "verkehrsinduktion",
-    "MIV (Fahrer)": "miv_fahrer",
-    "MIV (Mitfahrer)": "miv_mitfahrer",
-    "(Nahlinien-)Bus": "nahlinien_bus",
-    "Straßen-/Stadt-/U-Bahn": "strassen_stadt_u_bahn",
-    "Schienen(nah)verkehr/Bahn/Zug": "schienen_nah_verkehr_bahn_zug",
-    "Motorrad": "motorrad",
-    "E-Bike/Pedelec/E-Lastenrad": "e_bike_pedelec_e_lastenrad",
-    "Fahrrad/Lastenrad": "fahrrad_lastenrad",
-    "Zu Fuß": "zu_fuss",
-    "Sonstiges": "sonstiges"
-}
-
-if 'methodik' in st.session_state and st.session_state['methodik'] == "Umfrage (Pkm)":
-    with st.expander("**6. Verkehrsmittelverteilung der Referenzmobilität im Bediengebiet (alternativ genutzter Verkehrsmittel)**"):
-        st.info("""**Hinweis:** Bitte geben Sie die Annahmen für die Verteilung der alternativ genutzten Verkehrsmittelverteilung der Fahrgäste an.
-                    **Vorauswahl der Umfrage (Pkm):** Wählen Sie ein vordefiniertes Szenario aus, um die Standardwerte für die Verteilung automatisch auszufüllen. Diese Werte sind anpassbar.""")
-        # Dropdown-Menü für Umfrage_pkm
-        umfrage_pkm_options = {
-            "Eigene Angaben": [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-            "Umfrage LOOPmünster (2021, 2022, 2022)": [0, 31, 9, 7, 0, 2, 0, 10, 24, 17, 0]
-        }
-
-        selected_modal_split_umfrage_pkm = st.selectbox("Vorauswahl Umfrage (Pkm) (Optional):", list(umfrage_pkm_options.keys()))
-
-        # Speichern der globalen Variablen
-        st.session_state['selected_modal_split_umfrage_pkm'] = selected_modal_split_umfrage_pkm
-
-        # Anzeigen der Anteile basierend auf der ausgewählten Vorauswahl
-        default_values_umfrage_pkm = umfrage_pkm_options[selected_modal_split_umfrage_pkm]
-
-        # Eingabefelder für die Anteile
-        transport_modes_umfrage_pkm = ["Verkehrsinduktion", "MIV (Fahrer)", "MIV (Mitfahrer)", "(Nahlinien-)Bus", "Straßen-/Stadt-/U-Bahn", "Schienen(nah)verkehr/Bahn/Zug", "Motorrad", "E-Bike/Pedelec/E-Lastenrad", "Fahrrad/Lastenrad", "Zu Fuß", "Sonstiges"]
-        entries_umfrage_pkm = {}
-        for i, mode_umfrage_pkm in enumerate(transport_modes_umfrage_pkm):
-            entries_umfrage_pkm[mode_umfrage_pkm] = st.number_input(f"Anteil der Fahrgäste, die {mode_umfrage_pkm} genutzt hätten (%):",
-                                            min_value=0.0, max_value=100.0,
-                                            value=float(default_values_umfrage_pkm[i]), step=0.1, format="%f")
-            
-        # Überprüfung der Gesamtsumme der eingegebenen Werte
-        total_percentage = sum(entries_umfrage_pkm.values())
-
-        if total_percentage > 100:
-            st.error("Die Summe der Modal-Split-Anteile überschreitet 100%.")
-        elif total_percentage < 100:
-            st.warning("Die Summe der Modal-Split-Anteile liegt unter 100%.")
-
-        # Außerhalb des Expanders
-        st.subheader("Berechnung der Personenkilometer der alternativ genutzten Verkehrsmittel")
-
-        st.info("Die folgenden Daten beziehen sich auf die transportierten Fahrgäste des Ridepooling-Systems.")
-
-        # Speichern der globalen Variablen
-        st.session_state['entries_umfrage_pkm'] = entries_umfrage_pkm
-
-        if 'personenkilometer_gefahren' in st.session_state and 'entries_umfrage_pkm' in st.session_state:
-            personenkilometer_gefahren = int(st.session_state['personenkilometer_gefahren'])
-            st.write(f"Von den zurückgelegten **{int(st.session_state['personenkilometer_gefahren'])}** Personenkilometern des Ridepooling-Systems würden entsprechend viele auf folgende alternativ genutzte Verkehrsmittel entfallen:")
-            entries_umfrage_pkm = st.session_state['entries_umfrage_pkm']
-
-            for verkehrsmittel, anteil_umfrage_pkm in entries_umfrage_pkm.items():
-                col1, col2 = st.columns([3, 1])
-                with col1:
-                    st.write(f"**{verkehrsmittel}:**")
-                with col2:
-                    berechneter_wert = personenkilometer_gefahren * anteil_umfrage_pkm / 100
-                    st.session_state[f'personenkilometer_{mode_to_key_umfrage_pkm[verkehrsmittel]}'] = berechneter_wert
-                    st.write(f"**{berechneter_wert:.0f} Pkm**")
-
-        else:
-            st.warning("Bitte stellen Sie sicher, dass die Gesamtzahl der gefahrenen Personenkilometer und die Modal-Split-Annahmen festgelegt wurden.")
-
-    ######## 6. Annahmen für die Emissonen alternativer Verkehrsmittel
-        # Initialisierung der benötigten Variablen, falls nicht vorhanden
-    if 'transportierte_fahrgaeste' not in st.session_state:
-        st.session_state['transportierte_fahrgaeste'] = 0
-    if 'entries_umfrage_pkm' not in st.session_state:
-        st.session_state['entries_umfrage_pkm'] = {}
-
-    mode_to_key_umfrage_pkm = {
-        "Verkehrsinduktion": "verkehrsinduktion",
-        "MIV (Fahrer)": "miv_fahrer",
-        "MIV (Mitfahrer)": "miv_mitfahrer",
-        "(Nahlinien-)Bus": "nahlinien_bus",
-        "Straßen-/Stadt-/U-Bahn": "strassen_stadt_u_bahn",
-        "Schienen(nah)verkehr/Bahn/Zug": "schienen_nah_verkehr_bahn_zug",
-        "Motorrad": "motorrad",
-        "E-Bike/Pedelec/E-Lastenrad": "e_bike_pedelec_e_lastenrad",
-        "Fahrrad/Lastenrad": "fahrrad_lastenrad",
-        "Zu Fuß": "zu_fuss",
-        "Sonstiges": "sonstiges"
-    }
-
-
-    with st.expander("**7. Emissionsdaten der Referenzmobilität im Bediengebiet (alternativ genutzter Verkehrsmittel) (Nutzung [TTW] und Energie [WTT])**"):
-        st.info("""**Hinweis:** Bitte geben Sie die CO2-Emissionsdaten für die alternativ genutzten Verkehrsmittel an. Sie können vorausgewählte Optionen wählen oder eigene Angaben tätigen.""")
-        # Vorauswahl der Emissionsdaten
-        vorauswahl_emissionsdaten_optionen_umfrage_pkm = ["Eigene Angaben", "Umweltbundesamt, Umweltfreundlich mobil! (2022)"]
-        selected_vorauswahl_emissionsdaten_umfrage_pkm = st.selectbox("Vorauswahl der Emissionsdaten:", vorauswahl_emissionsdaten_optionen_umfrage_pkm)
-
-        # Definieren der Standardemissionswerte basierend auf der Vorauswahl
-        if selected_vorauswahl_emissionsdaten_umfrage_pkm == "Umweltbundesamt, Umweltfreundlich mobil! (2022)":
-            emissionsdaten_defaults_umfrage_pkm = {
-                "verkehrsinduktion": 0.0,
-                "miv_fahrer": 152.86,
-                "miv_mitfahrer": 152.86,
-                "nahlinien_bus": 80.54,
-                "strassen_stadt_u_bahn": 58.79,
-                "schienen_nah_verkehr_bahn_zug": 58.79,
-                "motorrad": 90.0,
-                "e_bike_pedelec_e_lastenrad": 3.9,
-                "fahrrad_lastenrad": 0.0,
-                "zu_fuss": 0.0,
-                "sonstiges": 0.0
-            }
-        else:
-            emissionsdaten_defaults_umfrage_pkm = {key: 0 for key in mode_to_key_umfrage_pkm.values()}
-
-        # Eingabefelder für die Emissionsdaten
-        for mode in transport_modes_umfrage_pkm:
-            key = mode_to_key_umfrage_pkm[mode]
-            emission_umfrage_pkm = st.number_input(f"Annahmen Emissionsdaten {mode} [gCO2eq/pkm]:", min_value=0.0, value=float(emissionsdaten_defaults_umfrage_pkm.get(key, 0)))
-            st.session_state[f'emission_{key}'] = emission_umfrage_pkm
-
-        st.write("Die Emissionsdaten für die alternativ genutzten Verkehrsmittel betragen:")
-
-        for mode in transport_modes_umfrage_pkm:
-            key = mode_to_key_umfrage_pkm[mode]
-            personenkilometer = st.session_state.get(f'personenkilometer_{key}', 0)
-            emission_umfrage_pkm = st.session_state.get(f'emission_{key}', 0)
-            emissionen_umfrage_pkm = round(personenkilometer * emission_umfrage_pkm / 1000, 2)
-
-            col1, col2 = st.columns([3, 1])
-            with col1:
-                st.write(f"**Emissionen für {mode}:**")
-            with col2:
-                st.write(f"**{emissionen_umfrage_pkm} kg CO2eq**")
-
-        # Berechnung und Speicherung der Gesamtemissionen für alternative Verkehrsmittel
-        gesamtemissionen_av_umfrage_pkm = round(sum(
-            st.session_state.get(f'personenkilometer_{mode_to_key_umfrage_pkm[mode]}', 0) *
-            st.session_state.get(f'emission_{mode_to_key_umfrage_pkm[mode]}', 0) / 1000
-            for mode in transport_modes_umfrage_pkm if mode != "verkehrsinduktion"
-        ), 2)
-
-        st.session_state['gesamtemissionen_av_umfrage_pkm'] = gesamtemissionen_av_umfrage_pkm
-
-        col1, col2 = st.columns([3, 1])
-        with col1:
-            st.write("**Gesamtemissionen für Referenzmobilität im Bediengebiet:**")
-        with col2:
-            st.write(f"**{gesamtemissionen_av_umfrage_pkm} kg CO2eq**")
-
-        # Berechnen der Personenkilometer für alternative Verkehrsmittel
-        personenkilometer_gefahren_umfrage_pkm = round(sum(
-            st.session_state.get(f'personenkilometer_{mode_to_key_umfrage_pkm[mode]}', 0)
-            for mode in transport_modes_umfrage_pkm if mode != "verkehrsinduktion"
-        ), 2)
-
-        # Berechne die PErsonenkilometer gesamt für alternative Verkehrsmittel
-
-
-        st.session_state['personenkilometer_gefahren_umfrage_pkm'] = personenkilometer_gefahren_umfrage_pkm
-
-
-
-    ######## 8. Berechnung der Umweltwirkung alternativer Verkehrsmittel
-    with st.expander("**8. Berechnung der Umweltwirkung Referenzmobilität im Bediengebiet (alternativ genutzter Verkehrsmittel)**"):
-        st.info("""**Hinweis:** Im Folgenden wird die Umweltwirkung der Referenzmobilität im Bediengebiet (alternativ genutzter Verkehrsmittel( anhand von Umfragedaten (Umfragedaten, Personenkilometer) dargestellt. In der Abbildung wird der spezifische CO2-Ausstoß der Referenzmobilität im Bediengebiet denen anderer Verkehrsmittel gegenübergestellt. Die Kategoerie 'Sonstiges' wird durch die UBA-Quelle ("umweltfreundlich mobil!", 2022) nicht berücksichtigt.""")
-        # Überprüfen, ob alle erforderlichen Werte vorhanden sind, bevor Sie fortfahren
-        required_keys = ['gesamtemissionen_av_umfrage_pkm', 'personenkilometer_gefahren_umfrage_pkm']
-        if all(key in st.session_state for key in required_keys):
-            gesamtemissionen_av_umfrage_pkm = st.session_state['gesamtemissionen_av_umfrage_pkm']
-            personenkilometer_gefahren_umfrage_pkm = st.session_state['personenkilometer_gefahren_umfrage_pkm']
-
-            # Berechnung der Emissionen pro Personenkilometer
-            emissionen_pro_personenkilometer_av_umfrage_pkm = gesamtemissionen_av_umfrage_pkm / personenkilometer_gefahren_umfrage_pkm if personenkilometer_gefahren_umfrage_pkm > 0 else 0
-
-            # Speichere die berechneten Werte im Sitzungszustand
-            st.session_state['emissionen_pro_personenkilometer_av_umfrage_pkm'] = emissionen_pro_personenkilometer_av_umfrage_pkm
-
-            emissionen_data = {
-                'Referenzmobilität im Bediengebiet (alternative Verkehrsmittel)': emissionen_pro_personenkilometer_av_umfrage_pkm * 1000,
-                'Pkw - MIV (Fahrer) & MIV (Mitfahrer)': 152.86,
-                '(Nahlinien-)Bus': 80.54,
-                'Straßen-/Stadt-/U-Bahn': 59.30,
-                'Schienen(nah)verkehr/Bahn/Zug': 58.79,
-                'Motorrad': 173.3,
-                'E-Bike/Pedelec/E-Lastenrad': 3.9,
-                'Fahrrad/Lastenrad': 0.0,
-                'Zu Fuß': 0.0
-            }
-
-            # Diagramm erstellen
-            fig = go.Figure()
-            for verkehrsmittel, emissionen in emissionen_data.items():
-                fig.add_trace(go.Bar(name=verkehrsmittel, x=[verkehrsmittel], y=[emissionen], marker_line_color='rgb(0,0,0)', marker_line_width=1.5, opacity=0.7))
-            fig.update_layout(
-                barmode='group',
-                title='Gegenüberstellung der Emissionen pro Personenkilometer nach Verkehrsmittel - Well-to-Wheel (WTW)*',
-                legend=dict(
-                    orientation="v",  # vertikale Anordnung
-                    y=0.6,  # Positionierung der Legende
-                    x=1.02,  # Legende rechts vom Diagramm
-                    xanchor='left',
-                    yanchor='top'
-                ),
-                width=650,
-                height=650,
-                yaxis_title='Emissionen [g CO2/pkm]',
-                xaxis_tickangle=-45
-            )
-            st.plotly_chart(fig)
-
-            col1, col2 = st.columns([3, 1])
-            with col1:
-                st.write("**Gesamte CO2-Emissionen der Referenzmobilität im Bediengebiet (alternativ genutzter Verkehrsmittel):**")
-            with col2:
-                st.write(f"**{gesamtemissionen_av_umfrage_pkm} kg CO2**")
-            st.session_state['gesamtemissionen_av_umfrage_pkm'] = gesamtemissionen_av_umfrage_pkm
-
-            col1, col2 = st.columns([3, 1])
-            with col1:
-                st.write("**CO2-Emissionen der Referenzmobilität im Bediengebiet (alternativ genutzter Verkehrsmittel) pro Personenkilometer:**")
-            with col2:
-                st.write(f"**{emissionen_pro_personenkilometer_av_umfrage_pkm:.3f} g CO2/pkm**")
-
-            # SPEICHERN DER GLOBALEN VARIABLEN
-            st.session_state['emissionen_pro_personenkilometer_av_umfrage_pkm'] = emissionen_pro_personenkilometer_av_umfrage_pkm
-
-        else:
-            st.error("Bitte stellen Sie sicher, dass alle erforderlichen Daten vorhanden sind, um die Umweltwirkung der Referenzmobilität im Bediengebiet (alternativ genutzte Verkehrsmittel) zu berechnen.")
-
-    st.subheader("Vergleich der spezifischen CO2-Emissionen pro Personenkilometer für das Ridepooling-System und Referenzmobilität im Bediengebiet")
-
-
-######## 9. Vergleich
-    with st.expander("**9. Vergleich**"):
-        st.info("""**Hinweis:** Im Folgenden wird der spezifische CO2-Ausstoß pro Personenkilometer des Ridepooling-Systems mit denen der Referenzmobilität im Bediengebiet (alternativ genutzte Verkehrsmittel) verglichen.""")
-
-        'initialisierung der benötigten Variablen, falls nicht vorhanden'
-        if 'co2_emissionen_pro_personenkilometer_rps_umfrage_pkm' not in st.session_state:
-            st.session_state['co2_emissionen_pro_personenkilometer_rps_umfrage_pkm'] = 0.0
-        if 'emissionen_pro_personenkilometer_av_umfrage_pkm' not in st.session_state:
-            st.session_state['emissionen_pro_personenkilometer_av_umfrage_pkm'] = 0.0
-        if 'co2_emissionen_gesamt_rps_umfrage_pkm' not in st.session_state:
-            st.session_state['co2_emissionen_gesamt_rps_umfrage_pkm'] = 0.0
-        if 'gesamtemissionen_av_umfrage_pkm' not in st.session_state:
-            st.session_state['gesamtemissionen_av_umfrage_pkm'] = 0.0
-        if 'start_date' not in st.session_state:
-            st.session_state['start_date'] = ""
-        if 'end_date' not in st.session_state:
-            st.session_state['end_date'] = ""
-
-
-        # Überprüfen, ob alle erforderlichen Werte vorhanden sind, bevor Sie fortfahren
-        required_keys = ['emissionen_pro_personenkilometer_av_umfrage_pkm', 'co2_emissionen_pro_personenkilometer_rps', 'gesamtemissionen_av_umfrage_pkm', 'start_date', 'end_date']
-
-        if all(key in st.session_state for key in required_keys):
-            co2_emissionen_pro_personenkilometer_rps = st.session_state['co2_emissionen_pro_personenkilometer_rps']
-            emissionen_pro_personenkilometer_av_umfrage_pkm = st.session_state['emissionen_pro_personenkilometer_av_umfrage_pkm']
-
-            # Erstellung des Diagramms
-            emissionen_data = {
-                st.session_state['name_ridepooling_system']: co2_emissionen_pro_personenkilometer_rps * 1000,
-                'Referenzmobilität im Bediengebiet (alternativ genutzte Verkehrsmittel)': emissionen_pro_personenkilometer_av_umfrage_pkm * 1000
-            }
-
-            fig5 = go.Figure()
-            for verkehrsmittel, emissionen in emissionen_data.items():
-                fig5.add_trace(go.Bar(name=verkehrsmittel, x=[verkehrsmittel], y=[emissionen], marker_line_color='rgb(0,0,0)', marker_line_width=1.5, opacity=0.7))
-            fig5.update_layout(
-                barmode='group',
-                title='Gegenüberstellung der spezifischen CO2-Emissionen pro Personenkilometer - Well-to-Wheel (WTW)*',
-                legend=dict(
-                    orientation="v",  # vertikale Anordnung
-                    y=0.6,  # Positionierung der Legende
-                    x=1.02,  # Legende rechts vom Diagramm
-                    xanchor='left',
-                    yanchor='top'
-                ),
-                width=650,
-                height=650,
-                yaxis_title='Emissionen [g CO2/pkm]',
-                xaxis_tickangle=-45
-            )
-            st.plotly_chart(fig5)
-
-            #Get co2_emissionen_gesamt_rps, start_date, end_date, gesamtemissionen_av, und runde auf 2 Dezimalstellen
-            co2_emissionen_gesamt_rps = round(st.session_state['co2_emissionen_gesamt_rps'], 2)
-            gesamtemissionen_av_umfrage_pkm = st.session_state['gesamtemissionen_av_umfrage_pkm']
-            start_date = st.session_state['start_date']
-            end_date = st.session_state['end_date']
-
-            # Erstellung eines Textfeldes, in welchem die spezifischen CO2-Emissionen pro Personenkilometer des Ridepooling-Systems und der alternativ genutzten Verkehrsmittel verglichen werden
-            col1, col2 = st.columns([3, 1])
-            with col1:
-                st.write("**Gesamte CO2-Emissionen des Ridepooling-Systems:**")
-            with col2:
-                st.write(f"**{co2_emissionen_gesamt_rps:.2f} kg CO2**")
-
-            col1, col2 = st.columns([3, 1])
-            with col1:
-                st.write("**CO2-Emissionen des Ridepooling-Systems pro Personenkilometer:**")
-            with col2:
-                st.write(f"**{co2_emissionen_pro_personenkilometer_rps:.3f} kg CO2/pkm**")
-            
-            col1, col2 = st.columns([3, 1])
-            with col1:
-                st.write("**Gesamte CO2-Emissionen der Referenzmobilität im Bediengebiet (alternativ genutzte Verkehrsmittel):**")
-            with col2:
-                st.write(f"**{gesamtemissionen_av_umfrage_pkm} kg CO2**")
-
-            col1, col2 = st.columns([3, 1])
-            with col1:
-                st.write("**CO2-Emissionen der Referenzmobilität im Bediengebiet (alternativ genutzte Verkehrsmittel) pro Personenkilometer:**")
-            with col2:
-                st.write(f"**{emissionen_pro_personenkilometer_av_umfrage_pkm:.3f} kg CO2/pkm**")
-                         
-            # Erstelle ein Textfeld, in welchem je nach Ausgang des Vergleichs eine entsprechende Meldung ausgegeben wird
-            if emissionen_pro_personenkilometer_av_umfrage_pkm != 0:
-                if co2_emissionen_pro_personenkilometer_rps < emissionen_pro_personenkilometer_av_umfrage_pkm:
-                    percentage_difference = round((emissionen_pro_personenkilometer_av_umfrage_pkm - co2_emissionen_pro_personenkilometer_rps) / emissionen_pro_personenkilometer_av_umfrage_pkm * 100, 2)
-                    total_difference = round((gesamtemissionen_av_umfrage_pkm - co2_emissionen_gesamt_rps), 2)
-                    st.success(f"Das Ridepooling-System weist im Vergleich zu der Referenzmobilität im Bediengebiet (den alternativ genutzten Verkehrsmitteln) eine geringere spezifische CO2-Emission pro Personenkilometer auf. Die spezifische CO2-Emission pro Personenkilometer des Ridepooling-Systems ist um {percentage_difference} % niedriger als die der Referenzmobilität im Bediengebiet (alternativ genutzten Verkehrsmittel). Die Gesamtemissionen des Ridepoolings betragen {co2_emissionen_gesamt_rps} kg CO2, was im Betrachtungszeitraum ({start_date} bis {end_date}) zu einer Einsparung von {total_difference} kg CO2 im Vergleich zu der Referenzmobilität im Bediengebiet entspricht.")
-                elif co2_emissionen_pro_personenkilometer_rps > emissionen_pro_personenkilometer_av_umfrage_pkm:
-                    percentage_difference = round((co2_emissionen_pro_personenkilometer_rps - emissionen_pro_personenkilometer_av_umfrage_pkm) / emissionen_pro_personenkilometer_av_umfrage_pkm * 100, 2)
-                    total_difference = round((co2_emissionen_gesamt_rps - gesamtemissionen_av_umfrage_pkm), 2)
-                    st.error(f"Das Ridepooling-System weist im Vergleich zu der Referenzmobilität im Bediengebiet (den alternativ genutzten Verkehrsmitteln) eine höhere spezifische CO2-Emission pro Personenkilometer auf. Die spezifische CO2-Emission pro Personenkilometer des Ridepooling-Systems ist um {percentage_difference} % höher als die der Referenzmobilität im Bediengebiet (alternativ genutzten Verkehrsmitteln). Die Gesamtemissionen des Ridepoolings betragen {co2_emissionen_gesamt_rps} kg CO2, was im Betrachtungszeitraum ({start_date} bis {end_date}) zu einer Erhöhung von {total_difference} kg CO2 im Vergleich der Referenzmobilität im Bediengebiet entspricht.")
-                else:
-                    st.warning("Das Ridepooling-System und die Referenzmobilität im Bediengebiet (alternativ genutzten Verkehrsmittel) weisen die gleiche spezifische CO2-Emission pro Personenkilometer auf.")
-        else:
-            st.error("Bitte stellen Sie sicher, dass alle erforderlichen Daten vorhanden sind, um den Vergleich der spezifischen CO2-Emissionen pro Personenkilometer durchzuführen.")
-
-
-    #####
-    with st.expander("**10. Export der Eingabedaten und Ergebnisse**"):
-        # Stellen Sie sicher, dass alle erforderlichen Werte vorhanden sind, bevor Sie fortfahren
-        required_keys = [
-            'name_ridepooling_system', 'start_date', 'end_date', 'abgeschlossene_buchungen',
-            'transportierte_fahrgaeste', 'vehicle_list', 'fahrzeugkilometer_leer', 'fahrzeugkilometer_besetzt',
-            'fahrzeugkilometer_gesamt', 'personenkilometer_gefahren', 'benzinverbrauch_gesamt', 'dieselverbrauch_gesamt', 'stromverbrauch_gesamt',
-            'oekostrom_anteil', 'benzin_emissionsdaten', 'diesel_emissionsdaten', 'strom_emissionsdaten',
-            'co2_emissionen_gesamt_rps', 'co2_emissionen_pro_personenkilometer_rps', 'personenkilometer_gefahren_umfrage_pkm',
-            'gesamtemissionen_av_umfrage_pkm', 'emissionen_pro_personenkilometer_av_umfrage_pkm', 'entries_umfrage_pkm'
-        ]
-        missing_keys = [key for key in required_keys if key not in st.session_state]
-        if missing_keys:
-            st.error(f"Die folgenden Schlüssel fehlen: {', '.join(missing_keys)}")
-        else:
-            st.write("Die Eingabedaten und Ergebnisse können als CSV-Datei exportiert werden.")
-            if st.button("Exportieren"):
-                # Erstellen eines DataFrames mit den Eingabedaten und Ergebnissen des Ridepooling-Systems
-                data_rps = {
-                    "Merkmal": ["Wert"],
-                    "Ridepooling-System": [st.session_state['name_ridepooling_system']],
-                    "Betrachtungszeitraum (Start)": [f"{st.session_state['start_date']}"],
-                    "Betrachtungszeitraum (Ende)": [f"{st.session_state['end_date']}"],
-                    "Anzahl abgeschlossener Buchungen": [st.session_state['abgeschlossene_buchungen']],
-                    "Transportierte Fahrgäste": [st.session_state['transportierte_fahrgaeste']],
-                    "Flotte - Fahrzeugkilometer (leer)": [st.session_state['fahrzeugkilometer_leer']],
-                    "Flotte - Fahrzeugkilometer (besetzt)": [st.session_state['fahrzeugkilometer_besetzt']],
-                    "Flotte - Fahrzeugkilometer (gesamt)": [st.session_state['fahrzeugkilometer_gesamt']],
-                    "Flotte - Personenkilometer (gefahren)": [st.session_state['personenkilometer_gefahren']],
-                    "Flotte - Benzinverbrauch (gesamt)": [st.session_state['benzinverbrauch_gesamt']],
-                    "Flotte - Dieselverbrauch (gesamt)": [st.session_state['dieselverbrauch_gesamt']],
-                    "Flotte - Stromverbrauch (gesamt)": [st.session_state['stromverbrauch_gesamt']],
-                    "Ökostromanteil (%)": [st.session_state['oekostrom_anteil']],
-                    "CO2-Emissionsdaten (Benzin)": [st.session_state['benzin_emissionsdaten']],
-                    "CO2-Emissionsdaten (Diesel)": [st.session_state['diesel_emissionsdaten']],
-                    "CO2-Emissionsdaten (Strom)": [st.session_state['strom_emissionsdaten']],
-                    "CO2-Emissionen (gesamt)": [st.session_state['co2_emissionen_gesamt_rps']],
-                    "CO2-Emissionen pro Personenkilometer": [st.session_state['co2_emissionen_pro_personenkilometer_rps']]
-                }
-
-                df_rps = pd.DataFrame(data_rps).transpose()
-                df_rps.columns = df_rps.iloc[0]
-                df_rps = df_rps[1:]
-
-                # Erstellen eines DataFrames mit den Fahrzeugdaten
-                if 'vehicle_list' in st.session_state and st.session_state['vehicle_list']:
-                    vehicle_data = {
-                        "Fahrzeugtyp": [],
-                        "Benzinverbrauch (l/100km)": [],
-                        "Dieselverbrauch (l/100km)": [],
-                        "Stromverbrauch (kWh/100km)": [],
-                        "Kilometer leer": [],
-                        "Kilometer besetzt": []
-                    }
-                    for vehicle in st.session_state['vehicle_list']:
-                        if isinstance(vehicle, dict) and all(key in vehicle for key in ['Fahrzeugtyp', 'Kilometer leer', 'Kilometer besetzt']):
-                            vehicle_data["Fahrzeugtyp"].append(vehicle['Fahrzeugtyp'])
-                            vehicle_data["Benzinverbrauch (l/100km)"].append(vehicle['Benzinverbrauch (l/100km)'])
-                            vehicle_data["Dieselverbrauch (l/100km)"].append(vehicle['Dieselverbrauch (l/100km)'])
-                            vehicle_data["Stromverbrauch (kWh/100km)"].append(vehicle['Stromverbrauch (kWh/100km)'])
-                            vehicle_data["Kilometer leer"].append(vehicle['Kilometer leer'])
-                            vehicle_data["Kilometer besetzt"].append(vehicle['Kilometer besetzt'])
-
-                    df_vehicles = pd.DataFrame(vehicle_data)
-                else:
-                    st.error("No vehicles in the session state or 'vehicle_list' is not set.")
-                    df_vehicles = pd.DataFrame()
-
-                # Erstellen eines DataFrames mit den Emissionsdaten der alternativ genutzten Verkehrsmittel, Modal Split, Emissions
-                mode_to_key_umfrage_pkm = {
-                    "Verkehrsinduktion": "verkehrsinduktion",
-                    "MIV (Fahrer)": "miv_fahrer",
-                    "MIV (Mitfahrer)": "miv_mitfahrer",
-                    "(Nahlinien-)Bus": "nahlinien_bus",
-                    "Straßen-/Stadt-/U-Bahn": "strassen_stadt_u_bahn",
-                    "Schienen(nah)verkehr/Bahn/Zug": "schienen_nah_verkehr_bahn_zug",
-                    "Motorrad": "motorrad",
-                    "E-Bike/Pedelec/E-Lastenrad": "e_bike_pedelec_e_lastenrad",
-                    "Fahrrad/Lastenrad": "fahrrad_lastenrad",
-                    "Zu Fuß": "zu_fuss",
-                    "Sonstiges": "sonstiges"
-                }
-
-                data_av_umfrage_pkm = {
-                    "Merkmal": ["Wert"],
-                    "Gesamtemissionen Referenzmobilität im Bediengebiet (alternativ genutzter Verkehrsmittel) (kg CO2eq)": [st.session_state['gesamtemissionen_av_umfrage_pkm']],
-                    "Personenkilometer Referenzmobilität im Bediengebiet (alternativ genutzter Verkehrsmittel) (pkm)": [st.session_state['personenkilometer_gefahren_umfrage_pkm']],
-                    "CO2-Emissionen pro Personenkilometer der Referenzmobilität im Bediengebiet (alternativ genutzter Verkehrsmittel) (g CO2eq/pkm)": [st.session_state['emissionen_pro_personenkilometer_av_umfrage_pkm']]
-                }
-
-                # Hinzufügen der Modal Split Daten
-                for verkehrsmittel, anteil in st.session_state['entries_umfrage_pkm'].items():
-                    key = mode_to_key_umfrage_pkm.get(verkehrsmittel, verkehrsmittel)
-                    data_av_umfrage_pkm[f"Modal Split Anteil für {verkehrsmittel} (%)"] = [anteil]
-
-                # Hinzufügen der Personenkilometer und Emissionsdaten für alternative Verkehrsmittel
-                for mode in st.session_state['entries_umfrage_pkm']:
-                    key = mode_to_key_umfrage_pkm.get(mode, mode)
-                    personenkilometer = st.session_state.get(f'personenkilometer_{key}', 0)
-                    emissionsdaten = st.session_state.get(f'emission_{key}', 0)
-                    data_av_umfrage_pkm[f"Personenkilometer für {mode} (km)"] = [personenkilometer]
-                    data_av_umfrage_pkm[f"Emissionsdaten für {mode} (g CO2eq/pkm)"] = [emissionsdaten]
-
-                df_av_umfrage_pkm = pd.DataFrame(data_av_umfrage_pkm).transpose()
-                df_av_umfrage_pkm.columns = df_av_umfrage_pkm.iloc[0]
-                df_av_umfrage_pkm = df_av_umfrage_pkm[1:]
-
-                # Zusammenführen der DataFrames
-                df_combined = pd.concat([df_rps, df_vehicles, df_av_umfrage_pkm], axis=0)
-                df_combined = df_combined.replace('', np.nan)
-                st.write(df_combined)
-
-                # Export als CSV-Datei
-                csv = df_combined.to_csv(index=True)
-                st.download_button(label="CSV-Datei herunterladen", data=csv, file_name='eingabedaten_und_ergebnisse_umfrage_pkm.csv', mime='text/csv')
-
-        
 # Footer
 st.markdown("---")
 st.write("***Entwurfsfassung***")
@@ -0,0 +1,46 @@
+"""ÖkoRPS - Ökologische Bewertung von Ridepooling-Systemen (Rechenkern)."""
+from oekorps.engine import (
+    METHODEN,
+    MODAL_SPLIT_PKM,
+    MODAL_SPLIT_WEGE,
+    MODE_KEYS,
+    UMFRAGE_PKM,
+    UMFRAGE_WEGE,
+    BalanceInputs,
+    BalanceResult,
+    ComparisonResult,
+    EmissionFactors,
+    FleetResult,
+    ReferenceResult,
+    RpsResult,
+    Vehicle,
+    blend_strom_emissionsdaten,
+    compare_balances,
+    compute_balance,
+    compute_fleet_performance,
+    compute_reference_mobility,
+    compute_rps_emissions,
+)
+
+__all__ = [
+    'METHODEN',
+    'MODAL_SPLIT_PKM',
+    'MODAL_SPLIT_WEGE',
+    'MODE_KEYS',
+    'UMFRAGE_PKM',
+    'UMFRAGE_WEGE',
+    'BalanceInputs',
+    'BalanceResult',
+    'ComparisonResult',
+    'EmissionFactors',
+    'FleetResult',
+    'ReferenceResult',
+    'RpsResult',
+    'Vehicle',
+    'blend_strom_emissionsdaten',
+    'compare_balances',
+    'compute_balance',
+    'compute_fleet_performance',
+    'compute_reference_mobility',
+    'compute_rps_emissions',
+]
@@ -0,0 +1,3 @@
+from oekorps.cli import main
+
+raise SystemExit(main())
@@ -0,0 +1,116 @@
+"""Verkehrsmittelverteilung nach Entfernungsklassen.
+
+Die Anteile der Verkehrsmittel hängen stark von der Weglänge ab (kurze Wege zu
+Fuß, lange mit dem MIV). `DistanceBands` hält eine Verteilung je
+Entfernungsklasse einer Wege-Methodik; die Klasse einer Fahrt bzw. eines
+Histogramm-Intervalls wird über `np.searchsorted` auf den Klassengrenzen
+bestimmt. Für das Ziehen eines Verkehrsmittels je Fahrt liegen die kumulierten
+Anteile aller Klassen hintereinander in einem aufsteigenden Suchindex
+(Klasse + kumulierter Anteil), sodass eine einzige Suche Klasse und
+Verkehrsmittel zugleich auflöst.
+
+Es werden keine Klassenverteilungen mitgeliefert; die Werte (z. B. aus einer
+eigenen Auswertung der MiD 2017 nach Entfernungsklassen) gibt der Nutzer an.
+"""
+from dataclasses import dataclass, field
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from oekorps.engine import mode_key, modes_for
+from oekorps.modes import MODE_LABELS, is_wege, mode_vector
+
+# Spalte der oberen Klassengrenze in Tabellen; leer für die letzte, nach oben offene Klasse
+BIS_KM = "bis km"
+
+
+@dataclass(frozen=True, eq=False)
+class DistanceBands:
+    methodik: str
+    grenzen: np.ndarray  # km, obere Grenzen aller Klassen außer der letzten (aufsteigend)
+    anteile: np.ndarray  # % je Klasse und Verkehrsmittel, Form (Klassen, Verkehrsmittel)
+    _suchindex: np.ndarray = field(init=False, repr=False)
+
+    def __post_init__(self):
+        grenzen = np.asarray(self.grenzen, dtype=float)
+        anteile = np.atleast_2d(np.asarray(self.anteile, dtype=float))
+        if not is_wege(self.methodik):
+            raise ValueError("Entfernungsklassen gelten nur für Wege-Methoden (Anteile je Weg).")
+        if anteile.shape != (len(grenzen) + 1, len(modes_for(self.methodik))):
+            raise ValueError(f"Erwartet werden {len(grenzen) + 1} Klassen mit je {len(modes_for(self.methodik))} Anteilen.")
+        if not np.isfinite(grenzen).all() or (grenzen <= 0).any() or (np.diff(grenzen) <= 0).any():
+            raise ValueError("Die Klassengrenzen müssen positiv und aufsteigend sein.")
+        if (anteile < 0).any() or (anteile.sum(axis=1) <= 0).any():
+            raise ValueError("Jede Entfernungsklasse benötigt nicht negative Anteile mit einer Summe größer 0.")
+        # Suchindex: Klasse k belegt das Intervall (k, k + 1]; Verkehrsmittel ohne Anteil haben die Breite 0
+        kumuliert = np.cumsum(anteile / anteile.sum(axis=1, keepdims=True), axis=1)
+        kumuliert[:, -1] = 1.0
+        object.__setattr__(self, 'grenzen', grenzen)
+        object.__setattr__(self, 'anteile', anteile)
+        object.__setattr__(self, '_suchindex', (kumuliert + np.arange(len(anteile))[:, None]).ravel())
+
+    @classmethod
+    def flat(cls, methodik: str, anteile) -> "DistanceBands":
+        """Eine Klasse für alle Entfernungen (entspricht der Verteilung ohne Klassen)."""
+        return cls(methodik, np.zeros(0), np.asarray(anteile, dtype=float)[None, :])
+
+    @classmethod
+    def from_frame(cls, methodik: str, tabelle: pd.DataFrame) -> "DistanceBands":
+        """Klassen aus einer Tabelle mit der Spalte `BIS_KM` und einer Spalte je Verkehrsmittel (Name oder Schlüssel).
+
+        Zeilen werden nach der oberen Grenze sortiert; die Zeile ohne Grenze ist die
+        letzte Klasse. Fehlende Verkehrsmittel und leere Zellen zählen als 0.
+        """
+        if BIS_KM not in tabelle.columns:
+            raise ValueError(f"Die Tabelle der Entfernungsklassen enthält nicht die Spalte: {BIS_KM}")
+        tabelle = tabelle.dropna(how='all')
+        bis = pd.to_numeric(tabelle[BIS_KM], errors='coerce').fillna(np.inf).to_numpy()
+        if np.isinf(bis).sum() != 1:
+            raise ValueError(f"Genau eine Entfernungsklasse muss nach oben offen sein (leere Spalte '{BIS_KM}').")
+        reihenfolge = np.argsort(bis, kind='stable')
+        spalten = {}
+        for spalte in tabelle.columns.drop(BIS_KM):
+            try:
+                spalten[mode_key(str(spalte))] = spalte
+            except KeyError:
+                raise ValueError(f"Unbekanntes Verkehrsmittel in den Entfernungsklassen: {spalte}") from None
+        anteile = np.array([mode_vector(methodik, {key: zeile[spalte] for key, spalte in spalten.items() if pd.notna(zeile[spalte])})
+                            for _, zeile in tabelle.iloc[reihenfolge].iterrows()])
+        return cls(methodik, bis[reihenfolge][:-1], anteile)
+
+    def frame(self) -> pd.DataFrame:
+        """Tabelle mit `BIS_KM` und einer Spalte je Verkehrsmittel (Anzeigename)."""
+        tabelle = pd.DataFrame(self.anteile, columns=[MODE_LABELS[key] for key in modes_for(self.methodik)])
+        tabelle.insert(0, BIS_KM, np.append(self.grenzen, np.nan))
+        return tabelle
+
+    @property
+    def klassen(self) -> int:
+        return len(self.anteile)
+
+    def band_index(self, distanzen) -> np.ndarray:
+        """Klasse je Entfernung; eine Entfernung gleich einer Grenze gehört zur oberen Klasse."""
+        return np.searchsorted(self.grenzen, np.asarray(distanzen), side='right')
+
+    def shares_for(self, distanzen) -> np.ndarray:
+        """Anteile [%] je Entfernung, Form (Entfernungen, Verkehrsmittel)."""
+        return self.anteile[self.band_index(distanzen)]
+
+    def weighted_shares(self, distanzen, gewichte: Optional[np.ndarray] = None) -> np.ndarray:
+        """Verteilung über alle Fahrten bzw. Histogramm-Intervalle (Gewicht: Anzahl), normiert wie die Klassenanteile.
+
+        Das Ergebnis kann als Verteilung ohne Klassen (Abschnitt 6) verwendet werden.
+        """
+        gewicht_je_klasse = np.bincount(self.band_index(distanzen), weights=gewichte, minlength=self.klassen)
+        if gewicht_je_klasse.sum() <= 0:
+            raise ValueError("Keine Fahrten für die Gewichtung der Entfernungsklassen.")
+        normiert = self.anteile / self.anteile.sum(axis=1, keepdims=True)
+        return gewicht_je_klasse @ normiert / gewicht_je_klasse.sum() * 100
+
+    def draw(self, distanzen, zufall: np.ndarray) -> np.ndarray:
+        """Verkehrsmittel (Index in `modes_for(methodik)`) je Fahrt zu gleichverteilten Zufallszahlen in [0, 1)."""
+        klasse = self.band_index(distanzen)
+        position = np.searchsorted(self._suchindex, klasse + zufall, side='right')
+        m = self.anteile.shape[1]
+        return np.minimum(position - klasse * m, m - 1)
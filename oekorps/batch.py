@@ -0,0 +1,305 @@
+"""Vektorisierte Bilanzierung vieler Ridepooling-Systeme und Betrachtungszeiträume.
+
+Die Fahrzeugtabelle enthält eine Zeile je Fahrzeug(typ), System und Zeitraum.
+Flottensummen und Emissionen werden spaltenweise mit NumPy berechnet; die
+Formeln entsprechen `oekorps.engine`.
+
+Mit `run_scenarios` werden mehrere Szenarien (Methodik, Vorauswahlen,
+Emissionsdaten) in Blöcken aus Szenario und Zeilenbereich berechnet,
+optional verteilt auf mehrere Prozesse (`oekorps.parallel`).
+"""
+from dataclasses import dataclass
+from typing import Mapping, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from oekorps.engine import (
+    BENZINVERBRAUCH, DIESELVERBRAUCH, ENTFERNUNG_MIT_FAHRGAST, ENTFERNUNG_MIT_LEERKILOMETERN, KILOMETER_BESETZT, KILOMETER_LEER,
+    MODES_UMFRAGE, STROMVERBRAUCH, VERKEHRSINDUKTION, EmissionFactors, mode_key, modes_for,
+)
+from oekorps.modes import ModeTable, is_wege, reference_kernel
+from oekorps.parallel import Fortschritt, SharedArrays, attach, run_tasks
+
+BATCH_KEYS = ("name_ridepooling_system", "start_date", "end_date")
+LEISTUNG_SPALTEN = ("abgeschlossene_buchungen", "transportierte_fahrgaeste")
+FAKTOR_SPALTEN = ("benzin_emissionsdaten", "diesel_emissionsdaten", "strom_emissionsdaten", "oekostrom_anteil", "pv_emissionsdaten")
+
+
+def _divide(zaehler, nenner):
+    """Division mit 0 als Ergebnis für Nenner <= 0 (wie in der Anwendung)."""
+    nenner = np.asarray(nenner, dtype=float)
+    return np.divide(zaehler, nenner, out=np.zeros_like(nenner), where=nenner > 0)
+
+
+def compute_fleet_batch(fahrzeuge: pd.DataFrame, leistung: Optional[pd.DataFrame] = None, keys: Sequence[str] = BATCH_KEYS) -> pd.DataFrame:
+    """Fahrtleistung und Verbrauch je System und Zeitraum (Abschnitt 3).
+
+    `fahrzeuge` enthält die Schlüsselspalten und die Spalten der Fahrzeugliste.
+    Die Beförderungsleistung (`abgeschlossene_buchungen`, `transportierte_fahrgaeste`)
+    wird aus `leistung` übernommen oder, falls nicht angegeben, aus der ersten
+    Fahrzeugzeile je Gruppe.
+    """
+    keys = list(keys)
+    km_leer = fahrzeuge[KILOMETER_LEER].to_numpy(dtype=float)
+    km_besetzt = fahrzeuge[KILOMETER_BESETZT].to_numpy(dtype=float)
+    km_100 = (km_besetzt + km_leer) / 100
+    zeilen = pd.DataFrame({
+        'fahrzeugkilometer_leer': km_leer,
+        'fahrzeugkilometer_besetzt': km_besetzt,
+        'benzinverbrauch_gesamt': fahrzeuge[BENZINVERBRAUCH].to_numpy(dtype=float) * km_100,
+        'dieselverbrauch_gesamt': fahrzeuge[DIESELVERBRAUCH].to_numpy(dtype=float) * km_100,
+        'stromverbrauch_gesamt': fahrzeuge[STROMVERBRAUCH].to_numpy(dtype=float) * km_100,
+    })
+    for key in keys:
+        zeilen[key] = fahrzeuge[key].to_numpy()
+    summen = zeilen.groupby(keys, sort=False, dropna=False).sum().reset_index()
+
+    if leistung is None:
+        leistung = fahrzeuge.groupby(keys, sort=False, dropna=False)[list(LEISTUNG_SPALTEN)].first().reset_index()
+    result = summen.merge(leistung, on=keys, how='left', validate='one_to_one')
+
+    buchungen = result['abgeschlossene_buchungen'].fillna(0).to_numpy(dtype=float)
+    fahrgaeste = result['transportierte_fahrgaeste'].fillna(0).to_numpy(dtype=float)
+    km_leer = result['fahrzeugkilometer_leer'].to_numpy()
+    km_besetzt = result['fahrzeugkilometer_besetzt'].to_numpy()
+    km_gesamt = np.round(km_leer + km_besetzt, 2)
+    personenkilometer_gefahren = np.round(_divide(km_besetzt, buchungen) * fahrgaeste, 2)
+
+    result['fahrzeugkilometer_gesamt'] = km_gesamt
+    result['durchschnittliche_fahrtdistanz_mit_lk'] = np.round(_divide(km_gesamt, buchungen), 2)
+    result['durchschnittliche_fahrtdistanz_mit_bk'] = np.round(_divide(km_besetzt, buchungen), 2)
+    result['personenkilometer_gefahren'] = personenkilometer_gefahren
+    result['leerkilometeranteil'] = np.round(_divide(km_leer, km_gesamt) * 100, 2)
+    result['buendelungsquote'] = np.round(_divide(personenkilometer_gefahren, km_gesamt), 2)
+    result['besetzungsquote'] = np.round(_divide(personenkilometer_gefahren, km_besetzt), 2)
+    return result
+
+
+def _faktor(df: pd.DataFrame, spalte: str, standard: float) -> np.ndarray:
+    if spalte in df:
+        return df[spalte].fillna(standard).to_numpy(dtype=float)
+    return np.full(len(df), float(standard))
+
+
+def compute_rps_batch(flotte: pd.DataFrame, faktoren: EmissionFactors = EmissionFactors()) -> pd.DataFrame:
+    """Emissionen des Ridepooling-Systems je Zeile (Abschnitte 4 und 5).
+
+    Spalten aus `FAKTOR_SPALTEN` in `flotte` haben Vorrang vor `faktoren`;
+    `strom_emissionsdaten` ist der Faktor vor Berücksichtigung der sekundären Stromquelle.
+    """
+    result = flotte.copy()
+    benzin = _faktor(flotte, 'benzin_emissionsdaten', faktoren.benzin_emissionsdaten)
+    diesel = _faktor(flotte, 'diesel_emissionsdaten', faktoren.diesel_emissionsdaten)
+    strom = _faktor(flotte, 'strom_emissionsdaten', faktoren.strom_emissionsdaten)
+    oekostrom_anteil = _faktor(flotte, 'oekostrom_anteil', faktoren.oekostrom_anteil)
+    pv = _faktor(flotte, 'pv_emissionsdaten', faktoren.pv_emissionsdaten)
+    strom = np.round(strom * (1 - oekostrom_anteil / 100.0) + pv * (oekostrom_anteil / 100.0), 2)
+
+    benzin_emissionen = flotte['benzinverbrauch_gesamt'].to_numpy(dtype=float) * benzin / 1000
+    diesel_emissionen = flotte['dieselverbrauch_gesamt'].to_numpy(dtype=float) * diesel / 1000
+    strom_emissionen = flotte['stromverbrauch_gesamt'].to_numpy(dtype=float) * strom / 1000 * (1 - oekostrom_anteil / 100)
+    co2_emissionen_gesamt_rps = np.round(benzin_emissionen + diesel_emissionen + strom_emissionen, 4)
+
+    result['strom_emissionsdaten_adjustiert'] = strom
+    result['benzin_emissionen'] = benzin_emissionen
+    result['diesel_emissionen'] = diesel_emissionen
+    result['strom_emissionen'] = strom_emissionen
+    result['co2_emissionen_gesamt_rps'] = co2_emissionen_gesamt_rps
+    result['co2_emissionen_pro_personenkilometer_rps'] = np.round(
+        _divide(co2_emissionen_gesamt_rps, flotte['personenkilometer_gefahren'].to_numpy(dtype=float)), 4)
+    return result
+
+
+def _mode_matrix(df: pd.DataFrame, prefix: str, modes: Sequence[str], standard: Optional[Mapping]) -> np.ndarray:
+    """Matrix Zeilen x Verkehrsmittel; Spalten `<prefix>_<schlüssel>` haben Vorrang vor `standard`."""
+    standard = {mode_key(mode): float(value) for mode, value in (standard or {}).items()}
+    matrix = np.empty((len(df), len(modes)))
+    for j, key in enumerate(modes):
+        spalte = f'{prefix}_{key}'
+        if spalte in df:
+            matrix[:, j] = df[spalte].fillna(standard.get(key, 0.0)).to_numpy(dtype=float)
+        else:
+            matrix[:, j] = standard.get(key, 0.0)
+    return matrix
+
+
+def compute_reference_batch(flotte: pd.DataFrame, methodik: str, anteile: Optional[Mapping], emissionsfaktoren: Optional[Mapping],
+                            entfernungen: Union[Mapping, str, None] = None) -> pd.DataFrame:
+    """Referenzmobilität je Zeile (Abschnitte 6 bis 9).
+
+    Spalten `anteil_<schlüssel>`, `entfernung_<schlüssel>` und `emission_<schlüssel>`
+    in `flotte` haben Vorrang vor den übergebenen Vorauswahlen.
+    """
+    modes = modes_for(methodik)
+    anteil = _mode_matrix(flotte, 'anteil', modes, anteile)
+    emission = _mode_matrix(flotte, 'emission', modes, emissionsfaktoren)
+
+    entfernung = 0.0
+    if is_wege(methodik):
+        if isinstance(entfernungen, str):
+            spalte = {ENTFERNUNG_MIT_FAHRGAST: 'durchschnittliche_fahrtdistanz_mit_bk',
+                      ENTFERNUNG_MIT_LEERKILOMETERN: 'durchschnittliche_fahrtdistanz_mit_lk'}.get(entfernungen)
+            if spalte is None:
+                raise ValueError(f"Unbekannte Vorauswahl der Wegeentfernung: {entfernungen}")
+            entfernung = flotte[spalte].to_numpy(dtype=float)[:, None]
+        else:
+            entfernung = _mode_matrix(flotte, 'entfernung', modes, entfernungen)
+
+    personenkilometer, _, personenkilometer_gesamt_av, gesamtemissionen_av, emissionen_pro_personenkilometer_av = reference_kernel(
+        is_wege(methodik), anteil, entfernung, emission, np.array([key != VERKEHRSINDUKTION for key in modes]),
+        flotte['transportierte_fahrgaeste'].fillna(0).to_numpy(dtype=float), flotte['personenkilometer_gefahren'].to_numpy(dtype=float),
+    )
+
+    result = flotte.copy()
+    for j, key in enumerate(modes):
+        result[f'personenkilometer_{key}'] = personenkilometer[:, j]
+    result['methodik'] = methodik
+    result['personenkilometer_gesamt_av'] = personenkilometer_gesamt_av
+    result['gesamtemissionen_av'] = gesamtemissionen_av
+    result['emissionen_pro_personenkilometer_av'] = emissionen_pro_personenkilometer_av
+    return result
+
+
+def compare_batch(df: pd.DataFrame) -> pd.DataFrame:
+    """Vergleich Ridepooling-System und Referenzmobilität je Zeile (Abschnitt 10)."""
+    result = df.copy()
+    rps_pkm = df['co2_emissionen_pro_personenkilometer_rps'].to_numpy(dtype=float)
+    av_pkm = df['emissionen_pro_personenkilometer_av'].to_numpy(dtype=float)
+    rps_gesamt = np.round(df['co2_emissionen_gesamt_rps'].to_numpy(dtype=float), 2)
+    av_gesamt = df['gesamtemissionen_av'].to_numpy(dtype=float)
+
+    niedriger = (av_pkm != 0) & (rps_pkm < av_pkm)
+    hoeher = (av_pkm != 0) & (rps_pkm > av_pkm)
+    gleich = (av_pkm != 0) & (rps_pkm == av_pkm)
+    differenz = np.abs(av_pkm - rps_pkm)
+    result['ergebnis'] = np.select([niedriger, hoeher, gleich], ['niedriger', 'hoeher', 'gleich'], default=None)
+    result['percentage_difference'] = np.where(niedriger | hoeher, np.round(_divide(differenz, np.abs(av_pkm)) * 100, 2), 0.0)
+    result['total_difference'] = np.select([niedriger, hoeher], [np.round(av_gesamt - rps_gesamt, 2), np.round(rps_gesamt - av_gesamt, 2)], default=0.0)
+    return result
+
+
+def compute_batch(fahrzeuge: pd.DataFrame, leistung: Optional[pd.DataFrame] = None, faktoren: EmissionFactors = EmissionFactors(),
+                  keys: Sequence[str] = BATCH_KEYS, methodik: Optional[str] = None, anteile: Optional[Mapping] = None,
+                  emissionsfaktoren: Optional[Mapping] = None, entfernungen: Union[Mapping, str, None] = None) -> pd.DataFrame:
+    """Flotte und Emissionen des Ridepooling-Systems für alle Systeme und Zeiträume.
+
+    Mit `methodik` werden zusätzlich Referenzmobilität und Vergleich berechnet.
+    """
+    result = compute_rps_batch(compute_fleet_batch(fahrzeuge, leistung, keys), faktoren)
+    if methodik is None:
+        return result
+    return compare_batch(compute_reference_batch(result, methodik, anteile, emissionsfaktoren, entfernungen))
+
+
+def compare_methods(tabellen: Sequence[ModeTable], transportierte_fahrgaeste: float, personenkilometer_gefahren: float,
+                    co2_emissionen_gesamt_rps: float, co2_emissionen_pro_personenkilometer_rps: float) -> pd.DataFrame:
+    """Referenzmobilität und Vergleich (Abschnitte 6 bis 10) für mehrere Methoden in einer Rechnung.
+
+    Die Verkehrsmitteltabellen werden auf alle Verkehrsmittel (`MODES_UMFRAGE`)
+    ausgerichtet und gemeinsam über `reference_kernel` berechnet. Eine Zeile je
+    Tabelle mit `methodik`, `personenkilometer_<schlüssel>` und den Spalten von `compare_batch`.
+    """
+    form = (len(tabellen), len(MODES_UMFRAGE))
+    anteile, entfernungen, emissionsfaktoren, bilanziert = np.zeros(form), np.zeros(form), np.zeros(form), np.zeros(form, dtype=bool)
+    for i, tabelle in enumerate(tabellen):
+        spalten = [MODES_UMFRAGE.index(key) for key in tabelle.keys]
+        anteile[i, spalten] = tabelle.anteile
+        entfernungen[i, spalten] = tabelle.entfernungen
+        emissionsfaktoren[i, spalten] = tabelle.emissionsfaktoren
+        bilanziert[i, spalten] = tabelle.bilanziert
+
+    personenkilometer, _, personenkilometer_gesamt_av, gesamtemissionen_av, emissionen_pro_personenkilometer_av = reference_kernel(
+        np.array([tabelle.wege for tabelle in tabellen], dtype=bool), anteile, entfernungen, emissionsfaktoren, bilanziert,
+        np.full(len(tabellen), float(transportierte_fahrgaeste)), np.full(len(tabellen), float(personenkilometer_gefahren)),
+    )
+
+    result = pd.DataFrame({'methodik': [tabelle.methodik for tabelle in tabellen]})
+    for j, key in enumerate(MODES_UMFRAGE):
+        result[f'personenkilometer_{key}'] = personenkilometer[:, j]
+    result['personenkilometer_gesamt_av'] = personenkilometer_gesamt_av
+    result['gesamtemissionen_av'] = gesamtemissionen_av
+    result['emissionen_pro_personenkilometer_av'] = emissionen_pro_personenkilometer_av
+    result['co2_emissionen_gesamt_rps'] = float(co2_emissionen_gesamt_rps)
+    result['co2_emissionen_pro_personenkilometer_rps'] = float(co2_emissionen_pro_personenkilometer_rps)
+    return compare_batch(result)
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    methodik: str
+    anteile: Optional[Mapping] = None
+    emissionsfaktoren: Optional[Mapping] = None
+    entfernungen: Union[Mapping, str, None] = None  # Wegeentfernungen oder Vorauswahl nach Fahrtdistanz
+    faktoren: EmissionFactors = EmissionFactors()
+
+
+# Zeilen je Block; wie bei der Monte-Carlo-Simulation unabhängig von der Zahl der Prozesse
+ZEILEN_JE_BLOCK = 50_000
+
+
+def _mode_vector(werte: Optional[Mapping]) -> np.ndarray:
+    """Werte je Verkehrsmittel über alle Verkehrsmittel (`MODES_UMFRAGE`), fehlende als 0."""
+    werte = {mode_key(mode): float(value) for mode, value in (werte or {}).items()}
+    return np.array([werte.get(key, 0.0) for key in MODES_UMFRAGE])
+
+
+def _scenario_block(handles: Mapping, spalten: tuple, start: int, stop: int, index: int, methodik: str,
+                    entfernung_vorauswahl: Optional[str]) -> dict:
+    """Szenario `index` für die Zeilen `start:stop`; gibt die neu berechneten Spalten zurück."""
+    with attach(handles) as arrays:
+        flotte = pd.DataFrame({name: arrays['flotte'][i, start:stop].copy() for i, name in enumerate(spalten)})
+        anteile, emission, entfernung, faktoren = (arrays[name][index].copy() for name in ('anteile', 'emission', 'entfernung', 'faktoren'))
+
+    def je_verkehrsmittel(werte):
+        return {key: float(werte[MODES_UMFRAGE.index(key)]) for key in modes_for(methodik)}
+
+    result = compare_batch(compute_reference_batch(
+        compute_rps_batch(flotte, EmissionFactors(*faktoren.tolist())), methodik, je_verkehrsmittel(anteile),
+        je_verkehrsmittel(emission), entfernung_vorauswahl or je_verkehrsmittel(entfernung)))
+    return {spalte: result[spalte].to_numpy() for spalte in result.columns if spalte not in flotte.columns}
+
+
+def run_scenarios(flotte: pd.DataFrame, szenarien: Sequence[Scenario], prozesse: int = 1, zeilen_je_block: int = ZEILEN_JE_BLOCK,
+                  fortschritt: Optional[Fortschritt] = None) -> pd.DataFrame:
+    """Abschnitte 4 bis 10 für jedes Szenario auf der Flotte aus `compute_fleet_batch`.
+
+    Das Ergebnis enthält je Szenario alle Zeilen von `flotte` mit der Spalte
+    `szenario`; für ein Szenario entsprechen die übrigen Spalten `compute_batch`.
+    Flotte und Szenarien liegen für die Prozesse in gemeinsamem Speicher.
+    """
+    szenarien = list(szenarien)
+    if not szenarien:
+        raise ValueError("Keine Szenarien angegeben.")
+    zahlen = flotte.select_dtypes('number')
+    spalten = tuple(zahlen.columns)
+    arrays = {
+        'flotte': zahlen.to_numpy(dtype=float).T,  # eine Zeile je Spalte: Blöcke sind zusammenhängend
+        'anteile': np.array([_mode_vector(szenario.anteile) for szenario in szenarien]),
+        'emission': np.array([_mode_vector(szenario.emissionsfaktoren) for szenario in szenarien]),
+        'entfernung': np.array([_mode_vector(None if isinstance(szenario.entfernungen, str) else szenario.entfernungen)
+                                for szenario in szenarien]),
+        'faktoren': np.array([[szenario.faktoren.benzin_emissionsdaten, szenario.faktoren.diesel_emissionsdaten,
+                               szenario.faktoren.strom_emissionsdaten, szenario.faktoren.oekostrom_anteil,
+                               szenario.faktoren.pv_emissionsdaten] for szenario in szenarien], dtype=float),
+    }
+    zeilen = len(flotte)
+    grenzen = [(start, min(start + zeilen_je_block, zeilen)) for start in range(0, zeilen, zeilen_je_block)] or [(0, 0)]
+    bloecke = [(index, start, stop) for index in range(len(szenarien)) for start, stop in grenzen]
+
+    with SharedArrays(arrays) as gemeinsam:
+        argumente = [(gemeinsam.handles, spalten, start, stop, index, szenarien[index].methodik,
+                      szenarien[index].entfernungen if isinstance(szenarien[index].entfernungen, str) else None)
+                     for index, start, stop in bloecke]
+        ergebnisse = run_tasks(_scenario_block, argumente, prozesse, fortschritt)
+
+    tabellen = []
+    for index, szenario in enumerate(szenarien):
+        teile = [ergebnis for (i, _, _), ergebnis in zip(bloecke, ergebnisse) if i == index]
+        result = flotte.copy()
+        for spalte in teile[0]:
+            result[spalte] = np.concatenate([teil[spalte] for teil in teile])
+        result.insert(0, 'szenario', szenario.name)
+        tabellen.append(result)
+    return pd.concat(tabellen, ignore_index=True)
@@ -0,0 +1,220 @@
+"""Kommandozeile für die Bilanzierung ohne Streamlit-Server.
+
+Beispiel:
+    python -m oekorps compute --input systeme.csv --method "Modal Split (Wege)" --out ergebnisse.parquet
+
+Die Eingabetabelle enthält eine Zeile je Fahrzeug(typ), System und Zeitraum mit
+den Spalten der Fahrzeugliste sowie `abgeschlossene_buchungen` und
+`transportierte_fahrgaeste`. Optional überschreiben Spalten `anteil_<schlüssel>`,
+`entfernung_<schlüssel>` und `emission_<schlüssel>` die Vorauswahlen je Gruppe.
+
+Mit mehreren Methoden oder `--processes` wird jede Methodik als Szenario
+berechnet (Spalte `szenario`), auf Wunsch verteilt auf mehrere Prozesse:
+    python -m oekorps compute --input systeme.csv --method "Modal Split (Wege)" "Umfrage (Pkm)" --processes 8 --out ergebnisse.parquet
+
+Fahrtdaten aus dem Buchungssystem werden blockweise zu Bilanzen je Zeitraum verdichtet:
+    python -m oekorps trips --input fahrten.csv --vehicles fahrzeuge.csv --period Monat --method "Umfrage (Pkm)" --out monate.csv
+
+Mit `--strom-reihe` gilt je Zeitraum der Emissionsfaktor für Strom aus einer
+stündlichen oder monatlichen Zeitreihe der Netzintensität und `--ladeprofil`.
+
+Mit `--store` werden alle berechneten Bilanzen im Bilanzspeicher abgelegt und
+können später abgefragt werden:
+    python -m oekorps history --store bilanzen.sqlite --system LOOPmünster --von 2021 --bis 2025 --method "Umfrage (Pkm)"
+"""
+import argparse
+import sqlite3
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+from oekorps import presets
+from oekorps.batch import BATCH_KEYS, LEISTUNG_SPALTEN, ZEILEN_JE_BLOCK, Scenario, compute_batch, compute_fleet_batch, run_scenarios
+from oekorps.engine import METHODEN, MODAL_SPLIT_WEGE, UMFRAGE_WEGE, EmissionFactors
+from oekorps.fleet import read_fleet, read_table
+from oekorps.grid import open_grid_series, with_grid_factors
+from oekorps.store import RunStore
+from oekorps.trips import BLOCKZEILEN, ZEITRAEUME, aggregate_trips, compute_trip_balance
+
+
+def write_table(df: pd.DataFrame, path) -> None:
+    """Schreibt eine Tabelle anhand der Dateiendung; wie beim Lesen kein altes Excel-Format (.xls)."""
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == '.xls':
+        raise ValueError("Excel-Dateien im alten Format (.xls) werden nicht unterstützt; bitte als .xlsx speichern.")
+    if suffix == '.parquet':
+        df.to_parquet(path, index=False)
+    elif suffix == '.xlsx':
+        df.to_excel(path, index=False, engine='openpyxl')
+    elif suffix == '.json':
+        df.to_json(path, orient='records', force_ascii=False, date_format='iso')
+    else:
+        df.to_csv(path, index=False)
+
+
+def _emissionsdaten(wert: str, optionen: dict) -> float:
+    """Zahlenwert oder Name einer Vorauswahl."""
+    if wert in optionen:
+        return float(optionen[wert])
+    try:
+        return float(wert)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Unbekannte Vorauswahl: {wert}") from None
+
+
+def _add_balance_arguments(parser: argparse.ArgumentParser) -> None:
+    """Vorauswahlen und Emissionsdaten (Abschnitte 4 und 6 bis 8)."""
+    parser.add_argument('--modal-split', help="Vorauswahl der Verkehrsmittelverteilung (Standard: erste Vorauswahl der Methodik)")
+    parser.add_argument('--entfernung', default=presets.REISEWEITEN_MID_2017_NAME, choices=presets.ENTFERNUNG_OPTIONEN,
+                        help="Vorauswahl der Wegeentfernung (nur Wege-Methoden)")
+    parser.add_argument('--emissionsdaten-av', default=presets.EMISSIONSDATEN_UBA_2022_NAME, choices=list(presets.EMISSIONSDATEN_AV_OPTIONEN),
+                        help="Emissionsdaten der alternativ genutzten Verkehrsmittel")
+    parser.add_argument('--benzin', default="DIN EN 16258:2013, Tabelle A.2 [CO2eq]", help="Emissionsdaten Benzin [g/l] oder Vorauswahl")
+    parser.add_argument('--diesel', default="DIN EN 16258:2013, Tabelle A.4 [CO2eq]", help="Emissionsdaten Diesel [g/l] oder Vorauswahl")
+    parser.add_argument('--strom', default="LANUK Emissionsfaktoren der Klimaneutralen Landesverwaltung: Strommix DE, 2022 [CO2eq]",
+                        help="Emissionsdaten Strom [g/kWh] oder Vorauswahl")
+    parser.add_argument('--oekostrom-anteil', type=float, default=0.0, help="Anteil der sekundären Stromquelle [%%]")
+    parser.add_argument('--pv-emissionsdaten', type=float, default=50.0, help="Emissionsfaktor der sekundären Stromquelle [g/kWh]")
+    parser.add_argument('--strom-reihe', help="Zeitreihe der Netzintensität (stündlich oder monatlich; Tabelle oder .npy) statt --strom")
+    parser.add_argument('--ladeprofil', default=next(iter(presets.LADEPROFILE)), choices=list(presets.LADEPROFILE),
+                        help="Ladeprofil für --strom-reihe")
+    parser.add_argument('--store', help="Bilanzspeicher (SQLite-Datei), in dem alle berechneten Bilanzen abgelegt werden")
+
+
+def _zeitpunkt(wert: str):
+    """Jahr (z. B. 2021) oder Tag (JJJJ-MM-TT) für Abfragen des Bilanzspeichers."""
+    return int(wert) if wert.isdigit() else wert
+
+
+def _fortschritt(erledigt: int, gesamt: int) -> None:
+    print(f"\r{erledigt}/{gesamt} Blöcke", end="\n" if erledigt == gesamt else "", file=sys.stderr, flush=True)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='oekorps', description="ÖkoRPS - Ökologische Bewertung von Ridepooling-Systemen")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    compute = subparsers.add_parser('compute', help="THG-Bilanz für alle Systeme und Zeiträume einer Tabelle berechnen")
+    compute.add_argument('--input', required=True, help="Fahrzeugtabelle (CSV, Parquet, Excel, JSON)")
+    compute.add_argument('--leistung', help="Optionale Tabelle mit Beförderungsleistung und Faktoren je System und Zeitraum")
+    compute.add_argument('--out', required=True, help="Ergebnisdatei; das Format folgt der Dateiendung")
+    compute.add_argument('--method', required=True, nargs='+', choices=METHODEN, help="Methodik der Referenzmobilität (eine oder mehrere)")
+    compute.add_argument('--keys', default=",".join(BATCH_KEYS), help="Schlüsselspalten (kommagetrennt)")
+    _add_balance_arguments(compute)
+    compute.add_argument('--processes', type=int, default=1, help="Anzahl der Prozesse für die Szenarien (Standard: 1)")
+    compute.add_argument('--chunk-rows', type=int, default=ZEILEN_JE_BLOCK, help="Zeilen je Block bei der Szenarienrechnung")
+
+    trips = subparsers.add_parser('trips', help="Fahrtdaten je Zeitraum zusammenfassen und bilanzieren")
+    trips.add_argument('--input', required=True, help="Fahrtliste (CSV oder Parquet, blockweise gelesen)")
+    trips.add_argument('--vehicles', required=True, help="Fahrzeugtabelle mit dem Verbrauch je Fahrzeug (Fahrzeugtyp = Fahrzeug-ID)")
+    trips.add_argument('--out', required=True, help="Ergebnisdatei; das Format folgt der Dateiendung")
+    trips.add_argument('--period', default='Monat', choices=list(ZEITRAEUME), help="Zeitraum je Bilanz")
+    trips.add_argument('--system', default="", help="Name des Ridepooling-Systems")
+    trips.add_argument('--method', required=True, choices=METHODEN, help="Methodik der Referenzmobilität")
+    trips.add_argument('--chunk-rows', type=int, default=BLOCKZEILEN, help="Zeilen je gelesenem Block")
+    _add_balance_arguments(trips)
+
+    history = subparsers.add_parser('history', help="Gespeicherte Bilanzen aus dem Bilanzspeicher abfragen")
+    history.add_argument('--store', help="Bilanzspeicher (SQLite-Datei); Standard: OEKORPS_SPEICHER bzw. oekorps_bilanzen.sqlite")
+    history.add_argument('--system', help="Name des Ridepooling-Systems")
+    history.add_argument('--method', choices=METHODEN, help="Methodik der Referenzmobilität")
+    history.add_argument('--von', type=_zeitpunkt, help="Beginn des Zeitraums (Jahr oder JJJJ-MM-TT)")
+    history.add_argument('--bis', type=_zeitpunkt, help="Ende des Zeitraums (Jahr oder JJJJ-MM-TT)")
+    history.add_argument('--out', help="Ergebnisdatei; ohne Angabe als Tabelle auf der Standardausgabe")
+    return parser
+
+
+def _faktoren(args) -> EmissionFactors:
+    return EmissionFactors(
+        benzin_emissionsdaten=_emissionsdaten(args.benzin, presets.BENZIN_EMISSIONSDATEN_OPTIONEN),
+        diesel_emissionsdaten=_emissionsdaten(args.diesel, presets.DIESEL_EMISSIONSDATEN_OPTIONEN),
+        strom_emissionsdaten=_emissionsdaten(args.strom, presets.STROM_EMISSIONSDATEN_OPTIONEN),
+        oekostrom_anteil=args.oekostrom_anteil,
+        pv_emissionsdaten=args.pv_emissionsdaten,
+    )
+
+
+def _scenario(args, methodik: str, faktoren: EmissionFactors) -> Scenario:
+    """Vorauswahlen der Kommandozeile für eine Methodik."""
+    modal_split = args.modal_split or presets.default_modal_split(methodik)
+    entfernungen = None
+    if methodik in (MODAL_SPLIT_WEGE, UMFRAGE_WEGE):
+        entfernungen = dict(presets.REISEWEITEN_MID_2017) if args.entfernung == presets.REISEWEITEN_MID_2017_NAME else args.entfernung
+    return Scenario(methodik, methodik, presets.modal_split_shares(methodik, modal_split),
+                    dict(presets.EMISSIONSDATEN_AV_OPTIONEN[args.emissionsdaten_av]), entfernungen, faktoren)
+
+
+def run_compute(args) -> pd.DataFrame:
+    faktoren = _faktoren(args)
+    szenarien = [_scenario(args, methodik, faktoren) for methodik in dict.fromkeys(args.method)]
+
+    fahrzeuge = read_table(args.input)
+    leistung = read_table(args.leistung) if args.leistung else None
+    keys = [key.strip() for key in args.keys.split(",") if key.strip()]
+    if args.strom_reihe:
+        if not {'start_date', 'end_date'} <= set(keys):
+            raise ValueError("--strom-reihe benötigt die Schlüsselspalten start_date und end_date.")
+        if leistung is None:
+            leistung = fahrzeuge.groupby(keys, sort=False, dropna=False)[list(LEISTUNG_SPALTEN)].first().reset_index()
+        leistung = with_grid_factors(leistung, open_grid_series(args.strom_reihe), presets.LADEPROFILE[args.ladeprofil])
+    if len(szenarien) == 1 and args.processes <= 1:
+        szenario = szenarien[0]
+        return compute_batch(fahrzeuge, leistung, faktoren, keys, methodik=szenario.methodik, anteile=szenario.anteile,
+                             emissionsfaktoren=szenario.emissionsfaktoren, entfernungen=szenario.entfernungen)
+    return run_scenarios(compute_fleet_batch(fahrzeuge, leistung, keys), szenarien, args.processes, args.chunk_rows, _fortschritt)
+
+
+def run_trips(args) -> pd.DataFrame:
+    faktoren = _faktoren(args)
+    szenario = _scenario(args, args.method, faktoren)
+    summen = aggregate_trips(args.input, zeitraum=args.period, blockzeilen=args.chunk_rows)
+    netz = open_grid_series(args.strom_reihe) if args.strom_reihe else None
+    return compute_trip_balance(summen, read_fleet(args.vehicles), faktoren, args.system, szenario.methodik, szenario.anteile,
+                                szenario.emissionsfaktoren, szenario.entfernungen, netz, presets.LADEPROFILE[args.ladeprofil])
+
+
+def store_results(args, result: pd.DataFrame) -> int:
+    """Bilanzen der Kommandozeile im Bilanzspeicher ablegen; Eingaben sind die Argumente des Aufrufs.
+
+    Die Methodik steht je Bilanz in den Ergebnissen, sodass eine Bilanz unabhängig
+    von den übrigen Methoden desselben Aufrufs nur einmal gespeichert wird.
+    """
+    eingaben = {name: wert for name, wert in vars(args).items() if name not in ('store', 'out', 'processes', 'chunk_rows', 'method')}
+    with RunStore(args.store) as store:
+        return store.record_many(result.drop(columns='szenario', errors='ignore').to_dict('records'), eingaben, quelle="cli")
+
+
+def run_history(args) -> pd.DataFrame:
+    with RunStore(args.store) as store:
+        return store.query(args.system, args.method, args.von, args.bis)
+
+
+def main(argv=None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        if args.command == 'compute':
+            result = run_compute(args)
+            write_table(result, args.out)
+            print(f"{len(result)} Bilanzen geschrieben: {args.out}", file=sys.stderr)
+        elif args.command == 'trips':
+            result = run_trips(args)
+            write_table(result, args.out)
+            print(f"{len(result)} Zeiträume geschrieben: {args.out}", file=sys.stderr)
+        elif args.command == 'history':
+            result = run_history(args)
+            if args.out:
+                write_table(result, args.out)
+            else:
+                print(result.to_string(index=False))
+            return 0
+        if args.store:
+            print(f"{store_results(args, result)} neue Bilanzen gespeichert: {args.store}", file=sys.stderr)
+    except (argparse.ArgumentTypeError, ImportError, KeyError, ValueError, OSError, sqlite3.Error) as error:
+        parser.error(str(error))
+    except KeyboardInterrupt:
+        print("Abgebrochen.", file=sys.stderr)
+        return 130
+    return 0
@@ -0,0 +1,376 @@
+"""Rechenkern der ÖkoRPS-Bilanzierung ohne Streamlit-Abhängigkeit.
+
+Die Funktionen bilden die Formeln der Abschnitte 3 bis 10 der Anwendung ab
+und können sowohl von der Streamlit-Seite als auch aus einem einfachen
+Python-Prozess heraus aufgerufen werden.
+"""
+from dataclasses import asdict, dataclass, field
+from datetime import date
+from typing import Iterable, Mapping, Optional, Sequence, Union
+
+# Methoden zur Berechnung der Referenzmobilität
+MODAL_SPLIT_WEGE = "Modal Split (Wege)"
+MODAL_SPLIT_PKM = "Modal Split (Pkm)"
+UMFRAGE_WEGE = "Umfrage (Wege)"
+UMFRAGE_PKM = "Umfrage (Pkm)"
+METHODEN = (MODAL_SPLIT_WEGE, MODAL_SPLIT_PKM, UMFRAGE_WEGE, UMFRAGE_PKM)
+
+# Verkehrsmittel der Referenzmobilität (Anzeigename -> Schlüssel)
+MODE_KEYS = {
+    "Verkehrsinduktion": "verkehrsinduktion",
+    "MIV (Fahrer)": "miv_fahrer",
+    "MIV (Mitfahrer)": "miv_mitfahrer",
+    "(Nahlinien-)Bus": "nahlinien_bus",
+    "Straßen-/Stadt-/U-Bahn": "strassen_stadt_u_bahn",
+    "Schienen(nah)verkehr/Bahn/Zug": "schienen_nah_verkehr_bahn_zug",
+    "Motorrad": "motorrad",
+    "E-Bike/Pedelec/E-Lastenrad": "e_bike_pedelec_e_lastenrad",
+    "Fahrrad/Lastenrad": "fahrrad_lastenrad",
+    "zu Fuß": "zu_fuss",
+    "Sonstiges": "sonstiges",
+}
+VERKEHRSINDUKTION = "verkehrsinduktion"
+
+# Die Umfrage-Methoden erfassen zusätzlich die Verkehrsinduktion
+MODES_MODAL_SPLIT = tuple(key for key in MODE_KEYS.values() if key != VERKEHRSINDUKTION)
+MODES_UMFRAGE = tuple(MODE_KEYS.values())
+
+# Vorauswahl der Wegeentfernung auf Basis der Fahrtleistung des Ridepooling-Systems
+ENTFERNUNG_MIT_FAHRGAST = "Durchschnittliche Fahrtdistanz je Buchung (mit Fahrgast)"
+ENTFERNUNG_MIT_LEERKILOMETERN = "Durchschnittliche Fahrtdistanz je Buchung (einschließlich Leerkilometern)"
+
+# Spaltennamen der Fahrzeugliste, wie sie in der Anwendung verwendet werden
+FAHRZEUGTYP = "Fahrzeugtyp"
+BENZINVERBRAUCH = "Benzinverbrauch (l/100km)"
+DIESELVERBRAUCH = "Dieselverbrauch (l/100km)"
+STROMVERBRAUCH = "Stromverbrauch (kWh/100km)"
+KILOMETER_LEER = "Kilometer leer"
+KILOMETER_BESETZT = "Kilometer besetzt"
+FAHRZEUG_SPALTEN = (FAHRZEUGTYP, BENZINVERBRAUCH, DIESELVERBRAUCH, STROMVERBRAUCH, KILOMETER_LEER, KILOMETER_BESETZT)
+
+
+def mode_key(mode: str) -> str:
+    """Liefert den Schlüssel eines Verkehrsmittels (Anzeigename oder Schlüssel)."""
+    if mode in MODE_KEYS.values():
+        return mode
+    if mode == "Zu Fuß":
+        return "zu_fuss"
+    return MODE_KEYS[mode]
+
+
+def modes_for(methodik: str) -> tuple:
+    """Verkehrsmittel, die für die gewählte Methodik abgefragt werden."""
+    if methodik in (UMFRAGE_WEGE, UMFRAGE_PKM):
+        return MODES_UMFRAGE
+    if methodik in (MODAL_SPLIT_WEGE, MODAL_SPLIT_PKM):
+        return MODES_MODAL_SPLIT
+    raise ValueError(f"Unbekannte Methodik: {methodik}")
+
+
+@dataclass(frozen=True)
+class Vehicle:
+    fahrzeugtyp: str
+    benzinverbrauch: float = 0.0  # l/100km
+    dieselverbrauch: float = 0.0  # l/100km
+    stromverbrauch: float = 0.0  # kWh/100km
+    kilometer_leer: float = 0.0
+    kilometer_besetzt: float = 0.0
+
+    @classmethod
+    def from_record(cls, record: Mapping) -> "Vehicle":
+        """Erzeugt ein Fahrzeug aus einer Zeile der Fahrzeugtabelle."""
+        return cls(
+            fahrzeugtyp=str(record.get(FAHRZEUGTYP, "")),
+            benzinverbrauch=float(record.get(BENZINVERBRAUCH, 0.0)),
+            dieselverbrauch=float(record.get(DIESELVERBRAUCH, 0.0)),
+            stromverbrauch=float(record.get(STROMVERBRAUCH, 0.0)),
+            kilometer_leer=float(record.get(KILOMETER_LEER, 0.0)),
+            kilometer_besetzt=float(record.get(KILOMETER_BESETZT, 0.0)),
+        )
+
+    def to_record(self) -> dict:
+        return {
+            FAHRZEUGTYP: self.fahrzeugtyp,
+            BENZINVERBRAUCH: self.benzinverbrauch,
+            DIESELVERBRAUCH: self.dieselverbrauch,
+            STROMVERBRAUCH: self.stromverbrauch,
+            KILOMETER_LEER: self.kilometer_leer,
+            KILOMETER_BESETZT: self.kilometer_besetzt,
+        }
+
+
+VehicleLike = Union[Vehicle, Mapping]
+
+
+def as_vehicles(vehicles: Iterable[VehicleLike]) -> tuple:
+    return tuple(v if isinstance(v, Vehicle) else Vehicle.from_record(v) for v in vehicles)
+
+
+@dataclass(frozen=True)
+class EmissionFactors:
+    benzin_emissionsdaten: float = 2880.0  # g/l
+    diesel_emissionsdaten: float = 3170.0  # g/l
+    strom_emissionsdaten: float = 498.0  # g/kWh, vor Berücksichtigung der sekundären Stromquelle
+    oekostrom_anteil: float = 0.0  # %
+    pv_emissionsdaten: float = 50.0  # g/kWh
+
+    @property
+    def strom_emissionsdaten_adjustiert(self) -> float:
+        return blend_strom_emissionsdaten(self.strom_emissionsdaten, self.pv_emissionsdaten, self.oekostrom_anteil)
+
+
+@dataclass(frozen=True)
+class FleetResult:
+    fahrzeugkilometer_leer: float
+    fahrzeugkilometer_besetzt: float
+    fahrzeugkilometer_gesamt: float
+    durchschnittliche_fahrtdistanz_mit_lk: float
+    durchschnittliche_fahrtdistanz_mit_bk: float
+    personenkilometer_gefahren: float
+    leerkilometeranteil: float
+    buendelungsquote: float
+    besetzungsquote: float
+    benzinverbrauch_gesamt: float
+    dieselverbrauch_gesamt: float
+    stromverbrauch_gesamt: float
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+@dataclass(frozen=True)
+class RpsResult:
+    benzin_emissionen: float  # kg CO2eq
+    diesel_emissionen: float
+    strom_emissionen: float
+    co2_emissionen_gesamt_rps: float
+    co2_emissionen_pro_personenkilometer_rps: float  # kg CO2eq/Pkm
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+@dataclass(frozen=True)
+class ReferenceResult:
+    methodik: str
+    personenkilometer: Mapping  # Schlüssel -> Pkm
+    emissionen: Mapping  # Schlüssel -> kg CO2eq
+    personenkilometer_gesamt_av: float
+    gesamtemissionen_av: float
+    emissionen_pro_personenkilometer_av: float  # kg CO2eq/Pkm
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+@dataclass(frozen=True)
+class ComparisonResult:
+    co2_emissionen_gesamt_rps: float
+    co2_emissionen_pro_personenkilometer_rps: float
+    gesamtemissionen_av: float
+    emissionen_pro_personenkilometer_av: float
+    ergebnis: Optional[str]  # "niedriger", "hoeher", "gleich" oder None ohne Referenzwert
+    percentage_difference: float
+    total_difference: float
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+@dataclass(frozen=True)
+class BalanceInputs:
+    abgeschlossene_buchungen: float
+    transportierte_fahrgaeste: float
+    fahrzeuge: Sequence[VehicleLike]
+    methodik: str
+    anteile: Mapping  # Verkehrsmittel -> Anteil in %
+    emissionsfaktoren_av: Mapping  # Verkehrsmittel -> g CO2eq/Pkm
+    entfernungen: Union[Mapping, str, None] = None  # Verkehrsmittel -> km oder Vorauswahl
+    faktoren: EmissionFactors = field(default_factory=EmissionFactors)
+    name_ridepooling_system: str = ""
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+
+
+@dataclass(frozen=True)
+class BalanceResult:
+    inputs: BalanceInputs
+    flotte: FleetResult
+    rps: RpsResult
+    referenz: ReferenceResult
+    vergleich: ComparisonResult
+
+    def as_dict(self) -> dict:
+        """Flache Darstellung mit den Schlüsseln des Sitzungszustands."""
+        result = {
+            'name_ridepooling_system': self.inputs.name_ridepooling_system,
+            'start_date': self.inputs.start_date,
+            'end_date': self.inputs.end_date,
+            'methodik': self.inputs.methodik,
+            'abgeschlossene_buchungen': self.inputs.abgeschlossene_buchungen,
+            'transportierte_fahrgaeste': self.inputs.transportierte_fahrgaeste,
+        }
+        result.update(self.flotte.as_dict())
+        result.update(self.rps.as_dict())
+        result.update({
+            'personenkilometer_gesamt_av': self.referenz.personenkilometer_gesamt_av,
+            'gesamtemissionen_av': self.referenz.gesamtemissionen_av,
+            'emissionen_pro_personenkilometer_av': self.referenz.emissionen_pro_personenkilometer_av,
+            'percentage_difference': self.vergleich.percentage_difference,
+            'total_difference': self.vergleich.total_difference,
+            'ergebnis': self.vergleich.ergebnis,
+        })
+        return result
+
+
+# Abschnitt 3: Fahrzeugflotte & Fahrtleistung
+def compute_fleet_performance(vehicles: Iterable[VehicleLike], abgeschlossene_buchungen: float, transportierte_fahrgaeste: float) -> FleetResult:
+    vehicles = as_vehicles(vehicles)
+    abgeschlossene_buchungen = float(abgeschlossene_buchungen)
+    transportierte_fahrgaeste = float(transportierte_fahrgaeste)
+
+    fahrzeugkilometer_leer = float(sum(v.kilometer_leer for v in vehicles))
+    fahrzeugkilometer_besetzt = float(sum(v.kilometer_besetzt for v in vehicles))
+    fahrzeugkilometer_gesamt = round(fahrzeugkilometer_leer + fahrzeugkilometer_besetzt, 2)
+    durchschnittliche_fahrtdistanz_mit_lk = round(fahrzeugkilometer_gesamt / abgeschlossene_buchungen, 2) if abgeschlossene_buchungen > 0 else 0
+    durchschnittliche_fahrtdistanz_mit_bk = round(fahrzeugkilometer_besetzt / abgeschlossene_buchungen, 2) if abgeschlossene_buchungen > 0 else 0
+    personenkilometer_gefahren = round((fahrzeugkilometer_besetzt / abgeschlossene_buchungen) * transportierte_fahrgaeste, 2) if abgeschlossene_buchungen > 0 else 0
+
+    leerkilometeranteil = round((fahrzeugkilometer_leer / fahrzeugkilometer_gesamt) * 100, 2) if fahrzeugkilometer_gesamt > 0 else 0
+    buendelungsquote = round(personenkilometer_gefahren / fahrzeugkilometer_gesamt, 2) if fahrzeugkilometer_gesamt > 0 else 0
+    besetzungsquote = round(personenkilometer_gefahren / fahrzeugkilometer_besetzt, 2) if fahrzeugkilometer_besetzt > 0 else 0
+
+    # Verbrauch je Energieträger: Σ (Verbrauch * (Kilometer besetzt + Kilometer leer) / 100)
+    benzinverbrauch_gesamt = sum(v.benzinverbrauch * ((v.kilometer_besetzt + v.kilometer_leer) / 100) for v in vehicles)
+    dieselverbrauch_gesamt = sum(v.dieselverbrauch * ((v.kilometer_besetzt + v.kilometer_leer) / 100) for v in vehicles)
+    stromverbrauch_gesamt = sum(v.stromverbrauch * ((v.kilometer_besetzt + v.kilometer_leer) / 100) for v in vehicles)
+
+    return FleetResult(
+        fahrzeugkilometer_leer=fahrzeugkilometer_leer,
+        fahrzeugkilometer_besetzt=fahrzeugkilometer_besetzt,
+        fahrzeugkilometer_gesamt=fahrzeugkilometer_gesamt,
+        durchschnittliche_fahrtdistanz_mit_lk=durchschnittliche_fahrtdistanz_mit_lk,
+        durchschnittliche_fahrtdistanz_mit_bk=durchschnittliche_fahrtdistanz_mit_bk,
+        personenkilometer_gefahren=personenkilometer_gefahren,
+        leerkilometeranteil=leerkilometeranteil,
+        buendelungsquote=buendelungsquote,
+        besetzungsquote=besetzungsquote,
+        benzinverbrauch_gesamt=benzinverbrauch_gesamt,
+        dieselverbrauch_gesamt=dieselverbrauch_gesamt,
+        stromverbrauch_gesamt=stromverbrauch_gesamt,
+    )
+
+
+# Abschnitt 4: Emissionsdaten
+def blend_strom_emissionsdaten(strom_emissionsdaten: float, pv_emissionsdaten: float, oekostrom_anteil: float) -> float:
+    """Gewichteter Emissionsfaktor für Strom mit sekundärer Stromquelle."""
+    return round(strom_emissionsdaten * (1 - oekostrom_anteil / 100.0) + pv_emissionsdaten * (oekostrom_anteil / 100.0), 2)
+
+
+# Abschnitt 5: Umweltwirkung Ridepooling-System
+def compute_rps_emissions(benzinverbrauch_gesamt: float, dieselverbrauch_gesamt: float, stromverbrauch_gesamt: float,
+                          personenkilometer_gefahren: float, benzin_emissionsdaten: float, diesel_emissionsdaten: float,
+                          strom_emissionsdaten: float, oekostrom_anteil: float) -> RpsResult:
+    """Emissionen des Ridepooling-Systems; `strom_emissionsdaten` ist der adjustierte Faktor aus Abschnitt 4."""
+    benzin_emissionen = (float(benzinverbrauch_gesamt) * benzin_emissionsdaten) / 1000  # kg CO2
+    diesel_emissionen = (float(dieselverbrauch_gesamt) * diesel_emissionsdaten) / 1000  # kg CO2
+    strom_emissionen = (float(stromverbrauch_gesamt) * strom_emissionsdaten) / 1000  # kg CO2
+    strom_emissionen *= (1 - oekostrom_anteil / 100)  # Anpassung für Ökostrom
+
+    co2_emissionen_gesamt_rps = round(benzin_emissionen + diesel_emissionen + strom_emissionen, 4)
+    co2_emissionen_pro_personenkilometer_rps = round(co2_emissionen_gesamt_rps / personenkilometer_gefahren, 4) if personenkilometer_gefahren else 0
+
+    return RpsResult(
+        benzin_emissionen=benzin_emissionen,
+        diesel_emissionen=diesel_emissionen,
+        strom_emissionen=strom_emissionen,
+        co2_emissionen_gesamt_rps=co2_emissionen_gesamt_rps,
+        co2_emissionen_pro_personenkilometer_rps=co2_emissionen_pro_personenkilometer_rps,
+    )
+
+
+def compute_rps_for_fleet(flotte: FleetResult, faktoren: EmissionFactors) -> RpsResult:
+    return compute_rps_emissions(
+        flotte.benzinverbrauch_gesamt, flotte.dieselverbrauch_gesamt, flotte.stromverbrauch_gesamt,
+        flotte.personenkilometer_gefahren, faktoren.benzin_emissionsdaten, faktoren.diesel_emissionsdaten,
+        faktoren.strom_emissionsdaten_adjustiert, faktoren.oekostrom_anteil,
+    )
+
+
+# Abschnitte 6 bis 9: Referenzmobilität im Bediengebiet
+def _by_key(values: Optional[Mapping]) -> dict:
+    return {mode_key(mode): float(value) for mode, value in (values or {}).items()}
+
+
+def resolve_entfernungen(entfernungen: Union[Mapping, str, None], methodik: str, flotte: Optional[FleetResult] = None) -> dict:
+    """Wegeentfernung je Verkehrsmittel; die Vorauswahl der Fahrtdistanz gilt für alle Verkehrsmittel."""
+    if isinstance(entfernungen, str):
+        if flotte is None:
+            raise ValueError("Für die Vorauswahl der Fahrtdistanz wird die Fahrtleistung benötigt.")
+        if entfernungen == ENTFERNUNG_MIT_FAHRGAST:
+            distanz = flotte.durchschnittliche_fahrtdistanz_mit_bk
+        elif entfernungen == ENTFERNUNG_MIT_LEERKILOMETERN:
+            distanz = flotte.durchschnittliche_fahrtdistanz_mit_lk
+        else:
+            raise ValueError(f"Unbekannte Vorauswahl der Wegeentfernung: {entfernungen}")
+        return {key: float(distanz) for key in modes_for(methodik)}
+    return _by_key(entfernungen)
+
+
+def compute_reference_mobility(methodik: str, anteile: Mapping, emissionsfaktoren: Mapping, entfernungen: Optional[Mapping] = None,
+                               transportierte_fahrgaeste: float = 0, personenkilometer_gefahren: float = 0) -> ReferenceResult:
+    """THG-Bilanz der Referenzmobilität (Abschnitte 6 bis 9) über `oekorps.modes.reference_kernel`.
+
+    Wege-Methoden: Fahrgäste * Anteil * Wegeentfernung; Pkm-Methoden: Pkm gefahren * Anteil.
+    Die Verkehrsinduktion bleibt in den Summen unberücksichtigt.
+    """
+    from oekorps.modes import ModeTable  # oekorps.modes importiert dieses Modul
+
+    return ModeTable.for_methodik(methodik, anteile, emissionsfaktoren, entfernungen).compute(transportierte_fahrgaeste, personenkilometer_gefahren)
+
+
+# Abschnitt 10: Vergleich
+def compare_balances(co2_emissionen_gesamt_rps: float, co2_emissionen_pro_personenkilometer_rps: float,
+                     gesamtemissionen_av: float, emissionen_pro_personenkilometer_av: float) -> ComparisonResult:
+    co2_emissionen_gesamt_rps = round(co2_emissionen_gesamt_rps, 2)
+    ergebnis = None
+    percentage_difference = 0.0
+    total_difference = 0.0
+    if emissionen_pro_personenkilometer_av != 0:
+        if co2_emissionen_pro_personenkilometer_rps < emissionen_pro_personenkilometer_av:
+            ergebnis = "niedriger"
+            percentage_difference = round((emissionen_pro_personenkilometer_av - co2_emissionen_pro_personenkilometer_rps) / emissionen_pro_personenkilometer_av * 100, 2)
+            total_difference = round((gesamtemissionen_av - co2_emissionen_gesamt_rps), 2)
+        elif co2_emissionen_pro_personenkilometer_rps > emissionen_pro_personenkilometer_av:
+            ergebnis = "hoeher"
+            percentage_difference = round((co2_emissionen_pro_personenkilometer_rps - emissionen_pro_personenkilometer_av) / emissionen_pro_personenkilometer_av * 100, 2)
+            total_difference = round((co2_emissionen_gesamt_rps - gesamtemissionen_av), 2)
+        else:
+            ergebnis = "gleich"
+    return ComparisonResult(
+        co2_emissionen_gesamt_rps=co2_emissionen_gesamt_rps,
+        co2_emissionen_pro_personenkilometer_rps=co2_emissionen_pro_personenkilometer_rps,
+        gesamtemissionen_av=gesamtemissionen_av,
+        emissionen_pro_personenkilometer_av=emissionen_pro_personenkilometer_av,
+        ergebnis=ergebnis,
+        percentage_difference=percentage_difference,
+        total_difference=total_difference,
+    )
+
+
+# Gesamtbilanz (Abschnitte 3 bis 10)
+def compute_balance(inputs: BalanceInputs) -> BalanceResult:
+    flotte = compute_fleet_performance(inputs.fahrzeuge, inputs.abgeschlossene_buchungen, inputs.transportierte_fahrgaeste)
+    rps = compute_rps_for_fleet(flotte, inputs.faktoren)
+    entfernungen = None
+    if inputs.methodik in (MODAL_SPLIT_WEGE, UMFRAGE_WEGE):
+        entfernungen = resolve_entfernungen(inputs.entfernungen, inputs.methodik, flotte)
+    referenz = compute_reference_mobility(
+        inputs.methodik, inputs.anteile, inputs.emissionsfaktoren_av, entfernungen,
+        inputs.transportierte_fahrgaeste, flotte.personenkilometer_gefahren,
+    )
+    vergleich = compare_balances(
+        rps.co2_emissionen_gesamt_rps, rps.co2_emissionen_pro_personenkilometer_rps,
+        referenz.gesamtemissionen_av, referenz.emissionen_pro_personenkilometer_av,
+    )
+    return BalanceResult(inputs=inputs, flotte=flotte, rps=rps, referenz=referenz, vergleich=vergleich)
@@ -0,0 +1,119 @@
+"""Export der Eingabedaten und Ergebnisse als typisierte Tabellen.
+
+`export_tables` liefert vier Tabellen mit festen Spalten und Datentypen:
+`eingaben` (eine Zeile), `flotte` (Fahrzeugtabelle), `referenz` (eine Zeile
+je Verkehrsmittel) und `zusammenfassung` (eine Zeile). `export_bytes` schreibt
+sie als ZIP-Archiv mit einer Parquet-Datei je Tabelle, als Excel-Datei mit
+einem Tabellenblatt je Tabelle (benötigt `openpyxl`) oder als JSON im Format
+`orient='table'` (mit Schema). Parquet und JSON sind für gleiche Tabellen
+byte-gleich.
+"""
+import gzip
+import io
+import json
+import zipfile
+from typing import Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+from oekorps import presets
+from oekorps.engine import (
+    FAHRZEUG_SPALTEN, FAHRZEUGTYP, ComparisonResult, EmissionFactors, FleetResult, ReferenceResult, RpsResult,
+)
+from oekorps.modes import ModeTable
+
+PARQUET = "parquet"
+EXCEL = "xlsx"
+JSON = "json"
+# Format -> (Dateiendung, MIME-Typ)
+EXPORT_FORMATE = {
+    PARQUET: (".zip", "application/zip"),
+    EXCEL: (".xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    JSON: (".json", "application/json"),
+}
+TABELLEN = ("eingaben", "flotte", "referenz", "zusammenfassung")
+
+# Feste Zeitstempel in ZIP- und gzip-Kopfzeilen, damit gleiche Tabellen gleiche Bytes ergeben
+_ZIP_ZEIT = (1980, 1, 1, 0, 0, 0)
+
+
+def export_tables(name_ridepooling_system: str, start_date, end_date, abgeschlossene_buchungen: float, transportierte_fahrgaeste: float,
+                  fahrzeuge: pd.DataFrame, flotte: FleetResult, faktoren: EmissionFactors, rps: RpsResult, tabelle: ModeTable,
+                  referenz: ReferenceResult, vergleich: Optional[ComparisonResult] = None) -> dict:
+    """Eingabedaten und Ergebnisse als {Name: Tabelle} in der Reihenfolge von `TABELLEN`."""
+    eingaben = pd.DataFrame({
+        'name_ridepooling_system': pd.Series([name_ridepooling_system], dtype='string'),
+        'start_date': pd.to_datetime([start_date]),
+        'end_date': pd.to_datetime([end_date]),
+        'abgeschlossene_buchungen': np.array([abgeschlossene_buchungen], dtype=np.int64),
+        'transportierte_fahrgaeste': np.array([transportierte_fahrgaeste], dtype=np.int64),
+        'methodik': pd.Series([tabelle.methodik], dtype='string'),
+        'benzin_emissionsdaten': [float(faktoren.benzin_emissionsdaten)],
+        'diesel_emissionsdaten': [float(faktoren.diesel_emissionsdaten)],
+        'strom_emissionsdaten': [float(faktoren.strom_emissionsdaten)],
+        'oekostrom_anteil': [float(faktoren.oekostrom_anteil)],
+        'pv_emissionsdaten': [float(faktoren.pv_emissionsdaten)],
+        'datenbibliothek': pd.Series([presets.VERSION], dtype='string'),
+    })
+
+    fahrzeuge = fahrzeuge.reindex(columns=list(FAHRZEUG_SPALTEN)).reset_index(drop=True)
+    fahrzeuge = fahrzeuge.astype({spalte: 'string' if spalte == FAHRZEUGTYP else float for spalte in FAHRZEUG_SPALTEN})
+
+    referenz_tabelle = pd.DataFrame({
+        'verkehrsmittel': pd.Series(tabelle.keys, dtype='string'),
+        'bezeichnung': pd.Series(tabelle.labels, dtype='string'),
+        'anteil': tabelle.anteile.astype(float),  # %
+        'entfernung': tabelle.entfernungen.astype(float) if tabelle.wege else np.full(len(tabelle.keys), np.nan),  # km
+        'emissionsfaktor': tabelle.emissionsfaktoren.astype(float),  # g CO2eq/Pkm
+        'personenkilometer': np.array([referenz.personenkilometer[key] for key in tabelle.keys], dtype=float),
+        'emissionen': np.array([referenz.emissionen[key] for key in tabelle.keys], dtype=float),  # kg CO2eq
+        'bilanziert': tabelle.bilanziert.astype(bool),
+    })
+
+    zusammenfassung = {**flotte.as_dict(), **rps.as_dict(),
+                       'personenkilometer_gesamt_av': referenz.personenkilometer_gesamt_av,
+                       'gesamtemissionen_av': referenz.gesamtemissionen_av,
+                       'emissionen_pro_personenkilometer_av': referenz.emissionen_pro_personenkilometer_av}
+    zusammenfassung = pd.DataFrame({spalte: [float(wert)] for spalte, wert in zusammenfassung.items()})
+    if vergleich is not None:
+        zusammenfassung['ergebnis'] = pd.Series([vergleich.ergebnis], dtype='string')
+        zusammenfassung['percentage_difference'] = float(vergleich.percentage_difference)
+        zusammenfassung['total_difference'] = float(vergleich.total_difference)
+    return {'eingaben': eingaben, 'flotte': fahrzeuge, 'referenz': referenz_tabelle, 'zusammenfassung': zusammenfassung}
+
+
+def export_bytes(tabellen: Mapping[str, pd.DataFrame], dateiformat: str = PARQUET, komprimiert: bool = False) -> bytes:
+    """Tabellen als Datei im gewählten Format.
+
+    `komprimiert` wählt für Parquet den Codec gzip (sonst snappy) und
+    komprimiert JSON mit gzip; Excel-Dateien sind bereits komprimiert.
+    """
+    if dateiformat not in EXPORT_FORMATE:
+        raise ValueError(f"Unbekanntes Exportformat: {dateiformat}")
+    puffer = io.BytesIO()
+    if dateiformat == PARQUET:
+        with zipfile.ZipFile(puffer, 'w', zipfile.ZIP_STORED) as archiv:
+            for name, tabelle in tabellen.items():
+                datei = io.BytesIO()
+                tabelle.to_parquet(datei, index=False, compression='gzip' if komprimiert else 'snappy')
+                archiv.writestr(zipfile.ZipInfo(f"{name}.parquet", _ZIP_ZEIT), datei.getvalue())
+        return puffer.getvalue()
+    if dateiformat == EXCEL:
+        with pd.ExcelWriter(puffer, engine='openpyxl') as writer:
+            for name, tabelle in tabellen.items():
+                tabelle.to_excel(writer, sheet_name=name, index=False)
+        return puffer.getvalue()
+
+    daten = {'datenbibliothek': presets.VERSION,
+             **{name: json.loads(tabelle.to_json(orient='table', index=False, date_format='iso')) for name, tabelle in tabellen.items()}}
+    inhalt = json.dumps(daten, ensure_ascii=False).encode('utf-8')
+    return gzip.compress(inhalt, mtime=0) if komprimiert else inhalt
+
+
+def export_file(basis: str, dateiformat: str = PARQUET, komprimiert: bool = False) -> tuple:
+    """Dateiname mit der Endung des Formats (z. B. `eingabedaten_und_ergebnisse.json.gz`) und MIME-Typ."""
+    endung, mime = EXPORT_FORMATE[dateiformat]
+    if komprimiert and dateiformat == JSON:
+        return basis + endung + ".gz", "application/gzip"
+    return basis + endung, mime
@@ -0,0 +1,181 @@
+"""Diagramme der Anwendung als zwischengespeicherte Plotly-Spezifikation.
+
+Alle Balken eines Balkendiagramms bilden eine einzige Bar-Spur. Die Spezifikation
+wird je Eingabe einmal aufgebaut und als JSON vorgehalten; Plotly wird erst
+beim ersten Aufbau geladen.
+"""
+import json
+from functools import lru_cache
+from typing import Iterable, Tuple
+
+import numpy as np
+
+# Emissionen pro Personenkilometer anderer Verkehrsmittel nach UBA, Umweltfreundlich mobil! (2022) [g CO2eq/pkm]
+UBA_VERGLEICHSWERTE = (
+    ('Pkw - MIV (Fahrer) & MIV (Mitfahrer)', 152.86),
+    ('(Nahlinien-)Bus', 80.54),
+    ('Straßen-/Stadt-/U-Bahn', 59.30),
+    ('Schienen(nah)verkehr/Bahn/Zug', 58.79),
+    ('Motorrad', 173.3),
+    ('E-Bike/Pedelec/E-Lastenrad', 3.9),
+    ('Fahrrad/Lastenrad', 0.0),
+    ('Zu Fuß', 0.0),
+)
+
+TITEL_VERKEHRSMITTEL = 'Gegenüberstellung der Emissionen pro Personenkilometer nach Verkehrsmittel - Well-to-Wheel (WTW)*'
+TITEL_VERGLEICH = 'Gegenüberstellung der spezifischen CO2-Emissionen pro Personenkilometer - Well-to-Wheel (WTW)*'
+TITEL_METHODEN = 'Spezifische CO2-Emissionen pro Personenkilometer je Methodik der Referenzmobilität - Well-to-Wheel (WTW)*'
+ACHSE_G_PRO_PKM = 'Emissionen [g CO2eq/pkm]'
+
+# Standard-Farbfolge von Plotly, damit jeder Balken weiterhin eine eigene Farbe erhält
+FARBEN = ('#636efa', '#EF553B', '#00cc96', '#ab63fa', '#FFA15A', '#19d3f3', '#FF6692', '#B6E880', '#FF97FF', '#FECB52')
+
+Balken = Tuple[Tuple[str, float], ...]
+
+
+@lru_cache(maxsize=256)
+def _bar_figure_json(balken: Balken, title: str, yaxis_title: str) -> str:
+    import plotly.graph_objects as go
+    from plotly.utils import PlotlyJSONEncoder
+
+    fig = go.Figure(go.Bar(
+        x=[label for label, _ in balken],
+        y=[wert for _, wert in balken],
+        marker=dict(color=[FARBEN[i % len(FARBEN)] for i in range(len(balken))], line=dict(color='rgb(0,0,0)', width=1.5)),
+        opacity=0.7,
+        showlegend=False,
+    ))
+    fig.update_layout(
+        title=title,
+        width=650,
+        height=650,
+        yaxis_title=yaxis_title,
+        xaxis_tickangle=-45
+    )
+    spec = fig.to_plotly_json()
+    # Die Streamlit-Darstellung setzt ein eigenes Theme; das Plotly-Standard-Template muss nicht übertragen werden
+    spec['layout'].pop('template', None)
+    return json.dumps(spec, cls=PlotlyJSONEncoder)
+
+
+def bar_figure(balken: Iterable, title: str, yaxis_title: str = ACHSE_G_PRO_PKM) -> dict:
+    """Spezifikation eines Balkendiagramms aus (Beschriftung, Wert)-Paaren für `st.plotly_chart`."""
+    balken = tuple((str(label), float(wert)) for label, wert in balken)
+    return json.loads(_bar_figure_json(balken, title, yaxis_title))
+
+
+def uba_comparison_figure(label: str, emissionen_g_pro_pkm: float, title: str = TITEL_VERKEHRSMITTEL) -> dict:
+    """Ein Wert im Vergleich zu den UBA-Werten anderer Verkehrsmittel."""
+    return bar_figure(((label, emissionen_g_pro_pkm),) + UBA_VERGLEICHSWERTE, title)
+
+
+def method_comparison_figure(rps_g_pro_pkm: float, methoden: Iterable, title: str = TITEL_METHODEN) -> dict:
+    """Ridepooling-System und Referenzmobilität je Methodik aus (Methodik, g CO2eq/pkm)-Paaren."""
+    return bar_figure((('Ridepooling-System', rps_g_pro_pkm), *methoden), title)
+
+
+TITEL_TORNADO = 'Sensitivität der Bilanz: Kennzahl an den Bereichsgrenzen der Eingaben'
+
+# (Beschriftung, Wert an der unteren Bereichsgrenze, Wert an der oberen Bereichsgrenze)
+TornadoBalken = Tuple[Tuple[str, float, float], ...]
+
+
+@lru_cache(maxsize=64)
+def _tornado_figure_json(balken: TornadoBalken, basis: float, title: str, xaxis_title: str) -> str:
+    import plotly.graph_objects as go
+    from plotly.utils import PlotlyJSONEncoder
+
+    labels = [label for label, _, _ in balken]
+    fig = go.Figure()
+    for name, werte, farbe in (('Untere Bereichsgrenze', [unten for _, unten, _ in balken], FARBEN[0]),
+                               ('Obere Bereichsgrenze', [oben for _, _, oben in balken], FARBEN[1])):
+        fig.add_trace(go.Bar(
+            y=labels,
+            x=[wert - basis for wert in werte],
+            base=basis,
+            orientation='h',
+            name=name,
+            marker=dict(color=farbe, line=dict(color='rgb(0,0,0)', width=1.5)),
+            opacity=0.7,
+        ))
+    fig.update_layout(
+        title=title,
+        width=650,
+        height=max(350, 60 * len(balken) + 150),
+        barmode='overlay',
+        xaxis_title=xaxis_title,
+        yaxis=dict(autorange='reversed'),  # größte Spannweite oben
+    )
+    fig.add_vline(x=basis, line=dict(color='rgb(0,0,0)', width=1))
+    spec = fig.to_plotly_json()
+    spec['layout'].pop('template', None)
+    return json.dumps(spec, cls=PlotlyJSONEncoder)
+
+
+def tornado_figure(balken: Iterable, basis: float, xaxis_title: str, title: str = TITEL_TORNADO) -> dict:
+    """Tornado-Diagramm aus (Beschriftung, unten, oben)-Tripeln in der gegebenen Reihenfolge um den Basiswert."""
+    balken = tuple((str(label), float(unten), float(oben)) for label, unten, oben in balken)
+    return json.loads(_tornado_figure_json(balken, float(basis), title, xaxis_title))
+
+
+TITEL_PARAMETERSTUDIE = 'Parameterstudie'
+
+
+@lru_cache(maxsize=64)
+def _sweep_figure_json(x_title: str, x: tuple, y_title: str, y: tuple, z: tuple, z_title: str, break_even: tuple, title: str) -> str:
+    import plotly.graph_objects as go
+    from plotly.utils import PlotlyJSONEncoder
+
+    fig = go.Figure()
+    if y:
+        # z als Zeilen je y-Wert; die Break-even-Linie gibt je y-Wert den x-Wert an
+        fig.add_trace(go.Heatmap(x=x, y=y, z=z, colorscale='RdBu', zmid=0, colorbar=dict(title=z_title)))
+        fig.add_trace(go.Scatter(x=break_even, y=y, mode='lines', name='Break-even', line=dict(color='rgb(0,0,0)', width=2)))
+        fig.update_layout(yaxis_title=y_title, legend=dict(orientation='h', y=-0.2))
+    else:
+        fig.add_trace(go.Scatter(x=x, y=z, mode='lines', line=dict(color=FARBEN[0], width=2), showlegend=False))
+        fig.add_hline(y=0, line=dict(color='rgb(0,0,0)', width=1))
+        for wert in break_even:
+            if wert == wert:  # NaN: kein Break-even
+                fig.add_vline(x=wert, line=dict(color=FARBEN[1], width=2, dash='dash'), annotation_text='Break-even')
+        fig.update_layout(yaxis_title=z_title)
+    fig.update_layout(title=title, width=650, height=650, xaxis_title=x_title)
+    spec = fig.to_plotly_json()
+    spec['layout'].pop('template', None)
+    return json.dumps(spec, cls=PlotlyJSONEncoder)
+
+
+def sweep_figure(x_title: str, x, z, z_title: str, break_even, y_title: str = '', y=None, title: str = TITEL_PARAMETERSTUDIE) -> dict:
+    """Linie (eine Achse) bzw. Heatmap mit Break-even-Linie (zwei Achsen, `z` mit Form (len(x), len(y)))."""
+    x = tuple(float(wert) for wert in x)
+    break_even = tuple(float(wert) for wert in np.ravel(break_even))
+    if y is None:
+        return json.loads(_sweep_figure_json(x_title, x, '', (), tuple(float(wert) for wert in z), z_title, break_even, title))
+    y = tuple(float(wert) for wert in y)
+    z = tuple(tuple(float(wert) for wert in zeile) for zeile in np.asarray(z).T)
+    return json.loads(_sweep_figure_json(x_title, x, y_title, y, z, z_title, break_even, title))
+
+
+TITEL_VORAUSWAHLEN = 'Emissionen pro Personenkilometer der Referenzmobilität je Kombination der Vorauswahlen'
+
+
+@lru_cache(maxsize=64)
+def _preset_matrix_figure_json(zeilen: tuple, spalten: tuple, z: tuple, z_title: str, rps: float, title: str) -> str:
+    import plotly.graph_objects as go
+    from plotly.utils import PlotlyJSONEncoder
+
+    # Mit dem Wert des Ridepooling-Systems als Mitte der Farbskala: blau = Einsparung, rot = Mehremission
+    farben = dict(colorscale='RdBu', zmid=rps) if rps == rps else dict(colorscale='Viridis')
+    fig = go.Figure(go.Heatmap(x=spalten, y=zeilen, z=z, texttemplate='%{z:.1f}', colorbar=dict(title=z_title), **farben))
+    fig.update_layout(title=title, width=900, height=max(400, 150 + 60 * len(zeilen)), yaxis=dict(autorange='reversed'),
+                      xaxis=dict(tickangle=-30))
+    spec = fig.to_plotly_json()
+    spec['layout'].pop('template', None)
+    return json.dumps(spec, cls=PlotlyJSONEncoder)
+
+
+def preset_matrix_figure(zeilen, spalten, z, z_title: str = ACHSE_G_PRO_PKM, rps: float = float('nan'),
+                         title: str = TITEL_VORAUSWAHLEN) -> dict:
+    """Heatmap mit `z` in der Form (len(zeilen), len(spalten)); `rps` (optional) ist der Wert des Ridepooling-Systems."""
+    z = tuple(tuple(float(wert) for wert in zeile) for zeile in np.asarray(z, dtype=float))
+    return json.loads(_preset_matrix_figure_json(tuple(map(str, zeilen)), tuple(map(str, spalten)), z, z_title, float(rps), title))
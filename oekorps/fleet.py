@@ -0,0 +1,303 @@
+"""Fahrzeugtabellen: Einlesen, Prüfen und Flottensummen in Spaltenform.
+
+Eine Fahrzeugtabelle hat die Spalten `FAHRZEUG_SPALTEN` (eine Zeile je
+Fahrzeug oder Fahrzeugtyp). Die Prüfung erfolgt spaltenweise für die ganze
+Tabelle, bei Änderungen im Editor nur für die geänderten Zeilen (`edited_fleet`);
+`compute_fleet_frame` entspricht `engine.compute_fleet_performance`.
+`FleetTotals` hält die Flottensummen, die bei Änderungen im Editor nur um die
+geänderten Zeilen fortgeschrieben werden.
+"""
+import csv
+from dataclasses import astuple, dataclass
+from pathlib import Path
+from typing import Iterable, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+from oekorps.engine import (
+    BENZINVERBRAUCH, DIESELVERBRAUCH, FAHRZEUG_SPALTEN, FAHRZEUGTYP, KILOMETER_BESETZT, KILOMETER_LEER, STROMVERBRAUCH, FleetResult,
+    VehicleLike, as_vehicles,
+)
+
+ZAHLEN_SPALTEN = (BENZINVERBRAUCH, DIESELVERBRAUCH, STROMVERBRAUCH, KILOMETER_LEER, KILOMETER_BESETZT)
+PFLICHT_SPALTEN = (FAHRZEUGTYP, KILOMETER_LEER, KILOMETER_BESETZT)
+DATEITYPEN = ('csv', 'xlsx', 'parquet')  # Excel über openpyxl, Parquet über pyarrow (requirements.txt)
+
+# Alternative Spaltenbezeichnungen (klein geschrieben) -> Spalte der Fahrzeugtabelle
+SPALTEN_ALIASE = {
+    **{spalte.lower(): spalte for spalte in FAHRZEUG_SPALTEN},
+    'fahrzeugtyp': FAHRZEUGTYP, 'typ': FAHRZEUGTYP, 'fahrzeug': FAHRZEUGTYP,
+    'benzinverbrauch': BENZINVERBRAUCH, 'benzin': BENZINVERBRAUCH, 'benzin (l/100km)': BENZINVERBRAUCH,
+    'dieselverbrauch': DIESELVERBRAUCH, 'diesel': DIESELVERBRAUCH, 'diesel (l/100km)': DIESELVERBRAUCH,
+    'stromverbrauch': STROMVERBRAUCH, 'strom': STROMVERBRAUCH, 'strom (kwh/100km)': STROMVERBRAUCH,
+    'kilometer_leer': KILOMETER_LEER, 'km leer': KILOMETER_LEER, 'km_leer': KILOMETER_LEER,
+    'kilometer_besetzt': KILOMETER_BESETZT, 'km besetzt': KILOMETER_BESETZT, 'km_besetzt': KILOMETER_BESETZT,
+}
+
+# Höchstzahl gemeldeter Zeilen je Fehlerart
+MAX_FEHLERZEILEN = 10
+
+# Datumsangaben im deutschen Format (Tag zuerst), geprüft nach ISO 8601
+DEUTSCHE_ZEITFORMATE = ('%d.%m.%Y %H:%M:%S', '%d.%m.%Y %H:%M', '%d.%m.%Y')
+
+
+def _csv_kopf(source) -> tuple:
+    """Trennzeichen, Dezimalzeichen und Spalten aus der Kopfzeile (Semikolon: deutsches Excel-CSV)."""
+    if hasattr(source, 'readline'):
+        position = source.tell()
+        kopf = source.readline()
+        source.seek(position)
+        if isinstance(kopf, bytes):
+            kopf = kopf.decode('utf-8', errors='replace')
+    else:
+        with open(source, encoding='utf-8', errors='replace') as datei:
+            kopf = datei.readline()
+    sep, decimal = (';', ',') if ';' in kopf else (',', '.')
+    return sep, decimal, next(csv.reader([kopf.lstrip('\ufeff')], delimiter=sep), [])
+
+
+def read_table(source, name=None) -> pd.DataFrame:
+    """Liest eine Tabelle anhand der Dateiendung (CSV, Parquet, Excel, JSON).
+
+    `source` ist ein Pfad oder ein Dateiobjekt (z. B. aus `st.file_uploader`);
+    bei Dateiobjekten bestimmt `name` das Format. Excel-Dateien im alten Format
+    (.xls) werden nicht gelesen.
+    """
+    suffix = Path(name if name is not None else source).suffix.lower()
+    if suffix == '.parquet':
+        return pd.read_parquet(source)
+    if suffix == '.xls':
+        raise ValueError("Excel-Dateien im alten Format (.xls) werden nicht unterstützt; bitte als .xlsx speichern.")
+    if suffix == '.xlsx':
+        return pd.read_excel(source, engine='openpyxl')
+    if suffix == '.json':
+        return pd.read_json(source)
+    sep, decimal, _ = _csv_kopf(source)
+    return pd.read_csv(source, sep=sep, decimal=decimal)
+
+
+def empty_fleet() -> pd.DataFrame:
+    return pd.DataFrame({spalte: pd.Series(dtype=object if spalte == FAHRZEUGTYP else float) for spalte in FAHRZEUG_SPALTEN})
+
+
+def _zeilen(maske: np.ndarray, erste_zeile: int, positionen: Optional[np.ndarray] = None) -> str:
+    """Zeilennummern der markierten Zeilen; `positionen` sind die Positionen der Zeilen in der Tabelle (Standard: fortlaufend)."""
+    zeilen = ((np.flatnonzero(maske) if positionen is None else positionen[maske]) + erste_zeile).tolist()
+    text = ", ".join(str(zeile) for zeile in zeilen[:MAX_FEHLERZEILEN])
+    return text + (f" und {len(zeilen) - MAX_FEHLERZEILEN} weitere" if len(zeilen) > MAX_FEHLERZEILEN else "")
+
+
+def _zahlen(spalte: pd.Series) -> pd.Series:
+    """Zahlen einer Spalte; Texte mit Dezimalkomma werden umgewandelt, leere Zellen sind NaN."""
+    if spalte.dtype == object or pd.api.types.is_string_dtype(spalte):
+        spalte = spalte.astype("string").str.strip().str.replace(",", ".", regex=False).replace("", pd.NA)
+    return pd.to_numeric(spalte, errors='coerce').astype(float)
+
+
+def _zeitpunkte(spalte: pd.Series, utc: bool = False) -> pd.Series:
+    """Zeitpunkte einer Spalte, jeder Wert für sich: ISO 8601 oder `DEUTSCHE_ZEITFORMATE`; sonst NaT.
+
+    Das Format wird nicht aus dem ersten Wert erraten, sodass `03.01.2024` der 3. Januar ist
+    und Werte mit und ohne Uhrzeit gemischt sein können.
+    """
+    if pd.api.types.is_datetime64_any_dtype(spalte):
+        return pd.to_datetime(spalte, utc=utc) if utc else spalte
+    zeitpunkte = pd.to_datetime(spalte, errors='coerce', format='ISO8601', utc=utc)
+    texte = spalte.astype("string").str.strip()
+    for format in DEUTSCHE_ZEITFORMATE:
+        offen = (zeitpunkte.isna() & texte.notna()).to_numpy()
+        if not offen.any():
+            break
+        zeitpunkte[offen] = pd.to_datetime(texte[offen], errors='coerce', format=format, utc=utc)
+    return zeitpunkte
+
+
+def validate_fleet(df: pd.DataFrame, erste_zeile: int = 2) -> pd.DataFrame:
+    """Prüft eine eingelesene Fahrzeugtabelle und gibt sie mit den Spalten `FAHRZEUG_SPALTEN` zurück.
+
+    Spaltennamen werden über `SPALTEN_ALIASE` zugeordnet, fehlende Verbrauchsspalten
+    und leere Zellen als 0 übernommen. Fehlende Pflichtspalten, leere Fahrzeugtypen,
+    nicht numerische und negative Werte führen zu einem `ValueError` mit allen Fundstellen.
+    `erste_zeile` ist die Nummer der ersten Datenzeile in der Meldung (Datei: 2, da Zeile 1 die Kopfzeile ist).
+    """
+    return _pruefe_fahrzeuge(df.reset_index(drop=True), erste_zeile).reset_index(drop=True)
+
+
+def _pruefe_fahrzeuge(df: pd.DataFrame, erste_zeile: int) -> pd.DataFrame:
+    """`validate_fleet` für Zeilen an den Positionen `df.index`; das Ergebnis behält den Index (ohne leere Zeilen)."""
+    df = df.rename(columns=lambda spalte: SPALTEN_ALIASE.get(str(spalte).strip().lower(), str(spalte).strip()))
+    fehlende = [spalte for spalte in PFLICHT_SPALTEN if spalte not in df.columns]
+    if fehlende:
+        raise ValueError(f"Die Fahrzeugtabelle enthält nicht die Spalten: {', '.join(fehlende)}")
+    if df.columns.duplicated().any():
+        raise ValueError(f"Doppelte Spalten in der Fahrzeugtabelle: {', '.join(df.columns[df.columns.duplicated()].unique())}")
+
+    # Vollständig leere Zeilen (z. B. am Ende einer Excel-Tabelle) werden übersprungen
+    df = df.loc[~df[[spalte for spalte in FAHRZEUG_SPALTEN if spalte in df.columns]].isna().all(axis=1)]
+    positionen = df.index.to_numpy()
+
+    fehler = []
+    fahrzeugtyp = df[FAHRZEUGTYP].astype("string").str.strip()
+    leer = fahrzeugtyp.isna().to_numpy() | (fahrzeugtyp == "").fillna(True).to_numpy()
+    if leer.any():
+        fehler.append(f"{FAHRZEUGTYP} fehlt in Zeile {_zeilen(leer, erste_zeile, positionen)}")
+
+    result = pd.DataFrame({FAHRZEUGTYP: fahrzeugtyp.fillna("").astype(object)})
+    for spalte in ZAHLEN_SPALTEN:
+        if spalte not in df.columns:
+            result[spalte] = 0.0
+            continue
+        werte = _zahlen(df[spalte])
+        ungueltig = (werte.isna() & df[spalte].notna() & (df[spalte].astype("string").str.strip() != "")).to_numpy()
+        if ungueltig.any():
+            fehler.append(f"{spalte}: keine Zahl in Zeile {_zeilen(ungueltig, erste_zeile, positionen)}")
+        werte = werte.fillna(0.0)
+        negativ = (werte < 0).to_numpy()
+        if negativ.any():
+            fehler.append(f"{spalte}: negativer Wert in Zeile {_zeilen(negativ, erste_zeile, positionen)}")
+        result[spalte] = werte.to_numpy()
+
+    if fehler:
+        raise ValueError("Fahrzeugtabelle ungültig: " + "; ".join(fehler))
+    return result
+
+
+def read_fleet(source, name=None) -> pd.DataFrame:
+    """Liest und prüft eine Fahrzeugtabelle (CSV, Excel, Parquet)."""
+    return validate_fleet(read_table(source, name))
+
+
+def fleet_frame(vehicles: Iterable[VehicleLike]) -> pd.DataFrame:
+    """Fahrzeugtabelle aus Zeilen (Mappings mit den Spalten der Fahrzeugtabelle) bzw. `Vehicle`-Objekten."""
+    records = [vehicle.to_record() for vehicle in as_vehicles(vehicles)]
+    return pd.DataFrame(records, columns=list(FAHRZEUG_SPALTEN)) if records else empty_fleet()
+
+
+def combine_fleets(*tabellen: pd.DataFrame) -> pd.DataFrame:
+    tabellen = [tabelle for tabelle in tabellen if tabelle is not None and len(tabelle)]
+    return pd.concat(tabellen, ignore_index=True) if tabellen else empty_fleet()
+
+
+@dataclass(frozen=True)
+class FleetTotals:
+    """Laufende Summen der Flotte; Änderungen einzelner Fahrzeuge werden als Differenz addiert."""
+    fahrzeuge: int = 0
+    kilometer_leer: float = 0.0
+    kilometer_besetzt: float = 0.0
+    benzinverbrauch: float = 0.0  # l
+    dieselverbrauch: float = 0.0  # l
+    stromverbrauch: float = 0.0  # kWh
+
+    @classmethod
+    def of_frame(cls, tabelle: pd.DataFrame) -> "FleetTotals":
+        """Summen über alle Zeilen; leere oder nicht numerische Zellen zählen als 0."""
+        spalten = {spalte: (_zahlen(tabelle[spalte]).fillna(0.0).to_numpy() if spalte in tabelle else np.zeros(len(tabelle)))
+                   for spalte in ZAHLEN_SPALTEN}
+        km_100 = (spalten[KILOMETER_BESETZT] + spalten[KILOMETER_LEER]) / 100
+        return cls(
+            fahrzeuge=len(tabelle),
+            kilometer_leer=float(spalten[KILOMETER_LEER].sum()),
+            kilometer_besetzt=float(spalten[KILOMETER_BESETZT].sum()),
+            benzinverbrauch=float(np.dot(spalten[BENZINVERBRAUCH], km_100)),
+            dieselverbrauch=float(np.dot(spalten[DIESELVERBRAUCH], km_100)),
+            stromverbrauch=float(np.dot(spalten[STROMVERBRAUCH], km_100)),
+        )
+
+    def __add__(self, other: "FleetTotals") -> "FleetTotals":
+        return FleetTotals(*(a + b for a, b in zip(astuple(self), astuple(other))))
+
+    def __sub__(self, other: "FleetTotals") -> "FleetTotals":
+        return FleetTotals(*(a - b for a, b in zip(astuple(self), astuple(other))))
+
+
+def apply_edits(summen: FleetTotals, basis: pd.DataFrame, aenderungen: Optional[Mapping]) -> FleetTotals:
+    """Summen nach den Änderungen eines `st.data_editor` an der Tabelle `basis`.
+
+    `summen` sind die Summen von `basis`; `aenderungen` hat die Form des Editor-Zustands
+    (`edited_rows`, `added_rows`, `deleted_rows`). Der Aufwand hängt nur von der Zahl der
+    geänderten Zeilen ab, nicht von der Flottengröße.
+    """
+    if not aenderungen:
+        return summen
+    alt, geaendert, hinzugefuegt = _editor_zeilen(basis, aenderungen)
+    if len(alt):
+        summen = summen - FleetTotals.of_frame(basis.iloc[alt])
+    if len(geaendert):
+        summen = summen + FleetTotals.of_frame(geaendert)
+    if len(hinzugefuegt):
+        summen = summen + FleetTotals.of_frame(hinzugefuegt)
+    return summen
+
+
+def edited_fleet(basis: pd.DataFrame, aenderungen: Optional[Mapping]) -> pd.DataFrame:
+    """Geprüfte Fahrzeugtabelle nach den Änderungen eines `st.data_editor` an der geprüften Tabelle `basis`.
+
+    Wie bei `apply_edits` werden nur geänderte und hinzugefügte Zeilen geprüft (`validate_fleet`);
+    die Zeilennummern in Meldungen sind die Zeilen im Editor (ab 1).
+    """
+    if not aenderungen:
+        return basis
+    alt, geaendert, hinzugefuegt = _editor_zeilen(basis, aenderungen)
+    # Positionen im Editor: gelöschte Zeilen entfallen, hinzugefügte Zeilen folgen auf die übrigen
+    geloescht = np.array(sorted({int(zeile) for zeile in aenderungen.get('deleted_rows', ())}), dtype=int)
+    hinzugefuegt.index = len(basis) + np.arange(len(hinzugefuegt))
+    unveraendert = basis.drop(index=basis.index[alt])
+    unveraendert.index = unveraendert.index - np.searchsorted(geloescht, unveraendert.index)
+    tabellen = [unveraendert]
+    neu = [tabelle for tabelle in (geaendert, hinzugefuegt) if len(tabelle)]
+    if neu:
+        neu = pd.concat(neu)
+        neu.index = neu.index - np.searchsorted(geloescht, neu.index)
+        tabellen.append(_pruefe_fahrzeuge(neu, erste_zeile=1))
+    tabellen = [tabelle for tabelle in tabellen if len(tabelle)]
+    return pd.concat(tabellen).sort_index().reset_index(drop=True) if tabellen else empty_fleet()
+
+
+def _editor_zeilen(basis: pd.DataFrame, aenderungen: Mapping) -> tuple:
+    """Änderungen eines `st.data_editor` an `basis` (Index 0 bis n-1).
+
+    Ergebnis: Positionen der gelöschten oder geänderten Zeilen in `basis`, die geänderten Zeilen
+    mit den neuen Werten (Index: Position in `basis`) und die hinzugefügten Zeilen.
+    """
+    geloescht = {int(zeile) for zeile in aenderungen.get('deleted_rows', ())}
+    bearbeitet = {int(zeile): werte for zeile, werte in aenderungen.get('edited_rows', {}).items() if int(zeile) not in geloescht}
+    geaendert = basis.iloc[sorted(bearbeitet)].copy()
+    for position, zeile in enumerate(sorted(bearbeitet)):
+        for spalte, wert in bearbeitet[zeile].items():
+            if spalte in geaendert.columns:
+                geaendert.iloc[position, geaendert.columns.get_loc(spalte)] = wert
+    hinzugefuegt = pd.DataFrame(list(aenderungen.get('added_rows', ())), columns=list(FAHRZEUG_SPALTEN))
+    return sorted(geloescht | set(bearbeitet)), geaendert, hinzugefuegt
+
+
+def compute_fleet_totals(summen: FleetTotals, abgeschlossene_buchungen: float, transportierte_fahrgaeste: float) -> FleetResult:
+    """Fahrtleistung und Verbrauch der Flotte (Abschnitt 3) aus den laufenden Summen."""
+    abgeschlossene_buchungen = float(abgeschlossene_buchungen)
+    transportierte_fahrgaeste = float(transportierte_fahrgaeste)
+    fahrzeugkilometer_leer = summen.kilometer_leer
+    fahrzeugkilometer_besetzt = summen.kilometer_besetzt
+    fahrzeugkilometer_gesamt = round(fahrzeugkilometer_leer + fahrzeugkilometer_besetzt, 2)
+    durchschnittliche_fahrtdistanz_mit_lk = round(fahrzeugkilometer_gesamt / abgeschlossene_buchungen, 2) if abgeschlossene_buchungen > 0 else 0
+    durchschnittliche_fahrtdistanz_mit_bk = round(fahrzeugkilometer_besetzt / abgeschlossene_buchungen, 2) if abgeschlossene_buchungen > 0 else 0
+    personenkilometer_gefahren = round((fahrzeugkilometer_besetzt / abgeschlossene_buchungen) * transportierte_fahrgaeste, 2) if abgeschlossene_buchungen > 0 else 0
+
+    return FleetResult(
+        fahrzeugkilometer_leer=fahrzeugkilometer_leer,
+        fahrzeugkilometer_besetzt=fahrzeugkilometer_besetzt,
+        fahrzeugkilometer_gesamt=fahrzeugkilometer_gesamt,
+        durchschnittliche_fahrtdistanz_mit_lk=durchschnittliche_fahrtdistanz_mit_lk,
+        durchschnittliche_fahrtdistanz_mit_bk=durchschnittliche_fahrtdistanz_mit_bk,
+        personenkilometer_gefahren=personenkilometer_gefahren,
+        leerkilometeranteil=round((fahrzeugkilometer_leer / fahrzeugkilometer_gesamt) * 100, 2) if fahrzeugkilometer_gesamt > 0 else 0,
+        buendelungsquote=round(personenkilometer_gefahren / fahrzeugkilometer_gesamt, 2) if fahrzeugkilometer_gesamt > 0 else 0,
+        besetzungsquote=round(personenkilometer_gefahren / fahrzeugkilometer_besetzt, 2) if fahrzeugkilometer_besetzt > 0 else 0,
+        benzinverbrauch_gesamt=summen.benzinverbrauch,
+        dieselverbrauch_gesamt=summen.dieselverbrauch,
+        stromverbrauch_gesamt=summen.stromverbrauch,
+    )
+
+
+def compute_fleet_frame(tabelle: pd.DataFrame, abgeschlossene_buchungen: float, transportierte_fahrgaeste: float) -> FleetResult:
+    """Fahrtleistung und Verbrauch der Flotte (Abschnitt 3) aus einer Fahrzeugtabelle."""
+    return compute_fleet_totals(FleetTotals.of_frame(tabelle), abgeschlossene_buchungen, transportierte_fahrgaeste)
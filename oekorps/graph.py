@@ -0,0 +1,98 @@
+"""Abhängigkeitsgraph benannter Größen mit verzögerter Berechnung.
+
+Eingaben werden mit `set` gesetzt; ändert sich ein Wert, werden nur die davon
+abhängigen Knoten verworfen. Knoten werden erst bei `get` berechnet und bis
+zur nächsten Änderung einer ihrer Eingaben vorgehalten.
+"""
+from collections import Counter, defaultdict
+from typing import Callable, Iterable
+
+
+def _unveraendert(alt, neu) -> bool:
+    """Gleichheit für Eingaben; nicht vergleichbare Werte (z. B. Arrays) gelten als geändert."""
+    if alt is neu:
+        return True
+    try:
+        return type(alt) is type(neu) and bool(alt == neu)
+    except (TypeError, ValueError):
+        return False
+
+
+class DependencyGraph:
+    def __init__(self):
+        self._knoten = {}  # Name -> (Funktion, Abhängigkeiten, optionale Abhängigkeiten)
+        self._eingaben = set()
+        self._abhaengige = defaultdict(set)  # Name -> direkt abhängige Knoten
+        self._werte = {}
+        self.berechnungen = Counter()  # Name -> Zahl der Berechnungen
+
+    def add_input(self, name: str) -> None:
+        self._eingaben.add(name)
+
+    def add_node(self, name: str, func: Callable, deps: Iterable[str], optional: Iterable[str] = ()) -> None:
+        """Knoten `name = func(*deps)`; fehlende optionale Abhängigkeiten werden als None übergeben."""
+        deps, optional = tuple(deps), frozenset(optional)
+        for dep in deps:
+            if dep not in self._knoten and dep not in self._eingaben:
+                raise KeyError(f"Unbekannte Abhängigkeit von {name}: {dep}")
+            self._abhaengige[dep].add(name)
+        self._knoten[name] = (func, deps, optional)
+
+    def node(self, name: str, *deps: str, optional: Iterable[str] = ()):
+        """Dekorator-Form von `add_node`."""
+        def register(func):
+            self.add_node(name, func, deps, optional)
+            return func
+        return register
+
+    def set(self, name: str, value) -> bool:
+        """Setzt eine Eingabe; gibt zurück, ob sich der Wert geändert hat."""
+        if name not in self._eingaben:
+            raise KeyError(f"Unbekannte Eingabe: {name}")
+        if name in self._werte and _unveraendert(self._werte[name], value):
+            return False
+        self._invalidate(name)
+        self._werte[name] = value
+        return True
+
+    def discard(self, name: str) -> None:
+        """Entfernt eine Eingabe; abhängige Knoten sind danach nicht mehr verfügbar."""
+        if name in self._werte:
+            self._invalidate(name)
+
+    def _invalidate(self, name: str) -> None:
+        # Auch über nicht berechnete Knoten hinweg: ein Knoten kann mit fehlender optionaler Abhängigkeit berechnet sein
+        offen, besucht = [name], {name}
+        while offen:
+            aktuell = offen.pop()
+            self._werte.pop(aktuell, None)
+            for abhaengig in self._abhaengige[aktuell] - besucht:
+                besucht.add(abhaengig)
+                offen.append(abhaengig)
+
+    def missing(self, name: str) -> list:
+        """Fehlende Eingaben, die für `name` benötigt werden (optionale Abhängigkeiten ausgenommen)."""
+        if name in self._werte:
+            return []
+        if name in self._eingaben:
+            return [name]
+        func, deps, optional = self._knoten[name]
+        fehlend = []
+        for dep in deps:
+            if dep not in optional:
+                fehlend.extend(eingabe for eingabe in self.missing(dep) if eingabe not in fehlend)
+        return fehlend
+
+    def ready(self, name: str) -> bool:
+        return not self.missing(name)
+
+    def get(self, name: str):
+        if name in self._werte:
+            return self._werte[name]
+        if name in self._eingaben:
+            raise KeyError(f"Eingabe nicht gesetzt: {name}")
+        func, deps, optional = self._knoten[name]
+        argumente = [self.get(dep) if dep not in optional or self.ready(dep) else None for dep in deps]
+        self._werte[name] = func(*argumente)
+        self.berechnungen[name] += 1
+        return self._werte[name]
@@ -0,0 +1,225 @@
+"""Zeitlich aufgelöste Emissionsfaktoren des Stromnetzes (Abschnitt 4) für Fahrzeuge mit Elektroantrieb.
+
+Statt eines Jahreswertes wird eine Zeitreihe der Netzintensität [g CO2eq/kWh]
+mit einem Wert je Stunde oder je Monat verwendet. Der Stromverbrauch eines
+Zeitraums wird über ein Ladeprofil (Anteil je Stunde des Tages) auf dessen
+Stunden verteilt und mit der Zeitreihe verrechnet; der wirksame
+Emissionsfaktor ist der mit der geladenen Energie gewichtete Mittelwert.
+
+Die Zuordnung von Zeitpunkten zu Werten erfolgt rechnerisch über den Abstand
+zum Beginn der Reihe (O(n), ohne Join oder Schleifen); die Mittelwerte vieler
+Zeiträume ergeben sich aus kumulierten Summen über eine gemeinsame Stundenachse.
+Mehrjährige Reihen vieler Netzbetreiber können mit `save_grid_series` als
+`.npy` abgelegt und mit `load_grid_series` speicherabgebildet (`np.memmap`)
+geöffnet werden; gelesen werden dann nur die benötigten Abschnitte.
+"""
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from oekorps.fleet import _zeitpunkte, read_table
+
+STUENDLICH = "stündlich"
+MONATLICH = "monatlich"
+AUFLOESUNGEN = (STUENDLICH, MONATLICH)
+
+STUNDEN_JE_TAG = 24
+
+# Ortszeit für Zeitstempel mit Zeitzone bzw. UTC-Versatz
+ZEITZONE = "Europe/Berlin"
+
+# Spaltenbezeichnungen (klein geschrieben) für Zeitpunkt und Emissionsfaktor
+ZEIT_SPALTEN = ('zeitstempel', 'zeit', 'datum', 'timestamp', 'datetime')
+WERT_SPALTEN = ('g/kwh', 'g co2eq/kwh', 'emissionsfaktor', 'intensitaet', 'intensität', 'co2', 'wert')
+
+
+def _positionen(start: pd.Timestamp, aufloesung: str, zeitpunkte) -> np.ndarray:
+    """Abstand zum Beginn in Stunden bzw. Kalendermonaten."""
+    zeitpunkte = pd.DatetimeIndex(zeitpunkte)
+    if aufloesung == STUENDLICH:
+        return np.asarray((zeitpunkte - start) // pd.Timedelta(hours=1), dtype=np.int64)
+    return np.asarray((zeitpunkte.year - start.year) * 12 + zeitpunkte.month - start.month, dtype=np.int64)
+
+
+@dataclass(frozen=True, eq=False)
+class GridSeries:
+    start: pd.Timestamp  # Beginn der ersten Stunde bzw. des ersten Monats (ohne Zeitzone)
+    aufloesung: str
+    werte: np.ndarray  # g CO2eq/kWh je Stunde bzw. Monat; auch als np.memmap
+
+    def __post_init__(self):
+        if self.aufloesung not in AUFLOESUNGEN:
+            raise ValueError(f"Unbekannte Auflösung der Zeitreihe: {self.aufloesung}")
+        start = pd.Timestamp(self.start)
+        start = start.floor('h') if self.aufloesung == STUENDLICH else start.normalize().replace(day=1)
+        object.__setattr__(self, 'start', start)
+
+    @property
+    def ende(self) -> pd.Timestamp:
+        """Ende der Reihe (ausschließlich)."""
+        if self.aufloesung == STUENDLICH:
+            return self.start + pd.Timedelta(hours=len(self.werte))
+        return self.start + pd.DateOffset(months=len(self.werte))
+
+    def positions(self, zeitpunkte) -> np.ndarray:
+        """Index des Wertes je Zeitpunkt; -1 außerhalb der Reihe."""
+        position = _positionen(self.start, self.aufloesung, zeitpunkte)
+        return np.where((position >= 0) & (position < len(self.werte)), position, -1)
+
+    def at(self, zeitpunkte) -> np.ndarray:
+        """Emissionsfaktor [g CO2eq/kWh] je Zeitpunkt."""
+        position = self.positions(zeitpunkte)
+        if (position < 0).any():
+            raise ValueError(f"Die Zeitreihe der Netzintensität ({self.start:%Y-%m-%d} bis {self.ende:%Y-%m-%d}) "
+                             "deckt den Betrachtungszeitraum nicht ab.")
+        return np.asarray(self.werte[position], dtype=float)
+
+    def timestamps(self, erste: int = 0, anzahl: Optional[int] = None) -> pd.DatetimeIndex:
+        """Beginn der Stunden bzw. Monate ab dem Index `erste`."""
+        anzahl = len(self.werte) - erste if anzahl is None else anzahl
+        if self.aufloesung == STUENDLICH:
+            return pd.date_range(self.start + pd.Timedelta(hours=erste), periods=anzahl, freq='h')
+        return pd.date_range(self.start + pd.DateOffset(months=erste), periods=anzahl, freq='MS')
+
+    def frame(self) -> pd.DataFrame:
+        return pd.DataFrame({'zeitstempel': self.timestamps(), 'g/kWh': np.asarray(self.werte, dtype=float)})
+
+
+def _spalte(spalten, namen) -> Optional[str]:
+    return next((spalte for spalte in spalten if str(spalte).strip().lower() in namen), None)
+
+
+def read_grid_series(source, name=None) -> GridSeries:
+    """Zeitreihe aus einer Tabelle mit Zeitstempel und Emissionsfaktor [g CO2eq/kWh] (CSV, Parquet, Excel, JSON).
+
+    Zeitstempel werden je Wert als ISO 8601 oder deutsch (`TT.MM.JJJJ [hh:mm]`) gelesen.
+    Die Auflösung folgt aus dem häufigsten Abstand der Zeitpunkte: bis zu einer Stunde
+    (kürzere Abstände werden je Stunde gemittelt) oder ein Kalendermonat; andere
+    Abstände (z. B. Tageswerte) führen zu einem `ValueError`. Zeitstempel mit Zeitzone werden in Ortszeit (`ZEITZONE`)
+    ohne Zeitzone umgerechnet; doppelte Stunden (Zeitumstellung) werden gemittelt,
+    fehlende Werte linear interpoliert.
+    """
+    df = read_table(source, name)
+    zeit = _spalte(df.columns, ZEIT_SPALTEN)
+    wert = _spalte(df.columns, WERT_SPALTEN)
+    if wert is None:
+        zahlen = [spalte for spalte in df.columns if spalte != zeit and pd.api.types.is_numeric_dtype(df[spalte])]
+        wert = zahlen[0] if len(zahlen) == 1 else None
+    if zeit is None or wert is None:
+        raise ValueError("Die Zeitreihe benötigt eine Spalte 'zeitstempel' und eine Spalte 'g/kWh'.")
+
+    try:
+        zeitpunkte = _zeitpunkte(df[zeit])
+    except ValueError:  # gemischte UTC-Versätze (Sommer- und Winterzeit)
+        zeitpunkte = _zeitpunkte(df[zeit], utc=True)
+    if zeitpunkte.dt.tz is not None:
+        zeitpunkte = zeitpunkte.dt.tz_convert(ZEITZONE).dt.tz_localize(None)
+    werte = pd.to_numeric(df[wert], errors='coerce')
+    gueltig = zeitpunkte.notna().to_numpy() & werte.notna().to_numpy()
+    if gueltig.sum() < 2:
+        raise ValueError("Die Zeitreihe benötigt mindestens zwei gültige Werte.")
+    zeitpunkte = pd.DatetimeIndex(zeitpunkte[gueltig])
+    werte = werte.to_numpy(dtype=float)[gueltig]
+    abstand = pd.Series(np.diff(zeitpunkte.unique().sort_values())).mode().iloc[0]
+    if abstand <= pd.Timedelta(hours=1):
+        aufloesung = STUENDLICH
+    elif pd.Timedelta(days=28) <= abstand <= pd.Timedelta(days=31):
+        aufloesung = MONATLICH
+    else:
+        raise ValueError(f"Die Zeitreihe enthält weder Stunden- noch Monatswerte (häufigster Abstand: {abstand}).")
+    start = GridSeries(zeitpunkte.min(), aufloesung, np.zeros(0)).start
+    position = _positionen(start, aufloesung, zeitpunkte)
+    anzahl = np.bincount(position)
+    summe = np.bincount(position, weights=werte)
+    vorhanden = anzahl > 0
+    mittel = np.interp(np.arange(len(anzahl)), np.flatnonzero(vorhanden), summe[vorhanden] / anzahl[vorhanden])
+    return GridSeries(start, aufloesung, mittel)
+
+
+def save_grid_series(reihe: GridSeries, pfad) -> Path:
+    """Speichert die Werte als `.npy` (float32) und Beginn und Auflösung daneben als `.json`."""
+    pfad = Path(pfad).with_suffix('.npy')
+    np.save(pfad, np.asarray(reihe.werte, dtype=np.float32))
+    pfad.with_suffix('.json').write_text(json.dumps({'start': reihe.start.isoformat(), 'aufloesung': reihe.aufloesung},
+                                                    ensure_ascii=False), encoding='utf-8')
+    return pfad
+
+
+def load_grid_series(pfad) -> GridSeries:
+    """Öffnet eine mit `save_grid_series` gespeicherte Reihe speicherabgebildet (nur lesend)."""
+    pfad = Path(pfad).with_suffix('.npy')
+    kopf = json.loads(pfad.with_suffix('.json').read_text(encoding='utf-8'))
+    return GridSeries(pd.Timestamp(kopf['start']), kopf['aufloesung'], np.load(pfad, mmap_mode='r'))
+
+
+def open_grid_series(source, name=None) -> GridSeries:
+    """`.npy` über `load_grid_series`, sonst `read_grid_series`."""
+    if Path(name if name is not None else source).suffix.lower() == '.npy':
+        return load_grid_series(source)
+    return read_grid_series(source, name)
+
+
+def charging_profile(gewichte=None) -> np.ndarray:
+    """Ladeprofil als Anteil je Stunde des Tages (Summe 1); ohne Angabe gleichmäßig."""
+    if gewichte is None:
+        return np.full(STUNDEN_JE_TAG, 1 / STUNDEN_JE_TAG)
+    gewichte = np.asarray(gewichte, dtype=float)
+    if gewichte.shape != (STUNDEN_JE_TAG,) or (gewichte < 0).any() or gewichte.sum() <= 0:
+        raise ValueError(f"Das Ladeprofil benötigt {STUNDEN_JE_TAG} nicht negative Werte mit einer Summe größer 0.")
+    return gewichte / gewichte.sum()
+
+
+def _stundenachse(beginn, ende) -> tuple:
+    """Gemeinsame Stundenachse und Grenzen je Zeitraum; `ende` ist der letzte Tag (einschließlich)."""
+    beginn = pd.DatetimeIndex(pd.to_datetime(beginn)).normalize()
+    ende = pd.DatetimeIndex(pd.to_datetime(ende)).normalize() + pd.Timedelta(days=1)
+    if (ende <= beginn).any():
+        raise ValueError("Das Ende eines Betrachtungszeitraums liegt vor dessen Beginn.")
+    null = beginn.min()
+    achse = pd.date_range(null, ende.max(), freq='h', inclusive='left')
+    return (achse, np.asarray((beginn - null) // pd.Timedelta(hours=1), dtype=np.int64),
+            np.asarray((ende - null) // pd.Timedelta(hours=1), dtype=np.int64))
+
+
+def period_grid_factors(reihe: GridSeries, beginn, ende, ladeprofil=None) -> np.ndarray:
+    """Wirksamer Emissionsfaktor [g CO2eq/kWh] je Zeitraum (Beginn bis letzter Tag).
+
+    Die Ladeenergie eines Zeitraums verteilt sich nach dem Ladeprofil auf seine
+    Stunden; der Faktor ist der so gewichtete Mittelwert der Zeitreihe.
+    """
+    profil = charging_profile(ladeprofil)
+    if len(beginn) == 0:
+        return np.zeros(0)
+    achse, von, bis = _stundenachse(beginn, ende)
+    gewichte = profil[achse.hour]
+    kumuliert = np.concatenate([[0.0], np.cumsum(gewichte)])
+    kumuliert_intensitaet = np.concatenate([[0.0], np.cumsum(gewichte * reihe.at(achse))])
+    return np.round((kumuliert_intensitaet[bis] - kumuliert_intensitaet[von]) / (kumuliert[bis] - kumuliert[von]), 2)
+
+
+def with_grid_factors(leistung: pd.DataFrame, reihe: GridSeries, ladeprofil=None) -> pd.DataFrame:
+    """`leistung` mit `strom_emissionsdaten` je Zeile (`start_date` bis `end_date`); hat in `oekorps.batch` Vorrang."""
+    return leistung.assign(strom_emissionsdaten=period_grid_factors(reihe, leistung['start_date'], leistung['end_date'], ladeprofil))
+
+
+def charging_emissions(reihe: GridSeries, stromverbrauch: float, beginn, ende, ladeprofil=None) -> pd.DataFrame:
+    """Ladeenergie [kWh] und Emissionen [kg CO2eq] je Wert der Zeitreihe im Betrachtungszeitraum."""
+    profil = charging_profile(ladeprofil)
+    achse, _, _ = _stundenachse([beginn], [ende])
+    gewichte = profil[achse.hour]
+    energie = float(stromverbrauch) * gewichte / gewichte.sum()
+    intensitaet = reihe.at(achse)
+    position = reihe.positions(achse)
+    erste = position.min()
+    strom = np.bincount(position - erste, weights=energie)
+    emissionen = np.bincount(position - erste, weights=energie * intensitaet) / 1000
+    return pd.DataFrame({
+        'zeitstempel': reihe.timestamps(erste, len(strom)),
+        'Strom (kWh)': strom,
+        'Emissionsfaktor (g CO2eq/kWh)': np.asarray(reihe.werte[erste:erste + len(strom)], dtype=float),
+        'Emissionen (kg CO2eq)': emissionen,
+    })
@@ -0,0 +1,80 @@
+"""Vergleich der Vorauswahlen der Referenzmobilität.
+
+Für eine Methodik werden alle Kombinationen aus Verkehrsmittelverteilung
+(Abschnitt 6), Wegeentfernung (Abschnitt 7, nur Wege-Methoden) und
+Emissionsdaten (Abschnitt 8) der Datenbibliothek in einem Aufruf von
+`reference_kernel` berechnet: die Vorauswahlen liegen auf je einer eigenen
+Achse und werden gegeneinander ausgestrahlt (Broadcasting), Form
+(Verteilungen, Entfernungen, Emissionsdaten, Verkehrsmittel).
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from oekorps import presets
+from oekorps.engine import VERKEHRSINDUKTION, modes_for
+from oekorps.modes import distance_preset, is_wege, mode_vector, reference_kernel
+
+
+@dataclass(frozen=True, eq=False)
+class PresetMatrix:
+    methodik: str
+    verteilungen: tuple  # Namen der Vorauswahlen der Verkehrsmittelverteilung
+    entfernungen: tuple  # Namen der Vorauswahlen der Wegeentfernung; leer bei Pkm-Methoden
+    emissionsdaten: tuple  # Namen der Vorauswahlen der Emissionsdaten
+    werte: np.ndarray  # kg CO2eq/pkm, Form (Verteilungen, Entfernungen oder 1, Emissionsdaten); NaN ohne Personenkilometer
+
+    def spalten(self) -> list:
+        """Beschriftung je Kombination aus Wegeentfernung und Emissionsdaten (Spalten von `pivot`)."""
+        if not self.entfernungen:
+            return list(self.emissionsdaten)
+        return [f"{entfernung} | {emissionsdaten}" for entfernung in self.entfernungen for emissionsdaten in self.emissionsdaten]
+
+    def pivot(self) -> pd.DataFrame:
+        """Eine Zeile je Verteilung, eine Spalte je Kombination aus Wegeentfernung und Emissionsdaten."""
+        return pd.DataFrame(self.werte.reshape(len(self.verteilungen), -1), index=list(self.verteilungen), columns=self.spalten())
+
+    def frame(self) -> pd.DataFrame:
+        """Lange Form: eine Zeile je Kombination mit `emissionen_pro_personenkilometer_av`."""
+        gitter = np.meshgrid(np.arange(len(self.verteilungen)), np.arange(self.werte.shape[1]), np.arange(len(self.emissionsdaten)),
+                             indexing='ij')
+        spalten = {'verteilung': np.array(self.verteilungen, dtype=object)[gitter[0].ravel()]}
+        if self.entfernungen:
+            spalten['entfernung'] = np.array(self.entfernungen, dtype=object)[gitter[1].ravel()]
+        spalten['emissionsdaten'] = np.array(self.emissionsdaten, dtype=object)[gitter[2].ravel()]
+        spalten['emissionen_pro_personenkilometer_av'] = self.werte.ravel()
+        return pd.DataFrame(spalten)
+
+
+def preset_matrix(methodik: str, transportierte_fahrgaeste: float = 0, personenkilometer_gefahren: float = 0,
+                  durchschnittliche_fahrtdistanz_mit_bk: float = 0.0, durchschnittliche_fahrtdistanz_mit_lk: float = 0.0) -> PresetMatrix:
+    """Emissionen pro Pkm der Referenzmobilität für alle Vorauswahlen der Methodik.
+
+    Die Fahrtdistanzen des Ridepooling-Systems werden für die Vorauswahlen der
+    Wegeentfernung nach Fahrtdistanz benötigt; ist eine davon 0, ergibt die
+    Kombination keine Personenkilometer und der Wert ist NaN.
+    """
+    verteilungen = presets.modal_split_options(methodik)
+    anteile = np.array(list(verteilungen.values()), dtype=float)
+    if is_wege(methodik):
+        entfernungen = presets.ENTFERNUNG_OPTIONEN
+        wegeentfernungen = np.array([
+            distance_preset(presets.REISEWEITEN_MID_2017 if name == presets.REISEWEITEN_MID_2017_NAME else name, methodik,
+                            durchschnittliche_fahrtdistanz_mit_bk, durchschnittliche_fahrtdistanz_mit_lk)
+            for name in entfernungen])
+    else:
+        entfernungen = ()
+        wegeentfernungen = np.zeros((1, len(modes_for(methodik))))
+    emissionsfaktoren = np.array([mode_vector(methodik, werte) for werte in presets.EMISSIONSDATEN_AV_OPTIONEN.values()])
+    bilanziert = np.array([key != VERKEHRSINDUKTION for key in modes_for(methodik)])
+
+    # Achsen: (Verteilung, Entfernung, Emissionsdaten, Verkehrsmittel)
+    _, _, personenkilometer_gesamt_av, _, emissionen_pro_personenkilometer_av = reference_kernel(
+        is_wege(methodik), anteile[:, None, None, :], wegeentfernungen[None, :, None, :], emissionsfaktoren[None, None, :, :], bilanziert,
+        transportierte_fahrgaeste, personenkilometer_gefahren,
+    )
+    form = (len(verteilungen), len(wegeentfernungen), len(emissionsfaktoren))
+    werte = np.where(personenkilometer_gesamt_av > 0, emissionen_pro_personenkilometer_av, np.nan)
+    return PresetMatrix(methodik, tuple(verteilungen), tuple(entfernungen), tuple(presets.EMISSIONSDATEN_AV_OPTIONEN),
+                        np.broadcast_to(werte, form).copy())
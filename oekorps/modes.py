@@ -0,0 +1,143 @@
+"""Verkehrsmitteltabelle der Referenzmobilität als kompakte Arrays.
+
+Eine `ModeTable` bündelt je Methodik die Verkehrsmittel (Index), Anteile,
+Wegeentfernungen, Emissionsfaktoren und das Kennzeichen der bilanzierten
+Verkehrsmittel (alle außer der Verkehrsinduktion). `reference_kernel`
+berechnet daraus Personenkilometer und Emissionen für alle vier Methoden;
+die Arrays dürfen zusätzliche führende Dimensionen (z. B. Systeme) haben.
+"""
+from dataclasses import dataclass
+from typing import Mapping, Optional, Union
+
+import numpy as np
+
+from oekorps.engine import (
+    ENTFERNUNG_MIT_FAHRGAST, ENTFERNUNG_MIT_LEERKILOMETERN, MODAL_SPLIT_WEGE, MODE_KEYS, UMFRAGE_WEGE, VERKEHRSINDUKTION, ReferenceResult,
+    mode_key, modes_for,
+)
+
+# Schlüssel -> Anzeigename
+MODE_LABELS = {key: mode for mode, key in MODE_KEYS.items()}
+
+
+def is_wege(methodik: str) -> bool:
+    """Wege-Methoden rechnen mit Fahrgästen und Wegeentfernungen, Pkm-Methoden mit den gefahrenen Pkm."""
+    modes_for(methodik)
+    return methodik in (MODAL_SPLIT_WEGE, UMFRAGE_WEGE)
+
+
+def mode_vector(methodik: str, values: Optional[Mapping]) -> np.ndarray:
+    """Werte je Verkehrsmittel in der Reihenfolge von `modes_for(methodik)`; fehlende Einträge sind 0."""
+    values = {mode_key(mode): float(value) for mode, value in (values or {}).items()}
+    return np.array([values.get(key, 0.0) for key in modes_for(methodik)])
+
+
+def _divide(zaehler, nenner):
+    nenner = np.asarray(nenner, dtype=float)
+    return np.divide(zaehler, nenner, out=np.zeros_like(nenner), where=nenner > 0)
+
+
+def reference_kernel(wege, anteile, entfernungen, emissionsfaktoren, bilanziert, transportierte_fahrgaeste=0.0,
+                     personenkilometer_gefahren=0.0) -> tuple:
+    """Personenkilometer und Emissionen der Referenzmobilität (Abschnitte 6 bis 9).
+
+    `anteile`, `entfernungen` und `emissionsfaktoren` haben die Form (..., Verkehrsmittel),
+    `transportierte_fahrgaeste` und `personenkilometer_gefahren` die Form (...).
+    `wege` gilt für alle Zeilen oder hat die Form (...), z. B. für mehrere Methoden in einer Rechnung.
+    Rückgabe: (personenkilometer, emissionen, personenkilometer_gesamt_av, gesamtemissionen_av,
+    emissionen_pro_personenkilometer_av).
+    """
+    anteile = np.asarray(anteile, dtype=float)
+    wege = np.asarray(wege, dtype=bool)
+
+    def ueber_wege():
+        fahrgaeste = np.trunc(np.asarray(transportierte_fahrgaeste, dtype=float))
+        return np.round(fahrgaeste[..., None] * anteile / 100 * np.asarray(entfernungen, dtype=float), 2)
+
+    def ueber_pkm():
+        pkm = np.trunc(np.asarray(personenkilometer_gefahren, dtype=float))
+        return pkm[..., None] * anteile / 100
+
+    if wege.ndim:
+        personenkilometer = np.where(wege[..., None], ueber_wege(), ueber_pkm())
+    else:
+        personenkilometer = ueber_wege() if wege else ueber_pkm()
+    emissionen = personenkilometer * np.asarray(emissionsfaktoren, dtype=float) / 1000
+
+    personenkilometer_gesamt_av = np.round(np.where(bilanziert, personenkilometer, 0.0).sum(axis=-1), 2)
+    gesamtemissionen_av = np.round(np.where(bilanziert, emissionen, 0.0).sum(axis=-1), 2)
+    emissionen_pro_personenkilometer_av = _divide(gesamtemissionen_av, personenkilometer_gesamt_av)
+    return personenkilometer, emissionen, personenkilometer_gesamt_av, gesamtemissionen_av, emissionen_pro_personenkilometer_av
+
+
+@dataclass(frozen=True, eq=False)
+class ModeTable:
+    methodik: str
+    keys: tuple  # Verkehrsmittel-Schlüssel (Index der Arrays)
+    anteile: np.ndarray  # %
+    entfernungen: np.ndarray  # km, bei Pkm-Methoden 0
+    emissionsfaktoren: np.ndarray  # g CO2eq/Pkm
+    bilanziert: np.ndarray  # False für die Verkehrsinduktion
+
+    @classmethod
+    def for_methodik(cls, methodik: str, anteile: Optional[Mapping] = None, emissionsfaktoren: Optional[Mapping] = None,
+                     entfernungen: Optional[Mapping] = None) -> "ModeTable":
+        keys = modes_for(methodik)
+        return cls(
+            methodik=methodik,
+            keys=keys,
+            anteile=mode_vector(methodik, anteile),
+            entfernungen=mode_vector(methodik, entfernungen if is_wege(methodik) else None),
+            emissionsfaktoren=mode_vector(methodik, emissionsfaktoren),
+            bilanziert=np.array([key != VERKEHRSINDUKTION for key in keys]),
+        )
+
+    @classmethod
+    def from_vectors(cls, methodik: str, anteile, emissionsfaktoren, entfernungen=None) -> "ModeTable":
+        """Tabelle aus Werten in der Reihenfolge von `modes_for(methodik)`."""
+        keys = modes_for(methodik)
+        return cls(
+            methodik=methodik,
+            keys=keys,
+            anteile=np.asarray(anteile, dtype=float),
+            entfernungen=np.asarray(entfernungen, dtype=float) if entfernungen is not None and is_wege(methodik) else np.zeros(len(keys)),
+            emissionsfaktoren=np.asarray(emissionsfaktoren, dtype=float),
+            bilanziert=np.array([key != VERKEHRSINDUKTION for key in keys]),
+        )
+
+    @property
+    def wege(self) -> bool:
+        return is_wege(self.methodik)
+
+    @property
+    def labels(self) -> tuple:
+        return tuple(MODE_LABELS[key] for key in self.keys)
+
+    def index(self, key: str) -> int:
+        return self.keys.index(mode_key(key))
+
+    def compute(self, transportierte_fahrgaeste: float = 0, personenkilometer_gefahren: float = 0) -> ReferenceResult:
+        personenkilometer, emissionen, pkm_gesamt, gesamt, pro_pkm = reference_kernel(
+            self.wege, self.anteile, self.entfernungen, self.emissionsfaktoren, self.bilanziert,
+            transportierte_fahrgaeste, personenkilometer_gefahren,
+        )
+        return ReferenceResult(
+            methodik=self.methodik,
+            personenkilometer=dict(zip(self.keys, personenkilometer.tolist())),
+            emissionen=dict(zip(self.keys, emissionen.tolist())),
+            personenkilometer_gesamt_av=float(pkm_gesamt),
+            gesamtemissionen_av=float(gesamt),
+            emissionen_pro_personenkilometer_av=float(pro_pkm),
+        )
+
+
+def distance_preset(name: Union[str, Mapping], methodik: str, durchschnittliche_fahrtdistanz_mit_bk: float = 0.0,
+                    durchschnittliche_fahrtdistanz_mit_lk: float = 0.0) -> np.ndarray:
+    """Wegeentfernungen einer Vorauswahl; die Fahrtdistanz des Ridepooling-Systems gilt für alle Verkehrsmittel."""
+    if name == ENTFERNUNG_MIT_FAHRGAST:
+        return np.full(len(modes_for(methodik)), float(durchschnittliche_fahrtdistanz_mit_bk))
+    if name == ENTFERNUNG_MIT_LEERKILOMETERN:
+        return np.full(len(modes_for(methodik)), float(durchschnittliche_fahrtdistanz_mit_lk))
+    if isinstance(name, str):
+        raise ValueError(f"Unbekannte Vorauswahl der Wegeentfernung: {name}")
+    return mode_vector(methodik, name)
@@ -0,0 +1,99 @@
+"""Parallele Ausführung unabhängiger Rechenblöcke.
+
+`run_tasks` führt Blöcke seriell oder in einem `ProcessPoolExecutor` aus und
+liefert die Ergebnisse in der Reihenfolge der Blöcke; Fortschritt wird über
+einen Rückruf gemeldet. Eine Ausnahme im Rückruf oder ein KeyboardInterrupt
+bricht ab, noch nicht gestartete Blöcke werden dann verworfen. Große
+Eingaben werden mit `SharedArrays` einmal in gemeinsamen Speicher gelegt; die
+Blöcke erhalten nur die Namen (`handles`) und lesen sie mit `attach`.
+
+Zufallszahlen werden je Block aus `task_seeds` gezogen. Die Zerlegung in Blöcke
+hängt nicht von der Zahl der Prozesse ab, daher stimmen die Ergebnisse bitgenau
+mit der seriellen Berechnung überein.
+"""
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from contextlib import contextmanager
+from multiprocessing.shared_memory import SharedMemory
+from typing import Callable, Mapping, Optional, Sequence
+
+import numpy as np
+
+Fortschritt = Callable[[int, int], None]  # (erledigte Blöcke, Blöcke gesamt)
+
+
+def task_seeds(seed: Optional[int], anzahl: int) -> list:
+    """Unabhängige Startwerte je Block, abhängig nur von `seed` und der Nummer des Blocks."""
+    return np.random.SeedSequence(seed).spawn(anzahl)
+
+
+def run_tasks(func: Callable, argumente: Sequence[tuple], prozesse: int = 1, fortschritt: Optional[Fortschritt] = None) -> list:
+    """`func(*args)` für alle Blöcke; mit `prozesse > 1` in einem Prozesspool (`func` muss auf Modulebene liegen)."""
+    argumente = list(argumente)
+    gesamt = len(argumente)
+    ergebnisse = [None] * gesamt
+    if prozesse <= 1 or gesamt <= 1:
+        for i, args in enumerate(argumente):
+            ergebnisse[i] = func(*args)
+            if fortschritt is not None:
+                fortschritt(i + 1, gesamt)
+        return ergebnisse
+
+    executor = ProcessPoolExecutor(max_workers=min(prozesse, gesamt))
+    try:
+        futures = {executor.submit(func, *args): i for i, args in enumerate(argumente)}
+        offen, erledigt = set(futures), 0
+        while offen:
+            fertig, offen = wait(offen, timeout=0.1, return_when=FIRST_COMPLETED)
+            for future in fertig:
+                ergebnisse[futures[future]] = future.result()
+                erledigt += 1
+                if fortschritt is not None:
+                    fortschritt(erledigt, gesamt)
+    finally:
+        # Bei Abbruch oder Fehler werden noch nicht gestartete Blöcke verworfen
+        executor.shutdown(wait=True, cancel_futures=True)
+    return ergebnisse
+
+
+class SharedArrays:
+    """NumPy-Arrays in gemeinsamem Speicher; als Kontextmanager werden die Blöcke am Ende freigegeben."""
+
+    def __init__(self, arrays: Mapping[str, np.ndarray]):
+        self._bloecke = []
+        self.handles = {}  # Name -> (Speichername, Form, Datentyp); wird an die Prozesse übergeben
+        try:
+            for name, array in arrays.items():
+                array = np.ascontiguousarray(array)
+                block = SharedMemory(create=True, size=max(array.nbytes, 1))
+                self._bloecke.append(block)
+                np.ndarray(array.shape, array.dtype, buffer=block.buf)[...] = array
+                self.handles[name] = (block.name, array.shape, array.dtype.str)
+        except BaseException:
+            self.release()
+            raise
+
+    def release(self) -> None:
+        for block in self._bloecke:
+            block.close()
+            block.unlink()
+        self._bloecke = []
+
+    def __enter__(self) -> "SharedArrays":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
+
+
+@contextmanager
+def attach(handles: Mapping):
+    """Arrays aus `SharedArrays.handles` lesen; die Ansichten sind nur innerhalb des Blocks gültig."""
+    bloecke = {name: SharedMemory(name=speichername) for name, (speichername, _, _) in handles.items()}
+    arrays = {name: np.ndarray(form, np.dtype(typ), buffer=bloecke[name].buf) for name, (_, form, typ) in handles.items()}
+    try:
+        yield arrays
+    finally:
+        # Ansichten vor dem Schließen freigeben; benötigte Werte kopiert der Aufrufer innerhalb des Blocks
+        arrays.clear()
+        for block in bloecke.values():
+            block.close()
@@ -0,0 +1,115 @@
+"""Vorauswahlen (Modal Split, Wegeentfernungen, Emissionsdaten, Fahrzeugtypen, Ladeprofile) für den Rechenkern.
+
+Die Werte stehen in der versionierten Datenbibliothek `data/presets.toml`
+(oder in der Datei der Umgebungsvariablen `OEKORPS_DATEN`). Sie wird einmal je
+Prozess gelesen und als unveränderliche Struktur gehalten (`MappingProxyType`,
+Tupel), die sich alle Sitzungen der Anwendung teilen. Listen sind in der
+Reihenfolge von `MODES_MODAL_SPLIT` bzw. `MODES_UMFRAGE` angegeben.
+"""
+import os
+import tomllib
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Mapping, Optional
+
+from oekorps.engine import (
+    BENZINVERBRAUCH, DIESELVERBRAUCH, ENTFERNUNG_MIT_FAHRGAST, ENTFERNUNG_MIT_LEERKILOMETERN, KILOMETER_BESETZT, KILOMETER_LEER,
+    MODAL_SPLIT_PKM, MODAL_SPLIT_WEGE, STROMVERBRAUCH, UMFRAGE_PKM, UMFRAGE_WEGE, modes_for,
+)
+
+DATENBIBLIOTHEK = Path(__file__).parent / 'data' / 'presets.toml'
+
+
+@dataclass(frozen=True)
+class Preset:
+    name: str
+    wert: Any  # Zahl, Tupel oder MappingProxyType
+    quelle: str = ""
+
+
+def _unveraenderlich(wert):
+    if isinstance(wert, dict):
+        return MappingProxyType({schluessel: _unveraenderlich(w) for schluessel, w in wert.items()})
+    if isinstance(wert, list):
+        return tuple(_unveraenderlich(w) for w in wert)
+    return wert
+
+
+@lru_cache(maxsize=None)
+def load_library(pfad: Optional[str] = None) -> Mapping:
+    """Datenbibliothek als {Kategorie: Tupel von `Preset`} und `version`; einmal je Pfad und Prozess gelesen."""
+    with open(pfad or os.environ.get('OEKORPS_DATEN') or DATENBIBLIOTHEK, 'rb') as datei:
+        daten = tomllib.load(datei)
+    if 'version' not in daten:
+        raise ValueError("Die Datenbibliothek enthält keine Version.")
+    bibliothek = {'version': daten.pop('version')}
+    for kategorie, eintraege in daten.items():
+        bibliothek[kategorie] = tuple(
+            Preset(eintrag['name'], _unveraenderlich(eintrag['wert']), eintrag.get('quelle', "")) for eintrag in eintraege)
+    return MappingProxyType(bibliothek)
+
+
+def options(kategorie: str) -> Mapping:
+    """Vorauswahlen einer Kategorie als {Name: Wert}."""
+    return MappingProxyType({eintrag.name: eintrag.wert for eintrag in load_library()[kategorie]})
+
+
+VERSION = load_library()['version']
+
+MODAL_SPLIT_WEGE_OPTIONEN = options('modal_split_wege')
+MODAL_SPLIT_PKM_OPTIONEN = options('modal_split_pkm')
+UMFRAGE_OPTIONEN = options('umfrage')
+
+# Durchschnittliche Reiseweiten nach MiD 2017 [km]
+REISEWEITEN_MID_2017_NAME = "Durchschnittliche Reiseweiten nach MID 2017"
+REISEWEITEN_MID_2017 = options('reiseweiten')[REISEWEITEN_MID_2017_NAME]
+ENTFERNUNG_OPTIONEN = (ENTFERNUNG_MIT_FAHRGAST, ENTFERNUNG_MIT_LEERKILOMETERN, REISEWEITEN_MID_2017_NAME)
+
+# Emissionsdaten alternativ genutzter Verkehrsmittel [g CO2eq/Pkm]
+EMISSIONSDATEN_UBA_2022_NAME = "Umweltbundesamt, Umweltfreundlich mobil! (2022)"
+EMISSIONSDATEN_AV_OPTIONEN = options('emissionsdaten_av')
+EMISSIONSDATEN_UBA_2022 = EMISSIONSDATEN_AV_OPTIONEN[EMISSIONSDATEN_UBA_2022_NAME]
+
+# CO2eq-Emissionsdaten der Energieträger des Ridepooling-Systems (Benzin, Diesel: g/l; Strom: g/kWh)
+BENZIN_EMISSIONSDATEN_OPTIONEN = options('benzin')
+DIESEL_EMISSIONSDATEN_OPTIONEN = options('diesel')
+STROM_EMISSIONSDATEN_OPTIONEN = options('strom')
+
+# Fahrzeugtypen als Zeilen der Fahrzeugtabelle (Verbrauch je 100 km, Kilometer 0)
+FAHRZEUGTYPEN = MappingProxyType({
+    name: MappingProxyType({BENZINVERBRAUCH: wert['benzin'], DIESELVERBRAUCH: wert['diesel'], STROMVERBRAUCH: wert['strom'],
+                            KILOMETER_LEER: 0, KILOMETER_BESETZT: 0})
+    for name, wert in options('fahrzeugtypen').items()
+})
+
+# Beförderungsleistung bekannter Ridepooling-Systeme
+RIDEPOOLING_SYSTEME = options('ridepooling_systeme')
+
+# Ladeprofile (Gewicht je Stunde des Tages) für Zeitreihen der Netzintensität
+LADEPROFILE = options('ladeprofile')
+
+
+def modal_split_options(methodik: str) -> dict:
+    """Vorauswahlen der Verkehrsmittelverteilung für die gewählte Methodik."""
+    if methodik == MODAL_SPLIT_WEGE:
+        return MODAL_SPLIT_WEGE_OPTIONEN
+    if methodik == MODAL_SPLIT_PKM:
+        return MODAL_SPLIT_PKM_OPTIONEN
+    if methodik in (UMFRAGE_WEGE, UMFRAGE_PKM):
+        return UMFRAGE_OPTIONEN
+    raise ValueError(f"Unbekannte Methodik: {methodik}")
+
+
+def modal_split_shares(methodik: str, name: str) -> dict:
+    """Anteile [%] einer Vorauswahl je Verkehrsmittel-Schlüssel."""
+    optionen = modal_split_options(methodik)
+    if name not in optionen:
+        raise ValueError(f"Unbekannte Vorauswahl der Verkehrsmittelverteilung für {methodik}: {name}")
+    return dict(zip(modes_for(methodik), optionen[name]))
+
+
+def default_modal_split(methodik: str) -> str:
+    return next(iter(modal_split_options(methodik)))
+
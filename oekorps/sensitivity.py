@@ -0,0 +1,288 @@
+"""Globale Sensitivitätsanalyse der Bilanz (Abschnitte 3 bis 10).
+
+`BalanceModel` bildet die Rechenkette um einen Basisfall als vektorisierte
+Funktion ab: jede Zeile einer Parametermatrix ist eine Modellauswertung. Darauf
+setzen Morris-Elementareffekte, Sobol-Indizes (Saltelli/Jansen-Schätzer) und
+ein Tornado-Vergleich an den Bereichsgrenzen auf. Die Auswertungen einer
+Methode werden in einer Matrix gesammelt und blockweise (optional in mehreren
+Prozessen) berechnet.
+
+Die Nachfrage (Personenkilometer und Fahrgäste) ist fest; die Fahrzeugkilometer
+folgen aus Besetzungsquote und Leerkilometeranteil, die Bündelungsquote ist
+Besetzungsquote * (1 - Leerkilometeranteil / 100).
+"""
+from dataclasses import dataclass, field
+from typing import Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+from oekorps.engine import FleetResult
+from oekorps.modes import ModeTable, reference_kernel
+from oekorps.parallel import Fortschritt, run_tasks
+
+MORRIS = "morris"
+SOBOL = "sobol"
+
+AUSGABEN = {
+    'differenz_pro_personenkilometer': "Differenz Referenz - Ridepooling pro Pkm (kg CO2eq/pkm)",
+    'co2_emissionen_pro_personenkilometer_rps': "CO2-Emissionen Ridepooling pro Pkm (kg CO2eq/pkm)",
+    'emissionen_pro_personenkilometer_av': "Emissionen Referenzmobilität pro Pkm (kg CO2eq/pkm)",
+    'total_difference': "Differenz Referenz - Ridepooling gesamt (kg CO2eq)",
+}
+
+MIV_KEYS = ('miv_fahrer', 'miv_mitfahrer')
+BLOCKGROESSE = 50_000
+
+
+@dataclass(frozen=True)
+class Parameter:
+    name: str
+    label: str
+    basis: float
+    untere: float
+    obere: float
+    einheit: str = ""
+
+
+@dataclass(frozen=True, eq=False)
+class BalanceModel:
+    tabelle: ModeTable
+    personenkilometer_gefahren: float
+    transportierte_fahrgaeste: float
+    leerkilometeranteil: float  # %
+    besetzungsquote: float  # Pkm je besetztem Fahrzeugkilometer
+    benzin_je_km: float  # l je Fahrzeugkilometer
+    diesel_je_km: float
+    strom_je_km: float  # kWh je Fahrzeugkilometer
+    benzin_emissionsdaten: float  # g/l
+    diesel_emissionsdaten: float  # g/l
+    strom_emissionsdaten: float  # g/kWh, Netzstrom vor Berücksichtigung der sekundären Stromquelle
+    oekostrom_anteil: float  # %
+    pv_emissionsdaten: float  # g/kWh
+
+    @classmethod
+    def from_balance(cls, flotte: FleetResult, tabelle: ModeTable, transportierte_fahrgaeste: float, benzin_emissionsdaten: float,
+                     diesel_emissionsdaten: float, strom_emissionsdaten: float, oekostrom_anteil: float,
+                     pv_emissionsdaten: float) -> "BalanceModel":
+        if flotte.fahrzeugkilometer_gesamt <= 0 or flotte.fahrzeugkilometer_besetzt <= 0 or flotte.personenkilometer_gefahren <= 0:
+            raise ValueError("Für die Sensitivitätsanalyse und die Parameterstudie werden Fahrzeugkilometer und Personenkilometer größer 0 benötigt.")
+        gesamt = flotte.fahrzeugkilometer_gesamt
+        return cls(
+            tabelle=tabelle,
+            personenkilometer_gefahren=flotte.personenkilometer_gefahren,
+            transportierte_fahrgaeste=float(transportierte_fahrgaeste),
+            leerkilometeranteil=flotte.fahrzeugkilometer_leer / gesamt * 100,
+            besetzungsquote=flotte.personenkilometer_gefahren / flotte.fahrzeugkilometer_besetzt,
+            benzin_je_km=flotte.benzinverbrauch_gesamt / gesamt,
+            diesel_je_km=flotte.dieselverbrauch_gesamt / gesamt,
+            strom_je_km=flotte.stromverbrauch_gesamt / gesamt,
+            benzin_emissionsdaten=float(benzin_emissionsdaten),
+            diesel_emissionsdaten=float(diesel_emissionsdaten),
+            strom_emissionsdaten=float(strom_emissionsdaten),
+            oekostrom_anteil=float(oekostrom_anteil),
+            pv_emissionsdaten=float(pv_emissionsdaten),
+        )
+
+    def parameters(self, spanne: float = 0.2) -> tuple:
+        """Parameter mit Bereichen: Faktoren ±`spanne` relativ, Anteile ±10 bzw. ±20 Prozentpunkte."""
+        def relativ(name, label, basis, einheit):
+            return Parameter(name, label, basis, basis * (1 - spanne), basis * (1 + spanne), einheit)
+
+        def absolut(name, label, basis, abstand, untere, obere):
+            return Parameter(name, label, basis, max(basis - abstand, untere), min(basis + abstand, obere), "%")
+
+        summe = float(self.tabelle.anteile.sum())
+        parameter = [
+            absolut('leerkilometeranteil', "Leerkilometeranteil", self.leerkilometeranteil, 10.0, 0.0, 95.0),
+            relativ('besetzungsquote', "Besetzungsquote", self.besetzungsquote, "Pkm/Fzkm"),
+            relativ('verbrauch', "Energieverbrauch der Fahrzeuge (Faktor)", 1.0, ""),
+            relativ('benzin_emissionsdaten', "CO2eq-Emissionsdaten Benzin", self.benzin_emissionsdaten, "g/l"),
+            relativ('diesel_emissionsdaten', "CO2eq-Emissionsdaten Diesel", self.diesel_emissionsdaten, "g/l"),
+            relativ('strom_emissionsdaten', "CO2eq-Emissionsdaten Strom", self.strom_emissionsdaten, "g/kWh"),
+            absolut('oekostrom_anteil', "Anteil sekundäre Stromquelle", self.oekostrom_anteil, 20.0, 0.0, 100.0),
+            absolut('anteil_miv', "Anteil MIV (Fahrer)", self._miv_anteil(), 10.0, 0.0, summe),
+            relativ('emission_miv', "Emissionsdaten MIV (Faktor)", 1.0, ""),
+        ]
+        if self.tabelle.wege:
+            parameter.append(relativ('entfernung', "Wegeentfernungen (Faktor)", 1.0, ""))
+        return tuple(parameter)
+
+    def _miv_anteil(self) -> float:
+        return float(self.tabelle.anteile[self.tabelle.index('miv_fahrer')])
+
+    def evaluate(self, werte: Mapping) -> dict:
+        """Kennzahlen für Parameterwerte (Arrays gleicher Länge); fehlende Parameter bleiben beim Basisfall."""
+        n = len(next(iter(werte.values()))) if werte else 1
+
+        def wert(name, basis):
+            return np.broadcast_to(np.asarray(werte.get(name, basis), dtype=float), (n,))
+
+        # Abschnitt 3: Fahrzeugkilometer aus der Nachfrage
+        leerkilometeranteil = wert('leerkilometeranteil', self.leerkilometeranteil)
+        fahrzeugkilometer_gesamt = self.personenkilometer_gefahren / wert('besetzungsquote', self.besetzungsquote) / (1 - leerkilometeranteil / 100)
+        verbrauch = wert('verbrauch', 1.0) * fahrzeugkilometer_gesamt
+
+        # Abschnitte 4 und 5: wie compute_rps_emissions mit gewichtetem Stromfaktor
+        oekostrom_anteil = wert('oekostrom_anteil', self.oekostrom_anteil)
+        strom_emissionsdaten = (wert('strom_emissionsdaten', self.strom_emissionsdaten) * (1 - oekostrom_anteil / 100)
+                                + self.pv_emissionsdaten * oekostrom_anteil / 100)
+        co2_emissionen_gesamt_rps = (
+            verbrauch * self.benzin_je_km * wert('benzin_emissionsdaten', self.benzin_emissionsdaten)
+            + verbrauch * self.diesel_je_km * wert('diesel_emissionsdaten', self.diesel_emissionsdaten)
+            + verbrauch * self.strom_je_km * strom_emissionsdaten * (1 - oekostrom_anteil / 100)
+        ) / 1000
+        co2_emissionen_pro_personenkilometer_rps = co2_emissionen_gesamt_rps / self.personenkilometer_gefahren
+
+        # Abschnitte 6 bis 9: MIV-Anteil zulasten der übrigen Verkehrsmittel, Summe der Anteile bleibt gleich
+        tabelle = self.tabelle
+        anteile = np.broadcast_to(tabelle.anteile, (n, len(tabelle.keys))).copy()
+        miv = tabelle.index('miv_fahrer')
+        summe, miv_basis = float(tabelle.anteile.sum()), self._miv_anteil()
+        anteil_miv = wert('anteil_miv', miv_basis)
+        rest = np.ones(len(tabelle.keys), dtype=bool)
+        rest[miv] = False
+        if summe - miv_basis > 0:
+            anteile[:, rest] *= ((summe - anteil_miv) / (summe - miv_basis))[:, None]
+        anteile[:, miv] = anteil_miv
+        emissionsfaktoren = np.broadcast_to(tabelle.emissionsfaktoren, anteile.shape).copy()
+        for key in MIV_KEYS:
+            if key in tabelle.keys:
+                emissionsfaktoren[:, tabelle.index(key)] *= wert('emission_miv', 1.0)
+        entfernungen = tabelle.entfernungen * wert('entfernung', 1.0)[:, None]
+        _, _, _, gesamtemissionen_av, emissionen_pro_personenkilometer_av = reference_kernel(
+            tabelle.wege, anteile, entfernungen, emissionsfaktoren, tabelle.bilanziert, self.transportierte_fahrgaeste,
+            self.personenkilometer_gefahren)
+
+        return {
+            'co2_emissionen_gesamt_rps': co2_emissionen_gesamt_rps,
+            'co2_emissionen_pro_personenkilometer_rps': co2_emissionen_pro_personenkilometer_rps,
+            'gesamtemissionen_av': gesamtemissionen_av,
+            'emissionen_pro_personenkilometer_av': emissionen_pro_personenkilometer_av,
+            'differenz_pro_personenkilometer': emissionen_pro_personenkilometer_av - co2_emissionen_pro_personenkilometer_rps,
+            'total_difference': gesamtemissionen_av - co2_emissionen_gesamt_rps,
+        }
+
+
+def _evaluate_block(model: BalanceModel, namen: tuple, X: np.ndarray, ausgabe: str) -> np.ndarray:
+    return model.evaluate(dict(zip(namen, X.T)))[ausgabe]
+
+
+def evaluate_batch(model: BalanceModel, parameter, X: np.ndarray, ausgabe: str, prozesse: int = 1,
+                   fortschritt: Optional[Fortschritt] = None) -> np.ndarray:
+    """Auswertung aller Zeilen von `X` (Werte in Parametereinheiten) in Blöcken, mit `prozesse > 1` parallel."""
+    namen = tuple(p.name for p in parameter)
+    bloecke = [X[start:start + BLOCKGROESSE] for start in range(0, len(X), BLOCKGROESSE)]
+    return np.concatenate(run_tasks(_evaluate_block, [(model, namen, block, ausgabe) for block in bloecke], prozesse, fortschritt))
+
+
+def _skalieren(parameter, U: np.ndarray) -> np.ndarray:
+    """Einheitswürfel [0, 1]^k -> Parameterbereiche."""
+    untere = np.array([p.untere for p in parameter])
+    obere = np.array([p.obere for p in parameter])
+    return untere + U * (obere - untere)
+
+
+def morris(model: BalanceModel, parameter, ausgabe: str, trajektorien: int = 100, stufen: int = 4,
+           seed: Optional[int] = None, prozesse: int = 1, fortschritt: Optional[Fortschritt] = None) -> pd.DataFrame:
+    """Morris-Elementareffekte (mu*, mu, sigma) je Parameter, bezogen auf den ganzen Parameterbereich."""
+    rng = np.random.default_rng(seed)
+    k = len(parameter)
+    delta = stufen / (2 * (stufen - 1))
+    # Startpunkte auf dem Stufengitter; Schritte um +delta bzw. -delta, je nachdem, welcher im Würfel bleibt
+    start = rng.integers(0, stufen, size=(trajektorien, k)) / (stufen - 1)
+    schritt = np.where(start + delta <= 1, delta, -delta)
+    reihenfolge = np.argsort(rng.random((trajektorien, k)), axis=1)
+    schritte = np.zeros((trajektorien, k, k))
+    zeilen = np.repeat(np.arange(trajektorien), k)
+    spalten = reihenfolge.ravel()
+    schritte[zeilen, np.tile(np.arange(k), trajektorien), spalten] = schritt[zeilen, spalten]
+    U = start[:, None, :] + np.concatenate([np.zeros((trajektorien, 1, k)), np.cumsum(schritte, axis=1)], axis=1)
+
+    y = evaluate_batch(model, parameter, _skalieren(parameter, U.reshape(-1, k)), ausgabe, prozesse, fortschritt).reshape(trajektorien, k + 1)
+    effekte = np.empty((trajektorien, k))
+    # Schritt i einer Trajektorie ändert Parameter reihenfolge[:, i]
+    effekte[zeilen, spalten] = np.diff(y, axis=1).ravel() / schritt[zeilen, spalten]
+    return pd.DataFrame({
+        'parameter': [p.name for p in parameter],
+        'Parameter': [p.label for p in parameter],
+        'mu_star': np.abs(effekte).mean(axis=0),
+        'mu': effekte.mean(axis=0),
+        'sigma': effekte.std(axis=0, ddof=1) if trajektorien > 1 else np.zeros(k),
+    }).sort_values('mu_star', ascending=False, ignore_index=True)
+
+
+def sobol(model: BalanceModel, parameter, ausgabe: str, stichproben: int = 4096, seed: Optional[int] = None,
+          prozesse: int = 1, fortschritt: Optional[Fortschritt] = None) -> pd.DataFrame:
+    """Sobol-Indizes erster Ordnung (Saltelli 2010) und totale Indizes (Jansen) aus N * (k + 2) Auswertungen."""
+    rng = np.random.default_rng(seed)
+    k = len(parameter)
+    A = rng.random((stichproben, k))
+    B = rng.random((stichproben, k))
+    AB = np.repeat(A[None], k, axis=0)
+    AB[np.arange(k), :, np.arange(k)] = B.T
+    U = np.concatenate([A, B, AB.reshape(-1, k)])
+
+    y = evaluate_batch(model, parameter, _skalieren(parameter, U), ausgabe, prozesse, fortschritt)
+    y_a, y_b, y_ab = y[:stichproben], y[stichproben:2 * stichproben], y[2 * stichproben:].reshape(k, stichproben)
+    varianz = np.var(np.concatenate([y_a, y_b]))
+    if varianz <= 0:
+        erste, totale = np.zeros(k), np.zeros(k)
+    else:
+        erste = np.mean(y_b * (y_ab - y_a), axis=1) / varianz
+        totale = 0.5 * np.mean((y_a - y_ab) ** 2, axis=1) / varianz
+    return pd.DataFrame({
+        'parameter': [p.name for p in parameter],
+        'Parameter': [p.label for p in parameter],
+        'S1': erste,
+        'ST': totale,
+    }).sort_values('ST', ascending=False, ignore_index=True)
+
+
+def tornado(model: BalanceModel, parameter, ausgabe: str) -> pd.DataFrame:
+    """Kennzahl an der unteren und oberen Bereichsgrenze je Parameter (übrige Parameter im Basisfall), nach Spannweite sortiert."""
+    k = len(parameter)
+    basis = np.array([p.basis for p in parameter])
+    X = np.repeat(basis[None], 2 * k, axis=0)
+    X[np.arange(k), np.arange(k)] = [p.untere for p in parameter]
+    X[k + np.arange(k), np.arange(k)] = [p.obere for p in parameter]
+    y = evaluate_batch(model, parameter, np.vstack([basis, X]), ausgabe)
+    result = pd.DataFrame({
+        'parameter': [p.name for p in parameter],
+        'Parameter': [p.label for p in parameter],
+        'basis': y[0],
+        'unten': y[1:k + 1],
+        'oben': y[k + 1:],
+    })
+    result['spannweite'] = (result['oben'] - result['unten']).abs()
+    return result.sort_values('spannweite', ascending=False, ignore_index=True)
+
+
+@dataclass(frozen=True)
+class SensitivitySpec:
+    methode: str = MORRIS
+    ausgabe: str = 'differenz_pro_personenkilometer'
+    spanne: float = 0.2
+    trajektorien: int = 100  # Morris
+    stichproben: int = 4096  # Sobol
+    seed: Optional[int] = None
+
+
+@dataclass(frozen=True, eq=False)
+class SensitivityResult:
+    spec: SensitivitySpec
+    parameter: tuple
+    indizes: pd.DataFrame
+    tornado: pd.DataFrame = field(repr=False)
+
+
+def run_sensitivity(model: BalanceModel, spec: SensitivitySpec = SensitivitySpec(), prozesse: int = 1,
+                    fortschritt: Optional[Fortschritt] = None) -> SensitivityResult:
+    parameter = model.parameters(spec.spanne)
+    if spec.methode == MORRIS:
+        indizes = morris(model, parameter, spec.ausgabe, spec.trajektorien, seed=spec.seed, prozesse=prozesse, fortschritt=fortschritt)
+    elif spec.methode == SOBOL:
+        indizes = sobol(model, parameter, spec.ausgabe, spec.stichproben, seed=spec.seed, prozesse=prozesse, fortschritt=fortschritt)
+    else:
+        raise ValueError(f"Unbekannte Methode der Sensitivitätsanalyse: {spec.methode}")
+    return SensitivityResult(spec, parameter, indizes, tornado(model, parameter, spec.ausgabe))
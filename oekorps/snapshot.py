@@ -0,0 +1,145 @@
+"""Szenario-Dateien: alle Eingaben der Abschnitte 1 bis 8 in einer Datei.
+
+Ein Szenario enthält die Eingaben (`EINGABEN`, Namen wie im Sitzungszustand
+der Anwendung) und die Fahrzeugtabelle. `snapshot_bytes` schreibt es als
+JSON-Dokument mit Formatkennung und Version (optional mit gzip komprimiert),
+`snapshot_token` als kurzen Text für Links (zlib, Base64 für URLs).
+`read_snapshot` und `read_token` lesen beide Fassungen und prüfen Format,
+Version und Datentypen; eine Datei einer neueren Version wird abgelehnt.
+"""
+import base64
+import binascii
+import gzip
+import json
+import zlib
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Mapping
+
+import numpy as np
+import pandas as pd
+
+from oekorps import presets
+from oekorps.engine import FAHRZEUG_SPALTEN
+from oekorps.fleet import empty_fleet, validate_fleet
+
+FORMAT = "oekorps-szenario"
+VERSION = 1
+
+# Eingaben der Abschnitte 1 bis 8 -> Typ; Werte je Verkehrsmittel als {Verkehrsmittel: Wert}
+EINGABEN = {
+    'name_ridepooling_system': str,
+    'start_date': date,
+    'end_date': date,
+    'ridepooling_system_auswahl': str,  # Abschnitt 2: Vorauswahl des Ridepooling-Systems
+    'abgeschlossene_buchungen': int,
+    'transportierte_fahrgaeste': int,
+    'benzin_emissionsdaten_auswahl': str,
+    'benzin_emissionsdaten': float,
+    'diesel_emissionsdaten_auswahl': str,
+    'diesel_emissionsdaten': float,
+    'strom_emissionsdaten_auswahl': str,
+    'strom_emissionsdaten_netz': float,  # vor der Gewichtung mit der sekundären Stromquelle
+    'oekostrom_anteil': int,
+    'pv_emissionsdaten': float,
+    'methodik': str,
+    'selected_modal_split': str,
+    'anteile': dict,  # %
+    'selected_entfernung': str,
+    'entfernungen': dict,  # km, nur Wege-Methoden
+    'selected_emissionsdaten_av': str,
+    'emissionsfaktoren_av': dict,  # g CO2eq/Pkm
+}
+
+_GZIP = b"\x1f\x8b"
+
+
+@dataclass(frozen=True, eq=False)
+class Snapshot:
+    eingaben: Mapping  # Teilmenge von `EINGABEN`
+    fahrzeuge: pd.DataFrame = field(default_factory=empty_fleet)  # Spalten `FAHRZEUG_SPALTEN`
+    datenbibliothek: str = presets.VERSION  # Version der Datenbibliothek beim Speichern
+
+
+def _json_wert(wert):
+    """JSON-fähiger Wert: Datum als ISO-Text, NumPy-Zahlen als Python-Zahlen."""
+    if isinstance(wert, date):
+        return wert.isoformat()
+    if isinstance(wert, Mapping):
+        return {str(schluessel): float(w) for schluessel, w in wert.items()}
+    if isinstance(wert, np.generic):
+        return wert.item()
+    return wert
+
+
+def _eingabe(name: str, wert):
+    """Wert aus der Datei als Typ von `EINGABEN`; ValueError bei ungültigem Wert."""
+    typ = EINGABEN[name]
+    try:
+        if typ is date:
+            return date.fromisoformat(wert)
+        if typ is dict:
+            return {str(schluessel): float(w) for schluessel, w in dict(wert).items()}
+        if typ is int:
+            return int(round(float(wert)))
+        return typ(wert)
+    except (TypeError, ValueError) as error:
+        raise ValueError(f"Ungültiger Wert für '{name}' im Szenario: {wert!r}") from error
+
+
+def _dokument(snapshot: Snapshot) -> bytes:
+    fahrzeuge = snapshot.fahrzeuge.reindex(columns=list(FAHRZEUG_SPALTEN))
+    dokument = {
+        'format': FORMAT,
+        'version': VERSION,
+        'datenbibliothek': snapshot.datenbibliothek,
+        'eingaben': {name: _json_wert(wert) for name, wert in snapshot.eingaben.items() if name in EINGABEN and wert is not None},
+        'fahrzeuge': {spalte: fahrzeuge[spalte].tolist() for spalte in FAHRZEUG_SPALTEN},
+    }
+    return json.dumps(dokument, ensure_ascii=False, separators=(',', ':'), allow_nan=False).encode('utf-8')
+
+
+def _snapshot(inhalt: bytes) -> Snapshot:
+    try:
+        dokument = json.loads(inhalt.decode('utf-8'))
+    except (UnicodeDecodeError, json.JSONDecodeError) as error:
+        raise ValueError(f"Die Szenario-Datei kann nicht gelesen werden: {error}") from error
+    if not isinstance(dokument, dict) or dokument.get('format') != FORMAT or not isinstance(dokument.get('version'), int):
+        raise ValueError("Die Datei ist keine Szenario-Datei von ÖkoRPS.")
+    version = dokument['version']
+    if version > VERSION:
+        raise ValueError(f"Die Szenario-Datei hat eine neuere Version ({version}) als unterstützt ({VERSION}).")
+    eingaben = {name: _eingabe(name, wert) for name, wert in dict(dokument.get('eingaben') or {}).items() if name in EINGABEN}
+    fahrzeuge = pd.DataFrame(dokument.get('fahrzeuge') or {spalte: [] for spalte in FAHRZEUG_SPALTEN})
+    return Snapshot(eingaben, validate_fleet(fahrzeuge, erste_zeile=1), str(dokument.get('datenbibliothek', "")))
+
+
+def snapshot_bytes(snapshot: Snapshot, komprimiert: bool = True) -> bytes:
+    """Szenario als JSON-Datei; mit `komprimiert` gzip-komprimiert (gleiche Eingaben ergeben gleiche Bytes)."""
+    inhalt = _dokument(snapshot)
+    return gzip.compress(inhalt, mtime=0) if komprimiert else inhalt
+
+
+def read_snapshot(daten: bytes) -> Snapshot:
+    """Szenario aus einer Datei von `snapshot_bytes` (JSON, mit oder ohne gzip)."""
+    if daten[:2] == _GZIP:
+        try:
+            daten = gzip.decompress(daten)
+        except (OSError, EOFError) as error:
+            raise ValueError(f"Die Szenario-Datei kann nicht entpackt werden: {error}") from error
+    return _snapshot(daten)
+
+
+def snapshot_token(snapshot: Snapshot) -> str:
+    """Szenario als Text für Links (zlib-komprimiert, Base64 für URLs ohne Auffüllzeichen)."""
+    return base64.urlsafe_b64encode(zlib.compress(_dokument(snapshot), 9)).rstrip(b'=').decode('ascii')
+
+
+def read_token(token: str) -> Snapshot:
+    """Szenario aus einem Text von `snapshot_token`."""
+    token = token.strip()
+    try:
+        inhalt = zlib.decompress(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+    except (binascii.Error, zlib.error, ValueError) as error:
+        raise ValueError("Der Szenario-Code ist ungültig.") from error
+    return _snapshot(inhalt)
@@ -0,0 +1,216 @@
+"""Bilanzspeicher: berechnete Bilanzen dauerhaft in einer SQLite-Datei.
+
+Jede Bilanz wird mit ihren Eingaben, der Methodik, der Version der
+Datenbibliothek und den Ergebnissen als eine Zeile der Tabelle `bilanzen`
+abgelegt. System, Methodik und Zeitraum sowie die wichtigsten Kennzahlen
+(`KENNZAHLEN`) sind eigene Spalten mit Index; Eingaben und vollständige
+Ergebnisse stehen als JSON daneben. Eine Bilanz mit gleichen Eingaben und
+Ergebnissen wird nur einmal gespeichert.
+
+Der Pfad kann über die Umgebungsvariable `OEKORPS_SPEICHER` angegeben werden.
+"""
+import hashlib
+import json
+import math
+import os
+import sqlite3
+from datetime import date, datetime, timezone
+from typing import Iterable, Mapping, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from oekorps import presets
+
+SPEICHER = "oekorps_bilanzen.sqlite"
+SCHEMA_VERSION = 1
+
+# Kennzahlen mit eigener Spalte; alle übrigen Ergebnisse nur im JSON der Spalte `ergebnisse`
+KENNZAHLEN = (
+    'abgeschlossene_buchungen', 'transportierte_fahrgaeste', 'fahrzeugkilometer_gesamt', 'personenkilometer_gefahren',
+    'co2_emissionen_gesamt_rps', 'co2_emissionen_pro_personenkilometer_rps', 'personenkilometer_gesamt_av', 'gesamtemissionen_av',
+    'emissionen_pro_personenkilometer_av', 'percentage_difference', 'total_difference',
+)
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS bilanzen (
+    id INTEGER PRIMARY KEY,
+    schluessel TEXT NOT NULL UNIQUE,
+    erstellt TEXT NOT NULL,
+    quelle TEXT NOT NULL,
+    name_ridepooling_system TEXT NOT NULL,
+    start_date TEXT,
+    end_date TEXT,
+    methodik TEXT NOT NULL,
+    datenbibliothek TEXT NOT NULL,
+    {', '.join(f'{kennzahl} REAL' for kennzahl in KENNZAHLEN)},
+    ergebnis TEXT,
+    eingaben TEXT NOT NULL,
+    ergebnisse TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS bilanzen_system ON bilanzen (name_ridepooling_system, methodik, start_date, end_date);
+CREATE INDEX IF NOT EXISTS bilanzen_zeitraum ON bilanzen (start_date, end_date);
+"""
+
+_SPALTEN = ('schluessel', 'erstellt', 'quelle', 'name_ridepooling_system', 'start_date', 'end_date', 'methodik', 'datenbibliothek',
+            *KENNZAHLEN, 'ergebnis', 'eingaben', 'ergebnisse')
+_EINFUEGEN = f"INSERT OR IGNORE INTO bilanzen ({', '.join(_SPALTEN)}) VALUES ({', '.join('?' * len(_SPALTEN))})"
+_ABFRAGE_SPALTEN = ('id', 'erstellt', 'quelle', 'name_ridepooling_system', 'start_date', 'end_date', 'methodik', 'datenbibliothek',
+                    *KENNZAHLEN, 'ergebnis')
+
+
+def _bereinigt(wert):
+    """JSON-fähige Werte: NumPy-Zahlen als Python-Zahlen, Datum als ISO-Text, NaN als None."""
+    if isinstance(wert, Mapping):
+        return {str(schluessel): _bereinigt(w) for schluessel, w in wert.items()}
+    if isinstance(wert, (list, tuple, np.ndarray)):
+        return [_bereinigt(w) for w in wert]
+    if isinstance(wert, np.generic):
+        wert = wert.item()
+    if isinstance(wert, float) and math.isnan(wert):
+        return None
+    if wert is pd.NaT or wert is pd.NA:
+        return None
+    if isinstance(wert, (date, datetime, pd.Timestamp)):
+        return wert.isoformat()
+    return wert
+
+
+def _datum(wert) -> Optional[str]:
+    """Tag im ISO-Format (JJJJ-MM-TT); andere Werte unverändert als Text."""
+    if wert is None or (isinstance(wert, float) and math.isnan(wert)) or wert is pd.NaT or wert is pd.NA:
+        return None
+    if isinstance(wert, (date, pd.Timestamp)):
+        return pd.Timestamp(wert).date().isoformat()
+    return str(wert)
+
+
+def _grenze(wert: Union[int, date, str, None], ende: bool) -> Optional[str]:
+    """Grenze eines Abfragezeitraums; ein Jahr steht für den 1.1. (von) bzw. 31.12. (bis)."""
+    if wert is None:
+        return None
+    if isinstance(wert, int):
+        return date(wert, 12, 31).isoformat() if ende else date(wert, 1, 1).isoformat()
+    return _datum(wert)
+
+
+def store_path(pfad: Optional[str] = None) -> str:
+    """Pfad des Bilanzspeichers: Angabe, Umgebungsvariable `OEKORPS_SPEICHER` oder `SPEICHER`."""
+    return pfad or os.environ.get('OEKORPS_SPEICHER') or SPEICHER
+
+
+class RunStore:
+    def __init__(self, pfad: Optional[str] = None):
+        self.pfad = store_path(pfad)
+        self._verbindung = sqlite3.connect(self.pfad)
+        self._verbindung.execute("PRAGMA journal_mode=WAL")
+        version = self._verbindung.execute("PRAGMA user_version").fetchone()[0]
+        if version > SCHEMA_VERSION:
+            self._verbindung.close()
+            raise ValueError(f"Der Bilanzspeicher {self.pfad} hat eine neuere Version ({version}) als unterstützt ({SCHEMA_VERSION}).")
+        with self._verbindung:
+            self._verbindung.executescript(_SCHEMA)
+            self._verbindung.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self) -> None:
+        self._verbindung.close()
+
+    def __enter__(self) -> "RunStore":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def _zeile(self, ergebnisse: Mapping, eingaben: Mapping, quelle: str, datenbibliothek: str, erstellt: str) -> tuple:
+        start_date, end_date = _datum(ergebnisse.get('start_date')), _datum(ergebnisse.get('end_date'))
+        ergebnisse, eingaben = _bereinigt(dict(ergebnisse)), _bereinigt(dict(eingaben))
+        if not ergebnisse.get('methodik'):
+            raise ValueError("Eine Bilanz für den Bilanzspeicher benötigt eine Methodik.")
+        ergebnisse_json = json.dumps(ergebnisse, ensure_ascii=False, sort_keys=True)
+        eingaben_json = json.dumps(eingaben, ensure_ascii=False, sort_keys=True)
+        schluessel = hashlib.sha256(f"{datenbibliothek}\n{eingaben_json}\n{ergebnisse_json}".encode('utf-8')).hexdigest()
+        return (schluessel, erstellt, quelle, str(ergebnisse.get('name_ridepooling_system') or ""),
+                start_date, end_date, ergebnisse['methodik'], datenbibliothek,
+                *(ergebnisse.get(kennzahl) for kennzahl in KENNZAHLEN), ergebnisse.get('ergebnis'), eingaben_json, ergebnisse_json)
+
+    def record_many(self, zeilen: Iterable[Mapping], eingaben: Mapping, quelle: str = "cli", datenbibliothek: str = presets.VERSION) -> int:
+        """Mehrere Bilanzen (flache Ergebnisse wie `BalanceResult.as_dict` bzw. Zeilen von `compute_batch`) in einer Transaktion.
+
+        Rückgabe: Zahl der neu gespeicherten Bilanzen.
+        """
+        erstellt = datetime.now(timezone.utc).isoformat(timespec='seconds')
+        werte = [self._zeile(zeile, eingaben, quelle, datenbibliothek, erstellt) for zeile in zeilen]
+        with self._verbindung:
+            vorher = self._verbindung.total_changes
+            self._verbindung.executemany(_EINFUEGEN, werte)
+            return self._verbindung.total_changes - vorher
+
+    def record(self, ergebnisse: Mapping, eingaben: Mapping, quelle: str = "app", datenbibliothek: str = presets.VERSION) -> int:
+        """Eine Bilanz speichern; Rückgabe: ihre ID (auch wenn sie bereits gespeichert war)."""
+        zeile = self._zeile(ergebnisse, eingaben, quelle, datenbibliothek, datetime.now(timezone.utc).isoformat(timespec='seconds'))
+        with self._verbindung:
+            self._verbindung.execute(_EINFUEGEN, zeile)
+        return self._verbindung.execute("SELECT id FROM bilanzen WHERE schluessel = ?", (zeile[0],)).fetchone()[0]
+
+    def query(self, system: Optional[str] = None, methodik: Optional[str] = None, von: Union[int, date, str, None] = None,
+              bis: Union[int, date, str, None] = None, limit: Optional[int] = None) -> pd.DataFrame:
+        """Gespeicherte Bilanzen, deren Zeitraum sich mit [von, bis] überschneidet (Jahre oder Tage), nach System und Zeitraum sortiert.
+
+        Beispiel: alle Bilanzen von LOOPmünster 2021 bis 2025 nach Umfrage (Pkm):
+        `store.query("LOOPmünster", UMFRAGE_PKM, 2021, 2025)`.
+        """
+        bedingungen, parameter = [], []
+        if system is not None:
+            bedingungen.append("name_ridepooling_system = ?")
+            parameter.append(system)
+        if methodik is not None:
+            bedingungen.append("methodik = ?")
+            parameter.append(methodik)
+        if (grenze := _grenze(von, ende=False)) is not None:
+            bedingungen.append("end_date >= ?")
+            parameter.append(grenze)
+        if (grenze := _grenze(bis, ende=True)) is not None:
+            bedingungen.append("start_date <= ?")
+            parameter.append(grenze)
+        sql = f"SELECT {', '.join(_ABFRAGE_SPALTEN)} FROM bilanzen"
+        if bedingungen:
+            sql += " WHERE " + " AND ".join(bedingungen)
+        sql += " ORDER BY name_ridepooling_system, start_date, end_date, methodik, id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            parameter.append(int(limit))
+        return pd.read_sql_query(sql, self._verbindung, params=parameter)
+
+    def load(self, bilanz_id: int) -> dict:
+        """Eine gespeicherte Bilanz mit Eingaben und Ergebnissen (aus dem JSON)."""
+        zeile = self._verbindung.execute("SELECT datenbibliothek, quelle, erstellt, eingaben, ergebnisse FROM bilanzen WHERE id = ?",
+                                         (int(bilanz_id),)).fetchone()
+        if zeile is None:
+            raise KeyError(f"Keine gespeicherte Bilanz mit der ID {bilanz_id}")
+        datenbibliothek, quelle, erstellt, eingaben, ergebnisse = zeile
+        return {'id': int(bilanz_id), 'datenbibliothek': datenbibliothek, 'quelle': quelle, 'erstellt': erstellt,
+                'eingaben': json.loads(eingaben), 'ergebnisse': json.loads(ergebnisse)}
+
+    def systems(self) -> list:
+        return [zeile[0] for zeile in self._verbindung.execute("SELECT DISTINCT name_ridepooling_system FROM bilanzen ORDER BY 1")]
+
+
+def balance_from_tables(tabellen: Mapping[str, pd.DataFrame]) -> tuple:
+    """Ergebnisse und Eingaben einer Bilanz aus den Tabellen von `oekorps.export.export_tables`.
+
+    Rückgabe: (flache Ergebnisse, Eingaben) für `RunStore.record`.
+    """
+    eingaben = tabellen['eingaben'].iloc[0].to_dict()
+    referenz = tabellen['referenz']
+    ergebnisse = {
+        **{schluessel: eingaben[schluessel] for schluessel in ('name_ridepooling_system', 'start_date', 'end_date', 'methodik',
+                                                              'abgeschlossene_buchungen', 'transportierte_fahrgaeste')},
+        **tabellen['zusammenfassung'].iloc[0].to_dict(),
+        **{f"personenkilometer_{key}": wert for key, wert in zip(referenz['verkehrsmittel'], referenz['personenkilometer'])},
+    }
+    eingaben = {
+        **eingaben,
+        'flotte': tabellen['flotte'].to_dict('records'),
+        'referenz': referenz[['verkehrsmittel', 'anteil', 'entfernung', 'emissionsfaktor']].to_dict('records'),
+    }
+    return ergebnisse, eingaben
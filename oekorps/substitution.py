@@ -0,0 +1,137 @@
+"""Referenzmobilität je Fahrt (Substitution) für Fahrtdaten.
+
+Abschnitt 7 rechnet je Verkehrsmittel mit einer mittleren Wegeentfernung.
+Mit Fahrtdaten erhält stattdessen jede Fahrt ein alternatives Verkehrsmittel
+und behält ihre eigene Distanz (besetzte Kilometer); die Personenkilometer je
+Verkehrsmittel sind die Summe aus Fahrgästen mal Distanz über alle Fahrten,
+die diesem Verkehrsmittel zugeordnet sind.
+
+Das Verkehrsmittel wird je Fahrt gezogen, entweder nach den Anteilen der
+Wege-Methodik oder über ein distanzabhängiges Logit-Modell mit dem Nutzen
+ln(Anteil) + beta * ln(Distanz / Referenzdistanz). Bei der Referenzdistanz
+entsprechen die Wahrscheinlichkeiten den Anteilen; beta > 0 macht ein
+Verkehrsmittel für längere Fahrten wahrscheinlicher. Werte für beta sind
+Annahmen des Nutzers, Standard ist 0 für alle Verkehrsmittel. Mit
+Entfernungsklassen (`oekorps.bands`) gelten je Fahrt die Anteile ihrer Klasse.
+"""
+from dataclasses import dataclass
+from typing import Mapping, Optional
+
+import numpy as np
+
+from oekorps.bands import DistanceBands
+from oekorps.engine import ReferenceResult
+from oekorps.modes import ModeTable, mode_vector
+from oekorps.parallel import Fortschritt, run_tasks, task_seeds
+from oekorps.trips import BLOCKZEILEN, BUCHUNG, FAHRGAESTE, FAHRT_KM_BESETZT, read_trip_chunks, validate_trips
+
+ANTEILE = "anteile"
+ENTFERNUNG = "entfernung"
+WAHLMODELLE = (ANTEILE, ENTFERNUNG)
+
+# Fahrten je Block; wie bei der Monte-Carlo-Simulation unabhängig von der Zahl der Prozesse
+BLOCKGROESSE = 500_000
+
+# Untergrenze der Distanz im Logit-Modell [km], damit ln(Distanz) endlich bleibt
+MIN_DISTANZ = 0.01
+
+
+@dataclass(frozen=True)
+class SubstitutionSpec:
+    wahlmodell: str = ANTEILE
+    elastizitaeten: Optional[Mapping] = None  # beta je Verkehrsmittel (nur ENTFERNUNG); fehlende Einträge sind 0
+    referenzdistanz: Optional[float] = None  # km; Standard: mittlere Distanz der Fahrten
+    klassen: Optional[DistanceBands] = None  # Anteile je Entfernungsklasse statt der Anteile der Verkehrsmitteltabelle
+    seed: Optional[int] = None
+
+
+@dataclass(frozen=True, eq=False)
+class SubstitutionResult:
+    referenz: ReferenceResult
+    fahrten: Mapping  # Schlüssel -> Anzahl der Fahrten
+    referenzdistanz: float  # km
+
+
+def load_trips(source, name=None, blockzeilen: int = BLOCKZEILEN) -> tuple:
+    """Distanz [km] und Fahrgäste je gebuchter Fahrt als float32-Arrays.
+
+    Fahrten ohne Buchungs-ID (z. B. Umsetzfahrten) haben keine Fahrgäste und
+    werden nicht übernommen.
+    """
+    distanzen, fahrgaeste, zeile = [], [], 2
+    for block in read_trip_chunks(source, name, blockzeilen):
+        fahrten = validate_trips(block, erste_zeile=zeile)
+        zeile += len(fahrten)
+        gebucht = fahrten[BUCHUNG].notna().to_numpy()
+        distanzen.append(fahrten[FAHRT_KM_BESETZT].to_numpy()[gebucht])
+        fahrgaeste.append(fahrten[FAHRGAESTE].to_numpy()[gebucht])
+    if not distanzen:
+        return np.zeros(0, dtype=np.float32), np.zeros(0, dtype=np.float32)
+    return np.concatenate(distanzen), np.concatenate(fahrgaeste)
+
+
+def _choose_block(klassen: DistanceBands, elastizitaeten: np.ndarray, referenzdistanz: float, distanzen: np.ndarray,
+                  fahrgaeste: np.ndarray, seed: np.random.SeedSequence) -> tuple:
+    """Verkehrsmittel je Fahrt ziehen; Rückgabe: (Pkm je Verkehrsmittel, Fahrten je Verkehrsmittel)."""
+    rng = np.random.default_rng(seed)
+    m = klassen.anteile.shape[1]
+    zufall = rng.random(len(distanzen))
+    if not elastizitaeten.any():
+        wahl = klassen.draw(distanzen, zufall)
+    else:
+        # exp(Nutzen) = Anteil * (Distanz / Referenzdistanz) ** beta, nur für Verkehrsmittel mit Anteil > 0
+        aktiv = np.flatnonzero(klassen.anteile.max(axis=0) > 0)
+        anteile = klassen.anteile[:, aktiv][klassen.band_index(distanzen)] if klassen.klassen > 1 else klassen.anteile[0, aktiv]
+        verhaeltnis = np.log(np.maximum(distanzen, MIN_DISTANZ) / referenzdistanz)
+        grenzen = np.cumsum(anteile * np.exp(np.outer(verhaeltnis, elastizitaeten[aktiv])), axis=1)
+        wahl = aktiv[np.minimum((grenzen < (zufall * grenzen[:, -1])[:, None]).sum(axis=1), len(aktiv) - 1)]
+    personenkilometer = np.bincount(wahl, weights=fahrgaeste.astype(float) * distanzen, minlength=m)
+    return personenkilometer, np.bincount(wahl, minlength=m)
+
+
+def substitute_trips(tabelle: ModeTable, distanzen, fahrgaeste, spec: SubstitutionSpec = SubstitutionSpec(), prozesse: int = 1,
+                     fortschritt: Optional[Fortschritt] = None) -> SubstitutionResult:
+    """Referenzmobilität aus einzelnen Fahrten; Anteile (ohne `spec.klassen`) und Emissionsfaktoren aus `tabelle`.
+
+    Nur für Wege-Methoden: deren Anteile beziehen sich auf Wege, also Fahrten.
+    Das Ergebnis hängt nur von `spec.seed` ab, nicht von der Zahl der Prozesse.
+    """
+    if not tabelle.wege:
+        raise ValueError("Die Substitution je Fahrt benötigt eine Wege-Methodik (Anteile je Weg).")
+    if spec.wahlmodell not in WAHLMODELLE:
+        raise ValueError(f"Unbekanntes Wahlmodell: {spec.wahlmodell}")
+    if spec.klassen is not None and spec.klassen.methodik != tabelle.methodik:
+        raise ValueError("Die Entfernungsklassen gehören zu einer anderen Methodik.")
+    if spec.klassen is None and tabelle.anteile.sum() <= 0:
+        raise ValueError("Die Anteile der Verkehrsmittel ergeben zusammen 0 %.")
+    klassen = spec.klassen or DistanceBands.flat(tabelle.methodik, tabelle.anteile)
+    distanzen = np.asarray(distanzen, dtype=np.float32)
+    fahrgaeste = np.asarray(fahrgaeste, dtype=np.float32)
+    if distanzen.shape != fahrgaeste.shape:
+        raise ValueError("Distanzen und Fahrgäste müssen gleich viele Fahrten enthalten.")
+
+    elastizitaeten = mode_vector(tabelle.methodik, spec.elastizitaeten) if spec.wahlmodell == ENTFERNUNG else np.zeros(len(tabelle.keys))
+    referenzdistanz = spec.referenzdistanz or (float(distanzen.mean(dtype=float)) if len(distanzen) else 1.0)
+    if referenzdistanz <= 0:
+        raise ValueError("Die Referenzdistanz muss größer als 0 sein.")
+
+    starts = range(0, len(distanzen), BLOCKGROESSE)
+    argumente = [(klassen, elastizitaeten, referenzdistanz, distanzen[start:start + BLOCKGROESSE],
+                  fahrgaeste[start:start + BLOCKGROESSE], seed) for start, seed in zip(starts, task_seeds(spec.seed, len(starts)))]
+    ergebnisse = run_tasks(_choose_block, argumente, prozesse, fortschritt)
+    personenkilometer = np.round(sum((pkm for pkm, _ in ergebnisse), np.zeros(len(tabelle.keys))), 2)
+    fahrten = sum((anzahl for _, anzahl in ergebnisse), np.zeros(len(tabelle.keys), dtype=np.int64))
+
+    # Summen wie in `reference_kernel`: die Verkehrsinduktion wird nicht bilanziert
+    emissionen = personenkilometer * tabelle.emissionsfaktoren / 1000
+    personenkilometer_gesamt_av = round(float(np.where(tabelle.bilanziert, personenkilometer, 0.0).sum()), 2)
+    gesamtemissionen_av = round(float(np.where(tabelle.bilanziert, emissionen, 0.0).sum()), 2)
+    referenz = ReferenceResult(
+        methodik=tabelle.methodik,
+        personenkilometer=dict(zip(tabelle.keys, personenkilometer.tolist())),
+        emissionen=dict(zip(tabelle.keys, emissionen.tolist())),
+        personenkilometer_gesamt_av=personenkilometer_gesamt_av,
+        gesamtemissionen_av=gesamtemissionen_av,
+        emissionen_pro_personenkilometer_av=gesamtemissionen_av / personenkilometer_gesamt_av if personenkilometer_gesamt_av > 0 else 0.0,
+    )
+    return SubstitutionResult(referenz, dict(zip(tabelle.keys, fahrten.tolist())), referenzdistanz)
@@ -0,0 +1,131 @@
+"""Parameterstudie: Kennzahlen auf einem Gitter über ein bis drei Eingaben mit Break-even-Suche.
+
+Das Gitter wird in einem Aufruf von `BalanceModel.evaluate` berechnet. Der
+Break-even (gleiche Emissionen pro Pkm von Ridepooling-System und
+Referenzmobilität) wird für die erste Achse je Gitterpunkt der übrigen Achsen
+gesucht, für alle Punkte gleichzeitig mit dem Illinois-Verfahren.
+"""
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from oekorps.sensitivity import AUSGABEN, BalanceModel
+
+# Kennzahl, deren Nullstelle der Break-even ist
+BREAK_EVEN_AUSGABE = 'differenz_pro_personenkilometer'
+MAX_ACHSEN = 3
+
+
+@dataclass(frozen=True)
+class Achse:
+    name: str  # Parameter von BalanceModel
+    untere: float
+    obere: float
+    schritte: int = 41
+
+    @property
+    def werte(self) -> np.ndarray:
+        return np.linspace(self.untere, self.obere, self.schritte)
+
+
+@dataclass(frozen=True)
+class SweepSpec:
+    achsen: tuple  # 1 bis 3 Achsen; der Break-even wird für die erste gesucht
+    ausgabe: str = 'differenz_pro_personenkilometer'
+
+
+@dataclass(frozen=True, eq=False)
+class SweepResult:
+    spec: SweepSpec
+    werte: np.ndarray  # Kennzahl, eine Dimension je Achse
+    break_even: np.ndarray  # Wert der ersten Achse je Gitterpunkt der übrigen Achsen; NaN ohne Break-even im Bereich
+
+    @property
+    def achsen(self) -> tuple:
+        return tuple(achse.werte for achse in self.spec.achsen)
+
+    def frame(self) -> pd.DataFrame:
+        """Gitter in langer Form: eine Spalte je Achse und die Kennzahl."""
+        gitter = np.meshgrid(*self.achsen, indexing='ij')
+        spalten = {achse.name: werte.ravel() for achse, werte in zip(self.spec.achsen, gitter)}
+        spalten[self.spec.ausgabe] = self.werte.ravel()
+        return pd.DataFrame(spalten)
+
+
+def default_axes(model: BalanceModel, schritte: int = 41) -> dict:
+    """Vorschlag je Parameter: Faktoren von 50 bis 150 % des Basiswerts, Anteile über den ganzen Bereich."""
+    anteile_bis = {'leerkilometeranteil': 80.0, 'oekostrom_anteil': 100.0, 'anteil_miv': float(model.tabelle.anteile.sum())}
+    achsen = {}
+    for parameter in model.parameters(spanne=0.5):
+        if parameter.name in anteile_bis:
+            achsen[parameter.name] = Achse(parameter.name, 0.0, anteile_bis[parameter.name], schritte)
+        else:
+            achsen[parameter.name] = Achse(parameter.name, parameter.untere, parameter.obere, schritte)
+    return achsen
+
+
+def find_roots(func: Callable, untere, obere, xtol: float = 1e-9, iterationen: int = 100) -> np.ndarray:
+    """Nullstellen von `func` je Intervall [untere, obere], vektorisiert über alle Intervalle.
+
+    Illinois-Verfahren (Regula falsi mit Halbierung des Funktionswerts am
+    festen Intervallende); NaN, wenn `func` an den Grenzen dasselbe Vorzeichen hat.
+    """
+    a, b = np.broadcast_arrays(np.asarray(untere, dtype=float), np.asarray(obere, dtype=float))
+    a, b = a.copy(), b.copy()
+    fa, fb = func(a), func(b)
+    wurzel = np.full(a.shape, np.nan)
+    wurzel = np.where(fb == 0, b, wurzel)
+    wurzel = np.where(fa == 0, a, wurzel)
+    offen = fa * fb < 0
+    seite = np.zeros(a.shape, dtype=int)  # zuletzt ersetztes Intervallende: -1 b, +1 a
+    c_alt = np.full(a.shape, np.nan)
+    for _ in range(iterationen):
+        if not offen.any():
+            break
+        c = np.where(offen, (a * fb - b * fa) / np.where(offen, fb - fa, 1.0), a)
+        fc = func(c)
+        rechts = offen & (fc * fb > 0)  # Nullstelle in [a, c]
+        links = offen & (fc * fa > 0)  # Nullstelle in [c, b]
+        fa_neu = np.where(rechts & (seite == -1), fa / 2, fa)
+        fb_neu = np.where(links & (seite == 1), fb / 2, fb)
+        b, fb = np.where(rechts, c, b), np.where(rechts, fc, fb_neu)
+        a, fa = np.where(links, c, a), np.where(links, fc, fa_neu)
+        seite = np.where(rechts, -1, np.where(links, 1, seite))
+
+        fertig = offen & ((fc == 0) | (np.abs(c - c_alt) <= xtol * (1 + np.abs(c))) | (np.abs(b - a) <= xtol * (1 + np.abs(c))))
+        wurzel = np.where(fertig, c, wurzel)
+        offen &= ~fertig
+        c_alt = c
+    return np.where(offen, c_alt, wurzel)
+
+
+def run_sweep(model: BalanceModel, spec: SweepSpec) -> SweepResult:
+    namen = [achse.name for achse in spec.achsen]
+    bekannt = {parameter.name for parameter in model.parameters()}
+    if not 1 <= len(namen) <= MAX_ACHSEN:
+        raise ValueError(f"Die Parameterstudie benötigt 1 bis {MAX_ACHSEN} Parameter.")
+    if len(set(namen)) != len(namen):
+        raise ValueError("Jeder Parameter darf in der Parameterstudie nur einmal vorkommen.")
+    if unbekannt := [name for name in namen if name not in bekannt]:
+        raise ValueError(f"Unbekannte Parameter: {', '.join(unbekannt)}")
+    if spec.ausgabe not in AUSGABEN:
+        raise ValueError(f"Unbekannte Kennzahl: {spec.ausgabe}")
+    if any(achse.schritte < 2 for achse in spec.achsen):
+        raise ValueError("Jede Achse benötigt mindestens 2 Stützstellen.")
+
+    achsen = [achse.werte for achse in spec.achsen]
+    gitter = np.meshgrid(*achsen, indexing='ij')
+    werte = model.evaluate({name: g.ravel() for name, g in zip(namen, gitter)})[spec.ausgabe].reshape(gitter[0].shape)
+
+    # Break-even der ersten Achse je Kombination der übrigen Achsen
+    erste, uebrige = spec.achsen[0], spec.achsen[1:]
+    rest = [g.ravel() for g in np.meshgrid(*achsen[1:], indexing='ij')] if uebrige else []
+
+    def differenz(x):
+        return model.evaluate({erste.name: x, **{achse.name: r for achse, r in zip(uebrige, rest)}})[BREAK_EVEN_AUSGABE]
+
+    n = len(rest[0]) if rest else 1
+    break_even = find_roots(differenz, np.full(n, erste.untere), np.full(n, erste.obere))
+    return SweepResult(spec, werte, break_even.reshape(tuple(achse.schritte for achse in uebrige)))
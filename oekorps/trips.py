@@ -0,0 +1,261 @@
+"""Fahrtdaten aus dem Buchungssystem: zeitlich aufgelöste Bilanzen.
+
+Eine Fahrtliste enthält eine Zeile je Fahrt mit Buchungsnummer, Fahrgästen,
+besetzten und leeren Kilometern, Fahrzeug und Zeitstempel; Fahrten ohne
+Buchungsnummer (z. B. Umsetzfahrten) zählen nur mit ihren Kilometern. Die Datei
+wird blockweise gelesen, nur mit den benötigten Spalten und in kompakten
+Datentypen (Fahrzeug-ID als Kategorie, Kilometer und Fahrgäste als float32,
+numerische Buchungs-IDs als Int32). Je Block werden Summen je Zeitraum und
+Fahrzeug gebildet und zu den bisherigen addiert. Der Speicherbedarf hängt daher
+nur von der Blockgröße und der Zahl der Zeiträume und Fahrzeuge ab, nicht von
+der Zahl der Fahrten.
+
+Aus den Summen entstehen Fahrzeug- und Leistungstabellen für `oekorps.batch`
+mit `start_date`/`end_date` je Zeitraum sowie mit `trip_totals` die Eingaben
+der Abschnitte 2 und 3 für den ganzen Zeitraum.
+"""
+from pathlib import Path
+from typing import Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+from oekorps.batch import BATCH_KEYS, compute_batch
+from oekorps.engine import FAHRZEUG_SPALTEN, FAHRZEUGTYP, KILOMETER_BESETZT, KILOMETER_LEER, EmissionFactors
+from oekorps.fleet import ZAHLEN_SPALTEN, _csv_kopf, _zahlen, _zeilen, _zeitpunkte, read_table
+from oekorps.grid import GridSeries, with_grid_factors
+
+BUCHUNG = 'buchung_id'
+FAHRGAESTE = 'fahrgaeste'
+FAHRT_KM_BESETZT = 'km_besetzt'
+FAHRT_KM_LEER = 'km_leer'
+FAHRZEUG = 'fahrzeug_id'
+ZEITSTEMPEL = 'zeitstempel'
+FAHRT_SPALTEN = (BUCHUNG, FAHRGAESTE, FAHRT_KM_BESETZT, FAHRT_KM_LEER, FAHRZEUG, ZEITSTEMPEL)
+PFLICHT_SPALTEN = (FAHRT_KM_BESETZT, FAHRT_KM_LEER, FAHRZEUG, ZEITSTEMPEL)
+
+# Alternative Spaltenbezeichnungen (klein geschrieben) -> Spalte der Fahrtliste
+FAHRT_ALIASE = {
+    **{spalte: spalte for spalte in FAHRT_SPALTEN},
+    'buchung': BUCHUNG, 'buchungsnummer': BUCHUNG, 'booking_id': BUCHUNG, 'booking': BUCHUNG,
+    'fahrgäste': FAHRGAESTE, 'personen': FAHRGAESTE, 'passengers': FAHRGAESTE, 'pax': FAHRGAESTE,
+    'kilometer besetzt': FAHRT_KM_BESETZT, 'kilometer_besetzt': FAHRT_KM_BESETZT, 'km besetzt': FAHRT_KM_BESETZT,
+    'occupied_km': FAHRT_KM_BESETZT,
+    'kilometer leer': FAHRT_KM_LEER, 'kilometer_leer': FAHRT_KM_LEER, 'km leer': FAHRT_KM_LEER, 'deadhead_km': FAHRT_KM_LEER,
+    'fahrzeug': FAHRZEUG, 'fahrzeug-id': FAHRZEUG, 'vehicle_id': FAHRZEUG, 'vehicle': FAHRZEUG,
+    'zeit': ZEITSTEMPEL, 'datum': ZEITSTEMPEL, 'timestamp': ZEITSTEMPEL,
+}
+
+# Zeiträume der Auswertung -> Pandas-Periodenkürzel
+ZEITRAEUME = {'Tag': 'D', 'Woche': 'W', 'Monat': 'M'}
+
+# Zeilen je gelesenem Block
+BLOCKZEILEN = 200_000
+
+SUMMEN_SPALTEN = ('abgeschlossene_buchungen', 'transportierte_fahrgaeste', KILOMETER_LEER, KILOMETER_BESETZT)
+
+
+def _projektion(spalten) -> dict:
+    """Spalten der Datei, die einer Spalte der Fahrtliste entsprechen -> Spalte der Fahrtliste."""
+    return {spalte: FAHRT_ALIASE[str(spalte).strip().lower()] for spalte in spalten
+            if str(spalte).strip().lower() in FAHRT_ALIASE}
+
+
+def read_trip_chunks(source, name=None, blockzeilen: int = BLOCKZEILEN) -> Iterator[pd.DataFrame]:
+    """Fahrtliste in Blöcken, nur mit den Spalten der Fahrtliste.
+
+    CSV wird über `chunksize` gelesen, Parquet über Record-Batches von Arrow;
+    die Fahrzeug-ID wird dabei als Kategorie gelesen. Excel und JSON werden als
+    ein Block gelesen und eignen sich daher nur für kleinere Dateien.
+    """
+    suffix = Path(name if name is not None else source).suffix.lower()
+    if suffix == '.parquet':
+        import pyarrow.parquet as pq
+
+        datei = pq.ParquetFile(source)
+        projektion = _projektion(datei.schema_arrow.names)
+        fahrzeug = [spalte for spalte, ziel in projektion.items() if ziel == FAHRZEUG]
+        for batch in datei.iter_batches(batch_size=blockzeilen, columns=list(projektion)):
+            yield batch.to_pandas(categories=fahrzeug)
+    elif suffix in ('.xlsx', '.xls', '.json'):  # .xls: Fehlermeldung von read_table
+        df = read_table(source, name)
+        yield df[list(_projektion(df.columns))]
+    else:
+        sep, decimal, spalten = _csv_kopf(source)
+        projektion = _projektion(spalten)
+        dtype = {spalte: 'category' for spalte, ziel in projektion.items() if ziel == FAHRZEUG}
+        with pd.read_csv(source, sep=sep, decimal=decimal, usecols=list(projektion), dtype=dtype, chunksize=blockzeilen) as reader:
+            yield from reader
+
+
+def _kompakte_ids(spalte: pd.Series) -> pd.Series:
+    """Numerische Buchungs-IDs als `Int32`, wenn der Wertebereich passt; sonst unverändert."""
+    if not pd.api.types.is_numeric_dtype(spalte) or spalte.isna().all():
+        return spalte
+    grenzen = np.iinfo(np.int32)
+    werte = spalte.dropna()
+    if werte.min() < grenzen.min or werte.max() > grenzen.max or (werte % 1 != 0).any():
+        return spalte
+    return spalte.astype('Int32')
+
+
+def validate_trips(df: pd.DataFrame, erste_zeile: int = 2) -> pd.DataFrame:
+    """Prüft einen Block der Fahrtliste und gibt ihn mit den Spalten `FAHRT_SPALTEN` zurück.
+
+    Zeitstempel werden je Wert als ISO 8601 oder deutsch (`TT.MM.JJJJ [hh:mm]`) gelesen.
+    Fehlende Fahrgäste zählen als 0; fehlende Pflichtspalten, fehlende Fahrzeuge,
+    ungültige Zeitstempel sowie nicht numerische und negative Werte führen zu einem
+    `ValueError` mit den Fundstellen (Zeilennummern ab `erste_zeile`).
+    """
+    df = df.rename(columns=lambda spalte: FAHRT_ALIASE.get(str(spalte).strip().lower(), str(spalte).strip()))
+    fehlende = [spalte for spalte in PFLICHT_SPALTEN if spalte not in df.columns]
+    if fehlende:
+        raise ValueError(f"Die Fahrtdaten enthalten nicht die Spalten: {', '.join(fehlende)}")
+
+    fehler = []
+    # Fahrzeug-IDs als Kategorie: Leerzeichen werden nur je Kategorie entfernt, nicht je Fahrt
+    fahrzeug = df[FAHRZEUG].astype('category')
+    kategorien = fahrzeug.cat.categories.astype("string").str.strip()
+    if kategorien.is_unique:
+        fahrzeug = fahrzeug.cat.rename_categories(kategorien)
+    else:
+        fahrzeug = fahrzeug.astype("string").str.strip().astype('category')
+    leer = fahrzeug.isna().to_numpy() | (fahrzeug == "").to_numpy()
+    if leer.any():
+        fehler.append(f"{FAHRZEUG} fehlt in Zeile {_zeilen(leer, erste_zeile)}")
+
+    zeitstempel = _zeitpunkte(df[ZEITSTEMPEL])
+    if getattr(zeitstempel.dt, 'tz', None) is not None:
+        # Ortszeit beibehalten, damit Tage und Monate nicht verschoben werden
+        zeitstempel = zeitstempel.dt.tz_localize(None)
+    ungueltig = zeitstempel.isna().to_numpy()
+    if ungueltig.any():
+        fehler.append(f"{ZEITSTEMPEL}: kein gültiger Zeitpunkt in Zeile {_zeilen(ungueltig, erste_zeile)}")
+
+    result = pd.DataFrame({
+        BUCHUNG: _kompakte_ids(df[BUCHUNG]) if BUCHUNG in df.columns else pd.Series(np.arange(len(df), dtype=np.int32), index=df.index),
+        FAHRZEUG: fahrzeug,
+        ZEITSTEMPEL: zeitstempel,
+    })
+    for spalte in (FAHRGAESTE, FAHRT_KM_BESETZT, FAHRT_KM_LEER):
+        if spalte not in df.columns:
+            result[spalte] = np.float32(0.0)
+            continue
+        werte = _zahlen(df[spalte])
+        # Nur Zellen ohne Zahl werden als Text geprüft; bei gültigen Blöcken entfällt die Umwandlung
+        ungueltig = (werte.isna() & df[spalte].notna()).to_numpy()
+        if ungueltig.any():
+            ungueltig = ungueltig & (df[spalte].astype("string").str.strip() != "").fillna(False).to_numpy(dtype=bool)
+        if ungueltig.any():
+            fehler.append(f"{spalte}: keine Zahl in Zeile {_zeilen(ungueltig, erste_zeile)}")
+        werte = werte.fillna(0.0)
+        negativ = (werte < 0).to_numpy()
+        if negativ.any():
+            fehler.append(f"{spalte}: negativer Wert in Zeile {_zeilen(negativ, erste_zeile)}")
+        result[spalte] = werte.to_numpy(dtype=np.float32)
+
+    if fehler:
+        raise ValueError("Fahrtdaten ungültig: " + "; ".join(fehler))
+    return result.reset_index(drop=True)
+
+
+class TripAggregator:
+    """Summen je Zeitraum und Fahrzeug, fortgeschrieben Block für Block."""
+
+    def __init__(self, zeitraum: str = 'Monat'):
+        if zeitraum not in ZEITRAEUME:
+            raise ValueError(f"Unbekannter Zeitraum: {zeitraum}")
+        self.zeitraum = zeitraum
+        self.fahrten = 0
+        self._summen = None
+
+    def add(self, block: pd.DataFrame) -> None:
+        fahrten = validate_trips(block, erste_zeile=self.fahrten + 2)
+        self.fahrten += len(fahrten)
+        gebucht = fahrten[BUCHUNG].notna()
+        teil = pd.DataFrame({
+            'zeitraum': fahrten[ZEITSTEMPEL].dt.to_period(ZEITRAEUME[self.zeitraum]),
+            FAHRZEUG: fahrten[FAHRZEUG],
+            'abgeschlossene_buchungen': gebucht.astype(float),
+            # Summen in doppelter Genauigkeit, auch wenn die Fahrten als float32 vorliegen; Fahrgäste nur mit Buchung
+            'transportierte_fahrgaeste': fahrten[FAHRGAESTE].astype(float).where(gebucht, 0.0),
+            KILOMETER_LEER: fahrten[FAHRT_KM_LEER].astype(float),
+            KILOMETER_BESETZT: fahrten[FAHRT_KM_BESETZT].astype(float),
+        }).groupby(['zeitraum', FAHRZEUG], sort=False, observed=True).sum()
+        # Kategorien unterscheiden sich je Block; für die Addition zählen nur die IDs
+        teil.index = teil.index.set_levels(teil.index.levels[1].astype(object), level=1)
+        self._summen = teil if self._summen is None else pd.concat([self._summen, teil]).groupby(level=[0, 1], sort=False).sum()
+
+    @property
+    def summen(self) -> pd.DataFrame:
+        """Eine Zeile je Zeitraum und Fahrzeug mit `start_date`, `end_date` und `SUMMEN_SPALTEN`."""
+        if self._summen is None:
+            return pd.DataFrame(columns=['start_date', 'end_date', FAHRZEUG, *SUMMEN_SPALTEN])
+        summen = self._summen.sort_index().reset_index()
+        zeitraum = pd.PeriodIndex(summen.pop('zeitraum'))
+        summen.insert(0, 'start_date', zeitraum.start_time.date)
+        summen.insert(1, 'end_date', zeitraum.end_time.date)
+        return summen
+
+
+def aggregate_trips(source, name=None, zeitraum: str = 'Monat', blockzeilen: int = BLOCKZEILEN) -> pd.DataFrame:
+    """Liest eine Fahrtliste blockweise und gibt die Summen je Zeitraum und Fahrzeug zurück."""
+    aggregator = TripAggregator(zeitraum)
+    for block in read_trip_chunks(source, name, blockzeilen):
+        aggregator.add(block)
+    return aggregator.summen
+
+
+def trip_totals(summen: pd.DataFrame, fahrzeuge: pd.DataFrame) -> tuple:
+    """Eingaben der Abschnitte 2 und 3 für den ganzen Zeitraum der Fahrtliste.
+
+    Gibt die Fahrzeugtabelle (eine Zeile je Fahrzeug mit Verbrauch und
+    Kilometern), die abgeschlossenen Buchungen und die transportierten Fahrgäste zurück.
+    """
+    gesamt = summen.groupby(FAHRZEUG, sort=True)[list(SUMMEN_SPALTEN)].sum().reset_index()
+    fahrzeug_tabelle, _ = trip_fleet_tables(gesamt.assign(start_date=None, end_date=None), fahrzeuge)
+    return (fahrzeug_tabelle[list(FAHRZEUG_SPALTEN)], int(gesamt['abgeschlossene_buchungen'].sum()),
+            int(gesamt['transportierte_fahrgaeste'].sum()))
+
+
+def trip_fleet_tables(summen: pd.DataFrame, fahrzeuge: pd.DataFrame, name_ridepooling_system: str = "") -> tuple:
+    """Fahrzeug- und Leistungstabelle für `oekorps.batch` aus den Summen und einer geprüften Fahrzeugtabelle.
+
+    Der Verbrauch wird über `Fahrzeugtyp` = Fahrzeug-ID zugeordnet; eine
+    Fahrzeugtabelle mit nur einer Zeile gilt für alle Fahrzeuge.
+    """
+    verbrauch = fahrzeuge.drop_duplicates(FAHRZEUGTYP).set_index(FAHRZEUGTYP)
+    verbrauch_spalten = [spalte for spalte in ZAHLEN_SPALTEN if spalte not in (KILOMETER_LEER, KILOMETER_BESETZT)]
+    if len(verbrauch) == 1:
+        zuordnung = verbrauch.iloc[np.zeros(len(summen), dtype=int)]
+    else:
+        fehlend = sorted(set(summen[FAHRZEUG]) - set(verbrauch.index))
+        if fehlend:
+            raise ValueError(f"Kein Verbrauch in der Fahrzeugtabelle für die Fahrzeuge: {', '.join(fehlend[:10])}"
+                             + (f" und {len(fehlend) - 10} weitere" if len(fehlend) > 10 else ""))
+        zuordnung = verbrauch.loc[summen[FAHRZEUG]]
+
+    tabelle = summen.assign(name_ridepooling_system=name_ridepooling_system)
+    fahrzeug_tabelle = pd.DataFrame({
+        **{key: tabelle[key].to_numpy() for key in BATCH_KEYS},
+        FAHRZEUGTYP: tabelle[FAHRZEUG].to_numpy(),
+        **{spalte: zuordnung[spalte].to_numpy(dtype=float) for spalte in verbrauch_spalten},
+        KILOMETER_LEER: tabelle[KILOMETER_LEER].to_numpy(dtype=float),
+        KILOMETER_BESETZT: tabelle[KILOMETER_BESETZT].to_numpy(dtype=float),
+    })
+    leistung = tabelle.groupby(list(BATCH_KEYS), sort=False)[['abgeschlossene_buchungen', 'transportierte_fahrgaeste']].sum().reset_index()
+    return fahrzeug_tabelle, leistung
+
+
+def compute_trip_balance(summen: pd.DataFrame, fahrzeuge: pd.DataFrame, faktoren: EmissionFactors = EmissionFactors(),
+                         name_ridepooling_system: str = "", methodik: Optional[str] = None, anteile=None, emissionsfaktoren=None,
+                         entfernungen=None, netz: Optional[GridSeries] = None, ladeprofil=None) -> pd.DataFrame:
+    """Bilanz je Zeitraum (Abschnitte 3 bis 10 über `compute_batch`).
+
+    Mit `netz` gilt je Zeitraum der Emissionsfaktor für Strom aus der Zeitreihe
+    und dem Ladeprofil (`oekorps.grid`) statt `faktoren.strom_emissionsdaten`.
+    """
+    fahrzeug_tabelle, leistung = trip_fleet_tables(summen, fahrzeuge, name_ridepooling_system)
+    if netz is not None:
+        leistung = with_grid_factors(leistung, netz, ladeprofil)
+    return compute_batch(fahrzeug_tabelle, leistung, faktoren, BATCH_KEYS, methodik, anteile, emissionsfaktoren, entfernungen)
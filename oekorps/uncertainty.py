@@ -0,0 +1,140 @@
+"""Monte-Carlo-Simulation der Referenzmobilität (Unsicherheitsanalyse zu Abschnitt 10).
+
+Die Eingaben der Verkehrsmitteltabelle werden als Zufallsgrößen behandelt:
+Anteile folgen einer Dirichlet-Verteilung um die gewählte Verteilung,
+Wegeentfernungen und Emissionsfaktoren einer Lognormal- oder Dreiecksverteilung
+um den gewählten Wert. Alle Stichproben eines Blocks werden gemeinsam über
+`reference_kernel` berechnet; Blöcke können auf mehrere Prozesse verteilt werden.
+"""
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from oekorps.modes import ModeTable, reference_kernel
+from oekorps.parallel import Fortschritt, run_tasks, task_seeds
+
+LOGNORMAL = "lognormal"
+DREIECK = "dreieck"
+FEST = "fest"
+VERTEILUNGEN = (LOGNORMAL, DREIECK, FEST)
+
+# Stichproben je Block; die Zerlegung ist unabhängig von der Zahl der Prozesse, damit ein Startwert
+# immer dieselben Ergebnisse liefert
+BLOCKGROESSE = 25_000
+
+
+@dataclass(frozen=True)
+class UncertaintySpec:
+    stichproben: int = 100_000
+    konzentration: float = 100.0  # Dirichlet: je größer, desto enger um die gewählte Verteilung
+    entfernung_verteilung: str = LOGNORMAL
+    entfernung_streuung: float = 0.2  # relativ: Lognormal sigma = ln(1 + s), Dreieck ±s
+    emission_verteilung: str = LOGNORMAL
+    emission_streuung: float = 0.1
+    seed: Optional[int] = None
+
+
+def sample_shares(anteile, konzentration: float, n: int, rng: np.random.Generator) -> np.ndarray:
+    """Dirichlet-Stichproben der Anteile [%]; Verkehrsmittel mit Anteil 0 bleiben 0, die Summe bleibt erhalten."""
+    anteile = np.asarray(anteile, dtype=float)
+    summe = anteile.sum()
+    positiv = anteile > 0
+    result = np.zeros((n, len(anteile)))
+    if summe <= 0 or konzentration <= 0:
+        result[:] = anteile
+        return result
+    result[:, positiv] = rng.dirichlet(konzentration * anteile[positiv] / summe, size=n) * summe
+    return result
+
+
+def sample_values(werte, verteilung: str, streuung: float, n: int, rng: np.random.Generator) -> np.ndarray:
+    """Stichproben um die Werte je Verkehrsmittel; der gewählte Wert ist Median (Lognormal) bzw. Modus (Dreieck)."""
+    werte = np.asarray(werte, dtype=float)
+    if verteilung == FEST or streuung <= 0:
+        return np.broadcast_to(werte, (n, len(werte))).copy()
+    if verteilung == LOGNORMAL:
+        return werte * rng.lognormal(0.0, np.log1p(streuung), size=(n, len(werte)))
+    if verteilung == DREIECK:
+        # Faktor mit Modus 1 und Grenzen 1 - s (höchstens bis 0) und 1 + s
+        links = max(1.0 - streuung, 0.0)
+        return werte * rng.triangular(links, 1.0, 1.0 + streuung, size=(n, len(werte)))
+    raise ValueError(f"Unbekannte Verteilung: {verteilung}")
+
+
+def _simulate_block(tabelle: ModeTable, spec: UncertaintySpec, n: int, seed: np.random.SeedSequence,
+                    transportierte_fahrgaeste: float, personenkilometer_gefahren: float) -> tuple:
+    rng = np.random.default_rng(seed)
+    anteile = sample_shares(tabelle.anteile, spec.konzentration, n, rng)
+    entfernungen = sample_values(tabelle.entfernungen, spec.entfernung_verteilung, spec.entfernung_streuung, n, rng) if tabelle.wege else 0.0
+    emissionsfaktoren = sample_values(tabelle.emissionsfaktoren, spec.emission_verteilung, spec.emission_streuung, n, rng)
+    _, _, _, gesamtemissionen_av, emissionen_pro_personenkilometer_av = reference_kernel(
+        tabelle.wege, anteile, entfernungen, emissionsfaktoren, tabelle.bilanziert, transportierte_fahrgaeste, personenkilometer_gefahren)
+    return gesamtemissionen_av, emissionen_pro_personenkilometer_av
+
+
+@dataclass(frozen=True, eq=False)
+class MonteCarloResult:
+    gesamtemissionen_av: np.ndarray  # kg CO2eq je Stichprobe
+    emissionen_pro_personenkilometer_av: np.ndarray  # kg CO2eq/Pkm je Stichprobe
+    co2_emissionen_gesamt_rps: float
+    co2_emissionen_pro_personenkilometer_rps: float
+
+    @property
+    def differenz_pro_personenkilometer(self) -> np.ndarray:
+        """Referenz minus Ridepooling [kg CO2eq/Pkm]; positiv bedeutet Einsparung."""
+        return self.emissionen_pro_personenkilometer_av - self.co2_emissionen_pro_personenkilometer_rps
+
+    @property
+    def total_difference(self) -> np.ndarray:
+        """Referenz minus Ridepooling [kg CO2eq]; positiv bedeutet Einsparung."""
+        return self.gesamtemissionen_av - round(self.co2_emissionen_gesamt_rps, 2)
+
+    @property
+    def wahrscheinlichkeit_niedriger(self) -> float:
+        """Anteil der Stichproben, in denen das Ridepooling-System je Pkm weniger emittiert."""
+        return float(np.mean(self.co2_emissionen_pro_personenkilometer_rps < self.emissionen_pro_personenkilometer_av))
+
+    def summary(self, niveau: float = 0.95) -> pd.DataFrame:
+        """Median, Mittelwert und zentrales Konfidenzintervall je Kennzahl."""
+        grenzen = [(1 - niveau) / 2, (1 + niveau) / 2]
+        kennzahlen = {
+            "Emissionen Referenzmobilität pro Pkm (kg CO2eq/pkm)": self.emissionen_pro_personenkilometer_av,
+            "Differenz Referenz - Ridepooling pro Pkm (kg CO2eq/pkm)": self.differenz_pro_personenkilometer,
+            "Gesamtemissionen Referenzmobilität (kg CO2eq)": self.gesamtemissionen_av,
+            "Differenz Referenz - Ridepooling gesamt (kg CO2eq)": self.total_difference,
+        }
+        zeilen = []
+        for name, werte in kennzahlen.items():
+            untere, obere = np.quantile(werte, grenzen)
+            zeilen.append({"Kennzahl": name, "Median": float(np.median(werte)), "Mittelwert": float(np.mean(werte)),
+                           f"{niveau:.0%}-Intervall unten": float(untere), f"{niveau:.0%}-Intervall oben": float(obere)})
+        return pd.DataFrame(zeilen)
+
+
+def run_monte_carlo(tabelle: ModeTable, co2_emissionen_gesamt_rps: float, co2_emissionen_pro_personenkilometer_rps: float,
+                    spec: UncertaintySpec = UncertaintySpec(), transportierte_fahrgaeste: float = 0,
+                    personenkilometer_gefahren: float = 0, prozesse: int = 1,
+                    fortschritt: Optional[Fortschritt] = None) -> MonteCarloResult:
+    """Referenzmobilität für `spec.stichproben` Stichproben; die Emissionen des Ridepooling-Systems sind fest.
+
+    Mit `prozesse > 1` werden die Blöcke parallel berechnet; das Ergebnis hängt nur von `spec.seed` ab.
+    """
+    if spec.stichproben <= 0:
+        raise ValueError("Die Monte-Carlo-Simulation benötigt mindestens eine Stichprobe.")
+    if spec.konzentration < 0 or spec.entfernung_streuung < 0 or spec.emission_streuung < 0:
+        raise ValueError("Konzentration und Streuungen der Monte-Carlo-Simulation dürfen nicht negativ sein.")
+    for verteilung in (spec.entfernung_verteilung, spec.emission_verteilung):
+        if verteilung not in VERTEILUNGEN:
+            raise ValueError(f"Unbekannte Verteilung: {verteilung}")
+    bloecke = [min(BLOCKGROESSE, spec.stichproben - start) for start in range(0, spec.stichproben, BLOCKGROESSE)]
+    argumente = [(tabelle, spec, n, seed, transportierte_fahrgaeste, personenkilometer_gefahren)
+                 for n, seed in zip(bloecke, task_seeds(spec.seed, len(bloecke)))]
+    ergebnisse = run_tasks(_simulate_block, argumente, prozesse, fortschritt)
+    return MonteCarloResult(
+        gesamtemissionen_av=np.concatenate([gesamt for gesamt, _ in ergebnisse]),
+        emissionen_pro_personenkilometer_av=np.concatenate([pro_pkm for _, pro_pkm in ergebnisse]),
+        co2_emissionen_gesamt_rps=float(co2_emissionen_gesamt_rps),
+        co2_emissionen_pro_personenkilometer_rps=float(co2_emissionen_pro_personenkilometer_rps),
+    )
@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from oekorps.bands import BIS_KM, DistanceBands
+from oekorps.engine import MODAL_SPLIT_PKM, MODAL_SPLIT_WEGE, modes_for
+
+M = len(modes_for(MODAL_SPLIT_WEGE))
+
+
+def _anteile(**werte):
+    keys = modes_for(MODAL_SPLIT_WEGE)
+    return [werte.get(key, 0.0) for key in keys]
+
+
+# Bis 2 km überwiegend zu Fuß, bis 10 km Fahrrad und MIV, darüber MIV; Verkehrsmittel ohne Anteil dazwischen
+KLASSEN = DistanceBands(MODAL_SPLIT_WEGE, [2.0, 10.0], [
+    _anteile(zu_fuss=70, fahrrad_lastenrad=20, miv_fahrer=10),
+    _anteile(fahrrad_lastenrad=30, miv_fahrer=50, nahlinien_bus=20),
+    _anteile(miv_fahrer=80, schienen_nah_verkehr_bahn_zug=20),
+])
+
+
+def test_band_index_grenzen():
+    assert KLASSEN.band_index([0.5, 2.0, 9.99, 10.0, 250.0]).tolist() == [0, 1, 1, 2, 2]
+
+
+def test_draw_haeufigkeiten_wie_anteile():
+    rng = np.random.default_rng(0)
+    n = 200_000
+    for klasse, distanz in enumerate([1.0, 5.0, 40.0]):
+        wahl = KLASSEN.draw(np.full(n, distanz), rng.random(n))
+        haeufigkeit = np.bincount(wahl, minlength=M) / n
+        erwartet = KLASSEN.anteile[klasse] / KLASSEN.anteile[klasse].sum()
+        assert haeufigkeit == pytest.approx(erwartet, abs=0.005)
+        assert (haeufigkeit[erwartet == 0] == 0).all()
+
+
+def test_draw_raender_der_zufallszahlen():
+    # 0 und knapp 1 ergeben das erste bzw. letzte Verkehrsmittel mit Anteil der jeweiligen Klasse
+    distanzen = np.array([1.0, 1.0, 5.0, 5.0, 40.0, 40.0])
+    wahl = KLASSEN.draw(distanzen, np.array([0.0, 1 - 1e-12] * 3))
+    for klasse, (erste, letzte) in enumerate(wahl.reshape(3, 2)):
+        aktiv = np.flatnonzero(KLASSEN.anteile[klasse] > 0)
+        assert (erste, letzte) == (aktiv[0], aktiv[-1])
+
+
+def test_weighted_shares_und_flat():
+    # Zwei Fahrten in der ersten, eine in der letzten Klasse
+    verteilung = KLASSEN.weighted_shares([1.0, 1.5, 40.0])
+    assert verteilung == pytest.approx((2 * KLASSEN.anteile[0] + KLASSEN.anteile[2]) / 3)
+    flach = DistanceBands.flat(MODAL_SPLIT_WEGE, KLASSEN.anteile[1])
+    assert flach.shares_for([0.1, 1000.0]).tolist() == [KLASSEN.anteile[1].tolist()] * 2
+
+
+def test_from_frame_sortiert_und_offen():
+    tabelle = pd.DataFrame({BIS_KM: [None, 2.0, 10.0], "MIV (Fahrer)": [80, 10, 50], "zu Fuß": [None, 70, 0]})
+    klassen = DistanceBands.from_frame(MODAL_SPLIT_WEGE, tabelle)
+    assert klassen.grenzen.tolist() == [2.0, 10.0]
+    assert klassen.anteile[:, modes_for(MODAL_SPLIT_WEGE).index('miv_fahrer')].tolist() == [10, 50, 80]
+    pd.testing.assert_frame_equal(DistanceBands.from_frame(MODAL_SPLIT_WEGE, klassen.frame()).frame(), klassen.frame())
+
+
+@pytest.mark.parametrize('methodik, grenzen, anteile', [
+    (MODAL_SPLIT_PKM, [], [[1.0] * len(modes_for(MODAL_SPLIT_PKM))]),
+    (MODAL_SPLIT_WEGE, [5.0, 2.0], [[1.0] * M] * 3),
+    (MODAL_SPLIT_WEGE, [2.0], [[1.0] * M]),
+    (MODAL_SPLIT_WEGE, [2.0], [[1.0] * M, [0.0] * M]),
+])
+def test_ungueltige_klassen(methodik, grenzen, anteile):
+    with pytest.raises(ValueError):
+        DistanceBands(methodik, grenzen, anteile)
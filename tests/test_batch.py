@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from oekorps.batch import compute_batch
+from oekorps.engine import compute_balance, modes_for
+from oekorps.modes import ModeTable
+from tests.test_engine import BUCHUNGEN, FAHRGAESTE, FAHRZEUGE, FAKTOREN, SOLLWERTE, _inputs
+
+
+@pytest.mark.parametrize('methodik', SOLLWERTE)
+def test_compute_batch_wie_mode_table(methodik):
+    inputs = _inputs(methodik)
+    fahrzeuge = pd.DataFrame(FAHRZEUGE).assign(name_ridepooling_system="LOOP", start_date="2022-01-01", end_date="2022-12-31",
+                                               abgeschlossene_buchungen=BUCHUNGEN, transportierte_fahrgaeste=FAHRGAESTE)
+    zeile = compute_batch(fahrzeuge, faktoren=FAKTOREN, methodik=methodik, anteile=inputs.anteile,
+                          emissionsfaktoren=inputs.emissionsfaktoren_av, entfernungen=inputs.entfernungen).iloc[0]
+
+    bilanz = compute_balance(inputs)
+    entfernungen = inputs.entfernungen
+    if isinstance(entfernungen, str):
+        entfernungen = dict.fromkeys(modes_for(methodik), bilanz.flotte.durchschnittliche_fahrtdistanz_mit_bk)
+    referenz = ModeTable.for_methodik(methodik, inputs.anteile, inputs.emissionsfaktoren_av, entfernungen).compute(
+        FAHRGAESTE, zeile['personenkilometer_gefahren'])
+
+    for key in modes_for(methodik):
+        assert zeile[f'personenkilometer_{key}'] == referenz.personenkilometer[key]
+    for name in ('personenkilometer_gesamt_av', 'gesamtemissionen_av', 'emissionen_pro_personenkilometer_av'):
+        assert zeile[name] == getattr(referenz, name) == getattr(bilanz.referenz, name)
+    for name, wert in bilanz.as_dict().items():
+        if isinstance(wert, float):
+            assert np.isclose(zeile[name], wert, rtol=1e-12, atol=0), name
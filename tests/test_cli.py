@@ -0,0 +1,52 @@
+import pandas as pd
+import pytest
+
+from oekorps.cli import main
+
+FLOTTE = """name_ridepooling_system,start_date,end_date,Kilometer leer,Kilometer besetzt,Benzinverbrauch (l/100km),Dieselverbrauch (l/100km),Stromverbrauch (kWh/100km),abgeschlossene_buchungen,transportierte_fahrgaeste
+A,0,0,3416.43,5884.79,0.0,8.68,0.0,716,5610
+B,3,0,3935.48,3881.04,0.0,3.61,0.0,2810,5738
+B,3,0,1000.0,2000.0,6.5,0.0,0.0,2810,5738
+"""
+
+
+@pytest.fixture
+def flotte(tmp_path):
+    pfad = tmp_path / "systeme.csv"
+    pfad.write_text(FLOTTE, encoding='utf-8')
+    return pfad
+
+
+def test_compute_schreibt_eine_bilanz_je_system(flotte, tmp_path):
+    ziel = tmp_path / "ergebnisse.csv"
+    assert main(['compute', '--input', str(flotte), '--method', "Modal Split (Wege)", '--out', str(ziel)]) == 0
+    ergebnis = pd.read_csv(ziel)
+    assert ergebnis['name_ridepooling_system'].tolist() == ["A", "B"]
+    assert ergebnis['methodik'].unique().tolist() == ["Modal Split (Wege)"]
+    assert ergebnis.notna().all().all()
+
+
+def test_compute_mit_mehreren_methoden(flotte, tmp_path):
+    ziel = tmp_path / "ergebnisse.json"
+    assert main(['compute', '--input', str(flotte), '--method', "Modal Split (Wege)", "Umfrage (Pkm)", '--out', str(ziel)]) == 0
+    ergebnis = pd.read_json(ziel)
+    assert len(ergebnis) == 4
+    assert sorted(ergebnis['szenario'].unique()) == ["Modal Split (Wege)", "Umfrage (Pkm)"]
+
+
+def test_xls_wird_abgelehnt(flotte, tmp_path, capsys):
+    ziel = tmp_path / "ergebnisse.xls"
+    with pytest.raises(SystemExit) as beendet:
+        main(['compute', '--input', str(flotte), '--method', "Modal Split (Wege)", '--out', str(ziel)])
+    assert beendet.value.code == 2
+    assert ".xls" in capsys.readouterr().err
+    assert not ziel.exists()
+
+
+def test_fehlendes_excel_paket_ergibt_meldung(flotte, tmp_path, capsys, monkeypatch):
+    def ohne_openpyxl(*args, **kwargs):
+        raise ImportError("Missing optional dependency 'openpyxl'.")
+    monkeypatch.setattr(pd.DataFrame, 'to_excel', ohne_openpyxl)
+    with pytest.raises(SystemExit):
+        main(['compute', '--input', str(flotte), '--method', "Modal Split (Wege)", '--out', str(tmp_path / "ergebnisse.xlsx")])
+    assert "openpyxl" in capsys.readouterr().err
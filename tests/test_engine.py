@@ -0,0 +1,84 @@
+"""Sollwerte der Gesamtbilanz (Abschnitte 3 bis 10) für alle vier Methoden.
+
+Die Eingaben entsprechen einem Durchlauf der Anwendung: LOOPmünster mit zwei
+Fahrzeugen LEVC TX, Strom nach Umweltbundesamt (2024), Emissionsdaten nach
+Umweltbundesamt (2022). Die Sollwerte sind die Ergebnisse der Seite vor der
+Auslagerung in `oekorps.engine`, mit zwei Abweichungen: Der Fußverkehr der
+Wege-Methoden wurde dort wegen "zu Fuß"/"Zu Fuß" nicht mitgezählt, und bei
+Umfrage (Pkm) verglich der Filter der Verkehrsinduktion den Schlüssel mit dem
+Anzeigenamen, sodass deren Pkm in der Summe und im Wert je Pkm enthalten waren.
+"""
+import pytest
+
+from oekorps.engine import (
+    BENZINVERBRAUCH, DIESELVERBRAUCH, ENTFERNUNG_MIT_FAHRGAST, FAHRZEUGTYP, KILOMETER_BESETZT, KILOMETER_LEER, MODAL_SPLIT_PKM,
+    MODAL_SPLIT_WEGE, STROMVERBRAUCH, UMFRAGE_PKM, UMFRAGE_WEGE, BalanceInputs, EmissionFactors, compute_balance, modes_for,
+)
+
+FAHRZEUGE = [
+    {FAHRZEUGTYP: "LEVC TX", BENZINVERBRAUCH: 1.35, DIESELVERBRAUCH: 0.0, STROMVERBRAUCH: 21.55, KILOMETER_LEER: 120000.0, KILOMETER_BESETZT: 380000.0},
+    {FAHRZEUGTYP: "LEVC TX", BENZINVERBRAUCH: 1.35, DIESELVERBRAUCH: 0.0, STROMVERBRAUCH: 21.55, KILOMETER_LEER: 50000.0, KILOMETER_BESETZT: 150000.0},
+]
+FAKTOREN = EmissionFactors(benzin_emissionsdaten=2880, diesel_emissionsdaten=3170, strom_emissionsdaten=363)
+BUCHUNGEN, FAHRGAESTE = 151415, 187309
+
+MODAL_SPLIT_WEGE_MID = [42, 16, 3, 3, 2, 1, 1, 10, 22, 0]
+MODAL_SPLIT_PKM_MID = [77, 0, 2, 4, 10, 0, 1, 3, 3, 0]
+UMFRAGE_LOOP = [0, 31, 9, 7, 0, 2, 0, 10, 24, 17, 0]
+REISEWEITEN_MID = [16.0, 18.0, 23.0, 23.0, 23.0, 16.0, 4.0, 4.0, 2.0, 0.0]  # ohne Verkehrsinduktion
+EMISSIONEN_UBA = [0.0, 152.86, 152.86, 80.54, 58.79, 58.79, 90.0, 3.9, 0.0, 0.0, 0.0]  # mit Verkehrsinduktion
+
+# Methodik -> (Anteile, Wegeentfernungen, gesamtemissionen_av, personenkilometer_gesamt_av, emissionen_pro_personenkilometer_av)
+SOLLWERTE = {
+    MODAL_SPLIT_WEGE: (MODAL_SPLIT_WEGE_MID, REISEWEITEN_MID, 300667.11, 2337616.32, 0.12862124011865214),
+    MODAL_SPLIT_PKM: (MODAL_SPLIT_PKM_MID, None, 83648.26, 655640.0, 0.12758260630833992),
+    UMFRAGE_WEGE: (UMFRAGE_LOOP, ENTFERNUNG_MIT_FAHRGAST, 44807.42, 655581.5, 0.06834759675189125),
+    UMFRAGE_PKM: (UMFRAGE_LOOP, None, 44811.42, 655640.0, 0.06834759929229454),
+}
+
+# Umfrage mit 10 % Verkehrsinduktion: deren Pkm zählen weder in der Summe noch im Wert je Pkm
+UMFRAGE_LOOP_INDUKTION = [10, 31, 9, 7, 0, 2, 0, 10, 24, 7, 0]
+SOLLWERTE_INDUKTION = {
+    UMFRAGE_WEGE: (UMFRAGE_LOOP_INDUKTION, ENTFERNUNG_MIT_FAHRGAST, 44807.42, 590023.34, 0.07594177545586586),
+    UMFRAGE_PKM: (UMFRAGE_LOOP_INDUKTION, None, 44811.42, 590076.0, 0.07594177699143839),  # Seite vorher: 655640.0 Pkm
+}
+
+
+def _inputs(methodik: str, sollwerte=SOLLWERTE) -> BalanceInputs:
+    anteile, entfernungen, *_ = sollwerte[methodik]
+    modes = modes_for(methodik)
+    if isinstance(entfernungen, list):
+        entfernungen = dict(zip(modes, entfernungen))
+    return BalanceInputs(
+        abgeschlossene_buchungen=BUCHUNGEN, transportierte_fahrgaeste=FAHRGAESTE, fahrzeuge=FAHRZEUGE, methodik=methodik,
+        anteile=dict(zip(modes, anteile)), emissionsfaktoren_av=dict(zip(modes, EMISSIONEN_UBA[-len(modes):])),
+        entfernungen=entfernungen, faktoren=FAKTOREN,
+    )
+
+
+@pytest.mark.parametrize('methodik', SOLLWERTE)
+def test_compute_balance_sollwerte(methodik):
+    ergebnis = compute_balance(_inputs(methodik))
+    assert ergebnis.flotte.fahrzeugkilometer_gesamt == 700000.0
+    assert ergebnis.flotte.personenkilometer_gefahren == 655640.26
+    assert ergebnis.flotte.benzinverbrauch_gesamt == pytest.approx(9450.0)
+    assert ergebnis.flotte.stromverbrauch_gesamt == pytest.approx(150850.0)
+    assert ergebnis.rps.co2_emissionen_gesamt_rps == 81974.55
+    assert ergebnis.rps.co2_emissionen_pro_personenkilometer_rps == 0.125
+
+    *_, gesamtemissionen_av, personenkilometer_gesamt_av, emissionen_pro_personenkilometer_av = SOLLWERTE[methodik]
+    assert ergebnis.referenz.gesamtemissionen_av == gesamtemissionen_av
+    assert ergebnis.referenz.personenkilometer_gesamt_av == personenkilometer_gesamt_av
+    assert ergebnis.referenz.emissionen_pro_personenkilometer_av == pytest.approx(emissionen_pro_personenkilometer_av, rel=1e-12)
+    assert ergebnis.vergleich.ergebnis == ("niedriger" if emissionen_pro_personenkilometer_av > 0.125 else "hoeher")
+
+
+@pytest.mark.parametrize('methodik', SOLLWERTE_INDUKTION)
+def test_compute_balance_ohne_verkehrsinduktion(methodik):
+    referenz = compute_balance(_inputs(methodik, SOLLWERTE_INDUKTION)).referenz
+    *_, gesamtemissionen_av, personenkilometer_gesamt_av, emissionen_pro_personenkilometer_av = SOLLWERTE_INDUKTION[methodik]
+    assert referenz.personenkilometer['verkehrsinduktion'] > 0
+    assert referenz.gesamtemissionen_av == gesamtemissionen_av
+    assert referenz.personenkilometer_gesamt_av == personenkilometer_gesamt_av
+    assert referenz.emissionen_pro_personenkilometer_av == pytest.approx(emissionen_pro_personenkilometer_av, rel=1e-12)
+
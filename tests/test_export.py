@@ -0,0 +1,62 @@
+import gzip
+import io
+import json
+import zipfile
+
+import pandas as pd
+import pytest
+
+from oekorps.engine import MODAL_SPLIT_WEGE, compute_balance
+from oekorps.export import EXCEL, JSON, PARQUET, TABELLEN, export_bytes, export_file, export_tables
+from oekorps.modes import ModeTable
+from tests.test_engine import BUCHUNGEN, FAHRGAESTE, FAHRZEUGE, FAKTOREN, _inputs
+
+
+@pytest.fixture(scope='module')
+def tabellen():
+    inputs = _inputs(MODAL_SPLIT_WEGE)
+    bilanz = compute_balance(inputs)
+    tabelle = ModeTable.for_methodik(MODAL_SPLIT_WEGE, inputs.anteile, inputs.emissionsfaktoren_av, inputs.entfernungen)
+    return export_tables("LOOPmünster", "2022-01-01", "2022-12-31", BUCHUNGEN, FAHRGAESTE, pd.DataFrame(FAHRZEUGE), bilanz.flotte,
+                         FAKTOREN, bilanz.rps, tabelle, bilanz.referenz, bilanz.vergleich)
+
+
+def test_export_tables_spalten(tabellen):
+    assert tuple(tabellen) == TABELLEN
+    assert len(tabellen['eingaben']) == len(tabellen['zusammenfassung']) == 1
+    assert len(tabellen['flotte']) == len(FAHRZEUGE)
+    assert tabellen['zusammenfassung'].loc[0, 'gesamtemissionen_av'] == 300667.11
+    assert tabellen['referenz']['personenkilometer'].where(tabellen['referenz']['bilanziert']).sum() == pytest.approx(2337616.32)
+
+
+@pytest.mark.parametrize('komprimiert', [False, True])
+def test_parquet_rundreise(tabellen, komprimiert):
+    daten = export_bytes(tabellen, PARQUET, komprimiert)
+    assert daten == export_bytes(tabellen, PARQUET, komprimiert)
+    with zipfile.ZipFile(io.BytesIO(daten)) as archiv:
+        assert archiv.namelist() == [f"{name}.parquet" for name in TABELLEN]
+        for name, tabelle in tabellen.items():
+            pd.testing.assert_frame_equal(pd.read_parquet(io.BytesIO(archiv.read(f"{name}.parquet"))), tabelle, check_dtype=False)
+
+
+def test_json_rundreise(tabellen):
+    daten = export_bytes(tabellen, JSON)
+    assert gzip.decompress(export_bytes(tabellen, JSON, komprimiert=True)) == daten
+    inhalt = json.loads(daten)
+    for name, tabelle in tabellen.items():
+        gelesen = pd.read_json(io.StringIO(json.dumps(inhalt[name])), orient='table')
+        pd.testing.assert_frame_equal(gelesen, tabelle, check_dtype=False)
+
+
+def test_excel_rundreise(tabellen):
+    pytest.importorskip('openpyxl')
+    blaetter = pd.read_excel(io.BytesIO(export_bytes(tabellen, EXCEL)), sheet_name=None, engine='openpyxl')
+    assert list(blaetter) == list(TABELLEN)
+    pd.testing.assert_frame_equal(blaetter['referenz'], tabellen['referenz'], check_dtype=False)
+
+
+def test_export_file():
+    assert export_file("ergebnisse", JSON, komprimiert=True) == ("ergebnisse.json.gz", "application/gzip")
+    assert export_file("ergebnisse", PARQUET)[0] == "ergebnisse.zip"
+    with pytest.raises(ValueError):
+        export_bytes({}, "csv")
@@ -0,0 +1,79 @@
+import io
+
+import pandas as pd
+import pytest
+
+from oekorps.engine import BENZINVERBRAUCH, DIESELVERBRAUCH, FAHRZEUGTYP, KILOMETER_BESETZT, KILOMETER_LEER, STROMVERBRAUCH
+from oekorps.fleet import FleetTotals, apply_edits, edited_fleet, read_fleet, validate_fleet
+
+
+BASIS = pd.DataFrame({
+    FAHRZEUGTYP: ["LEVC TX", "Vito", "eVito", "EQV"],
+    BENZINVERBRAUCH: [1.35, 0.0, 0.0, 0.0],
+    DIESELVERBRAUCH: [0.0, 8.4, 0.0, 0.0],
+    STROMVERBRAUCH: [21.55, 0.0, 29.8, 30.2],
+    KILOMETER_LEER: [120000.0, 50000.0, 30000.0, 1000.0],
+    KILOMETER_BESETZT: [380000.0, 150000.0, 90000.0, 4000.0],
+})
+
+
+def test_apply_edits_wie_neuberechnung():
+    aenderungen = {
+        'edited_rows': {0: {KILOMETER_LEER: 100000.0}, 2: {STROMVERBRAUCH: 25.0}, 3: {KILOMETER_BESETZT: 9999.0}},
+        'added_rows': [{FAHRZEUGTYP: "Nissan e NV 200", STROMVERBRAUCH: 20.6, KILOMETER_LEER: 500.0, KILOMETER_BESETZT: 2500.0}],
+        'deleted_rows': [3, 1],
+    }
+    bearbeitet = BASIS.copy()
+    bearbeitet.loc[0, KILOMETER_LEER] = 100000.0
+    bearbeitet.loc[2, STROMVERBRAUCH] = 25.0
+    bearbeitet = pd.concat([bearbeitet.drop(index=[1, 3]), pd.DataFrame(aenderungen['added_rows'])], ignore_index=True)
+
+    summen = apply_edits(FleetTotals.of_frame(BASIS), BASIS, aenderungen)
+    erwartet = FleetTotals.of_frame(bearbeitet)
+    assert summen.fahrzeuge == erwartet.fahrzeuge == 3
+    for name in ('kilometer_leer', 'kilometer_besetzt', 'benzinverbrauch', 'dieselverbrauch', 'stromverbrauch'):
+        assert getattr(summen, name) == pytest.approx(getattr(erwartet, name), rel=1e-12, abs=1e-9), name
+
+
+def test_apply_edits_ohne_aenderungen():
+    summen = FleetTotals.of_frame(BASIS)
+    assert apply_edits(summen, BASIS, None) is summen
+    assert apply_edits(summen, BASIS, {'edited_rows': {}, 'added_rows': [], 'deleted_rows': []}) == summen
+
+
+def test_edited_fleet_wie_vollstaendige_pruefung():
+    aenderungen = {
+        'edited_rows': {0: {KILOMETER_LEER: 100000.5}, 1: {STROMVERBRAUCH: 1.0}, 2: {FAHRZEUGTYP: " eVito 2 ", BENZINVERBRAUCH: None}},
+        'added_rows': [{FAHRZEUGTYP: "Nissan e NV 200", STROMVERBRAUCH: 20.6, KILOMETER_LEER: 500.0}, {}],
+        'deleted_rows': [1],
+    }
+    bearbeitet = BASIS.copy()
+    bearbeitet.loc[0, KILOMETER_LEER] = 100000.5
+    bearbeitet.loc[2, [FAHRZEUGTYP, BENZINVERBRAUCH]] = [" eVito 2 ", None]
+    bearbeitet = pd.concat([bearbeitet.drop(index=[1]), pd.DataFrame(aenderungen['added_rows'])], ignore_index=True)
+
+    pd.testing.assert_frame_equal(edited_fleet(BASIS, aenderungen), validate_fleet(bearbeitet))
+    assert edited_fleet(BASIS, None) is BASIS
+
+
+def test_edited_fleet_meldet_zeilen_im_editor():
+    aenderungen = {
+        'edited_rows': {3: {KILOMETER_BESETZT: -1.0}},
+        'added_rows': [{FAHRZEUGTYP: "", KILOMETER_LEER: 5.0}],
+        'deleted_rows': [0],
+    }
+    with pytest.raises(ValueError) as fehler:
+        edited_fleet(BASIS, aenderungen)
+    assert f"{FAHRZEUGTYP} fehlt in Zeile 4" in str(fehler.value)
+    assert f"{KILOMETER_BESETZT}: negativer Wert in Zeile 3" in str(fehler.value)
+
+
+def test_read_fleet_deutsches_csv():
+    # Erste Zeile ohne Dezimalkomma: die Kopfzeile bestimmt das Format, nicht die Zahl der Felder
+    daten = ("Fahrzeugtyp;Benzinverbrauch (l/100km);Stromverbrauch (kWh/100km);Kilometer leer;Kilometer besetzt\n"
+             "eVito;0;30;30000;90000\nLEVC TX;1,35;21,55;120000;380000,5\n")
+    fahrzeuge = read_fleet(io.BytesIO(daten.encode('utf-8')), 'flotte.csv')
+    assert fahrzeuge[FAHRZEUGTYP].tolist() == ["eVito", "LEVC TX"]
+    assert fahrzeuge.loc[1, BENZINVERBRAUCH] == 1.35
+    assert fahrzeuge.loc[1, STROMVERBRAUCH] == 21.55
+    assert fahrzeuge.loc[1, KILOMETER_BESETZT] == 380000.5
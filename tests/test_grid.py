@@ -0,0 +1,62 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from oekorps.grid import MONATLICH, STUENDLICH, GridSeries, charging_emissions, period_grid_factors, read_grid_series
+
+
+def _reihe(text: str):
+    return read_grid_series(io.BytesIO(text.encode('utf-8')), 'netz.csv')
+
+
+def test_monatswerte_deutsch():
+    reihe = _reihe("zeitstempel;g/kWh\n01.01.2024;300\n01.02.2024;400,5\n01.03.2024;350\n")
+    assert reihe.aufloesung == MONATLICH
+    assert str(reihe.start.date()) == "2024-01-01"
+    assert np.array_equal(reihe.werte, [300.0, 400.5, 350.0])
+
+
+def test_stundenwerte_mit_und_ohne_uhrzeit():
+    reihe = _reihe("zeitstempel,g/kWh\n2024-01-01,300\n2024-01-01 01:00,310\n2024-01-01 02:00,320\n")
+    assert reihe.aufloesung == STUENDLICH
+    assert np.array_equal(reihe.werte, [300.0, 310.0, 320.0])
+
+
+def test_tageswerte_abgelehnt():
+    with pytest.raises(ValueError, match="weder Stunden- noch Monatswerte"):
+        _reihe("zeitstempel;g/kWh\n01.01.2024;300\n02.01.2024;400\n03.01.2024;350\n")
+
+
+def test_period_grid_factors_konstant():
+    reihe = GridSeries(pd.Timestamp("2024-01-01"), STUENDLICH, np.full(24 * 366, 420.0))
+    faktoren = period_grid_factors(reihe, ["2024-01-01", "2024-03-31", "2024-06-01"], ["2024-01-31", "2024-04-01", "2024-12-31"],
+                                   ladeprofil=np.arange(1, 25))
+    assert faktoren.tolist() == [420.0, 420.0, 420.0]
+
+
+def test_period_grid_factors_zwei_werte():
+    # Januar 100, Februar 300 g/kWh: gleichmäßiges Laden über 31 + 29 Tage
+    reihe = GridSeries(pd.Timestamp("2024-01-01"), MONATLICH, np.array([100.0, 300.0]))
+    faktoren = period_grid_factors(reihe, ["2024-01-01", "2024-01-01", "2024-02-10"], ["2024-02-29", "2024-01-31", "2024-02-20"])
+    assert faktoren.tolist() == [round((31 * 100 + 29 * 300) / 60, 2), 100.0, 300.0]
+
+
+def test_period_grid_factors_ladeprofil():
+    # Tag und Nacht im Wechsel; geladen wird nur nachts (0 bis 5 Uhr)
+    stunden = np.tile(np.where(np.arange(24) < 6, 50.0, 500.0), 7)
+    reihe = GridSeries(pd.Timestamp("2024-01-01"), STUENDLICH, stunden)
+    nachts = np.where(np.arange(24) < 6, 1.0, 0.0)
+    assert period_grid_factors(reihe, ["2024-01-01"], ["2024-01-07"], nachts).tolist() == [50.0]
+    assert period_grid_factors(reihe, ["2024-01-01"], ["2024-01-07"]).tolist() == [(6 * 50 + 18 * 500) / 24]
+    with pytest.raises(ValueError, match="deckt den Betrachtungszeitraum nicht ab"):
+        period_grid_factors(reihe, ["2024-01-01"], ["2024-01-08"])
+
+
+def test_charging_emissions_summen():
+    reihe = GridSeries(pd.Timestamp("2024-01-01"), MONATLICH, np.array([100.0, 300.0]))
+    tabelle = charging_emissions(reihe, 6000.0, "2024-01-01", "2024-02-29")
+    assert tabelle['Strom (kWh)'].sum() == pytest.approx(6000.0)
+    assert tabelle['Strom (kWh)'].tolist() == pytest.approx([3100.0, 2900.0])
+    assert tabelle['Emissionen (kg CO2eq)'].tolist() == pytest.approx([310.0, 870.0])
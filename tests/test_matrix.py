@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from oekorps import presets
+from oekorps.engine import ENTFERNUNG_MIT_FAHRGAST, METHODEN
+from oekorps.matrix import preset_matrix
+from oekorps.modes import ModeTable, distance_preset, is_wege, mode_vector
+
+FAHRGAESTE, PERSONENKILOMETER = 187309, 655640.26
+FAHRTDISTANZ_BK, FAHRTDISTANZ_LK = 3.5, 4.62
+
+
+@pytest.mark.parametrize('methodik', METHODEN)
+def test_preset_matrix_wie_einzelrechnung(methodik):
+    matrix = preset_matrix(methodik, FAHRGAESTE, PERSONENKILOMETER, FAHRTDISTANZ_BK, FAHRTDISTANZ_LK)
+    verteilungen = presets.modal_split_options(methodik)
+    entfernungen = presets.ENTFERNUNG_OPTIONEN if is_wege(methodik) else (None,)
+    assert matrix.werte.shape == (len(verteilungen), len(entfernungen), len(presets.EMISSIONSDATEN_AV_OPTIONEN))
+    assert matrix.pivot().shape == (len(verteilungen), len(matrix.spalten()))
+    assert len(matrix.frame()) == matrix.werte.size
+
+    for i, anteile in enumerate(verteilungen.values()):
+        for j, entfernung in enumerate(entfernungen):
+            wegeentfernungen = None if entfernung is None else distance_preset(
+                presets.REISEWEITEN_MID_2017 if entfernung == presets.REISEWEITEN_MID_2017_NAME else entfernung, methodik,
+                FAHRTDISTANZ_BK, FAHRTDISTANZ_LK)
+            for k, emissionsdaten in enumerate(presets.EMISSIONSDATEN_AV_OPTIONEN.values()):
+                tabelle = ModeTable.from_vectors(methodik, anteile, mode_vector(methodik, emissionsdaten), wegeentfernungen)
+                erwartet = tabelle.compute(FAHRGAESTE, PERSONENKILOMETER).emissionen_pro_personenkilometer_av
+                assert matrix.werte[i, j, k] == pytest.approx(erwartet, rel=1e-12)
+
+
+def test_preset_matrix_ohne_fahrtdistanz():
+    # Ohne Fahrtdistanz ergibt die Wegeentfernung nach Fahrtdistanz keine Personenkilometer
+    methodik = METHODEN[0]
+    matrix = preset_matrix(methodik, FAHRGAESTE, PERSONENKILOMETER)
+    spalte = presets.ENTFERNUNG_OPTIONEN.index(ENTFERNUNG_MIT_FAHRGAST)
+    assert np.isnan(matrix.werte[:, spalte]).all()
+    assert np.isfinite(matrix.werte[:, presets.ENTFERNUNG_OPTIONEN.index(presets.REISEWEITEN_MID_2017_NAME)]).all()
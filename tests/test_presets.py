@@ -0,0 +1,48 @@
+import pytest
+
+from oekorps import presets
+from oekorps.engine import MODAL_SPLIT_PKM, MODAL_SPLIT_WEGE, UMFRAGE_PKM, UMFRAGE_WEGE, modes_for
+
+
+def test_vorauswahlen_passen_zur_methodik():
+    for methodik in (MODAL_SPLIT_WEGE, MODAL_SPLIT_PKM, UMFRAGE_WEGE, UMFRAGE_PKM):
+        for name, anteile in presets.modal_split_options(methodik).items():
+            assert len(anteile) == len(modes_for(methodik)), name
+        assert list(presets.modal_split_shares(methodik, presets.default_modal_split(methodik))) == list(modes_for(methodik))
+    assert set(modes_for(UMFRAGE_WEGE)) == set(presets.REISEWEITEN_MID_2017)  # mit Verkehrsinduktion
+    for name, profil in presets.LADEPROFILE.items():
+        assert len(profil) == 24, name
+
+
+def test_werte_der_seite():
+    # Werte, die vor der Datenbibliothek in der Seite standen
+    assert presets.BENZIN_EMISSIONSDATEN_OPTIONEN["DIN EN 16258:2013, Tabelle A.2 [CO2eq]"] == 2880
+    assert sorted(presets.STROM_EMISSIONSDATEN_OPTIONEN.values()) == [56, 363, 498]
+    assert presets.EMISSIONSDATEN_UBA_2022['miv_fahrer'] == 152.86
+
+
+def test_unveraenderlich():
+    with pytest.raises(TypeError):
+        presets.STROM_EMISSIONSDATEN_OPTIONEN["Neu"] = 1
+    with pytest.raises(TypeError):
+        presets.FAHRZEUGTYPEN["Nissan e NV 200"]["Kilometer leer"] = 1
+    assert isinstance(presets.MODAL_SPLIT_WEGE_OPTIONEN["Modal Split (Wege) MiD 2017"], tuple)
+
+
+def test_eigene_datenbibliothek(tmp_path):
+    pfad = tmp_path / "eigene.toml"
+    pfad.write_text('version = "test"\n\n[[strom]]\nname = "Eigener Strommix"\nwert = 321\nquelle = "Messung"\n', encoding='utf-8')
+    bibliothek = presets.load_library(str(pfad))
+    assert bibliothek['version'] == "test"
+    assert bibliothek['strom'][0] == presets.Preset("Eigener Strommix", 321, "Messung")
+    assert presets.load_library(str(pfad)) is bibliothek  # einmal je Pfad gelesen
+
+    ohne_version = tmp_path / "ohne_version.toml"
+    ohne_version.write_text('[[strom]]\nname = "x"\nwert = 1\n', encoding='utf-8')
+    with pytest.raises(ValueError, match="keine Version"):
+        presets.load_library(str(ohne_version))
+
+
+def test_unbekannte_vorauswahl():
+    with pytest.raises(ValueError):
+        presets.modal_split_shares(MODAL_SPLIT_WEGE, "gibt es nicht")
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from oekorps.engine import MODAL_SPLIT_WEGE, compute_balance
+from oekorps.modes import ModeTable
+from oekorps.sensitivity import SOBOL, BalanceModel, Parameter, SensitivitySpec, morris, run_sensitivity, sobol
+from tests.test_engine import FAHRGAESTE, FAKTOREN, _inputs
+
+# Additives Testmodell y = 1 * a + 2 * b + 0 * c auf [0, 1]^3: S1 = ST = (0.2, 0.8, 0)
+PARAMETER = (Parameter('a', "a", 0.5, 0.0, 1.0), Parameter('b', "b", 0.5, 0.0, 1.0), Parameter('c', "c", 0.5, 0.0, 1.0))
+
+
+class Additiv:
+    def evaluate(self, werte):
+        return {'y': werte['a'] + 2 * werte['b'] + 0 * werte['c']}
+
+
+def test_sobol_additives_modell():
+    indizes = sobol(Additiv(), PARAMETER, 'y', stichproben=2 ** 14, seed=1).set_index('parameter')
+    assert indizes.loc[['a', 'b', 'c'], 'S1'].to_numpy() == pytest.approx([0.2, 0.8, 0.0], abs=0.03)
+    assert indizes.loc[['a', 'b', 'c'], 'ST'].to_numpy() == pytest.approx([0.2, 0.8, 0.0], abs=0.03)
+
+
+def test_morris_lineares_modell():
+    # Elementareffekte eines linearen Modells sind Steigung * Bereich, ohne Streuung
+    indizes = morris(Additiv(), PARAMETER, 'y', trajektorien=50, seed=3).set_index('parameter')
+    assert indizes.loc[['a', 'b', 'c'], 'mu_star'].to_numpy() == pytest.approx([1.0, 2.0, 0.0])
+    assert indizes.loc[['a', 'b', 'c'], 'mu'].to_numpy() == pytest.approx([1.0, 2.0, 0.0])
+    assert indizes['sigma'].to_numpy() == pytest.approx(0.0, abs=1e-9)
+
+
+def test_balance_model_basisfall_wie_compute_balance():
+    inputs = _inputs(MODAL_SPLIT_WEGE)
+    bilanz = compute_balance(inputs)
+    tabelle = ModeTable.for_methodik(MODAL_SPLIT_WEGE, inputs.anteile, inputs.emissionsfaktoren_av, inputs.entfernungen)
+    model = BalanceModel.from_balance(bilanz.flotte, tabelle, FAHRGAESTE, FAKTOREN.benzin_emissionsdaten, FAKTOREN.diesel_emissionsdaten,
+                                      FAKTOREN.strom_emissionsdaten, FAKTOREN.oekostrom_anteil, FAKTOREN.pv_emissionsdaten)
+    basis = model.evaluate({})
+    assert basis['gesamtemissionen_av'][0] == pytest.approx(bilanz.referenz.gesamtemissionen_av)
+    assert basis['co2_emissionen_gesamt_rps'][0] == pytest.approx(bilanz.rps.co2_emissionen_gesamt_rps, rel=1e-6)
+
+    ergebnis = run_sensitivity(model, SensitivitySpec(methode=SOBOL, stichproben=512, seed=0))
+    assert len(ergebnis.indizes) == len(ergebnis.parameter)
+    assert np.isfinite(ergebnis.indizes[['S1', 'ST']].to_numpy()).all()
+    # Die Kennzahl ist in jedem Parameter monoton: der Basisfall liegt zwischen den Werten an den Bereichsgrenzen
+    tornado = ergebnis.tornado
+    assert (tornado[['unten', 'oben']].min(axis=1) <= tornado['basis'] + 1e-8).all()
+    assert (tornado[['unten', 'oben']].max(axis=1) >= tornado['basis'] - 1e-8).all()
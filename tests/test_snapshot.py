@@ -0,0 +1,47 @@
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from oekorps.fleet import validate_fleet
+from oekorps.snapshot import Snapshot, read_snapshot, read_token, snapshot_bytes, snapshot_token
+
+EINGABEN = {
+    'name_ridepooling_system': "LOOPmünster",
+    'start_date': date(2022, 1, 1),
+    'end_date': date(2022, 12, 31),
+    'abgeschlossene_buchungen': 151415,
+    'oekostrom_anteil': 30,
+    'pv_emissionsdaten': 50.0,
+    'methodik': "Modal Split (Wege)",
+    'anteile': {'miv_fahrer': 40.5, 'zu_fuss': 22.0},
+}
+FAHRZEUGE = validate_fleet(pd.DataFrame({
+    "Fahrzeugtyp": [f"Fahrzeug {i}" for i in range(100)],
+    "Stromverbrauch (kWh/100km)": [20.0 + i / 10 for i in range(100)],
+    "Kilometer leer": [1000.0 * i for i in range(100)],
+    "Kilometer besetzt": [3000.5 * i for i in range(100)],
+}))
+
+
+def _pruefen(geladen: Snapshot):
+    assert geladen.eingaben == EINGABEN
+    pd.testing.assert_frame_equal(geladen.fahrzeuge, FAHRZEUGE)
+
+
+def test_snapshot_token():
+    _pruefen(read_token(snapshot_token(Snapshot(EINGABEN, FAHRZEUGE))))
+
+
+@pytest.mark.parametrize('komprimiert', [True, False])
+def test_snapshot_bytes(komprimiert):
+    daten = snapshot_bytes(Snapshot(EINGABEN, FAHRZEUGE), komprimiert)
+    assert daten == snapshot_bytes(Snapshot(EINGABEN, FAHRZEUGE), komprimiert)
+    _pruefen(read_snapshot(daten))
+
+
+def test_snapshot_neuere_version():
+    with pytest.raises(ValueError, match="neuere Version"):
+        read_snapshot(b'{"format": "oekorps-szenario", "version": 99}')
+    with pytest.raises(ValueError):
+        read_token("kein-code")
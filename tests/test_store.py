@@ -0,0 +1,38 @@
+from datetime import date
+
+from oekorps.engine import MODAL_SPLIT_PKM, MODAL_SPLIT_WEGE, BalanceInputs, compute_balance, modes_for
+from oekorps.store import RunStore
+
+FAHRZEUGE = [{"Fahrzeugtyp": "Vito", "Dieselverbrauch (l/100km)": 8.4, "Kilometer leer": 5000.0, "Kilometer besetzt": 15000.0}]
+
+
+def _bilanz(methodik: str, jahr: int) -> dict:
+    modes = modes_for(methodik)
+    return compute_balance(BalanceInputs(
+        abgeschlossene_buchungen=1000, transportierte_fahrgaeste=1500, fahrzeuge=FAHRZEUGE, methodik=methodik,
+        anteile={'miv_fahrer': 60, 'zu_fuss': 40}, emissionsfaktoren_av=dict.fromkeys(modes, 100.0),
+        entfernungen=dict.fromkeys(modes, 5.0), name_ridepooling_system="G-Mobil", start_date=date(jahr, 1, 1), end_date=date(jahr, 12, 31),
+    )).as_dict()
+
+
+def test_run_store_speichern_und_laden(tmp_path):
+    pfad = tmp_path / "bilanzen.sqlite"
+    eingaben = {'quelle': "test"}
+    with RunStore(str(pfad)) as store:
+        ergebnisse = _bilanz(MODAL_SPLIT_WEGE, 2022)
+        bilanz_id = store.record(ergebnisse, eingaben)
+        assert store.record(ergebnisse, eingaben) == bilanz_id  # gleiche Bilanz nur einmal
+        assert store.record_many([_bilanz(MODAL_SPLIT_PKM, 2022), _bilanz(MODAL_SPLIT_WEGE, 2023)], eingaben) == 2
+
+    with RunStore(str(pfad)) as store:
+        geladen = store.load(bilanz_id)
+        assert geladen['eingaben'] == eingaben
+        assert geladen['ergebnisse']['start_date'] == "2022-01-01"
+        for name, wert in ergebnisse.items():
+            if isinstance(wert, (int, float, str)):
+                assert geladen['ergebnisse'][name] == wert, name
+
+        assert store.systems() == ["G-Mobil"]
+        assert len(store.query("G-Mobil")) == 3
+        assert store.query(methodik=MODAL_SPLIT_WEGE, von=2023)['start_date'].tolist() == ["2023-01-01"]
+        assert sorted(store.query(bis=2022)['methodik']) == [MODAL_SPLIT_PKM, MODAL_SPLIT_WEGE]
@@ -0,0 +1,64 @@
+import io
+
+import numpy as np
+import pytest
+
+from oekorps.engine import MODAL_SPLIT_PKM, MODAL_SPLIT_WEGE, modes_for
+from oekorps.modes import ModeTable
+from oekorps.substitution import ENTFERNUNG, SubstitutionSpec, load_trips, substitute_trips
+
+KEYS = modes_for(MODAL_SPLIT_WEGE)
+ANTEILE = [40, 0, 10, 0, 0, 0, 0, 20, 30, 0]
+EMISSIONEN = [150.0, 150.0, 80.0, 60.0, 60.0, 90.0, 4.0, 0.0, 0.0, 0.0]
+TABELLE = ModeTable.from_vectors(MODAL_SPLIT_WEGE, ANTEILE, EMISSIONEN, [10.0] * len(KEYS))
+N = 100_000
+
+
+def test_pkm_je_verkehrsmittel_wie_anteile():
+    distanzen, fahrgaeste = np.full(N, 4.0), np.full(N, 1.5)
+    ergebnis = substitute_trips(TABELLE, distanzen, fahrgaeste, SubstitutionSpec(seed=5))
+    referenz = ergebnis.referenz
+    assert sum(ergebnis.fahrten.values()) == N
+    assert referenz.personenkilometer_gesamt_av == pytest.approx(N * 4.0 * 1.5)
+    anteile = np.array([referenz.personenkilometer[key] for key in KEYS]) / referenz.personenkilometer_gesamt_av * 100
+    assert anteile == pytest.approx(ANTEILE, abs=0.5)
+    assert referenz.gesamtemissionen_av == pytest.approx(sum(referenz.emissionen.values()), abs=0.01)
+    assert ergebnis.referenzdistanz == pytest.approx(4.0)
+
+
+def test_gleicher_seed_gleiches_ergebnis():
+    rng = np.random.default_rng(0)
+    distanzen, fahrgaeste = rng.uniform(0.5, 15, N), rng.integers(1, 4, N)
+    spec = SubstitutionSpec(wahlmodell=ENTFERNUNG, elastizitaeten={'miv_fahrer': 1.0}, seed=11)
+    erstes = substitute_trips(TABELLE, distanzen, fahrgaeste, spec)
+    zweites = substitute_trips(TABELLE, distanzen, fahrgaeste, spec, prozesse=2)
+    assert erstes.fahrten == zweites.fahrten
+    assert erstes.referenz.personenkilometer == zweites.referenz.personenkilometer
+
+
+def test_elastizitaet_verschiebt_lange_fahrten_zum_miv():
+    # Bei der Referenzdistanz gelten die Anteile; mit beta > 0 wählen längere Fahrten häufiger den MIV
+    spec = SubstitutionSpec(wahlmodell=ENTFERNUNG, elastizitaeten={'miv_fahrer': 1.0}, referenzdistanz=4.0, seed=2)
+    miv = KEYS.index('miv_fahrer')
+
+    def miv_anteil(distanz):
+        fahrten = substitute_trips(TABELLE, np.full(N, distanz), np.ones(N), spec).fahrten
+        return fahrten[KEYS[miv]] / N
+
+    assert miv_anteil(4.0) == pytest.approx(0.4, abs=0.01)
+    # Nutzen ln(0.4 * 4) gegen ln(0.6): Wahrscheinlichkeit 1.6 / 2.2
+    assert miv_anteil(16.0) == pytest.approx(1.6 / 2.2, abs=0.01)
+
+
+def test_load_trips_nur_gebuchte_fahrten():
+    daten = "buchung_id,fahrgaeste,km_besetzt,km_leer,fahrzeug_id,zeitstempel\n1,2,3.5,0,A,2024-01-01\n,0,0,5,A,2024-01-01\n2,1,7,1,B,2024-01-02\n"
+    distanzen, fahrgaeste = load_trips(io.BytesIO(daten.encode('utf-8')), 'fahrten.csv')
+    assert distanzen.tolist() == [3.5, 7.0]
+    assert fahrgaeste.tolist() == [2.0, 1.0]
+
+
+def test_nur_wege_methoden():
+    tabelle = ModeTable.from_vectors(MODAL_SPLIT_PKM, [100.0] + [0.0] * (len(modes_for(MODAL_SPLIT_PKM)) - 1),
+                                     [150.0] * len(modes_for(MODAL_SPLIT_PKM)))
+    with pytest.raises(ValueError):
+        substitute_trips(tabelle, [1.0], [1.0])
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from oekorps.engine import MODAL_SPLIT_WEGE, compute_balance
+from oekorps.modes import ModeTable
+from oekorps.sensitivity import BalanceModel
+from oekorps.sweep import BREAK_EVEN_AUSGABE, Achse, SweepSpec, find_roots, run_sweep
+from tests.test_engine import FAHRGAESTE, FAKTOREN, _inputs
+
+
+def test_find_roots_linear():
+    wurzel = find_roots(lambda x: 2 * x - 3, [0.0, 1.5, 2.0, -4.0], [5.0, 4.0, 5.0, 1.5])
+    assert wurzel[[0, 1, 3]] == pytest.approx([1.5, 1.5, 1.5], abs=1e-9)
+    assert np.isnan(wurzel[2])  # gleiches Vorzeichen an beiden Grenzen
+
+
+def test_find_roots_nichtlinear():
+    steigung = np.array([1.0, 2.0, 10.0])
+    wurzel = find_roots(lambda x: steigung * x ** 3 - 2, np.zeros(3), np.full(3, 2.0))
+    assert wurzel == pytest.approx((2 / steigung) ** (1 / 3), abs=1e-8)
+
+
+@pytest.fixture
+def model():
+    inputs = _inputs(MODAL_SPLIT_WEGE)
+    bilanz = compute_balance(inputs)
+    tabelle = ModeTable.for_methodik(MODAL_SPLIT_WEGE, inputs.anteile, inputs.emissionsfaktoren_av, inputs.entfernungen)
+    return BalanceModel.from_balance(bilanz.flotte, tabelle, FAHRGAESTE, FAKTOREN.benzin_emissionsdaten, FAKTOREN.diesel_emissionsdaten,
+                                     FAKTOREN.strom_emissionsdaten, FAKTOREN.oekostrom_anteil, FAKTOREN.pv_emissionsdaten)
+
+
+def test_run_sweep_break_even(model):
+    achsen = (Achse('besetzungsquote', 0.2, 3.0, 15), Achse('strom_emissionsdaten', 100.0, 600.0, 6))
+    ergebnis = run_sweep(model, SweepSpec(achsen))
+    assert ergebnis.werte.shape == (15, 6)
+    assert ergebnis.break_even.shape == (6,)
+    assert len(ergebnis.frame()) == 15 * 6
+
+    # Am Break-even sind die Emissionen pro Pkm gleich; mit höherem Stromfaktor wird eine höhere Besetzung benötigt
+    strom = achsen[1].werte
+    differenz = model.evaluate({'besetzungsquote': ergebnis.break_even, 'strom_emissionsdaten': strom})[BREAK_EVEN_AUSGABE]
+    assert differenz == pytest.approx(0.0, abs=1e-9)
+    assert (np.diff(ergebnis.break_even) > 0).all()
+
+
+@pytest.mark.parametrize('achsen', [
+    (),
+    (Achse('besetzungsquote', 0.5, 2.0), Achse('besetzungsquote', 0.5, 2.0)),
+    (Achse('unbekannt', 0.0, 1.0),),
+    (Achse('besetzungsquote', 0.5, 2.0, schritte=1),),
+])
+def test_run_sweep_ungueltige_achsen(model, achsen):
+    with pytest.raises(ValueError):
+        run_sweep(model, SweepSpec(achsen))
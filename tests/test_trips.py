@@ -0,0 +1,44 @@
+import io
+
+import pandas as pd
+import pytest
+
+from oekorps.engine import KILOMETER_BESETZT, KILOMETER_LEER
+from oekorps.trips import FAHRZEUG, aggregate_trips
+
+# Zweite Zeile ohne Buchungs-ID (Umsetzfahrt), aber mit eingetragenen Fahrgästen
+FAHRTEN = """buchung_id,fahrgaeste,km_besetzt,km_leer,fahrzeug_id,zeitstempel
+1,2,10.0,1.0,A,2024-01-05 08:00
+,3,0.0,4.0,A,2024-01-05 09:00
+2,1,5.0,0.5,B,2024-01-20 10:00
+3,4,8.0,2.0,A,2024-02-01 11:00
+"""
+
+
+def test_fahrgaeste_nur_mit_buchung():
+    summen = aggregate_trips(io.StringIO(FAHRTEN), 'fahrten.csv', 'Monat', blockzeilen=2).set_index(['start_date', FAHRZEUG])
+    januar_a = summen.loc[(pd.Timestamp('2024-01-01').date(), 'A')]
+    assert januar_a['abgeschlossene_buchungen'] == 1
+    assert januar_a['transportierte_fahrgaeste'] == 2
+    assert januar_a[KILOMETER_LEER] == 5.0
+    assert januar_a[KILOMETER_BESETZT] == 10.0
+    assert summen['abgeschlossene_buchungen'].sum() == 3
+    assert summen['transportierte_fahrgaeste'].sum() == 7
+
+
+# Deutsches Excel-CSV: Tag zuerst, Dezimalkomma; Zeitstempel mit und ohne Uhrzeit in einem Block
+FAHRTEN_DEUTSCH = """buchung_id;fahrgaeste;km_besetzt;km_leer;fahrzeug_id;zeitstempel
+1;1;2,5;0,5;A;03.01.2024 08:00
+2;1;2,5;0,5;A;05.01.2024
+3;1;2,5;0,5;A;13.01.2024 17:45
+4;1;2,5;0,5;A;2024-02-01 10:00
+5;1;2,5;0,5;A;2024-02-02
+"""
+
+
+@pytest.mark.parametrize('blockzeilen', [1, 2, 4, 5])
+def test_deutsche_zeitstempel_je_block(blockzeilen):
+    summen = aggregate_trips(io.BytesIO(FAHRTEN_DEUTSCH.encode('utf-8')), 'fahrten.csv', 'Monat', blockzeilen=blockzeilen)
+    assert [str(tag) for tag in summen['start_date']] == ["2024-01-01", "2024-02-01"]
+    assert summen['abgeschlossene_buchungen'].tolist() == [3, 2]
+    assert summen[KILOMETER_BESETZT].tolist() == [7.5, 5.0]
@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from oekorps.engine import MODAL_SPLIT_WEGE, modes_for
+from oekorps.modes import ModeTable
+from oekorps.uncertainty import BLOCKGROESSE, DREIECK, UncertaintySpec, run_monte_carlo
+
+TABELLE = ModeTable.from_vectors(MODAL_SPLIT_WEGE, [42, 16, 3, 3, 2, 1, 1, 10, 22, 0],
+                                 [0.0, 152.86, 152.86, 80.54, 58.79, 58.79, 90.0, 3.9, 0.0, 0.0][:len(modes_for(MODAL_SPLIT_WEGE))],
+                                 [16.0, 18.0, 23.0, 23.0, 23.0, 16.0, 4.0, 4.0, 2.0, 0.0])
+
+
+def test_run_monte_carlo_seriell_wie_parallel():
+    spec = UncertaintySpec(stichproben=2 * BLOCKGROESSE + 123, emission_verteilung=DREIECK, seed=7)
+    seriell = run_monte_carlo(TABELLE, 81974.55, 0.125, spec, transportierte_fahrgaeste=187309, prozesse=1)
+    parallel = run_monte_carlo(TABELLE, 81974.55, 0.125, spec, transportierte_fahrgaeste=187309, prozesse=2)
+    assert len(seriell.gesamtemissionen_av) == spec.stichproben
+    assert np.array_equal(seriell.gesamtemissionen_av, parallel.gesamtemissionen_av)
+    assert np.array_equal(seriell.emissionen_pro_personenkilometer_av, parallel.emissionen_pro_personenkilometer_av)
+
+
+@pytest.mark.parametrize('spec', [
+    UncertaintySpec(stichproben=0),
+    UncertaintySpec(stichproben=-5),
+    UncertaintySpec(konzentration=-1.0),
+    UncertaintySpec(entfernung_streuung=-0.1),
+    UncertaintySpec(emission_streuung=-0.1),
+    UncertaintySpec(emission_verteilung="normal"),
+])
+def test_run_monte_carlo_ungueltige_angaben(spec):
+    with pytest.raises(ValueError):
+        run_monte_carlo(TABELLE, 81974.55, 0.125, spec, transportierte_fahrgaeste=187309)